@@ -4,23 +4,17 @@ import sys
 import yaml
 import json
 import os
-import math
+import sqlite3
+import time
 import pandas as pd
 import geocoder
 import pytz
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from timezonefinder import TimezoneFinder
 import altair as alt
-from astropy.coordinates import EarthLocation, SkyCoord, FK5, AltAz
-try:
-    from astropy.coordinates import get_moon, get_sun
-except ImportError:
-    from astropy.coordinates import get_body
-    def get_moon(time, location=None, ephemeris=None): return get_body("moon", time, location, ephemeris=ephemeris)
-    def get_sun(time): return get_body("sun", time)
+from astropy.coordinates import EarthLocation, SkyCoord, FK5
 from astropy import units as u
-from astropy.time import Time
 
 try:
     from streamlit_js_eval import get_geolocation, streamlit_js_eval as _ss_js
@@ -39,8 +33,19 @@ except ImportError:
     Github = None           # optional: admin panel GitHub sync disabled without this
 
 # Import from local modules
-from backend.resolvers import resolve_simbad, resolve_horizons, resolve_horizons_with_mag, get_horizons_ephemerides, resolve_planet, get_planet_ephemerides
-from backend.core import compute_trajectory, calculate_planning_info, azimuth_to_compass, moon_sep_deg, compute_peak_alt_in_window
+from backend.resolvers import resolve_simbad, resolve_horizons, get_daily_positions, get_horizons_ephemerides, resolve_planet, get_planet_ephemerides
+from backend.core import compute_trajectory, calculate_planning_info, calculate_planning_info_batch, azimuth_to_compass, moon_sep_deg, compute_peak_alt_in_window
+from backend.moonsun import MOON_SUN
+from backend.chebyshev import load_chebyshev
+from backend import planets as planet_engine
+from backend.ephemeris import EphemerisReader, load_ephemeris
+from backend.orbits import catalog_positions, elements_from_catalog
+from backend.response_cache import default_cache as default_response_cache
+from backend.cancellation import CancelToken, bind as bind_cancellation
+from backend.jpl_client import JPL, available as jpl_available
+from backend.singleflight import FLIGHTS as JPL_FLIGHTS
+from backend.positions import GEOMETRY, POSITIONS, utc_date
+from backend.browser import BROWSER as SCRAPER_BROWSER
 from backend.scrape import scrape_unistellar_table, scrape_unistellar_priority_comets, scrape_unistellar_priority_asteroids
 from backend.github import create_issue as _gh_create_issue
 
@@ -56,11 +61,20 @@ CONFIG = {
     "default_alt_min":     20,    # altitude filter lower bound
     "default_session_hour":18,    # default observation start hour
     "default_dur_idx":      8,    # duration selectbox default index (720 min)
+    # Alt/Az engine for planning checks (observability, peak altitude, night plan):
+    # "astropy" = full AltAz transform, "fast" = backend/fastsky.py NumPy kernel (~0.01°)
+    "sky_engine":    "astropy",
+    # Planet positions: "local" = backend/planets.py (no network), "horizons" = JPL majorbody queries
+    "planet_engine": "local",
+    # Comet/asteroid tables redraw at most this often (s) while live JPL rows arrive
+    "summary_frame_interval": 0.5,
 }
 
 from backend.app_logic import (
     _AZ_OCTANTS, _AZ_LABELS, az_in_selected,
-    get_moon_status, _check_row_observability,
+    get_moon_status,
+    evaluate_observability, moon_positions_at, _add_observability_columns,
+    _add_planning_columns,
     _sort_df_like_chart, build_night_plan,
     _sanitize_csv_df, _add_peak_alt_session,
     _apply_night_plan_filters,
@@ -75,53 +89,144 @@ def _location_needed():
     """Consistent placeholder shown in every section that requires a location."""
     st.info("📍 Set your location in the sidebar to see results here.")
 
-@st.cache_data(ttl=3600, show_spinner="Calculating planetary visibility...")
-def get_planet_summary(lat, lon, start_time):
-    planet_map = {
-        "Mercury": "199", "Venus": "299", "Mars": "499", "Jupiter": "599",
-        "Saturn": "699", "Uranus": "799", "Neptune": "899", "Pluto": "999"
+def _summary_geometry(lat, lon, start_time, rows, memoize=True):
+    """Stage 2 of the summaries: planning + Moon columns for stage-1 rows (GEOMETRY-cached).
+
+    ``memoize=False`` computes without caching (progressive frames that are
+    superseded a moment later).
+    """
+    def _compute():
+        location = EarthLocation(lat=lat * u.deg, lon=lon * u.deg)
+        # Moon info from the shared per-night Moon/Sun grid (backend/moonsun.py)
+        try:
+            moon_loc, moon_illum = MOON_SUN.moon_and_illumination(location, start_time)
+        except Exception:
+            moon_loc = None
+            moon_illum = 0
+        # Every entry is a row — no filter(None).
+        return _add_planning_columns(pd.DataFrame(rows), location, start_time, moon_loc, moon_illum)
+    if not memoize:
+        return _compute()
+    return GEOMETRY.get_or_compute(lat, lon, start_time, rows, _compute)
+
+
+def _stale_fallback(row, ephem, section, name, start_time):
+    """A failed live lookup → the ephemeris store's nearest sample, flagged stale.
+
+    POSITIONS already answers from the object's last known good daily query
+    when it has one; this covers objects only the committed ephemeris knows.
+    """
+    if not row.get("_resolve_error"):
+        return row
+    nearest = ephem.nearest(section, name, start_time)
+    if nearest is None:
+        return row
+    ra_deg, dec_deg, vmag, jd = nearest
+    return {
+        "Name": name, "_ra_deg": ra_deg, "_dec_deg": dec_deg, "Magnitude": vmag,
+        "_jpl_id_used": "(ephemeris cache)", "_stale": True,
+        "_stale_as_of": (datetime(2000, 1, 1, 12) + timedelta(days=jd - 2451545.0)).strftime("%Y-%m-%d"),
     }
-    location = EarthLocation(lat=lat*u.deg, lon=lon*u.deg)
-    utc_start = start_time.astimezone(pytz.utc)
-    obs_time_str = utc_start.strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Calculate Moon info
-    t_moon = Time(start_time)
+
+
+def _daily_fetch(section, jpl_id, day):
+    """POSITIONS fetch callback: one get_daily_positions() range query, or a failure stub."""
     try:
-        moon_loc = get_moon(t_moon, location)
-        sun_loc = get_sun(t_moon)
-        elongation = sun_loc.separation(moon_loc)
-        moon_illum = float(0.5 * (1 - math.cos(elongation.rad))) * 100
-    except Exception:
-        moon_loc = None
-        moon_illum = 0
-    
-    data = []
-    for p_name, p_id in planet_map.items():
+        return {"positions": get_daily_positions(jpl_id, day, section), "_jpl_id_used": jpl_id}
+    except Exception as e:
+        return {"_resolve_error": True, "_jpl_id_tried": jpl_id, "_jpl_id_used": jpl_id,
+                "_jpl_error": str(e)[:200]}
+
+
+def _listed_window(section, display_name, jpl_id, times):
+    """Array SkyCoord over ``times`` for an object from a summary table, or None.
+
+    Same sources as its summary row: the committed ephemeris, then the
+    POSITIONS entry for (section, JPL ID, UTC date) — which the summary has
+    usually fetched already — so target selection and the trajectory are
+    cache reads. None means neither covers the window (fall back to Horizons).
+    """
+    coords = None if section == "planets" else _ephemeris_reader().sky_coords(section, display_name, times)
+    if coords is not None:
+        return coords
+    day = utc_date(times[0])
+    res = POSITIONS.window(section, jpl_id, times, lambda: _daily_fetch(section, jpl_id, day))
+    if res is None:
+        return None
+    return SkyCoord(ra=res[0] * u.deg, dec=res[1] * u.deg, frame='icrs')
+
+
+def _stale_notice(df, noun):
+    """Warn when rows were served from last known positions because JPL was unreachable."""
+    if df.empty or "_stale" not in df.columns:
+        return
+    stale = df[df["_stale"] == True]
+    if stale.empty:
+        return
+    oldest = stale["_stale_as_of"].min()
+    circuit = "JPL Horizons is unavailable" if not jpl_available() else "Some JPL lookups failed"
+    st.warning(
+        f"⏳ {circuit} — {len(stale)} {noun} show their last known position "
+        f"(as of {oldest} UTC, may be off by the object's daily motion): "
+        f"{', '.join(stale['Name'].astype(str).head(8))}{' …' if len(stale) > 8 else ''}. "
+        "Fresh positions are being fetched in the background; reload in a minute."
+    )
+
+
+def _pipeline_stats_caption():
+    """Admin caption: summary cache stages, disk response cache, JPL scheduler and coalescing metrics."""
+    p, g = POSITIONS.stats(), GEOMETRY.stats()
+    caption = (
+        f"Positions cache: {p['size']} entries, {p['hits']} hits / {p['misses']} misses "
+        f"({p['hit_rate']:.0%}), {p['stale_served']} stale served, {p['revalidated']} revalidated, {p['too_coarse']} trajectories refetched (fast movers) · Geometry cache: {g['size']} entries, "
+        f"{g['hits']} hits / {g['misses']} misses ({g['hit_rate']:.0%})"
+    )
+    disk = default_response_cache()
+    if disk is not None:
         try:
-            _, sky_coord = resolve_planet(p_id, obs_time_str=obs_time_str)
-            details = calculate_planning_info(sky_coord, location, start_time)
-            
-            moon_sep = 0.0
-            if moon_loc:
-                moon_sep = moon_sep_deg(sky_coord, moon_loc)
-            
-            row = {
+            d = disk.stats()
+            caption += (f" · JPL response cache (disk): {d['entries']} entries, "
+                        f"{d['hits']} hits / {d['misses']} misses this process")
+        except sqlite3.Error:
+            pass
+    j = JPL.metrics()
+    caption += (f" · JPL scheduler: {j['in_flight']} in flight (limit {j['concurrency_limit']:g}), "
+                f"{j['requests']} requests, {j['throttles']} throttled, {j['retries']} retries, "
+                f"{j['cancelled']} dropped as superseded, {j['wait_s']:.1f} s queued, "
+                f"circuit {j['circuit']['state']}")
+    f = JPL_FLIGHTS.stats()
+    caption += (f" · Coalesced: {f['coalesced']} of {f['calls']} JPL lookups joined an identical "
+                f"in-flight request ({f['in_flight']} in flight, {f['timeouts']} waits timed out, "
+                f"{f['takeovers']} taken over from cancelled runs)")
+    st.caption(caption)
+
+
+def get_planet_summary(lat, lon, start_time):
+    """Planet visibility: local positions (or POSITIONS from Horizons), then geometry."""
+    if CONFIG["planet_engine"] == "local":
+        data = [{"Name": p_name, "_ra_deg": float(p["ra"][0]), "_dec_deg": float(p["dec"][0]),
+                 "Magnitude": round(float(p["vmag"][0]), 1)}
+                for p_name, p in planet_engine.planet_positions(start_time).items()]
+        return _summary_geometry(lat, lon, start_time, data)
+
+    planet_map = planet_engine.PLANETS
+    day = utc_date(start_time)
+    data = []
+    with st.spinner("Calculating planetary visibility..."):
+        for p_name, p_id in planet_map.items():
+            pos = POSITIONS.position_at("planets", p_id, start_time,
+                                        lambda p_id=p_id: _daily_fetch("planets", p_id, day))
+            if pos.get("_resolve_error"):
+                continue
+            data.append({
                 "Name": p_name,
-                "RA": sky_coord.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True),
-                "Dec": sky_coord.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True),
-                "_dec_deg": sky_coord.dec.degree,
-                "_ra_deg":  sky_coord.ra.deg,
-                "Moon Sep (°)": round(moon_sep, 1) if moon_loc else 0,
-                "Moon Status": get_moon_status(moon_illum, moon_sep) if moon_loc else "",
-            }
-            row.update(details)
-            data.append(row)
-        except Exception:
-            continue
-    return pd.DataFrame(data)
+                "_dec_deg": pos["_dec_deg"],
+                "_ra_deg":  pos["_ra_deg"],
+                **{k: pos[k] for k in ("_stale", "_stale_as_of") if k in pos},
+            })
+    return _summary_geometry(lat, lon, start_time, data)
 
-def plot_visibility_timeline(df, obs_start=None, obs_end=None, default_sort_label="Default Order", priority_col=None, brightness_col=None, chart_key=None):
+def plot_visibility_timeline(df, obs_start=None, obs_end=None, default_sort_label="Default Order", priority_col=None, brightness_col=None, chart_key=None, interactive=True):
     """Generates a Gantt-style chart showing Rise to Set times.
 
     obs_start / obs_end: naive local datetimes for the observation window overlay.
@@ -132,6 +237,9 @@ def plot_visibility_timeline(df, obs_start=None, obs_end=None, default_sort_labe
     priority_col: if provided, the "Priority Order" sort will place rows with a
         non-empty value in this column first (ranked URGENT > HIGH > LOW > other),
         then remaining rows in their natural order.
+    interactive: False draws the chart without the sort radio (using the sort
+        already chosen for ``chart_key``), so it can be redrawn several times
+        in one run — the progressive summary previews.
     """
     # Filter for objects with valid rise/set times
     chart_data = df.dropna(subset=['_rise_datetime', '_set_datetime']).copy()
@@ -181,13 +289,16 @@ def plot_visibility_timeline(df, obs_start=None, obs_end=None, default_sort_labe
     if brightness_col and brightness_col in chart_data.columns and chart_data[brightness_col].notna().any():
         _sort_options.append("Brightest First")
 
-    sort_option = st.radio(
-        "Sort Graph By:",
-        _sort_options,
-        horizontal=True,
-        label_visibility="collapsed",
-        key=f"sort_{chart_key}" if chart_key else None
-    )
+    if interactive:
+        sort_option = st.radio(
+            "Sort Graph By:",
+            _sort_options,
+            horizontal=True,
+            label_visibility="collapsed",
+            key=f"sort_{chart_key}" if chart_key else None
+        )
+    else:
+        sort_option = st.session_state.get(f"sort_{chart_key}", _sort_options[0]) if chart_key else _sort_options[0]
 
     # For Earliest Rise / Earliest Set: Always Up objects move to the bottom
     # (sorted by earliest transit), regular objects sort by the chosen criterion.
@@ -337,6 +448,46 @@ def plot_visibility_timeline(df, obs_start=None, obs_end=None, default_sort_labe
 
 
 
+def _summary_with_preview(frames, noun, classify, display_cols, chart_kwargs):
+    """Consume a stream_*_summary generator, previewing the rows while JPL answers arrive.
+
+    Each intermediate frame updates a progress line and, when it carries new
+    rows, redraws the preview placeholder: the Observable / Unobservable tabs
+    with their counts, the Gantt chart (``interactive=False``) and the rows
+    so far. Heartbeat frames (no new rows) only touch the progress line — that
+    st call is where Streamlit stops a superseded run, which closes the
+    generator and cancels its JPL work. ``classify(df)`` adds the section's
+    observability columns and returns (df_obs, df_filt). Both placeholders
+    are cleared when the final frame lands; the caller then renders the full
+    section (sort widget, night plan builder, downloads) from it.
+    """
+    progress, placeholder = st.empty(), st.empty()
+    drawn = None
+    with st.spinner(f"Calculating {noun[:-1]} visibility..."):
+        for df, pending in frames:
+            if not pending:
+                break
+            ready = 0 if df is None else len(df)
+            progress.caption(f"⏳ {ready} of {ready + pending} {noun} ready — live JPL results still arriving…")
+            if df is None or df is drawn:
+                continue
+            drawn = df
+            df_obs, df_filt = classify(df.copy())
+            with placeholder.container():
+                tab_obs, tab_filt = st.tabs([f"🎯 Observable ({len(df_obs)})", f"👻 Unobservable ({len(df_filt)})"])
+                with tab_obs:
+                    plot_visibility_timeline(df_obs, interactive=False, **chart_kwargs)
+                    st.dataframe(df_obs[[c for c in display_cols if c in df_obs.columns]],
+                                 hide_index=True, width="stretch", column_config=_MOON_SEP_COL_CONFIG)
+                with tab_filt:
+                    filt_show = [c for c in ["Name", "filter_reason", "Rise", "Transit", "Set", "Status"]
+                                 if c in df_filt.columns]
+                    st.dataframe(df_filt[filt_show], hide_index=True, width="stretch")
+    progress.empty()
+    placeholder.empty()
+    return df
+
+
 # GITHUB_TOKEN must be a fine-grained PAT with:
 #   - Contents: Read and Write  (to push YAML file updates)
 #   - Issues: Write             (to create admin notification issues)
@@ -355,7 +506,13 @@ def _send_github_notification(title, body):
 
 
 def _notify_jpl_failure(name, jpl_id_tried, error_msg):
-    """Fire a GitHub Issue for a JPL resolution failure — once per session per name."""
+    """Fire a GitHub Issue for a JPL resolution failure — once per session per name.
+
+    Skipped while the JPL circuit is open: every lookup fails then, and an
+    outage is not an ID problem worth an issue per object.
+    """
+    if not jpl_available():
+        return
     notified = st.session_state.setdefault("_jpl_notified", set())
     if name in notified:
         return
@@ -892,6 +1049,7 @@ def _render_night_plan_builder(
                 sel_moon=_sel_moon,     all_moon_statuses=_all_moon_statuses,
                 location=location,
                 min_alt=min_alt,
+                engine=CONFIG["sky_engine"],
             )
 
             if _plan_src.empty:
@@ -1043,7 +1201,8 @@ _MOON_SEP_COL_CONFIG = {
         "Peak Alt (session)",
         format="%.0f°",
         help="Highest altitude this object reaches during your observation window "
-             "(sidebar Start Time + Duration). Sampled at 5 points.",
+             "(sidebar Start Time + Duration). Exact: at transit if it falls in the window, "
+             "otherwise at the window start or end.",
     ),
     "Magnitude": st.column_config.NumberColumn("Magnitude", format="%.1f"),
 }
@@ -1071,16 +1230,23 @@ def _load_jpl_cache():
 
 
 EPHEMERIS_CACHE_FILE = "ephemeris_cache.json"
+EPHEMERIS_STORE_FILE = "ephemeris_cache.npy"
+EPHEMERIS_CHEB_FILE = "ephemeris_chebyshev.npy"
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def _load_ephemeris_cache():
-    """Load pre-computed ephemeris_cache.json (cached 1h). Returns {} if missing."""
-    from backend.config import read_ephemeris_cache
-    return read_ephemeris_cache(EPHEMERIS_CACHE_FILE)
 
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _ephemeris_reader():
+    """Interpolating EphemerisReader shared by all sessions (1h).
 
-def _save_jpl_cache_entry(section, name, jpl_id):
-    """Persist a newly SBDB-resolved JPL ID to jpl_id_cache.json.
+    Reads the memory-mapped binary store (falls back to ephemeris_cache.json)
+    and, past its 30 days, the long-range Chebyshev fits.
+    """
+    return EphemerisReader(load_ephemeris(EPHEMERIS_STORE_FILE, EPHEMERIS_CACHE_FILE),
+                           long_range=load_chebyshev(EPHEMERIS_CHEB_FILE))
+
+
+def _save_jpl_cache_entries(section, entries):
+    """Persist newly SBDB-resolved JPL IDs {name: jpl_id} to jpl_id_cache.json in one write.
 
     Guards against SBDB internal-format SPK-IDs in [20M, 30M) which JPL
     Horizons rejects.  SBDB returns 20000000 + catalog_number for numbered
@@ -1092,16 +1258,136 @@ def _save_jpl_cache_entry(section, name, jpl_id):
       - Comet SPK-IDs:      ~1_003_000 – 1_004_999  (1003861, 1004111 …)
       - Fragment IDs:       ~90_000_000+  (90001202, 90001203 …)
     """
-    try:
-        _id_int = int(jpl_id)
-        if 20_000_000 <= _id_int < 30_000_000:
-            return  # SBDB internal ID — Horizons rejects these; skip caching
-    except (ValueError, TypeError):
-        pass  # non-numeric IDs (designations like "C/2025 F2", "3I") are fine
-    from backend.config import read_jpl_cache, write_jpl_cache
-    cache = read_jpl_cache(JPL_CACHE_FILE)
-    cache.setdefault(section, {})[name] = jpl_id
-    write_jpl_cache(JPL_CACHE_FILE, cache)
+    from backend.config import update_jpl_cache
+    from backend.sbdb import is_sbdb_internal_id
+    update_jpl_cache(JPL_CACHE_FILE, section,
+                     {name: jpl_id for name, jpl_id in entries.items() if not is_sbdb_internal_id(jpl_id)})
+
+
+def _save_jpl_cache_entry(section, name, jpl_id):
+    """Persist one SBDB-resolved JPL ID (see _save_jpl_cache_entries)."""
+    _save_jpl_cache_entries(section, {name: jpl_id})
+
+
+def _retry_failed_via_sbdb(section, rows, start_time):
+    """Second chance for summary rows whose Horizons query failed.
+
+    Every failed name is resolved in one bulk SBDB lookup (backend/sbdb.py);
+    only for names SBDB does not know is the ID that was tried looked up, in
+    a second bulk call. Objects that get a different SPK-ID are queried
+    again and the new IDs saved with a single jpl_id_cache.json write.
+    Returns the rows with the recovered ones replaced.
+    """
+    failed = [k for k, row in enumerate(rows) if row.get("_resolve_error")]
+    if not failed:
+        return rows
+    from backend.sbdb import sbdb_lookup_many
+    names = [rows[k]["Name"] for k in failed]
+    sbdb_ids = sbdb_lookup_many(names)
+    tried_ids = [rows[k].get("_jpl_id_tried") for k in failed if not sbdb_ids.get(rows[k]["Name"])]
+    tried_ids = list(dict.fromkeys(t for t in tried_ids if t and t not in names))
+    if tried_ids:
+        sbdb_ids = {**sbdb_lookup_many(tried_ids), **sbdb_ids}
+    retry = {}
+    for k in failed:
+        tried = rows[k].get("_jpl_id_tried")
+        sbdb_id = sbdb_ids.get(rows[k]["Name"]) or sbdb_ids.get(tried)
+        if sbdb_id and sbdb_id != tried:
+            retry[k] = sbdb_id
+    if not retry:
+        return rows
+
+    day = utc_date(start_time)
+
+    def _refetch(k):
+        return {"Name": rows[k]["Name"], **POSITIONS.position_at(
+            section, retry[k], start_time, lambda: _daily_fetch(section, retry[k], day))}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(len(retry), JPL.max_concurrency))) as executor:
+        refetched = dict(zip(retry, executor.map(bind_cancellation(_refetch), retry)))
+    rows, resolved = list(rows), {}
+    for k, row in refetched.items():
+        if not row.get("_resolve_error"):
+            rows[k] = row
+            if not row.get("_stale"):
+                resolved[row["Name"]] = retry[k]
+    _save_jpl_cache_entries(section, resolved)
+    return rows
+
+
+def _summary_token(section):
+    """A fresh CancelToken for this session's ``section`` summary; cancels the run it replaces."""
+    key = f"_summary_token_{section}"
+    previous = st.session_state.get(key)
+    if previous is not None:
+        previous.cancel()
+    token = st.session_state[key] = CancelToken(section)
+    return token
+
+
+def _stream_summary(section, lat, lon, start_time, names, cached, live, ephem):
+    """Shared engine of the comet/asteroid summaries: yields (DataFrame, pending) frames.
+
+    Rows the committed ephemeris answers (``cached(name)``) come first — the
+    first frame costs cache reads only. The rest go to ``live(name)`` in a
+    thread pool (JPL requests are paced process-wide by backend/jpl_client.py,
+    so the pool only needs enough threads to keep its current limit busy).
+    While they run a frame is yielded every ``CONFIG["summary_frame_interval"]``
+    seconds — the same DataFrame object (None before any row) when nothing new
+    arrived, so the caller's next st call gives Streamlit a chance to stop the
+    run when the inputs change. Intermediate frames hold the rows so far in
+    list order and are not memoized; the last one (pending 0) follows the
+    bulk SBDB retry and stale fallback and goes through the GEOMETRY cache.
+
+    The run's CancelToken (backend/cancellation.py) is current in every
+    worker. A newer run for the same section, or the generator being closed
+    early (Streamlit stopping the script), cancels it: queued names are
+    dropped, running workers stop at their next JPL request, and answers
+    already received stay in the response cache for the next run.
+    """
+    token = _summary_token(section)
+    rows = {}
+    for name in names:
+        row = cached(name)
+        if row is not None:
+            rows[name] = row
+    pending = [name for name in names if name not in rows]
+
+    def _frame():
+        return _summary_geometry(lat, lon, start_time, [rows[n] for n in names if n in rows], memoize=False)
+
+    if pending:
+        interval = CONFIG["summary_frame_interval"]
+        frame = _frame() if rows else None
+        if frame is not None:
+            yield frame, len(pending)
+        executor = ThreadPoolExecutor(max_workers=max(1, min(len(pending), JPL.max_concurrency)))
+        try:
+            futures = {executor.submit(token.run, live, name): name for name in pending}
+            remaining, fresh, last = set(futures), False, time.monotonic()
+            while remaining:
+                done, remaining = wait(remaining, timeout=interval or None, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rows[futures[future]] = future.result()
+                fresh = fresh or bool(done)
+                if remaining and time.monotonic() - last >= interval:
+                    if fresh:
+                        frame, fresh = _frame(), False
+                    yield frame, len(remaining)
+                    last = time.monotonic()
+            # Names Horizons rejected: one bulk SBDB resolution, then stale data for what is left
+            with token.scope():
+                results = _retry_failed_via_sbdb(section, [rows[n] for n in names], start_time)
+        except BaseException:
+            token.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=not token.cancelled, cancel_futures=True)
+    else:
+        results = [rows[n] for n in names]
+    results = [_stale_fallback(row, ephem, section, row["Name"], start_time) for row in results]
+    # Workers only fetch positions; planning/Moon columns are computed for all rows at once.
+    yield _summary_geometry(lat, lon, start_time, results), 0
 
 
 def _dedup_by_jpl_id(names, id_fn):
@@ -1149,6 +1435,29 @@ def load_comet_catalog():
     return read_comet_catalog(COMET_CATALOG_FILE)
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def predict_catalog_comets(start_time):
+    """Two-body RA/Dec/predicted magnitude for every catalog comet with full elements.
+
+    Returns {designation: (ra_deg, dec_deg, vmag or None)}; entries from an
+    older snapshot without ω/Ω/perihelion JD are absent (→ Horizons).
+    """
+    _, entries = load_comet_catalog()
+    if not entries:
+        return {}
+    pos = catalog_positions(elements_from_catalog(entries), start_time)
+    out = {}
+    for k in range(len(entries)):
+        if not pos["valid"][k]:
+            continue
+        vmag = pos["vmag"][k]
+        out[entries[k]["designation"]] = (
+            float(pos["ra"][k]), float(pos["dec"][k]),
+            round(float(vmag), 1) if pd.notna(vmag) else None,
+        )
+    return out
+
+
 def save_comets_config(config):
     load_comets_config.clear()          # invalidate cache after write
     with open(COMETS_FILE, "w") as f:
@@ -1171,25 +1480,31 @@ def save_comets_config(config):
             st.error(f"GitHub Sync Error: {e}")  # admin panel — full error OK
 
 
-@st.cache_data(ttl=3600, show_spinner="Calculating comet visibility...")
 def get_comet_summary(lat, lon, start_time, comet_tuple):
-    """Batch-calculate rise/set/moon info for all comets in the list."""
-    location = EarthLocation(lat=lat * u.deg, lon=lon * u.deg)
-    utc_start = start_time.astimezone(pytz.utc)
-    obs_time_str = utc_start.strftime('%Y-%m-%d %H:%M:%S')
-    t_moon = Time(start_time)
-    try:
-        moon_loc_inner = get_moon(t_moon, location)
-        sun_loc_inner = get_sun(t_moon)
-        elongation = sun_loc_inner.separation(moon_loc_inner)
-        moon_illum_inner = float(0.5 * (1 - math.cos(elongation.rad))) * 100
-    except Exception:
-        moon_loc_inner = None
-        moon_illum_inner = 0
+    """Batch-calculate rise/set/moon info for all comets in the list.
+
+    Two stages (backend/positions.py), not st.cache_data: stage 1 gets each
+    object's position from the ephemeris cache or the per-(JPL ID, UTC date)
+    POSITIONS cache; stage 2 (_summary_geometry) computes the location/time
+    columns from those rows. Time and location changes never hit the network.
+    The final frame of stream_comet_summary.
+    """
+    with st.spinner("Calculating comet visibility..."):
+        for df, _ in stream_comet_summary(lat, lon, start_time, comet_tuple):
+            pass
+    return df
+
+
+def stream_comet_summary(lat, lon, start_time, comet_tuple):
+    """get_comet_summary, yielding (DataFrame, pending count) frames as rows arrive.
+
+    See _stream_summary; the last frame (pending 0) is the complete summary.
+    """
+    day = utc_date(start_time)
     # --- Thread-safe: load @st.cache_data maps BEFORE spawning workers ---
     _overrides = _load_jpl_overrides()   # @st.cache_data — safe here (main thread)
     _jpl_cache = _load_jpl_cache()       # plain file read, always safe
-    _ephem = _load_ephemeris_cache()
+    _ephem = _ephemeris_reader()         # @st.cache_resource — shared, thread-safe reads
 
     def _comet_id_local(name):
         """Resolve comet display name → JPL ID using pre-loaded maps (no Streamlit cache calls)."""
@@ -1199,85 +1514,37 @@ def get_comet_summary(lat, lon, start_time, comet_tuple):
             return _jpl_cache["comets"][name]
         return name.split('(')[0].strip()
 
-    def _fetch(comet_name):
-        import time as _time
-        from backend.sbdb import sbdb_lookup
-        from backend.config import lookup_cached_position
-
-        # ── Fast path: use pre-computed ephemeris if available ──
-        target_date = start_time.date().isoformat()   # e.g. "2026-03-05"
-        cached_pos = lookup_cached_position(_ephem, "comets", comet_name, target_date)
-        if cached_pos is not None:
-            ra_deg, dec_deg, vmag = cached_pos
-            sky_coord = SkyCoord(ra=ra_deg * u.deg, dec=dec_deg * u.deg, frame='icrs')
-            details = calculate_planning_info(sky_coord, location, start_time)
-            moon_sep = moon_sep_deg(sky_coord, moon_loc_inner) if moon_loc_inner else 0.0
-            row = {
-                "Name": comet_name,
-                "RA": sky_coord.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True),
-                "Dec": sky_coord.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True),
-                "_dec_deg": sky_coord.dec.degree,
-                "_ra_deg":  sky_coord.ra.deg,
-                "Magnitude": vmag,
-                "Moon Sep (°)": round(moon_sep, 1),
-                "Moon Status": get_moon_status(moon_illum_inner, moon_sep) if moon_loc_inner else "",
-                "_jpl_id_used": "(ephemeris cache)",
-            }
-            row.update(details)
-            return row
+    def _cached(comet_name):
+        # ── Fast path: pre-computed ephemeris, interpolated to start_time ──
+        cached_pos = _ephem.position("comets", comet_name, start_time)
+        if cached_pos is None:
+            return None
+        ra_deg, dec_deg, vmag = cached_pos
+        sky_coord = SkyCoord(ra=ra_deg * u.deg, dec=dec_deg * u.deg, frame='icrs')
+        return {
+            "Name": comet_name,
+            "_dec_deg": sky_coord.dec.degree,
+            "_ra_deg":  sky_coord.ra.deg,
+            "Magnitude": vmag,
+            "_jpl_id_used": "(ephemeris cache)",
+        }
 
-        # ── Fallback: live JPL query (date > 30 days out or object not in cache) ──
+    def _live(comet_name):
+        # ── Fallback: live JPL query (time outside the cached span or object not in cache) ──
+        # Stage 1: one Horizons query per (JPL ID, UTC date), shared by all sessions and
+        # interpolated to start_time; an override invalidates only its object.
         jpl_id = _comet_id_local(comet_name)
+        return {"Name": comet_name, **POSITIONS.position_at(
+            "comets", jpl_id, start_time, lambda: _fetch_remote(jpl_id))}
+
+    def _fetch_remote(jpl_id):
         try:
-            try:
-                _, sky_coord, vmag = resolve_horizons_with_mag(jpl_id, obs_time_str, 'comets')
-            except Exception:
-                _time.sleep(1.5)  # one retry after backoff — JPL rate-limits parallel requests
-                _, sky_coord, vmag = resolve_horizons_with_mag(jpl_id, obs_time_str, 'comets')
-            details = calculate_planning_info(sky_coord, location, start_time)
-            moon_sep = moon_sep_deg(sky_coord, moon_loc_inner) if moon_loc_inner else 0.0
-            row = {
-                "Name": comet_name,
-                "RA": sky_coord.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True),
-                "Dec": sky_coord.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True),
-                "_dec_deg": sky_coord.dec.degree,
-                "_ra_deg":  sky_coord.ra.deg,
-                "Magnitude": vmag,
-                "Moon Sep (°)": round(moon_sep, 1),
-                "Moon Status": get_moon_status(moon_illum_inner, moon_sep) if moon_loc_inner else "",
-                "_jpl_id_used": jpl_id,
-            }
-            row.update(details)
-            return row
+            # Throttling and retries are handled per request by backend/jpl_client.py
+            positions = get_daily_positions(jpl_id, day, 'comets')
+            return {"positions": positions, "_jpl_id_used": jpl_id}
         except Exception as first_exc:
-            # Try full display name first, then stripped jpl_id
-            sbdb_id = sbdb_lookup(comet_name)
-            if sbdb_id is None and jpl_id != comet_name:
-                sbdb_id = sbdb_lookup(jpl_id)
-            if sbdb_id and sbdb_id != jpl_id:
-                try:
-                    _, sky_coord, vmag = resolve_horizons_with_mag(sbdb_id, obs_time_str, 'comets')
-                    _save_jpl_cache_entry("comets", comet_name, sbdb_id)
-                    details = calculate_planning_info(sky_coord, location, start_time)
-                    moon_sep = moon_sep_deg(sky_coord, moon_loc_inner) if moon_loc_inner else 0.0
-                    row = {
-                        "Name": comet_name,
-                        "RA": sky_coord.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True),
-                        "Dec": sky_coord.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True),
-                        "_dec_deg": sky_coord.dec.degree,
-                        "_ra_deg":  sky_coord.ra.deg,
-                        "Magnitude": vmag,
-                        "Moon Sep (°)": round(moon_sep, 1),
-                        "Moon Status": get_moon_status(moon_illum_inner, moon_sep) if moon_loc_inner else "",
-                        "_jpl_id_used": sbdb_id,
-                    }
-                    row.update(details)
-                    return row
-                except Exception:
-                    pass
-            # All resolution attempts failed — return stub row (never None)
+            # Stub row (never None); failures get one bulk SBDB retry after the pool
             return {
-                "Name": comet_name,
                 "RA": "—", "Dec": "—", "_dec_deg": 0.0, "_ra_deg": 0.0,
                 "Rise": "—", "Transit": "—", "Set": "—",
                 "Status": "—", "Constellation": "—",
@@ -1291,11 +1558,33 @@ def get_comet_summary(lat, lon, start_time, comet_tuple):
             }
 
     deduped_comets = _dedup_by_jpl_id(list(comet_tuple), _comet_id_local)
-    # Cap at 3 workers — JPL Horizons rate-limits aggressively under high concurrency;
-    # sequential tests always pass, 8 parallel workers caused ~50% failures.
-    with ThreadPoolExecutor(max_workers=max(1, min(len(deduped_comets), 3))) as executor:
-        results = list(executor.map(_fetch, deduped_comets))
-    return pd.DataFrame(results)   # every entry is a row — no filter(None)
+    yield from _stream_summary("comets", lat, lon, start_time, deduped_comets, _cached, _live, _ephem)
+
+
+def get_catalog_comet_summary(lat, lon, start_time, comet_tuple):
+    """Explore Catalog visibility: local orbit propagation, Horizons only for the rest.
+
+    Comets with full elements in comets_catalog.json are placed by
+    backend/orbits.py in one pass; any others go through get_comet_summary.
+    """
+    predicted = predict_catalog_comets(start_time)
+    rows = [{
+        "Name": name,
+        "_dec_deg": predicted[name][1],
+        "_ra_deg": predicted[name][0],
+        "Magnitude": predicted[name][2],
+        "_jpl_id_used": "(orbit elements)",
+    } for name in comet_tuple if name in predicted]
+    remote = tuple(name for name in comet_tuple if name not in predicted)
+
+    frames = []
+    if rows:
+        frames.append(_summary_geometry(lat, lon, start_time, rows))
+    if remote:
+        frames.append(get_comet_summary(lat, lon, start_time, remote))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
 
 
 @st.cache_data(ttl=86400, show_spinner=False)
@@ -1390,24 +1679,25 @@ def save_asteroids_config(config):
             st.error(f"GitHub Sync Error: {e}")  # admin panel — full error OK
 
 
-@st.cache_data(ttl=3600, show_spinner="Calculating asteroid visibility...")
 def get_asteroid_summary(lat, lon, start_time, asteroid_tuple):
-    location = EarthLocation(lat=lat * u.deg, lon=lon * u.deg)
-    utc_start = start_time.astimezone(pytz.utc)
-    obs_time_str = utc_start.strftime('%Y-%m-%d %H:%M:%S')
-    t_moon = Time(start_time)
-    try:
-        moon_loc_inner = get_moon(t_moon, location)
-        sun_loc_inner = get_sun(t_moon)
-        elongation = sun_loc_inner.separation(moon_loc_inner)
-        moon_illum_inner = float(0.5 * (1 - math.cos(elongation.rad))) * 100
-    except Exception:
-        moon_loc_inner = None
-        moon_illum_inner = 0
+    """Batch-calculate rise/set/moon info for all asteroids in the list.
+
+    Same two-stage pipeline as get_comet_summary (the final frame of
+    stream_asteroid_summary).
+    """
+    with st.spinner("Calculating asteroid visibility..."):
+        for df, _ in stream_asteroid_summary(lat, lon, start_time, asteroid_tuple):
+            pass
+    return df
+
+
+def stream_asteroid_summary(lat, lon, start_time, asteroid_tuple):
+    """get_asteroid_summary, yielding (DataFrame, pending count) frames as rows arrive."""
+    day = utc_date(start_time)
     # --- Thread-safe: load @st.cache_data maps BEFORE spawning workers ---
     _overrides = _load_jpl_overrides()   # @st.cache_data — safe here (main thread)
     _jpl_cache = _load_jpl_cache()       # plain file read, always safe
-    _ephem = _load_ephemeris_cache()
+    _ephem = _ephemeris_reader()         # @st.cache_resource — shared, thread-safe reads
 
     def _asteroid_id_local(name):
         """Resolve asteroid display name → JPL ID using pre-loaded maps (no Streamlit cache calls)."""
@@ -1422,83 +1712,35 @@ def get_asteroid_summary(lat, lon, start_time, asteroid_tuple):
             return name.split(' ')[0]  # Numbered: '433 Eros' → '433'
         return name
 
-    def _fetch(asteroid_name):
-        import time as _time
-        from backend.sbdb import sbdb_lookup
-        from backend.config import lookup_cached_position
-
-        # ── Fast path: use pre-computed ephemeris if available ──
-        target_date = start_time.date().isoformat()
-        cached_pos = lookup_cached_position(_ephem, "asteroids", asteroid_name, target_date)
-        if cached_pos is not None:
-            ra_deg, dec_deg, vmag = cached_pos
-            sky_coord = SkyCoord(ra=ra_deg * u.deg, dec=dec_deg * u.deg, frame='icrs')
-            details = calculate_planning_info(sky_coord, location, start_time)
-            moon_sep = moon_sep_deg(sky_coord, moon_loc_inner) if moon_loc_inner else 0.0
-            row = {
-                "Name": asteroid_name,
-                "RA": sky_coord.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True),
-                "Dec": sky_coord.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True),
-                "_dec_deg": sky_coord.dec.degree,
-                "_ra_deg":  sky_coord.ra.deg,
-                "Moon Sep (°)": round(moon_sep, 1),
-                "Moon Status": get_moon_status(moon_illum_inner, moon_sep) if moon_loc_inner else "",
-                "Magnitude": vmag,
-                "_jpl_id_used": "(ephemeris cache)",
-            }
-            row.update(details)
-            return row
+    def _cached(asteroid_name):
+        # ── Fast path: pre-computed ephemeris, interpolated to start_time ──
+        cached_pos = _ephem.position("asteroids", asteroid_name, start_time)
+        if cached_pos is None:
+            return None
+        ra_deg, dec_deg, vmag = cached_pos
+        sky_coord = SkyCoord(ra=ra_deg * u.deg, dec=dec_deg * u.deg, frame='icrs')
+        return {
+            "Name": asteroid_name,
+            "_dec_deg": sky_coord.dec.degree,
+            "_ra_deg":  sky_coord.ra.deg,
+            "Magnitude": vmag,
+            "_jpl_id_used": "(ephemeris cache)",
+        }
 
-        # ── Fallback: live JPL query (date > 30 days out or object not in cache) ──
+    def _live(asteroid_name):
+        # ── Fallback: live JPL query (time outside the cached span or object not in cache) ──
+        # Stage 1: one Horizons query per (JPL ID, UTC date), shared by all sessions and
+        # interpolated to start_time; an override invalidates only its object.
         jpl_id = _asteroid_id_local(asteroid_name)
+        return {"Name": asteroid_name, **POSITIONS.position_at(
+            "asteroids", jpl_id, start_time, lambda: _fetch_remote(jpl_id))}
+
+    def _fetch_remote(jpl_id):
         try:
-            try:
-                _, sky_coord, vmag = resolve_horizons_with_mag(jpl_id, obs_time_str, 'asteroids')
-            except Exception:
-                _time.sleep(1.5)
-                _, sky_coord, vmag = resolve_horizons_with_mag(jpl_id, obs_time_str, 'asteroids')
-            details = calculate_planning_info(sky_coord, location, start_time)
-            moon_sep = moon_sep_deg(sky_coord, moon_loc_inner) if moon_loc_inner else 0.0
-            row = {
-                "Name": asteroid_name,
-                "RA": sky_coord.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True),
-                "Dec": sky_coord.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True),
-                "_dec_deg": sky_coord.dec.degree,
-                "_ra_deg":  sky_coord.ra.deg,
-                "Moon Sep (°)": round(moon_sep, 1),
-                "Moon Status": get_moon_status(moon_illum_inner, moon_sep) if moon_loc_inner else "",
-                "Magnitude": vmag,
-                "_jpl_id_used": jpl_id,
-            }
-            row.update(details)
-            return row
+            positions = get_daily_positions(jpl_id, day, 'asteroids')
+            return {"positions": positions, "_jpl_id_used": jpl_id}
         except Exception as first_exc:
-            sbdb_id = sbdb_lookup(asteroid_name)
-            if sbdb_id is None and jpl_id != asteroid_name:
-                sbdb_id = sbdb_lookup(jpl_id)
-            if sbdb_id and sbdb_id != jpl_id:
-                try:
-                    _, sky_coord, vmag = resolve_horizons_with_mag(sbdb_id, obs_time_str, 'asteroids')
-                    _save_jpl_cache_entry("asteroids", asteroid_name, sbdb_id)
-                    details = calculate_planning_info(sky_coord, location, start_time)
-                    moon_sep = moon_sep_deg(sky_coord, moon_loc_inner) if moon_loc_inner else 0.0
-                    row = {
-                        "Name": asteroid_name,
-                        "RA": sky_coord.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True),
-                        "Dec": sky_coord.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True),
-                        "_dec_deg": sky_coord.dec.degree,
-                        "_ra_deg":  sky_coord.ra.deg,
-                        "Moon Sep (°)": round(moon_sep, 1),
-                        "Moon Status": get_moon_status(moon_illum_inner, moon_sep) if moon_loc_inner else "",
-                        "Magnitude": vmag,
-                        "_jpl_id_used": sbdb_id,
-                    }
-                    row.update(details)
-                    return row
-                except Exception:
-                    pass
             return {
-                "Name": asteroid_name,
                 "RA": "—", "Dec": "—", "_dec_deg": 0.0, "_ra_deg": 0.0,
                 "Rise": "—", "Transit": "—", "Set": "—",
                 "Status": "—", "Constellation": "—",
@@ -1512,10 +1754,7 @@ def get_asteroid_summary(lat, lon, start_time, asteroid_tuple):
             }
 
     deduped_asteroids = _dedup_by_jpl_id(list(asteroid_tuple), _asteroid_id_local)
-    # Cap at 3 workers — JPL Horizons rate-limits aggressively under high concurrency.
-    with ThreadPoolExecutor(max_workers=max(1, min(len(deduped_asteroids), 3))) as executor:
-        results = list(executor.map(_fetch, deduped_asteroids))
-    return pd.DataFrame(results)   # every entry is a row — no filter(None)
+    yield from _stream_summary("asteroids", lat, lon, start_time, deduped_asteroids, _cached, _live, _ephem)
 
 
 @st.cache_data(ttl=86400, show_spinner=False)
@@ -1543,40 +1782,41 @@ def get_dso_summary(lat, lon, start_time, dso_tuple):
     dso_tuple: tuple of (name, ra_deg, dec_deg, obj_type, magnitude, common_name, image_url)
     """
     location = EarthLocation(lat=lat * u.deg, lon=lon * u.deg)
-    t_moon = Time(start_time)
+    # Moon info from the shared per-night Moon/Sun grid (backend/moonsun.py)
     try:
-        moon_loc_inner = get_moon(t_moon, location)
-        sun_loc_inner = get_sun(t_moon)
-        elongation = sun_loc_inner.separation(moon_loc_inner)
-        moon_illum_inner = float(0.5 * (1 - math.cos(elongation.rad))) * 100
+        moon_loc_inner, moon_illum_inner = MOON_SUN.moon_and_illumination(location, start_time)
     except Exception:
         moon_loc_inner = None
         moon_illum_inner = 0
     data = []
     for entry in dso_tuple:
         d_name, ra_deg, dec_deg, obj_type, magnitude, common_name, image_url = entry
-        try:
-            sky_coord = SkyCoord(ra=ra_deg * u.deg, dec=dec_deg * u.deg, frame='icrs')
-            details = calculate_planning_info(sky_coord, location, start_time)
-            moon_sep = moon_sep_deg(sky_coord, moon_loc_inner) if moon_loc_inner else 0.0
-            row = {
-                "Name": d_name,
-                "Common Name": common_name,
-                "Type": obj_type,
-                "Magnitude": magnitude,
-                "RA": sky_coord.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True),
-                "Dec": sky_coord.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True),
-                "_dec_deg": dec_deg,
-                "_ra_deg":  sky_coord.ra.deg,
-                "_image_url": image_url,
-                "Moon Sep (°)": round(moon_sep, 1),
-                "Moon Status": get_moon_status(moon_illum_inner, moon_sep) if moon_loc_inner else "",
-            }
-            row.update(details)
-            data.append(row)
-        except Exception:
-            continue
-    return pd.DataFrame(data)
+        data.append({
+            "Name": d_name,
+            "Common Name": common_name,
+            "Type": obj_type,
+            "Magnitude": magnitude,
+            "_dec_deg": dec_deg,
+            "_ra_deg":  ra_deg % 360.0,
+            "_image_url": image_url,
+        })
+    df = pd.DataFrame(data)
+    if df.empty:
+        return df
+    _add_planning_columns(df, location, start_time, moon_loc_inner, moon_illum_inner)
+    # Rows whose coordinates could not be evaluated are dropped, as before
+    return df[df["Status"].notna()].reset_index(drop=True)
+
+
+@st.cache_resource(show_spinner=False)
+def _warm_up_scraper_browser():
+    """Install Chromium and launch the shared scraper browser once per process (background)."""
+    return SCRAPER_BROWSER.warmup()
+
+
+# Off the request path: the first Unistellar scrape finds the browser installed and running
+if st.runtime.exists():
+    _warm_up_scraper_browser()
 
 
 # --- Hide Streamlit Branding & Toolbar ---
@@ -1937,15 +2177,8 @@ location = None
 if lat is not None and lon is not None and not (lat == 0.0 and lon == 0.0):
     try:
         location = EarthLocation(lat=lat*u.deg, lon=lon*u.deg)
-        t_moon = Time(start_time)
-        moon_loc = get_moon(t_moon, location)
-        sun_loc = get_sun(t_moon)
-        elongation = sun_loc.separation(moon_loc)
-        moon_illum = float(0.5 * (1 - math.cos(elongation.rad))) * 100
-        
-        moon_altaz = moon_loc.transform_to(AltAz(obstime=t_moon, location=location))
-        moon_alt = moon_altaz.alt.degree
-        moon_az_deg = moon_altaz.az.degree
+        moon_loc, moon_illum = MOON_SUN.moon_and_illumination(location, start_time)
+        moon_alt, moon_az_deg = MOON_SUN.moon_altaz(location, start_time)
         moon_direction = azimuth_to_compass(moon_az_deg)
 
         # Moon rise/transit/set
@@ -2082,41 +2315,16 @@ def render_dso_section(location, start_time, duration, min_alt, max_alt, az_dirs
         if not df_dsos.empty:
             # Observability check (same pattern as comet/asteroid sections)
             location_d = EarthLocation(lat=lat * u.deg, lon=lon * u.deg)
-            is_obs_list, reason_list, moon_sep_list, moon_status_list = [], [], [], []
-            for _, row in df_dsos.iterrows():
-                try:
-                    sc = SkyCoord(row['RA'], row['Dec'], frame='icrs')
-                    check_times = [
-                        start_time,
-                        start_time + timedelta(minutes=duration / 2),
-                        start_time + timedelta(minutes=duration)
-                    ]
-                    _mlocs = []
-                    if moon_loc:
-                        try:
-                            _mlocs = [get_moon(Time(t), location_d) for t in check_times]
-                        except Exception:
-                            _mlocs = [moon_loc] * 3
-                    obs, reason, ms, mst = _check_row_observability(
-                        sc, row.get('Status', ''), location_d, check_times,
-                        moon_loc, _mlocs, moon_illum, min_alt, max_alt, az_dirs, min_moon_sep
-                    )
-                    is_obs_list.append(obs)
-                    reason_list.append(reason)
-                    moon_sep_list.append(ms)
-                    moon_status_list.append(mst)
-                except Exception as _e:
-                    is_obs_list.append(False)
-                    reason_list.append("Parse Error")
-                    moon_sep_list.append("–")
-                    moon_status_list.append("")
-                    print(f"[WARN] DSO observability parse error for row: {_e}", file=sys.stderr)
-
-            df_dsos["is_observable"] = is_obs_list
-            df_dsos["filter_reason"] = reason_list
-            if moon_sep_list:
-                df_dsos["Moon Sep (°)"] = moon_sep_list
-                df_dsos["Moon Status"] = moon_status_list
+            check_times = [
+                start_time,
+                start_time + timedelta(minutes=duration / 2),
+                start_time + timedelta(minutes=duration)
+            ]
+            _mlocs = moon_positions_at(check_times, location_d, fallback=moon_loc) if moon_loc else None
+            _add_observability_columns(
+                df_dsos, location_d, check_times, _mlocs, moon_illum,
+                min_alt, max_alt, az_dirs, min_moon_sep, engine=CONFIG["sky_engine"]
+            )
 
             # Dec filter: objects outside range go to Unobservable tab with reason
             if "_dec_deg" in df_dsos.columns and (min_dec > -90 or max_dec < 90):
@@ -2127,7 +2335,7 @@ def render_dso_section(location, start_time, duration, min_alt, max_alt, az_dirs
                 )
 
             df_obs_d = df_dsos[df_dsos["is_observable"]].copy()
-            _add_peak_alt_session(df_obs_d, location, start_time, start_time + timedelta(minutes=duration))
+            _add_peak_alt_session(df_obs_d, location, start_time, start_time + timedelta(minutes=duration), engine=CONFIG["sky_engine"])
             df_filt_d = df_dsos[~df_dsos["is_observable"]].copy()
 
             display_cols_d = ["Name", "Common Name", "Type", "Magnitude", "Constellation",
@@ -2257,16 +2465,7 @@ def render_planet_section(location, start_time, duration, min_alt, max_alt, az_d
     sky_coord = None
     resolved = False
 
-    planet_map = {
-        "Mercury": "199",
-        "Venus": "299",
-        "Mars": "499",
-        "Jupiter": "599",
-        "Saturn": "699",
-        "Uranus": "799",
-        "Neptune": "899",
-        "Pluto": "999"
-    }
+    planet_map = planet_engine.PLANETS     # display name → Horizons ID
 
     if lat is None or lon is None or (lat == 0.0 and lon == 0.0):
         _location_needed()
@@ -2275,39 +2474,16 @@ def render_planet_section(location, start_time, duration, min_alt, max_alt, az_d
             _location_needed()
     else:
         df_planets = get_planet_summary(lat, lon, start_time)
+        _stale_notice(df_planets, "planets")
         if not df_planets.empty:
             # --- Observability check ---
-            is_obs_list, reason_list, moon_sep_list, moon_status_list = [], [], [], []
-
-            for idx, row in df_planets.iterrows():
-                try:
-                    sc = SkyCoord(row['RA'], row['Dec'], frame='icrs')
-                    check_times = [start_time, start_time + timedelta(minutes=duration/2), start_time + timedelta(minutes=duration)]
-                    _mlocs = []
-                    if moon_loc:
-                        try:
-                            _mlocs = [get_moon(Time(t), location) for t in check_times]
-                        except Exception:
-                            _mlocs = [moon_loc] * 3
-                    obs, reason, ms, mst = _check_row_observability(
-                        sc, row.get('Status', ''), location, check_times,
-                        moon_loc, _mlocs, moon_illum, min_alt, max_alt, az_dirs, min_moon_sep
-                    )
-                    is_obs_list.append(obs)
-                    reason_list.append(reason)
-                    moon_sep_list.append(ms)
-                    moon_status_list.append(mst)
-                except Exception:
-                    is_obs_list.append(True)   # keep on error (planets stay visible by default)
-                    reason_list.append("")
-                    moon_sep_list.append("–")
-                    moon_status_list.append("")
-
-            df_planets["is_observable"] = is_obs_list
-            df_planets["filter_reason"] = reason_list
-            if moon_sep_list:
-                df_planets["Moon Sep (°)"] = moon_sep_list
-                df_planets["Moon Status"] = moon_status_list
+            check_times = [start_time, start_time + timedelta(minutes=duration/2), start_time + timedelta(minutes=duration)]
+            _mlocs = moon_positions_at(check_times, location, fallback=moon_loc) if moon_loc else None
+            # error_observable: keep on error (planets stay visible by default)
+            _add_observability_columns(
+                df_planets, location, check_times, _mlocs, moon_illum,
+                min_alt, max_alt, az_dirs, min_moon_sep, error_observable=True, engine=CONFIG["sky_engine"]
+            )
 
             # Dec filter: objects outside range go to Unobservable tab with reason
             if "_dec_deg" in df_planets.columns and (min_dec > -90 or max_dec < 90):
@@ -2318,10 +2494,10 @@ def render_planet_section(location, start_time, duration, min_alt, max_alt, az_d
                 )
 
             df_obs_p = df_planets[df_planets["is_observable"]].copy()
-            _add_peak_alt_session(df_obs_p, location, start_time, start_time + timedelta(minutes=duration))
+            _add_peak_alt_session(df_obs_p, location, start_time, start_time + timedelta(minutes=duration), engine=CONFIG["sky_engine"])
             df_filt_p = df_planets[~df_planets["is_observable"]].copy()
 
-            display_cols_p = ["Name", "Constellation", "Rise", "Transit", "Set",
+            display_cols_p = ["Name", "Magnitude", "Constellation", "Rise", "Transit", "Set",
                               "RA", "_dec_deg", "Status", "_peak_alt_session", "Moon Sep (°)", "Moon Status"]
 
             tab_obs_p, tab_filt_p = st.tabs([
@@ -2377,9 +2553,18 @@ def render_planet_section(location, start_time, duration, min_alt, max_alt, az_d
 
     if obj_name:
         try:
-            with st.spinner(f"Querying JPL Horizons for {selected_target}..."):
-                utc_start = start_time.astimezone(pytz.utc)
-                _, sky_coord = resolve_planet(obj_name, obs_time_str=utc_start.strftime('%Y-%m-%d %H:%M:%S'))
+            utc_start = start_time.astimezone(pytz.utc)
+            if CONFIG["planet_engine"] == "local":
+                _ra, _dec, _ = planet_engine.planet_position(obj_name, utc_start)
+                sky_coord = SkyCoord(ra=_ra * u.deg, dec=_dec * u.deg, frame='icrs')
+            else:
+                # Horizons engine: the summary's cached day, else one live lookup
+                _cached = _listed_window("planets", selected_target, obj_name, [start_time])
+                if _cached is not None:
+                    sky_coord = _cached[0]
+                else:
+                    with st.spinner(f"Querying JPL Horizons for {selected_target}..."):
+                        _, sky_coord = resolve_planet(obj_name, obs_time_str=utc_start.strftime('%Y-%m-%d %H:%M:%S'))
 
             name = selected_target
             st.success(f"✅ Resolved: **{name}**")
@@ -2676,19 +2861,20 @@ def render_comet_section(location, start_time, duration, min_alt, max_alt, az_di
 
                     st.markdown("---")
                     if st.button("🔄 Refresh JPL Data", key="jpl_refresh_comets",
-                                 help="Clears cached JPL results and reloads overrides — use after editing jpl_id_overrides.yaml"):
+                                 help="Reloads overrides and retries failed JPL lookups — use after editing jpl_id_overrides.yaml. "
+                                      "Cached positions of resolved objects are kept; edited IDs are refetched."):
                         _load_jpl_overrides.clear()
-                        get_comet_summary.clear()
-                        get_asteroid_summary.clear()
-                        st.success("JPL cache cleared — reloading...")
+                        _n_retry = POSITIONS.invalidate_failures()
+                        st.success(f"Overrides reloaded, {_n_retry} failed lookup(s) will be retried — reloading...")
                         st.rerun()
+                    _pipeline_stats_caption()
                     # JPL Resolution Failures
                     _comet_failures_df = st.session_state.get("_comet_jpl_failures", None)
                     if _comet_failures_df is not None and not _comet_failures_df.empty:
                         st.markdown("### ⚠️ JPL Resolution Failures")
                         st.caption(f"{len(_comet_failures_df)} comet(s) could not be resolved via JPL Horizons. "
                                    "This only occurs for newly-added objects not yet in the ephemeris cache, "
-                                   "or queries beyond the 30-day pre-computed window. "
+                                   "or dates beyond the pre-computed long-range window. "
                                    "Add a permanent fix via jpl_id_overrides.yaml if this persists.")
                         for _, _fail_row in _comet_failures_df.iterrows():
                             _fname = _fail_row["Name"]
@@ -2709,7 +2895,7 @@ def render_comet_section(location, start_time, duration, min_alt, max_alt, az_di
                                         _ovr_data["comets"][_fname] = _ovr_id.strip()
                                         write_jpl_overrides(JPL_OVERRIDES_FILE, _ovr_data)
                                         _load_jpl_overrides.clear()
-                                        get_comet_summary.clear()
+                                        POSITIONS.invalidate("comets", [_ftried, _ovr_id.strip()])
                                         st.success(f"Override saved: **{_fname}** → `{_ovr_id.strip()}`")
                                         st.rerun()
                                     else:
@@ -2726,20 +2912,10 @@ def render_comet_section(location, start_time, duration, min_alt, max_alt, az_di
             with st.expander("2\\. 📅 Night Plan Builder", expanded=False):
                 _location_needed()
         elif active_comets:
-            df_comets = get_comet_summary(lat, lon, start_time, tuple(active_comets))
-
-            # Store JPL failure rows in session state for admin panel + fire notifications
-            if not df_comets.empty and "_resolve_error" in df_comets.columns:
-                _cf = df_comets[df_comets["_resolve_error"] == True]
-                st.session_state["_comet_jpl_failures"] = _cf
-                for _, _fr in _cf.iterrows():
-                    _notify_jpl_failure(_fr["Name"], _fr.get("_jpl_id_tried", "?"), _fr.get("_jpl_error", ""))
-            else:
-                st.session_state["_comet_jpl_failures"] = pd.DataFrame()
-
-            if not df_comets.empty:
+            def _classify_comets(df):
+                """Priority, Window and observability columns → (observable, unobservable) rows."""
                 # Priority column: admin override > unistellar priority > empty
-                df_comets["Priority"] = df_comets["Name"].apply(
+                df["Priority"] = df["Name"].apply(
                     lambda n: comet_config["priorities"].get(n,
                         "⭐ PRIORITY" if n in priority_set else "")
                 )
@@ -2753,68 +2929,56 @@ def render_comet_section(location, start_time, duration, min_alt, max_alt, az_di
                         label = f"{w_start} → {w_end}"
                         return f"✅ ACTIVE: {label}" if w_start <= today_str <= w_end else f"⏳ {label}"
                     return ""
-                df_comets["Window"] = df_comets["Name"].apply(_comet_window_status)
+                df["Window"] = df["Name"].apply(_comet_window_status)
 
                 # Observability check (same pattern as planet section)
+                # Stub rows from failed JPL lookups get a "JPL lookup failed" reason
                 location_c = EarthLocation(lat=lat * u.deg, lon=lon * u.deg)
-                is_obs_list, reason_list, moon_sep_list, moon_status_list = [], [], [], []
-                for _, row in df_comets.iterrows():
-                    # Short-circuit: stub rows from failed JPL lookups
-                    # NOTE: use `is True` not truthy check — NaN is truthy and
-                    # would incorrectly flag successful rows that lack _resolve_error
-                    if row.get("_resolve_error") is True:
-                        is_obs_list.append(False)
-                        reason_list.append(f"JPL lookup failed (tried: {row.get('_jpl_id_tried', '?')})")
-                        moon_sep_list.append("—")
-                        moon_status_list.append("")
-                        continue
-                    try:
-                        sc = SkyCoord(row['RA'], row['Dec'], frame='icrs')
-                        check_times = [
-                            start_time,
-                            start_time + timedelta(minutes=duration / 2),
-                            start_time + timedelta(minutes=duration)
-                        ]
-                        _mlocs = []
-                        if moon_loc:
-                            try:
-                                _mlocs = [get_moon(Time(t), location_c) for t in check_times]
-                            except Exception:
-                                _mlocs = [moon_loc] * 3
-                        obs, reason, ms, mst = _check_row_observability(
-                            sc, row.get('Status', ''), location_c, check_times,
-                            moon_loc, _mlocs, moon_illum, min_alt, max_alt, az_dirs, min_moon_sep
-                        )
-                        is_obs_list.append(obs)
-                        reason_list.append(reason)
-                        moon_sep_list.append(ms)
-                        moon_status_list.append(mst)
-                    except Exception:
-                        is_obs_list.append(False)
-                        reason_list.append("Parse Error")
-                        moon_sep_list.append("–")
-                        moon_status_list.append("")
-
-                df_comets["is_observable"] = is_obs_list
-                df_comets["filter_reason"] = reason_list
-                if moon_sep_list:
-                    df_comets["Moon Sep (°)"] = moon_sep_list
-                    df_comets["Moon Status"] = moon_status_list
+                check_times = [
+                    start_time,
+                    start_time + timedelta(minutes=duration / 2),
+                    start_time + timedelta(minutes=duration)
+                ]
+                _mlocs = moon_positions_at(check_times, location_c, fallback=moon_loc) if moon_loc else None
+                _add_observability_columns(
+                    df, location_c, check_times, _mlocs, moon_illum,
+                    min_alt, max_alt, az_dirs, min_moon_sep, engine=CONFIG["sky_engine"]
+                )
 
                 # Dec filter: objects outside range go to Unobservable tab with reason
-                if "_dec_deg" in df_comets.columns and (min_dec > -90 or max_dec < 90):
-                    _dec_out = ~((df_comets["_dec_deg"] >= min_dec) & (df_comets["_dec_deg"] <= max_dec))
-                    df_comets.loc[_dec_out, "is_observable"] = False
-                    df_comets.loc[_dec_out, "filter_reason"] = df_comets.loc[_dec_out, "_dec_deg"].apply(
+                if "_dec_deg" in df.columns and (min_dec > -90 or max_dec < 90):
+                    _dec_out = ~((df["_dec_deg"] >= min_dec) & (df["_dec_deg"] <= max_dec))
+                    df.loc[_dec_out, "is_observable"] = False
+                    df.loc[_dec_out, "filter_reason"] = df.loc[_dec_out, "_dec_deg"].apply(
                         lambda d: f"Dec {d:+.1f}° outside filter ({min_dec}° to {max_dec}°)"
                     )
+                return df[df["is_observable"]].copy(), df[~df["is_observable"]].copy()
 
-                df_obs_c = df_comets[df_comets["is_observable"]].copy()
-                _add_peak_alt_session(df_obs_c, location, start_time, start_time + timedelta(minutes=duration))
-                df_filt_c = df_comets[~df_comets["is_observable"]].copy()
+            display_cols_c = ["Name", "Priority", "Magnitude", "Window", "Constellation", "Rise", "Transit", "Set",
+                              "RA", "_dec_deg", "Status", "_peak_alt_session", "Moon Sep (°)", "Moon Status"]
 
-                display_cols_c = ["Name", "Priority", "Magnitude", "Window", "Constellation", "Rise", "Transit", "Set",
-                                  "RA", "_dec_deg", "Status", "_peak_alt_session", "Moon Sep (°)", "Moon Status"]
+            # Rows appear as they arrive (committed ephemeris first, then live JPL answers)
+            df_comets = _summary_with_preview(
+                stream_comet_summary(lat, lon, start_time, tuple(active_comets)), "comets",
+                _classify_comets, display_cols_c,
+                dict(obs_start=obs_start_naive if show_obs_window else None,
+                     obs_end=obs_end_naive if show_obs_window else None,
+                     default_sort_label="Priority Order", priority_col="Priority",
+                     brightness_col="Magnitude", chart_key="comet"))
+            _stale_notice(df_comets, "comets")
+
+            # Store JPL failure rows in session state for admin panel + fire notifications
+            if not df_comets.empty and "_resolve_error" in df_comets.columns:
+                _cf = df_comets[df_comets["_resolve_error"] == True]
+                st.session_state["_comet_jpl_failures"] = _cf
+                for _, _fr in _cf.iterrows():
+                    _notify_jpl_failure(_fr["Name"], _fr.get("_jpl_id_tried", "?"), _fr.get("_jpl_error", ""))
+            else:
+                st.session_state["_comet_jpl_failures"] = pd.DataFrame()
+
+            if not df_comets.empty:
+                df_obs_c, df_filt_c = _classify_comets(df_comets)
+                _add_peak_alt_session(df_obs_c, location, start_time, start_time + timedelta(minutes=duration), engine=CONFIG["sky_engine"])
 
                 def display_comet_table(df_in):
                     show = [c for c in display_cols_c if c in df_in.columns]
@@ -2900,7 +3064,15 @@ def render_comet_section(location, start_time, duration, min_alt, max_alt, az_di
         else:
             obj_name = _get_comet_jpl_id(selected_target)
 
-        if obj_name:
+        _cached = None if selected_target == "Custom Comet..." or not obj_name else \
+            _listed_window("comets", selected_target, obj_name, [start_time])
+        if _cached is not None:
+            # Listed comet: pre-computed ephemeris or the summary's cached day — no new JPL round trip
+            name = selected_target
+            sky_coord = _cached[0]
+            st.success(f"✅ Resolved: **{name}**")
+            resolved = True
+        elif obj_name:
             try:
                 with st.spinner(f"Querying JPL Horizons for {obj_name}..."):
                     utc_start = start_time.astimezone(pytz.utc)
@@ -2967,7 +3139,11 @@ def render_comet_section(location, start_time, duration, min_alt, max_alt, az_di
                 )
             with col_f3:
                 mag_options = [10, 12, 15, 17, 20, "Any"]
-                mag_limit = st.selectbox("Est. magnitude <", mag_options, index=3, key="cat_mag_limit")
+                mag_limit = st.selectbox(
+                    "Est. magnitude <", mag_options, index=3, key="cat_mag_limit",
+                    help="Predicted magnitude at session start from the MPC orbit "
+                         "(absolute magnitude H for entries without full elements).",
+                )
 
             # --- Apply filters locally (no API needed) ---
             _window_map = {"6 months": 180, "1 year": 365, "2 years": 730, "3 years": 1095}
@@ -2976,6 +3152,9 @@ def render_comet_section(location, start_time, duration, min_alt, max_alt, az_di
             _cutoff_past = _today_dt - timedelta(days=_days)
             _cutoff_future = _today_dt + timedelta(days=_days)
 
+            # Predicted magnitude at session start from the local orbit propagator;
+            # falls back to absolute magnitude H for entries without full elements.
+            _cat_predicted = predict_catalog_comets(start_time)
             filtered_cat = []
             for _c in cat_entries:
                 if sel_orbit_types and not any(_c.get("orbit_type", "").startswith(t) for t in sel_orbit_types):
@@ -2987,9 +3166,11 @@ def render_comet_section(location, start_time, duration, min_alt, max_alt, az_di
                         continue
                 except Exception:
                     continue
-                if mag_limit != "Any" and _c.get("H") is not None:
+                _est_mag = (_cat_predicted[_c["designation"]][2]
+                            if _c.get("designation") in _cat_predicted else _c.get("H"))
+                if mag_limit != "Any" and _est_mag is not None:
                     try:
-                        if float(_c["H"]) > float(mag_limit):
+                        if float(_est_mag) > float(mag_limit):
                             continue
                     except Exception:
                         pass
@@ -3001,12 +3182,15 @@ def render_comet_section(location, start_time, duration, min_alt, max_alt, az_di
                 with st.expander(f"Show {len(filtered_cat)} matched comet(s)"):
                     for _c in filtered_cat:
                         _H_str = f", H={_c['H']}" if _c.get("H") is not None else ""
+                        _pred = _cat_predicted.get(_c["designation"])
+                        if _pred and _pred[2] is not None:
+                            _H_str += f", est. mag {_pred[2]:.1f}"
                         st.markdown(f"- {_c['designation']}  *(q={_c.get('q', 0):.2f} AU{_H_str})*")
 
                 if st.button("\U0001f52d Calculate Visibility for Filtered Comets", key="cat_calc_btn",
                              disabled=(lat is None or lon is None or (lat == 0.0 and lon == 0.0))):
                     _cat_names = tuple(_c["designation"] for _c in filtered_cat)
-                    _df_cat = get_comet_summary(lat, lon, start_time, _cat_names)
+                    _df_cat = get_catalog_comet_summary(lat, lon, start_time, _cat_names)
                     st.session_state["_cat_df"] = _df_cat
                     st.session_state["_cat_df_lat"] = lat
                     st.session_state["_cat_df_lon"] = lon
@@ -3023,34 +3207,18 @@ def render_comet_section(location, start_time, duration, min_alt, max_alt, az_di
                         _df_cat = st.session_state["_cat_df"]
                         if not _df_cat.empty:
                             _location_cat = EarthLocation(lat=lat * u.deg, lon=lon * u.deg)
-                            _is_obs_cat, _reason_cat = [], []
-                            for _, _row in _df_cat.iterrows():
-                                try:
-                                    _sc = SkyCoord(_row["RA"], _row["Dec"], frame="icrs")
-                                    _check_times = [
-                                        start_time,
-                                        start_time + timedelta(minutes=duration / 2),
-                                        start_time + timedelta(minutes=duration),
-                                    ]
-                                    _obs, _reason = False, "Not in window (Alt/Az/Moon)"
-                                    if str(_row.get("Status", "")) == "Never Rises":
-                                        _reason = "Never Rises"
-                                    else:
-                                        for _t_chk in _check_times:
-                                            _aa = _sc.transform_to(AltAz(obstime=Time(_t_chk), location=_location_cat))
-                                            if min_alt <= _aa.alt.degree <= max_alt and (not az_dirs or az_in_selected(_aa.az.degree, az_dirs)):
-                                                _obs, _reason = True, ""
-                                                break
-                                    _is_obs_cat.append(_obs)
-                                    _reason_cat.append(_reason)
-                                except Exception:
-                                    _is_obs_cat.append(False)
-                                    _reason_cat.append("Parse Error")
-
-                            _df_cat["is_observable"] = _is_obs_cat
-                            _df_cat["filter_reason"] = _reason_cat
+                            _check_times = [
+                                start_time,
+                                start_time + timedelta(minutes=duration / 2),
+                                start_time + timedelta(minutes=duration),
+                            ]
+                            # Alt/Az only — catalog scan has no Moon filter
+                            _add_observability_columns(
+                                _df_cat, _location_cat, _check_times, None, moon_illum,
+                                min_alt, max_alt, az_dirs, 0, fail_reason="Not in window (Alt/Az/Moon)", engine=CONFIG["sky_engine"]
+                            )
                             _df_obs_cat = _df_cat[_df_cat["is_observable"]].copy()
-                            _add_peak_alt_session(_df_obs_cat, _location_cat, start_time, start_time + timedelta(minutes=duration))
+                            _add_peak_alt_session(_df_obs_cat, _location_cat, start_time, start_time + timedelta(minutes=duration), engine=CONFIG["sky_engine"])
                             _df_filt_cat = _df_cat[~_df_cat["is_observable"]].copy()
 
                             _tab_obs_cat, _tab_filt_cat = st.tabs([
@@ -3430,19 +3598,20 @@ def render_asteroid_section(location, start_time, duration, min_alt, max_alt, az
 
                 st.markdown("---")
                 if st.button("🔄 Refresh JPL Data", key="jpl_refresh_asteroids",
-                             help="Clears cached JPL results and reloads overrides — use after editing jpl_id_overrides.yaml"):
+                             help="Reloads overrides and retries failed JPL lookups — use after editing jpl_id_overrides.yaml. "
+                                  "Cached positions of resolved objects are kept; edited IDs are refetched."):
                     _load_jpl_overrides.clear()
-                    get_comet_summary.clear()
-                    get_asteroid_summary.clear()
-                    st.success("JPL cache cleared — reloading...")
+                    _n_retry = POSITIONS.invalidate_failures()
+                    st.success(f"Overrides reloaded, {_n_retry} failed lookup(s) will be retried — reloading...")
                     st.rerun()
+                _pipeline_stats_caption()
                 # JPL Resolution Failures
                 _asteroid_failures_df = st.session_state.get("_asteroid_jpl_failures", None)
                 if _asteroid_failures_df is not None and not _asteroid_failures_df.empty:
                     st.markdown("### ⚠️ JPL Resolution Failures")
                     st.caption(f"{len(_asteroid_failures_df)} asteroid(s) could not be resolved via JPL Horizons. "
                                "This only occurs for newly-added objects not yet in the ephemeris cache, "
-                               "or queries beyond the 30-day pre-computed window. "
+                               "or dates beyond the pre-computed long-range window. "
                                "Add a permanent fix via jpl_id_overrides.yaml if this persists.")
                     for _, _fail_row in _asteroid_failures_df.iterrows():
                         _fname = _fail_row["Name"]
@@ -3463,7 +3632,7 @@ def render_asteroid_section(location, start_time, duration, min_alt, max_alt, az
                                     _ovr_data["asteroids"][_fname] = _ovr_id.strip()
                                     write_jpl_overrides(JPL_OVERRIDES_FILE, _ovr_data)
                                     _load_jpl_overrides.clear()
-                                    get_asteroid_summary.clear()
+                                    POSITIONS.invalidate("asteroids", [_ftried, _ovr_id.strip()])
                                     st.success(f"Override saved: **{_fname}** → `{_ovr_id.strip()}`")
                                     st.rerun()
                                 else:
@@ -3480,19 +3649,9 @@ def render_asteroid_section(location, start_time, duration, min_alt, max_alt, az
         with st.expander("2\\. 📅 Night Plan Builder", expanded=False):
             _location_needed()
     elif active_asteroids:
-        df_asteroids = get_asteroid_summary(lat, lon, start_time, tuple(active_asteroids))
-
-        # Store JPL failure rows in session state for admin panel + fire notifications
-        if not df_asteroids.empty and "_resolve_error" in df_asteroids.columns:
-            _af = df_asteroids[df_asteroids["_resolve_error"] == True]
-            st.session_state["_asteroid_jpl_failures"] = _af
-            for _, _fr in _af.iterrows():
-                _notify_jpl_failure(_fr["Name"], _fr.get("_jpl_id_tried", "?"), _fr.get("_jpl_error", ""))
-        else:
-            st.session_state["_asteroid_jpl_failures"] = pd.DataFrame()
-
-        if not df_asteroids.empty:
-            df_asteroids["Priority"] = df_asteroids["Name"].apply(
+        def _classify_asteroids(df):
+            """Priority, Window and observability columns → (observable, unobservable) rows."""
+            df["Priority"] = df["Name"].apply(
                 lambda n: asteroid_config["priorities"].get(n,
                     "⭐ PRIORITY" if n in priority_set else "")
             )
@@ -3505,65 +3664,54 @@ def render_asteroid_section(location, start_time, duration, min_alt, max_alt, az
                     label = f"{w_start} → {w_end}"
                     return f"✅ ACTIVE: {label}" if w_start <= today_str <= w_end else f"⏳ {label}"
                 return ""
-            df_asteroids["Window"] = df_asteroids["Name"].apply(_window_status)
+            df["Window"] = df["Name"].apply(_window_status)
 
             location_a = EarthLocation(lat=lat * u.deg, lon=lon * u.deg)
-            is_obs_list, reason_list, moon_sep_list, moon_status_list = [], [], [], []
-            for _, row in df_asteroids.iterrows():
-                # Short-circuit: stub rows from failed JPL lookups
-                if row.get("_resolve_error") is True:
-                    is_obs_list.append(False)
-                    reason_list.append(f"JPL lookup failed (tried: {row.get('_jpl_id_tried', '?')})")
-                    moon_sep_list.append("—")
-                    moon_status_list.append("")
-                    continue
-                try:
-                    sc = SkyCoord(row['RA'], row['Dec'], frame='icrs')
-                    check_times = [
-                        start_time,
-                        start_time + timedelta(minutes=duration / 2),
-                        start_time + timedelta(minutes=duration)
-                    ]
-                    _mlocs = []
-                    if moon_loc:
-                        try:
-                            _mlocs = [get_moon(Time(t), location_a) for t in check_times]
-                        except Exception:
-                            _mlocs = [moon_loc] * 3
-                    obs, reason, ms, mst = _check_row_observability(
-                        sc, row.get('Status', ''), location_a, check_times,
-                        moon_loc, _mlocs, moon_illum, min_alt, max_alt, az_dirs, min_moon_sep
-                    )
-                    is_obs_list.append(obs)
-                    reason_list.append(reason)
-                    moon_sep_list.append(ms)
-                    moon_status_list.append(mst)
-                except Exception:
-                    is_obs_list.append(False)
-                    reason_list.append("Parse Error")
-                    moon_sep_list.append("–")
-                    moon_status_list.append("")
-
-            df_asteroids["is_observable"] = is_obs_list
-            df_asteroids["filter_reason"] = reason_list
-            if moon_sep_list:
-                df_asteroids["Moon Sep (°)"] = moon_sep_list
-                df_asteroids["Moon Status"] = moon_status_list
+            check_times = [
+                start_time,
+                start_time + timedelta(minutes=duration / 2),
+                start_time + timedelta(minutes=duration)
+            ]
+            _mlocs = moon_positions_at(check_times, location_a, fallback=moon_loc) if moon_loc else None
+            _add_observability_columns(
+                df, location_a, check_times, _mlocs, moon_illum,
+                min_alt, max_alt, az_dirs, min_moon_sep, engine=CONFIG["sky_engine"]
+            )
 
             # Dec filter: objects outside range go to Unobservable tab with reason
-            if "_dec_deg" in df_asteroids.columns and (min_dec > -90 or max_dec < 90):
-                _dec_out = ~((df_asteroids["_dec_deg"] >= min_dec) & (df_asteroids["_dec_deg"] <= max_dec))
-                df_asteroids.loc[_dec_out, "is_observable"] = False
-                df_asteroids.loc[_dec_out, "filter_reason"] = df_asteroids.loc[_dec_out, "_dec_deg"].apply(
+            if "_dec_deg" in df.columns and (min_dec > -90 or max_dec < 90):
+                _dec_out = ~((df["_dec_deg"] >= min_dec) & (df["_dec_deg"] <= max_dec))
+                df.loc[_dec_out, "is_observable"] = False
+                df.loc[_dec_out, "filter_reason"] = df.loc[_dec_out, "_dec_deg"].apply(
                     lambda d: f"Dec {d:+.1f}° outside filter ({min_dec}° to {max_dec}°)"
                 )
+            return df[df["is_observable"]].copy(), df[~df["is_observable"]].copy()
 
-            df_obs_a = df_asteroids[df_asteroids["is_observable"]].copy()
-            _add_peak_alt_session(df_obs_a, location, start_time, start_time + timedelta(minutes=duration))
-            df_filt_a = df_asteroids[~df_asteroids["is_observable"]].copy()
+        display_cols_a = ["Name", "Priority", "Magnitude", "Window", "Constellation", "Rise", "Transit", "Set",
+                          "RA", "_dec_deg", "Status", "_peak_alt_session", "Moon Sep (°)", "Moon Status"]
 
-            display_cols_a = ["Name", "Priority", "Magnitude", "Window", "Constellation", "Rise", "Transit", "Set",
-                              "RA", "_dec_deg", "Status", "_peak_alt_session", "Moon Sep (°)", "Moon Status"]
+        # Rows appear as they arrive (committed ephemeris first, then live JPL answers)
+        df_asteroids = _summary_with_preview(
+            stream_asteroid_summary(lat, lon, start_time, tuple(active_asteroids)), "asteroids",
+            _classify_asteroids, display_cols_a,
+            dict(obs_start=obs_start_naive if show_obs_window else None,
+                 obs_end=obs_end_naive if show_obs_window else None,
+                 default_sort_label="Priority Order", priority_col="Priority",
+                 brightness_col="Magnitude", chart_key="asteroid"))
+        _stale_notice(df_asteroids, "asteroids")
+
+        # Store JPL failure rows in session state for admin panel + fire notifications
+        if not df_asteroids.empty and "_resolve_error" in df_asteroids.columns:
+            _af = df_asteroids[df_asteroids["_resolve_error"] == True]
+            st.session_state["_asteroid_jpl_failures"] = _af
+            for _, _fr in _af.iterrows():
+                _notify_jpl_failure(_fr["Name"], _fr.get("_jpl_id_tried", "?"), _fr.get("_jpl_error", ""))
+        else:
+            st.session_state["_asteroid_jpl_failures"] = pd.DataFrame()
+
+        if not df_asteroids.empty:
+            df_obs_a, df_filt_a = _classify_asteroids(df_asteroids)
+            _add_peak_alt_session(df_obs_a, location, start_time, start_time + timedelta(minutes=duration), engine=CONFIG["sky_engine"])
 
             def display_asteroid_table(df_in):
                 show = [c for c in display_cols_a if c in df_in.columns]
@@ -3649,7 +3797,15 @@ def render_asteroid_section(location, start_time, duration, min_alt, max_alt, az
     else:
         obj_name = _asteroid_jpl_id(selected_target)
 
-    if obj_name:
+    _cached = None if selected_target == "Custom Asteroid..." or not obj_name else \
+        _listed_window("asteroids", selected_target, obj_name, [start_time])
+    if _cached is not None:
+        # Listed asteroid: pre-computed ephemeris or the summary's cached day — no new JPL round trip
+        name = selected_target
+        sky_coord = _cached[0]
+        st.success(f"✅ Resolved: **{name}**")
+        resolved = True
+    elif obj_name:
         try:
             with st.spinner(f"Querying JPL Horizons for {obj_name}..."):
                 utc_start = start_time.astimezone(pytz.utc)
@@ -3970,6 +4126,7 @@ def render_cosmic_section(location, start_time, duration, min_alt, max_alt, az_d
             progress_bar = st.progress(0)
             total_rows = len(df_alerts)
 
+            planning_ok = []   # indices into planning_data with parsed coordinates
             for idx, row in df_alerts.iterrows():
                 # Update progress
                 if idx % 5 == 0: progress_bar.progress(min(idx / total_rows, 1.0))
@@ -3981,67 +4138,10 @@ def render_cosmic_section(location, start_time, duration, min_alt, max_alt, az_d
                     # Handle potential string formatting issues
                     sc = SkyCoord(str(ra_val), str(dec_val), frame='icrs')
 
-                    # Calculate details
-                    details = calculate_planning_info(sc, location, start_time)
-
-                    # --- Observability Check ---
-                    is_obs = True
-                    filt_reason = ""
-
-                    # Moon positions across window (start / mid / end) — used for both display and filter
-                    check_times = [start_time, start_time + timedelta(minutes=duration/2), start_time + timedelta(minutes=duration)]
-                    moon_locs_dynamic = []
-                    if moon_loc:
-                        try:
-                            moon_locs_dynamic = [get_moon(Time(t), location) for t in check_times]
-                        except Exception:
-                            moon_locs_dynamic = [moon_loc] * 3
-
-                    # Moon Sep = range across window (min–max)
-                    _seps_dyn = [moon_sep_deg(sc, ml) for ml in moon_locs_dynamic] if moon_locs_dynamic else []
-                    moon_sep = min(_seps_dyn) if _seps_dyn else (moon_sep_deg(sc, moon_loc) if moon_loc else 0.0)
-                    _moon_sep_max = max(_seps_dyn) if _seps_dyn else moon_sep
-                    moon_status = get_moon_status(moon_illum, moon_sep) if moon_loc else ""
-
-                    # 1. Basic Status
-                    if is_obs:
-                        if details['Status'] == "Never Rises":
-                            is_obs = False
-                            filt_reason = "Never Rises"
-                        elif details['Status'] == "Error":
-                            is_obs = False
-                            filt_reason = "Coord Error"
-
-                    # 2. Advanced Filters (Alt/Az)
-                    if is_obs:
-                        passed_checks = False
-                        for i, t_check in enumerate(check_times):
-                            # Quick AltAz check
-                            frame = AltAz(obstime=Time(t_check), location=location)
-                            aa = sc.transform_to(frame)
-                            if min_alt <= aa.alt.degree <= max_alt and (not az_dirs or az_in_selected(aa.az.degree, az_dirs)):
-                                # Check Moon dynamically
-                                if moon_locs_dynamic:
-                                    sep_dyn = moon_sep_deg(sc, moon_locs_dynamic[i])
-                                    if sep_dyn >= min_moon_sep:
-                                        passed_checks = True
-                                        break
-                                else:
-                                    passed_checks = True
-                                    break
-                        if not passed_checks:
-                            is_obs = False
-                            filt_reason = f"Filters failed (Alt/Az or Moon < {min_moon_sep}°) during window"
-
-                    # Merge row data with details
                     row_dict = row.to_dict()
-                    row_dict.update(details)
                     row_dict['_dec_deg'] = sc.dec.degree   # needed for Dec filter
                     row_dict['_ra_deg']  = sc.ra.deg
-                    row_dict['is_observable'] = is_obs
-                    row_dict['filter_reason'] = filt_reason
-                    row_dict['Moon Sep (°)'] = f"{moon_sep:.1f}°–{_moon_sep_max:.1f}°" if moon_loc else "–"
-                    row_dict['Moon Status'] = moon_status
+                    planning_ok.append(len(planning_data))
                     planning_data.append(row_dict)
                 except Exception:
                     # If coord parsing fails, just keep original row
@@ -4050,6 +4150,42 @@ def render_cosmic_section(location, start_time, duration, min_alt, max_alt, az_d
                     d['filter_reason'] = "Data/Parse Error"
                     planning_data.append(d)
 
+            # Calculate details for every parsed row at once and merge them into the row data
+            if planning_ok:
+                _details = calculate_planning_info_batch(
+                    [planning_data[i]['_ra_deg'] for i in planning_ok],
+                    [planning_data[i]['_dec_deg'] for i in planning_ok],
+                    location, start_time,
+                ).to_dict('records')
+                for i, details in zip(planning_ok, _details):
+                    planning_data[i].update(details)
+
+            # --- Observability Check (one batched Alt/Az + Moon pass over all parsed rows) ---
+            if planning_ok:
+                check_times = [start_time, start_time + timedelta(minutes=duration/2), start_time + timedelta(minutes=duration)]
+                moon_locs_dynamic = moon_positions_at(check_times, location, fallback=moon_loc) if moon_loc else None
+                _ok_rows = [planning_data[i] for i in planning_ok]
+                try:
+                    _obs, _reasons, _seps, _mstats = evaluate_observability(
+                        [r['_ra_deg'] for r in _ok_rows], [r['_dec_deg'] for r in _ok_rows],
+                        location, check_times, statuses=[r['Status'] for r in _ok_rows],
+                        moon_coords=moon_locs_dynamic, moon_illum=moon_illum,
+                        min_alt=min_alt, max_alt=max_alt, az_dirs=az_dirs, min_moon_sep=min_moon_sep,
+                        fail_reason=f"Filters failed (Alt/Az or Moon < {min_moon_sep}°) during window",
+                        engine=CONFIG["sky_engine"],
+                    )
+                except Exception as _e:
+                    print(f"[WARN] Cosmic observability check failed: {_e}", file=sys.stderr)
+                    _n = len(_ok_rows)
+                    _obs, _reasons, _seps, _mstats = [False] * _n, ["Data/Parse Error"] * _n, ["–"] * _n, [""] * _n
+                for r, ob, reason, ms, mst in zip(_ok_rows, _obs, _reasons, _seps, _mstats):
+                    if r['Status'] == "Error":
+                        ob, reason = False, "Coord Error"
+                    r['is_observable'] = bool(ob)
+                    r['filter_reason'] = reason
+                    r['Moon Sep (°)'] = ms
+                    r['Moon Status'] = mst
+
             progress_bar.empty()
 
             # Create new enriched DataFrame
@@ -4137,7 +4273,7 @@ def render_cosmic_section(location, start_time, duration, min_alt, max_alt, az_d
             df_filt = df_display[df_display['is_observable'] == False].copy()
 
             # Add peak altitude during the observation session to the observable slice
-            _add_peak_alt_session(df_obs, location, start_time, start_time + timedelta(minutes=duration))
+            _add_peak_alt_session(df_obs, location, start_time, start_time + timedelta(minutes=duration), engine=CONFIG["sky_engine"])
 
             # Filter columns for display
             cols_to_remove_keywords = ['exposure', 'cadence', 'gain', 'exp', 'cad']
@@ -4368,14 +4504,22 @@ if st.button("🚀 Calculate Visibility", type="primary", disabled=not resolved
     
     ephem_coords = None
     # For moving objects, fetch precise ephemerides for the duration
-    if target_mode in ["Comet (JPL Horizons)", "Asteroid (JPL Horizons)"]:
+    _steps = [start_time + timedelta(minutes=m) for m in range(0, duration + 1, 10)]
+    _moving_section = {"Comet (JPL Horizons)": "comets", "Asteroid (JPL Horizons)": "asteroids",
+                       "Planet (JPL Horizons)": "planets"}.get(target_mode)
+    if _moving_section == "planets" and CONFIG["planet_engine"] == "local":
+        ephem_coords = planet_engine.sky_coords(obj_name, _steps)
+    elif _moving_section and obj_name:
+        # Listed objects: the same arrays that served the summary row — no new request
+        ephem_coords = _listed_window(_moving_section, name, obj_name, _steps)
+    if ephem_coords is None and _moving_section in ("comets", "asteroids"):
         with st.spinner("Fetching detailed ephemerides from JPL..."):
             try:
                 ephem_coords = get_horizons_ephemerides(obj_name, start_time, duration_minutes=duration, step_minutes=10)
             except Exception as e:
                 print(f"[ERROR] Could not fetch detailed ephemerides for '{obj_name}': {e}", file=sys.stderr)
                 st.warning("Could not fetch position data from JPL. Please try again. Using fixed coordinates.")
-    elif target_mode == "Planet (JPL Horizons)":
+    elif ephem_coords is None and _moving_section == "planets":
         with st.spinner("Fetching planetary ephemerides from JPL..."):
             try:
                 ephem_coords = get_planet_ephemerides(obj_name, start_time, duration_minutes=duration, step_minutes=10)
@@ -4384,9 +4528,8 @@ if st.button("🚀 Calculate Visibility", type="primary", disabled=not resolved
                 st.warning("Could not fetch position data from JPL. Please try again. Using fixed coordinates.")
 
     with st.spinner("Calculating trajectory..."):
-        results = compute_trajectory(sky_coord, location, start_time, duration_minutes=duration, ephemeris_coords=ephem_coords)
-    
-    df = pd.DataFrame(results)
+        df = compute_trajectory(sky_coord, location, start_time, duration_minutes=duration,
+                                ephemeris_coords=ephem_coords, as_dataframe=True)
     
 
     # --- Moon Check (driven from per-step trajectory data) ---
@@ -4,13 +4,21 @@ No Streamlit imports. All functions are independently testable.
 Imported by app.py via: from backend.app_logic import <name>
 """
 
+import sys
 import pytz
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime, timedelta
-from astropy.coordinates import AltAz
+from astropy import units as u
+from astropy.coordinates import AltAz, SkyCoord, angular_separation
 from astropy.time import Time
-from backend.core import moon_sep_deg, compute_peak_alt_in_window
+from backend import fastsky
+from backend.moonsun import MOON_SUN
+from backend.core import (
+    moon_sep_deg, compute_peak_alt_in_window, compute_peak_alt_batch,
+    calculate_planning_info_batch, PLANNING_COLUMNS,
+)
 
 # ── Azimuth direction filter ───────────────────────────────────────────────
 
@@ -46,6 +54,16 @@ def az_in_selected(az_deg: float, selected_dirs: set) -> bool:
     return False
 
 
+def az_in_selected_mask(az_deg, selected_dirs: set) -> np.ndarray:
+    """Vectorized az_in_selected: boolean array, True where az falls in any selected octant."""
+    az = np.asarray(az_deg, dtype=float)
+    mask = np.zeros(az.shape, dtype=bool)
+    for d in selected_dirs:
+        for lo, hi in _AZ_OCTANTS[d]:
+            mask |= (lo <= az) & (az < hi)
+    return mask
+
+
 # ── Moon status ────────────────────────────────────────────────────────────
 
 _MOON_DARK_SKY_ILLUM = 15   # illumination % below which it's "Dark Sky"
@@ -107,6 +125,202 @@ def _check_row_observability(sc, row_status, location, check_times, moon_loc, mo
     return obs, reason, moon_sep_str, moon_status_str
 
 
+def moon_positions_at(check_times, location, fallback=None, moon_ephemeris=None):
+    """Moon coordinates at every check time, read from the shared per-night grid.
+
+    Returns an array-valued coordinate of len(check_times), or ``fallback``
+    (e.g. the start-time Moon) when the ephemeris call fails.
+    """
+    try:
+        return (moon_ephemeris or MOON_SUN).moon(location, list(check_times))
+    except Exception:
+        return fallback
+
+
+def evaluate_observability(ra_deg, dec_deg, location, check_times, statuses=None,
+                           moon_coords=None, moon_illum=0.0, min_alt=0, max_alt=90,
+                           az_dirs=None, min_moon_sep=0,
+                           fail_reason="Not visible during window", engine="astropy"):
+    """Batched observability for N targets × T check times.
+
+    Vectorized equivalent of _check_row_observability: all targets go through a
+    single (N, T) AltAz transform and the Moon separation is computed once per
+    check time instead of once per row.
+
+    Args:
+        ra_deg, dec_deg: Array-likes of ICRS coordinates (degrees), length N.
+        location:        EarthLocation of the observer.
+        check_times:     Sequence of T datetimes (start, mid, end of window).
+        statuses:        Optional length-N 'Status' values; "Never Rises" rows
+                         are never observable.
+        moon_coords:     Moon coordinate(s) at each check time — array of length
+                         T (see moon_positions_at) or a single coordinate reused
+                         for every time — or None when Moon info is unavailable
+                         (no Moon filter, "–" separation strings).
+        moon_illum, min_alt, max_alt, az_dirs, min_moon_sep:
+                         Same meaning as in _check_row_observability.
+        fail_reason:     Reason string for rows that fail the window checks.
+        engine:          "astropy" (full AltAz transform) or "fast"
+                         (backend/fastsky.py closed-form kernel, ~0.01°).
+
+    Returns:
+        (is_observable: bool ndarray, reasons: list[str],
+         moon_sep_strs: list[str], moon_status_strs: list[str])
+    """
+    fastsky.check_engine(engine)
+    ra = np.atleast_1d(np.asarray(ra_deg, dtype=float))
+    dec = np.atleast_1d(np.asarray(dec_deg, dtype=float))
+    n = len(ra)
+    if n == 0:
+        return np.zeros(0, dtype=bool), [], [], []
+    times = Time(list(check_times))
+
+    if engine == "fast":
+        alt, az = fastsky.altaz(ra, dec, location, list(check_times))
+    else:
+        targets = SkyCoord(ra=ra[:, None] * u.deg, dec=dec[:, None] * u.deg, frame='icrs')
+        altaz = targets.transform_to(AltAz(obstime=times[None, :], location=location))
+        alt, az = altaz.alt.degree, altaz.az.degree
+    ok = (alt >= min_alt) & (alt <= max_alt)
+    if az_dirs:
+        ok &= az_in_selected_mask(az, az_dirs)
+
+    if moon_coords is not None:
+        # Direction-only Moon (see moon_sep_deg), moved to ICRS once per time
+        moon_dir = SkyCoord(ra=moon_coords.ra, dec=moon_coords.dec, frame=moon_coords.frame).icrs
+        m_ra = np.broadcast_to(np.atleast_1d(moon_dir.ra.rad), (len(times),))
+        m_dec = np.broadcast_to(np.atleast_1d(moon_dir.dec.rad), (len(times),))
+        seps = np.degrees(angular_separation(
+            np.radians(ra)[:, None], np.radians(dec)[:, None], m_ra[None, :], m_dec[None, :]
+        ))
+        ok &= seps >= min_moon_sep
+        sep_min, sep_max = seps.min(axis=1), seps.max(axis=1)
+        moon_sep_strs = [f"{lo:.1f}°–{hi:.1f}°" for lo, hi in zip(sep_min, sep_max)]
+        moon_status_strs = [get_moon_status(moon_illum, lo) for lo in sep_min]
+    else:
+        moon_sep_strs = ["–"] * n
+        moon_status_strs = [""] * n
+
+    is_obs = ok.any(axis=1)
+    never = np.zeros(n, dtype=bool) if statuses is None else \
+        np.array([str(st) == "Never Rises" for st in statuses], dtype=bool)
+    is_obs &= ~never
+    reasons = [
+        "Never Rises" if nv else ("" if ob else fail_reason)
+        for nv, ob in zip(never, is_obs)
+    ]
+    return is_obs, reasons, moon_sep_strs, moon_status_strs
+
+
+def _add_observability_columns(df, location, check_times, moon_coords, moon_illum,
+                               min_alt, max_alt, az_dirs, min_moon_sep,
+                               fail_reason="Not visible during window", error_observable=False,
+                               engine="astropy"):
+    """Add is_observable / filter_reason / Moon Sep (°) / Moon Status columns in place.
+
+    Batched replacement for the per-row _check_row_observability loop used by the
+    summary sections. Targets come from the numeric _ra_deg / _dec_deg columns.
+    Stub rows (_resolve_error is True) get a "JPL lookup failed" reason; rows
+    without finite coordinates get "Parse Error" (or stay observable when
+    error_observable=True, as the planet section does). engine is passed
+    through to evaluate_observability.
+    """
+    n = len(df)
+    is_obs = np.full(n, bool(error_observable))
+    reasons = ["" if error_observable else "Parse Error"] * n
+    moon_seps, moon_stats = ["–"] * n, [""] * n
+
+    stub = np.zeros(n, dtype=bool)
+    if "_resolve_error" in df.columns:
+        stub = np.array([v is True for v in df["_resolve_error"]], dtype=bool)
+        tried = df["_jpl_id_tried"] if "_jpl_id_tried" in df.columns else pd.Series("?", index=df.index)
+        for i in np.flatnonzero(stub):
+            t = tried.iloc[i]
+            is_obs[i], moon_seps[i] = False, "—"
+            reasons[i] = f"JPL lookup failed (tried: {t if isinstance(t, str) else '?'})"
+
+    def _deg_col(col):
+        if col not in df.columns:
+            return np.full(n, np.nan)
+        return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+
+    ra, dec = _deg_col("_ra_deg"), _deg_col("_dec_deg")
+    good = np.flatnonzero(~stub & np.isfinite(ra) & np.isfinite(dec))
+    if len(good):
+        statuses = df["Status"].iloc[good] if "Status" in df.columns else None
+        try:
+            b_obs, b_reason, b_sep, b_stat = evaluate_observability(
+                ra[good], dec[good], location, check_times,
+                statuses=statuses, moon_coords=moon_coords, moon_illum=moon_illum,
+                min_alt=min_alt, max_alt=max_alt, az_dirs=az_dirs, min_moon_sep=min_moon_sep,
+                fail_reason=fail_reason, engine=engine,
+            )
+        except Exception as e:
+            print(f"[WARN] Batched observability check failed: {e}", file=sys.stderr)
+        else:
+            for j, i in enumerate(good):
+                is_obs[i], reasons[i] = bool(b_obs[j]), b_reason[j]
+                moon_seps[i], moon_stats[i] = b_sep[j], b_stat[j]
+
+    df["is_observable"] = is_obs
+    df["filter_reason"] = reasons
+    # Without Moon positions keep any start-time Moon columns the summary already set
+    if moon_coords is not None or "Moon Sep (°)" not in df.columns:
+        df["Moon Sep (°)"] = moon_seps
+        df["Moon Status"] = moon_stats
+    return df
+
+
+# ── Summary planning columns ─────────────────────────────────────────────────
+
+def _add_planning_columns(df, location, start_time, moon_loc=None, moon_illum=0.0):
+    """Fill the per-target summary columns for every resolved row of df, in place.
+
+    Replaces the per-row calculate_planning_info + moon_sep_deg dict building in
+    the summary functions: one calculate_planning_info_batch call, one array
+    Moon separation and vectorized RA/Dec formatting over all rows whose
+    _ra_deg / _dec_deg are finite. Stub rows (_resolve_error is True) keep the
+    placeholder values they were built with.
+
+    Sets RA, Dec, Moon Sep (°), Moon Status and the PLANNING_COLUMNS.
+    Returns df for chaining.
+    """
+    if df.empty:
+        return df
+    ra = pd.to_numeric(df["_ra_deg"], errors="coerce").to_numpy(dtype=float)
+    dec = pd.to_numeric(df["_dec_deg"], errors="coerce").to_numpy(dtype=float)
+    ok = np.isfinite(ra) & np.isfinite(dec)
+    if "_resolve_error" in df.columns:
+        ok &= ~np.array([v is True for v in df["_resolve_error"]], dtype=bool)
+    if not ok.any():
+        return df
+
+    sc = SkyCoord(ra=ra[ok] * u.deg, dec=dec[ok] * u.deg, frame='icrs')
+    planning = calculate_planning_info_batch(ra[ok], dec[ok], location, start_time)
+    if moon_loc is not None:
+        seps = np.atleast_1d(moon_sep_deg(sc, moon_loc))
+        moon_seps = [round(float(v), 1) for v in seps]
+        moon_stats = [get_moon_status(moon_illum, float(v)) for v in seps]
+    else:
+        moon_seps, moon_stats = [0.0] * len(sc), [""] * len(sc)
+
+    values = {
+        "RA": [str(v) for v in sc.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True)],
+        "Dec": [str(v) for v in sc.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True)],
+        "Moon Sep (°)": moon_seps,
+        "Moon Status": moon_stats,
+    }
+    values.update({c: planning[c].tolist() for c in PLANNING_COLUMNS})
+    positions = np.flatnonzero(ok)
+    for col, vals in values.items():
+        # Rebuild whole columns so pandas infers dtypes exactly as it did for row dicts
+        merged = df[col].tolist() if col in df.columns else [None] * len(df)
+        for pos, v in zip(positions, vals):
+            merged[pos] = v
+        df[col] = pd.Series(merged, index=df.index)
+    return df
+
+
 # ── DataFrame sort helpers ───────────────────────────────────────────────────
 
 def _sort_df_like_chart(df, sort_option, priority_col=None, brightness_col=None):
@@ -192,16 +406,38 @@ def _sanitize_csv_df(df: pd.DataFrame) -> pd.DataFrame:
 
 # ── Peak altitude helper ────────────────────────────────────────────────────
 
-def _add_peak_alt_session(df, location, win_start_tz, win_end_tz, n_steps=5):
+def _add_peak_alt_session(df, location, win_start_tz, win_end_tz, n_steps=5, engine="astropy",
+                          method="analytic"):
     """Add _peak_alt_session column (peak altitude during obs window) to df in-place.
 
-    Uses compute_peak_alt_in_window at n_steps sample points.
+    method="analytic" computes the exact peak for every row in one
+    compute_peak_alt_batch call. method="sampled" uses
+    compute_peak_alt_in_window at n_steps sample points (with engine="fast"
+    every row is sampled in one backend/fastsky.py call).
     Falls back to None when location or coordinates are missing.
     Returns df for chaining.
     """
     if location is None or df.empty or '_ra_deg' not in df.columns or '_dec_deg' not in df.columns:
         df['_peak_alt_session'] = None
         return df
+    if method == "analytic":
+        peaks = compute_peak_alt_batch(
+            pd.to_numeric(df['_ra_deg'], errors='coerce').to_numpy(dtype=float),
+            pd.to_numeric(df['_dec_deg'], errors='coerce').to_numpy(dtype=float),
+            location, win_start_tz, win_end_tz, engine=engine,
+        )
+        df['_peak_alt_session'] = [float(p) if np.isfinite(p) else None for p in peaks]
+        return df
+    if fastsky.check_engine(engine) == "fast":
+        ra = pd.to_numeric(df['_ra_deg'], errors='coerce').to_numpy(dtype=float)
+        dec = pd.to_numeric(df['_dec_deg'], errors='coerce').to_numpy(dtype=float)
+        window_secs = (win_end_tz - win_start_tz).total_seconds()
+        samples = [win_start_tz + timedelta(seconds=i / max(n_steps - 1, 1) * window_secs)
+                   for i in range(n_steps)]
+        alt, _ = fastsky.altaz(ra, dec, location, samples)
+        peaks = alt.max(axis=1)
+        df['_peak_alt_session'] = [float(p) if np.isfinite(p) else None for p in peaks]
+        return df
     peaks = []
     for _, row in df.iterrows():
         ra = row.get('_ra_deg')
@@ -209,7 +445,8 @@ def _add_peak_alt_session(df, location, win_start_tz, win_end_tz, n_steps=5):
         if pd.notnull(ra) and pd.notnull(dec):
             try:
                 peaks.append(compute_peak_alt_in_window(
-                    float(ra), float(dec), location, win_start_tz, win_end_tz, n_steps=n_steps
+                    float(ra), float(dec), location, win_start_tz, win_end_tz, n_steps=n_steps,
+                    method="sampled",
                 ))
             except Exception:
                 peaks.append(None)
@@ -231,6 +468,7 @@ def _apply_night_plan_filters(
     sel_moon, all_moon_statuses,
     location=None,
     min_alt=0,
+    engine="astropy",
 ):
     """Apply all night plan filters to df and return the filtered copy.
 
@@ -265,6 +503,11 @@ def _apply_night_plan_filters(
     min_alt : float
         Minimum peak altitude (degrees) the target must reach inside the
         observation window.  Ignored when ``location`` is ``None``.
+    engine : "astropy" | "fast"
+        Alt/Az engine for the peak-altitude check (see backend/fastsky.py).
+
+    The peak altitude of every horizon-passing row is computed in a single
+    compute_peak_alt_batch call (exact transit-or-endpoint peak).
     """
     out = df.copy()
 
@@ -307,7 +550,8 @@ def _apply_night_plan_filters(
     if '_rise_datetime' in out.columns and '_set_datetime' in out.columns:
         _keep = []
         _peak_alts = []
-        for _, _row in out.iterrows():
+        _alt_rows, _alt_ra, _alt_dec = [], [], []   # rows needing the altitude check
+        for _i, (_, _row) in enumerate(out.iterrows()):
             _status = str(_row.get('Status', ''))
             if 'Always Up' in _status:
                 _keep.append(True)
@@ -336,15 +580,19 @@ def _apply_night_plan_filters(
             if (location is not None
                     and _ra is not None and pd.notnull(_ra)
                     and _dec is not None and pd.notnull(_dec)):
-                _peak = compute_peak_alt_in_window(
-                    float(_ra), float(_dec), location, win_start_dt, win_end_dt
-                )
-                _keep.append(_peak >= min_alt)
-                _peak_alts.append(_peak)
-            else:
-                # No location or coordinates — fall back to horizon-only check
-                _keep.append(True)
-                _peak_alts.append(None)
+                _alt_rows.append(_i)
+                _alt_ra.append(float(_ra))
+                _alt_dec.append(float(_dec))
+            # Placeholder; no location or coordinates keeps the horizon-only result
+            _keep.append(True)
+            _peak_alts.append(None)
+
+        if _alt_rows:
+            _peaks = compute_peak_alt_batch(_alt_ra, _alt_dec, location, win_start_dt, win_end_dt,
+                                            engine=engine)
+            for _i, _peak in zip(_alt_rows, _peaks):
+                _keep[_i] = bool(_peak >= min_alt)
+                _peak_alts[_i] = float(_peak)
 
         out['_peak_alt_window'] = _peak_alts
         out = out[_keep].copy()
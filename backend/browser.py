@@ -0,0 +1,252 @@
+"""backend/browser.py — One long-lived headless browser shared by the scrapers.
+
+Every scrape used to launch its own StealthyFetcher browser on a throwaway
+thread — a Chromium start-up and teardown (seconds, a few hundred MB) per
+page — and the first scrape in a session could block on ``patchright
+install chromium``. ``BrowserWorker`` keeps one browser for the process:
+
+- a daemon thread owns an asyncio loop and a scrapling
+  ``AsyncStealthySession``: one persistent context with a pool of up to
+  ``max_pages`` tabs that are reused across fetches. Playwright running on
+  its own loop stays clear of Streamlit's, and on Windows gets the Proactor
+  loop it needs for subprocesses;
+- ``fetch(url, **kwargs)`` is callable from any thread. Requests queue on
+  the loop behind ``max_pages`` slots, so that many pages load at once (the
+  three Unistellar pages in parallel) and the rest wait their turn;
+- health checks: a session idle for ``health_interval`` seconds is probed
+  before reuse; a failed probe, or a fetch that fails because the browser
+  died, replaces the session and the fetch is retried once. The session is
+  also recycled after ``recycle_after`` fetches to bound memory growth;
+- a session left idle for ``idle_timeout`` seconds is closed, so an idle app
+  does not hold a Chromium process (a few hundred MB) for the rest of its
+  life; the next fetch relaunches it;
+- ``warmup()`` installs Patchright's Chromium and launches the browser in the
+  background. The app runs it once per process at startup; fetches that
+  arrive meanwhile wait for it. ``fetch`` itself never installs anything.
+
+``BROWSER`` is the process-wide instance; ``stats()`` reports launches,
+restarts, idle closes, fetches, failures and the page pool.
+"""
+
+import asyncio
+import atexit
+import logging
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import suppress
+
+from scrapling.fetchers import AsyncStealthySession
+
+logger = logging.getLogger(__name__)
+
+FETCH_TIMEOUT = 120.0      # seconds a caller waits for one page (queueing included)
+HEALTH_TIMEOUT = 10.0      # seconds the liveness probe may take
+INSTALL_TIMEOUT = 300.0    # seconds for ``patchright install chromium``
+
+
+def install_chromium():
+    """Install Patchright's Chromium if missing (idempotent; a failure is only logged)."""
+    try:
+        subprocess.run(
+            ["patchright", "install", "chromium"],
+            check=True, capture_output=True, text=True, timeout=INSTALL_TIMEOUT,
+        )
+    except Exception as e:
+        logger.warning(f"Browser auto-install note: {e}")
+
+
+class BrowserWorker:
+    """Persistent stealth browser on its own event-loop thread, shared by every caller.
+
+    Args:
+        max_pages:       Tabs kept in the pool = pages fetched concurrently.
+        health_interval: Idle seconds after which the session is probed before reuse.
+        recycle_after:   Fetches after which the browser is relaunched (memory bound).
+        idle_timeout:    Idle seconds after which the browser is closed (None: never).
+        session_options: Extra AsyncStealthySession options (default: headless).
+    """
+
+    def __init__(self, max_pages=3, health_interval=300.0, recycle_after=200, idle_timeout=600.0,
+                 session_options=None):
+        self.max_pages = max_pages
+        self.health_interval = health_interval
+        self.recycle_after = recycle_after
+        self.idle_timeout = idle_timeout
+        self.session_options = {"headless": True, **(session_options or {})}
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._session = None
+        self._slots = asyncio.Semaphore(max_pages)
+        self._guard = asyncio.Lock()          # launch / replace / warmup, one at a time
+        self._busy = 0
+        self._uses = 0
+        self._last_used = 0.0
+        self._idle_timer = None
+        self._m = {"launches": 0, "restarts": 0, "idle_closes": 0, "fetches": 0, "failures": 0,
+                   "health_checks": 0}
+
+    # ── public API (any thread) ────────────────────────────────────────────
+
+    def fetch(self, url, **kwargs):
+        """Load ``url`` in a pooled tab; returns scrapling's Response.
+
+        ``kwargs`` are per-page fetch options (``network_idle``, ``wait_selector``,
+        …). Raises TimeoutError after FETCH_TIMEOUT seconds.
+        """
+        return self._submit(self._fetch(url, kwargs), FETCH_TIMEOUT)
+
+    def warmup(self, install=True):
+        """Install Chromium (optional) and launch the browser in the background.
+
+        Returns a concurrent Future; fetches submitted meanwhile wait for it.
+        """
+        return asyncio.run_coroutine_threadsafe(self._warmup(install), self._ensure_loop())
+
+    def close(self, timeout=30.0):
+        """Close the browser (the next fetch relaunches it). No-op if never started."""
+        if self._loop is None:
+            return
+        with suppress(Exception):
+            self._submit(self._close(), timeout)
+
+    def stats(self):
+        """Counters plus whether a browser is running, fetches in progress and the page pool."""
+        session = self._session
+        pool = session.get_pool_stats() if session is not None else {}
+        return {**self._m, "alive": session is not None, "busy": self._busy,
+                "uses": self._uses, "pool": pool}
+
+    # ── loop thread ────────────────────────────────────────────────────────
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.ProactorEventLoop() if sys.platform == "win32" else asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="browser-worker", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _submit(self, coro, timeout):
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise TimeoutError(f"browser worker did not answer within {timeout:g} s")
+
+    async def _fetch(self, url, kwargs):
+        async with self._slots:
+            for attempt in (1, 2):
+                session = await self._ready_session()
+                self._busy += 1
+                try:
+                    page = await session.fetch(url, **kwargs)
+                except Exception as e:
+                    self._m["failures"] += 1
+                    if attempt == 2 or await self._healthy(session):
+                        raise                    # the page failed, not the browser
+                    await self._replace(session, f"fetch failed ({e})")
+                    continue
+                finally:
+                    self._busy -= 1
+                    self._last_used = time.monotonic()
+                    self._arm_idle_timer()
+                self._uses += 1
+                self._m["fetches"] += 1
+                return page
+
+    async def _ready_session(self):
+        """The live session — launched, health-checked or recycled first when needed."""
+        async with self._guard:
+            session = self._session
+            if session is not None and self._busy == 0:
+                if self._uses >= self.recycle_after:
+                    await self._discard(f"recycled after {self._uses} fetches")
+                elif (time.monotonic() - self._last_used >= self.health_interval
+                      and not await self._healthy(session)):
+                    await self._discard("health check failed")
+            if self._session is None:
+                await self._launch()
+            return self._session
+
+    def _arm_idle_timer(self, delay=None):
+        """(Re)schedule the idle close ``idle_timeout`` seconds from now (loop thread)."""
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        if self.idle_timeout is not None and self._session is not None:
+            self._idle_timer = asyncio.get_running_loop().call_later(
+                self.idle_timeout if delay is None else delay,
+                lambda: asyncio.ensure_future(self._close_if_idle()),
+            )
+
+    async def _close_if_idle(self):
+        """Close the session if nothing used it for ``idle_timeout``; else re-arm."""
+        async with self._guard:
+            if self._session is None:
+                return
+            idle = time.monotonic() - self._last_used
+            if self._busy or idle < self.idle_timeout:
+                self._arm_idle_timer(None if self._busy else self.idle_timeout - idle)
+                return
+            session, self._session = self._session, None
+            self._idle_timer = None
+            self._m["idle_closes"] += 1
+            logger.info(f"Closing scraper browser after {idle:.0f} s idle")
+            with suppress(Exception):
+                await session.close()
+
+    async def _healthy(self, session):
+        """Cheap liveness probe: the browser context still answers."""
+        self._m["health_checks"] += 1
+        try:
+            await asyncio.wait_for(session.context.cookies(), HEALTH_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def _launch(self):
+        session = AsyncStealthySession(max_pages=self.max_pages, **self.session_options)
+        await session.start()
+        self._session, self._uses, self._last_used = session, 0, time.monotonic()
+        self._m["launches"] += 1
+        self._arm_idle_timer()
+
+    async def _replace(self, session, reason):
+        """Drop ``session`` unless a concurrent fetch already replaced it."""
+        async with self._guard:
+            if self._session is session:
+                await self._discard(reason)
+
+    async def _discard(self, reason):
+        session, self._session = self._session, None
+        self._m["restarts"] += 1
+        logger.warning(f"Restarting scraper browser: {reason}")
+        with suppress(Exception):
+            await session.close()
+
+    async def _warmup(self, install):
+        try:
+            async with self._guard:
+                if install:
+                    await asyncio.get_running_loop().run_in_executor(None, install_chromium)
+                if self._session is None:
+                    await self._launch()
+        except Exception as e:
+            logger.warning(f"Scraper browser warmup failed (first fetch will retry): {e}")
+
+    async def _close(self):
+        async with self._guard:
+            if self._session is not None:
+                session, self._session = self._session, None
+                with suppress(Exception):
+                    await session.close()
+
+
+# Process-wide instance shared by every session and scraper
+BROWSER = BrowserWorker()
+atexit.register(BROWSER.close, 10.0)
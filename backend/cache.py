@@ -0,0 +1,124 @@
+"""backend/cache.py — Small thread-safe in-process caches (no Streamlit dependency).
+
+st.cache_data memoizes whole function calls per argument tuple; the services in
+backend/ need finer-grained, process-wide caches shared by every section and
+session, with bounded size and visible hit rates. LRUCache provides that, with
+optional per-entry expiry and targeted invalidation.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Size-bounded least-recently-used mapping with hit/miss/eviction counters.
+
+    Safe to share between threads (Streamlit sessions and ThreadPoolExecutor
+    workers). ``compute`` callbacks run outside the lock, so two threads missing
+    the same key at once may both compute it; the last result wins.
+
+    ``ttl`` (seconds) sets a default lifetime for entries; ``put`` can override
+    it per entry. Expired entries count as misses and are dropped on access.
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be >= 1, got {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()      # key → (value, expires_at or None)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def _lookup(self, key):
+        """(value,) for a live entry, else None (drops it if expired). Lock held."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return (entry[0],)
+
+    def get(self, key, default=None):
+        """Return the cached value (marking it most recent) or ``default``."""
+        with self._lock:
+            found = self._lookup(key)
+            if found is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return found[0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, ttl=None):
+        """Insert or replace a value, evicting the least recently used overflow.
+
+        ``ttl`` overrides the cache-wide lifetime for this entry.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """Return the cached value for key, calling ``compute()`` on a miss.
+
+        ``ttl`` may be a number or a callable taking the computed value
+        (e.g. to keep failures briefly and successes for the default lifetime).
+        """
+        with self._lock:
+            found = self._lookup(key)
+            if found is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return found[0]
+            self.misses += 1
+        value = compute()
+        self.put(key, value, ttl=ttl(value) if callable(ttl) else ttl)
+        return value
+
+    def invalidate(self, key):
+        """Drop one entry. Returns True if it was cached."""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def invalidate_where(self, predicate):
+        """Drop every entry for which ``predicate(key, value)`` is true. Returns the count."""
+        with self._lock:
+            doomed = [k for k, (v, _) in self._data.items() if predicate(k, v)]
+            for k in doomed:
+                del self._data[k]
+            return len(doomed)
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """Counters snapshot: hits, misses, evictions, size, maxsize, hit_rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,92 @@
+"""backend/cancellation.py — Cooperative cancellation of superseded JPL work.
+
+When the user changes the date, location or list mid-computation, Streamlit
+reruns the script, but the previous run's pool threads used to work through
+every queued Horizons / SBDB request for results nobody would see, spending
+the shared JPL budget (backend/jpl_client.py). Each summary run now owns a
+``CancelToken``:
+
+- the token is made current in each worker with ``token.run(fn, ...)`` (or
+  ``bind(fn)`` for a callable that should inherit the caller's token) — a
+  ContextVar, so no resolver signature changes;
+- ``check()`` raises ``Cancelled`` once the current token is cancelled.
+  ``jpl_client.call`` checks before every request and again after waiting
+  for a slot, which covers the summary workers, every step of the
+  ``_horizons_query`` fallback chain and the SBDB lookups;
+- a request already on the wire is never interrupted: it completes and is
+  written to the persistent response cache as usual, so finished work is
+  reused by the next run.
+
+``Cancelled`` derives from BaseException (like asyncio.CancelledError): the
+broad ``except Exception`` fallbacks — resolver variants, summary stub rows,
+POSITIONS' failure caching — never swallow it or record it as a failure.
+Work without a current token (scripts, background revalidation) is never
+cancelled.
+"""
+
+import contextlib
+import contextvars
+import functools
+import threading
+
+_current = contextvars.ContextVar("jpl_cancel_token", default=None)
+
+
+class Cancelled(BaseException):
+    """Raised at a checkpoint once the current work has been superseded."""
+
+
+class CancelToken:
+    """One cancellable unit of work (e.g. a summary run), shared by its threads."""
+
+    def __init__(self, label=""):
+        self.label = label
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Raise Cancelled if this token has been cancelled."""
+        if self._event.is_set():
+            raise Cancelled(f"superseded: {self.label}" if self.label else "superseded")
+
+    def wait(self, seconds):
+        """Sleep up to ``seconds``; return True early if cancelled meanwhile."""
+        return self._event.wait(seconds)
+
+    def run(self, fn, *args, **kwargs):
+        """``fn(*args, **kwargs)`` with this token current (e.g. as a pool task)."""
+        with self.scope():
+            return fn(*args, **kwargs)
+
+    @contextlib.contextmanager
+    def scope(self):
+        """Make this token current for the block (not across generator yields)."""
+        reset = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(reset)
+
+
+def current():
+    """The current CancelToken, or None."""
+    return _current.get()
+
+
+def check():
+    """Checkpoint: raise Cancelled if the current token (if any) is cancelled."""
+    token = _current.get()
+    if token is not None:
+        token.check()
+
+
+def bind(fn):
+    """``fn`` wrapped to run under the caller's current token (for pool threads)."""
+    token = _current.get()
+    return fn if token is None else functools.partial(token.run, fn)
@@ -0,0 +1,189 @@
+"""backend/chebyshev.py — Piecewise Chebyshev ephemerides for long planning horizons.
+
+The daily ephemeris store (backend/ephemeris.py) covers 30 days; any later
+date fell back to a live Horizons query. The update script now also fetches
+``LONG_HORIZON_DAYS`` of daily samples per watchlist object and compresses
+them the way SPK type-2 segments do: the span is cut into contiguous
+segments (``SEGMENT_DAYS`` long, halved where a fit misses ``TOLERANCE_ARCSEC``)
+and each segment stores one Chebyshev series per component —
+
+- x, y, z of the geocentric unit vector (no RA wraparound, exact at the poles);
+- vmag, fitted only to samples that have one (NaN series when too few).
+
+A fit never uses more than half as many coefficients as it has samples, so
+the residual at the samples is a real check rather than an interpolation.
+The worst residual per object is kept in the index (``max_error_arcsec``).
+
+``write_chebyshev`` packs every segment into one ``.npy`` (``CHEB_DTYPE``:
+jd0, jd1, coef[4, DEGREE + 1]) plus an ``.index.json`` with per-object
+(offset, count) and fit metadata; ``load_chebyshev`` memory-maps it.
+``evaluate`` answers any array of instants with one segment lookup and one
+Clenshaw pass — a few microseconds per object, no network.
+"""
+
+import json
+
+import numpy as np
+from numpy.polynomial import chebyshev as C
+
+from backend.ephemeris import _atomic_write, index_path_for
+
+DEGREE = 12               # highest series degree stored per segment
+SEGMENT_DAYS = 32.0       # initial segment length
+MIN_SEGMENT_DAYS = 2.0    # segments are not split below this
+TOLERANCE_ARCSEC = 1.0    # target worst residual at the fitted samples
+CHEB_FORMAT = 1
+CHEB_DTYPE = np.dtype([("jd0", "<f8"), ("jd1", "<f8"), ("coef", "<f8", (4, DEGREE + 1))])
+_ARCSEC = np.radians(1.0 / 3600.0)
+
+
+def _unit_vectors(ra, dec):
+    ra, dec = np.radians(ra), np.radians(dec)
+    return np.stack([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)])
+
+
+def _fit_window(jd, xyz, vmag, a, b, degree):
+    """One segment over [a, b] → (record, worst residual in arcsec)."""
+    x = (2.0 * jd - a - b) / (b - a)
+    deg = min(degree, max(1, (len(jd) - 1) // 2))
+    rec = np.zeros((), dtype=CHEB_DTYPE)
+    rec["jd0"], rec["jd1"] = a, b
+    rec["coef"][:3, :deg + 1] = C.chebfit(x, xyz.T, deg).T
+    fitted = C.chebval(x, rec["coef"][:3, :deg + 1].T)              # (3, n)
+    fitted /= np.linalg.norm(fitted, axis=0)
+    err = np.arccos(np.clip(np.sum(fitted * xyz, axis=0), -1.0, 1.0)).max() / _ARCSEC
+
+    known = np.isfinite(vmag)
+    vdeg = min(deg, (int(known.sum()) - 1) // 2)
+    if vdeg >= 0 and known.sum() >= 2:
+        rec["coef"][3, :vdeg + 1] = C.chebfit(x[known], vmag[known], vdeg)
+    else:
+        rec["coef"][3] = np.nan
+    return rec, float(err)
+
+
+def fit_segments(jd, ra, dec, vmag, segment_days=SEGMENT_DAYS, degree=DEGREE,
+                 tolerance_arcsec=TOLERANCE_ARCSEC, min_segment_days=MIN_SEGMENT_DAYS):
+    """Daily (jd, ra, dec, vmag) samples → (CHEB_DTYPE segments, worst residual arcsec).
+
+    Segments tile [jd[0], jd[-1]] without gaps and share their boundary
+    samples. Returns (empty array, 0.0) for fewer than 2 samples.
+    """
+    jd, ra, dec, vmag = (np.asarray(c, dtype=float) for c in (jd, ra, dec, vmag))
+    if len(jd) < 2:
+        return np.empty(0, dtype=CHEB_DTYPE), 0.0
+    if degree > DEGREE:
+        raise ValueError(f"degree {degree} exceeds the stored {DEGREE}")
+    order = np.argsort(jd)
+    jd, xyz, vmag = jd[order], _unit_vectors(ra[order], dec[order]), vmag[order]
+
+    # Segment edges sit on samples, so every segment is pinned at both ends
+    segments, worst = [], 0.0
+    count = int(np.ceil((jd[-1] - jd[0]) / segment_days - 1e-9))
+    edges = np.unique(np.round(np.linspace(0, len(jd) - 1, count + 1)).astype(int))
+    stack = list(zip(edges[:-1], edges[1:]))[::-1]
+    while stack:
+        i0, i1 = stack.pop()
+        rec, err = _fit_window(jd[i0:i1 + 1], xyz[:, i0:i1 + 1], vmag[i0:i1 + 1], jd[i0], jd[i1], degree)
+        mid = (i0 + i1) // 2
+        if err > tolerance_arcsec and i1 - i0 >= 4 and jd[i1] - jd[i0] >= 2 * min_segment_days:
+            stack.extend([(mid, i1), (i0, mid)])              # left half first
+            continue
+        segments.append(rec)
+        worst = max(worst, err)
+    return np.array(segments, dtype=CHEB_DTYPE), worst
+
+
+def evaluate(segments, jd):
+    """(ra_deg, dec_deg, vmag) arrays at JD array ``jd`` (all inside the segments' span)."""
+    jd = np.asarray(jd, dtype=float)
+    i = np.clip(np.searchsorted(segments["jd0"], jd, side="right") - 1, 0, len(segments) - 1)
+    jd0, jd1 = segments["jd0"][i], segments["jd1"][i]
+    x = (2.0 * jd - jd0 - jd1) / (jd1 - jd0)
+    coef = np.transpose(segments["coef"][i], (2, 1, 0))        # (DEGREE + 1, 4, n)
+    val = C.chebval(x, coef, tensor=False)                     # (4, n)
+    xyz = val[:3] / np.linalg.norm(val[:3], axis=0)
+    ra = np.degrees(np.arctan2(xyz[1], xyz[0])) % 360.0
+    dec = np.degrees(np.arcsin(np.clip(xyz[2], -1.0, 1.0)))
+    return ra, dec, val[3]
+
+
+# ── Store ────────────────────────────────────────────────────────────────────
+
+def write_chebyshev(fits, npy_path, meta=None):
+    """Write {section: {name: {"segments", "fitted_utc", "id", "max_error_arcsec"}}}.
+
+    Both files are written atomically (array first). Returns the index dict.
+    """
+    chunks, objects, info, offset = [], {}, {}, 0
+    for section in ("comets", "asteroids"):
+        objects[section], info[section] = {}, {}
+        for name, fit in (fits.get(section) or {}).items():
+            segs = np.asarray(fit["segments"], dtype=CHEB_DTYPE)
+            chunks.append(segs)
+            objects[section][name] = [offset, len(segs)]
+            info[section][name] = {k: fit[k] for k in ("fitted_utc", "id", "max_error_arcsec") if k in fit}
+            offset += len(segs)
+    data = np.concatenate(chunks) if chunks else np.empty(0, dtype=CHEB_DTYPE)
+    index = {"format": CHEB_FORMAT, "degree": DEGREE, "rows": int(len(data)),
+             "objects": objects, "fits": info, **(meta or {})}
+    _atomic_write(npy_path, lambda f: np.save(f, data))
+    _atomic_write(index_path_for(npy_path),
+                  lambda f: f.write(json.dumps(index, indent=1, ensure_ascii=False).encode("utf-8")))
+    return index
+
+
+class ChebyshevStore:
+    """Memory-mapped segment store (see write_chebyshev)."""
+
+    def __init__(self, data, index):
+        self.data = data
+        self.index = index
+
+    def names(self, section):
+        return list(self.index["objects"].get(section, {}))
+
+    def segments(self, section, name):
+        """CHEB_DTYPE view for one object, or None if not stored."""
+        loc = self.index["objects"].get(section, {}).get(name)
+        if not loc or not loc[1]:
+            return None
+        return self.data[loc[0]:loc[0] + loc[1]]
+
+    def fit_info(self, section, name):
+        """{"fitted_utc", "id", "max_error_arcsec"} for one object ({} if unknown)."""
+        return self.index.get("fits", {}).get(section, {}).get(name, {})
+
+    def span(self, section, name):
+        """(first_jd, last_jd) covered for an object, or None."""
+        segs = self.segments(section, name)
+        return None if segs is None else (float(segs["jd0"][0]), float(segs["jd1"][-1]))
+
+    def positions(self, section, name, jd):
+        """(ra_deg, dec_deg, vmag) arrays at JD array ``jd``, or None if any is outside the span."""
+        segs = self.segments(section, name)
+        jd = np.atleast_1d(np.asarray(jd, dtype=float))
+        if segs is None or len(jd) == 0 or jd.min() < segs["jd0"][0] or jd.max() > segs["jd1"][-1]:
+            return None
+        return evaluate(segs, jd)
+
+    def to_fits(self):
+        """Inverse of write_chebyshev's ``fits`` argument (segments copied out of the memmap)."""
+        return {section: {name: {"segments": np.array(self.segments(section, name)),
+                                 **self.fit_info(section, name)}
+                          for name in self.names(section)}
+                for section in ("comets", "asteroids")}
+
+
+def load_chebyshev(npy_path):
+    """Open a Chebyshev store with mmap, or None if missing, corrupt or inconsistent."""
+    try:
+        with open(index_path_for(npy_path), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        data = np.load(npy_path, mmap_mode="r")
+    except Exception:
+        return None
+    if (index.get("format") != CHEB_FORMAT or data.dtype != CHEB_DTYPE
+            or len(data) != index.get("rows")):
+        return None
+    return ChebyshevStore(data, index)
@@ -2,6 +2,7 @@
 """Pure file I/O for YAML/JSON config files — no Streamlit dependency."""
 
 import os
+import threading
 import yaml
 import json
 
@@ -93,12 +94,35 @@ def read_jpl_cache(path):
 
 
 def write_jpl_cache(path, data):
-    """Write jpl_id_cache.json. Silently ignores write errors (non-fatal)."""
+    """Write jpl_id_cache.json atomically (temp file + rename, so a reader never
+    sees half a file). Silently ignores write errors (non-fatal)."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        with open(path, "w", encoding="utf-8") as f:
+        with open(tmp, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp, path)
     except Exception:
         pass
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+_JPL_CACHE_LOCK = threading.Lock()
+
+
+def update_jpl_cache(path, section, entries):
+    """Merge {name: jpl_id} into one section of jpl_id_cache.json in a single write.
+
+    The read-modify-write is serialized within the process, so concurrent
+    summaries never drop each other's entries. No-op for empty ``entries``.
+    """
+    if not entries:
+        return
+    with _JPL_CACHE_LOCK:
+        cache = read_jpl_cache(path)
+        cache.setdefault(section, {}).update(entries)
+        write_jpl_cache(path, cache)
 
 
 def read_ephemeris_cache(path):
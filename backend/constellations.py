@@ -0,0 +1,193 @@
+"""backend/constellations.py — Precomputed IAU constellation lookup.
+
+astropy's ``get_constellation`` transforms every call to a B1875 frame and then
+scans the 357 Delporte boundary segments (Roman 1987) one mask at a time, so
+calling it per object or per trajectory step costs ~8 ms each.
+
+The boundaries are axis-aligned in B1875 RA/Dec, so the sky can be cut into a
+grid at every distinct boundary RA and Dec, with exactly one constellation per
+cell. That grid is built once from the same data file astropy ships, cached on
+disk (``constellation_index.npz``) and answered with two ``searchsorted`` calls:
+
+    ICRS RA/Dec → J2000 annual aberration → precess to B1875 (IAU 1976)
+    → (Dec row, RA column) → constellation index
+
+Parity
+------
+The closed-form B1875 position is within ~5" of astropy's PrecessedGeocentric
+frame, so only targets that close to a boundary line can get a different
+answer than ``SkyCoord.get_constellation``.
+"""
+
+import os
+
+import numpy as np
+
+from backend import fastsky
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "constellation_index.npz")
+
+# Bump when the on-disk layout changes; stale files are rebuilt automatically.
+_INDEX_VERSION = 1
+
+_JD_B1875 = 2405889.258550475
+
+_index = {}
+
+
+def _boundary_table():
+    """Read astropy's Roman (1987) boundary table and IAU names.
+
+    Returns (ral_hours, rau_hours, decl_deg, short_names, short→long dict),
+    rows in file order (first match wins, as in get_constellation).
+    """
+    from astropy.utils import data
+
+    ral, rau, decl, names = [], [], [], []
+    cdata = data.get_pkg_data_contents("data/constellation_data_roman87.dat", package="astropy.coordinates")
+    for line in cdata.splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        lo, hi, dec, name = line.split()
+        ral.append(float(lo))
+        rau.append(float(hi))
+        decl.append(float(dec))
+        names.append(name)
+    cnames = data.get_pkg_data_contents("data/constellation_names.dat", package="astropy.coordinates",
+                                        encoding="UTF8")
+    long_names = {l[:3]: l[4:] for l in cnames.splitlines() if l and not l.startswith("#")}
+    return np.array(ral), np.array(rau), np.array(decl), names, long_names
+
+
+def _earth_velocity_j2000():
+    """Earth's barycentric velocity at J2000 as a fraction of c (xyz, ICRS)."""
+    from astropy import units as u
+    from astropy.coordinates import get_body_barycentric_posvel
+    from astropy.time import Time
+
+    _, vel = get_body_barycentric_posvel("earth", Time("J2000"))
+    return vel.xyz.to_value(u.km / u.s) / 299792.458
+
+
+def build_index():
+    """Build the lookup grid from the boundary table.
+
+    Returns a dict of NumPy arrays: ra_edges (hours), dec_edges (deg),
+    cells (n_dec × n_ra indices into short/long), short, long, beta.
+    """
+    import astropy
+
+    ral, rau, decl, names, long_names = _boundary_table()
+    ra_edges = np.unique(np.concatenate([ral, rau, [0.0, 24.0]]))
+    dec_edges = np.unique(np.concatenate([decl, [-90.0, 90.0]]))
+    ra_mid = (ra_edges[:-1] + ra_edges[1:]) / 2
+    dec_mid = (dec_edges[:-1] + dec_edges[1:]) / 2
+
+    short = sorted(set(names))
+    code = {n: i for i, n in enumerate(short)}
+    cells = np.full((len(dec_mid), len(ra_mid)), -1, dtype=np.int16)
+    # Same first-match rule as get_constellation: walk the table backwards so
+    # earlier rows overwrite later ones.
+    for i in range(len(names) - 1, -1, -1):
+        ra_in = (ral[i] < ra_mid) & (ra_mid < rau[i])
+        dec_in = dec_mid > decl[i]
+        cells[np.ix_(dec_in, ra_in)] = code[names[i]]
+    return {
+        "version": np.array(_INDEX_VERSION),
+        "astropy": np.array(astropy.__version__),
+        "ra_edges": ra_edges,
+        "dec_edges": dec_edges,
+        "cells": cells,
+        "short": np.array(short),
+        "long": np.array([long_names[n] for n in short]),
+        "beta": _earth_velocity_j2000(),
+    }
+
+
+def _read_index(path):
+    """Load a cached index, or None if missing, corrupt or built by another astropy."""
+    import astropy
+
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as f:
+            idx = {k: f[k] for k in f.files}
+        if int(idx["version"]) != _INDEX_VERSION or str(idx["astropy"]) != astropy.__version__:
+            return None
+        return idx
+    except Exception:
+        return None
+
+
+def _write_index(path, idx):
+    """Write the index atomically. Silently ignores write errors (non-fatal)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            np.savez(f, **idx)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def load_index(path=DEFAULT_INDEX_PATH):
+    """Return the lookup index: memory → disk cache → rebuilt from astropy data."""
+    idx = _index.get(path)
+    if idx is None:
+        idx = _read_index(path)
+        if idx is None:
+            idx = build_index()
+            _write_index(path, idx)
+        _index[path] = idx
+    return idx
+
+
+def to_b1875(ra_deg, dec_deg, beta):
+    """ICRS RA/Dec (degrees) → B1875 mean RA (hours) and Dec (degrees).
+
+    Applies annual aberration for an observer at J2000 (what astropy's
+    PrecessedGeocentric frame does at its default obstime) and IAU 1976
+    precession back to B1875.
+    """
+    ra = np.radians(ra_deg)
+    dec = np.radians(dec_deg)
+    xyz = np.stack([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)])
+    xyz = xyz + np.reshape(beta, (3,) + (1,) * (xyz.ndim - 1))
+    xyz /= np.linalg.norm(xyz, axis=0)
+    ra_a = np.degrees(np.arctan2(xyz[1], xyz[0]))
+    dec_a = np.degrees(np.arcsin(np.clip(xyz[2], -1.0, 1.0)))
+    ra_b, dec_b = fastsky.precess_from_j2000(ra_a, dec_a, _JD_B1875)
+    return ra_b / 15.0, dec_b
+
+
+def constellation_names(ra_deg, dec_deg, short_name=True, index=None):
+    """Constellation of each ICRS RA/Dec (degrees), vectorized.
+
+    Args:
+        ra_deg, dec_deg: Scalars or arrays (broadcast together).
+        short_name:      IAU abbreviation ("UMa") when True, full name
+                         ("Ursa Major") otherwise — same as get_constellation.
+        index:           Optional index from load_index(); defaults to the
+                         cached one.
+
+    Returns:
+        A str for scalar input, otherwise an array of str with the broadcast
+        shape. Non-finite coordinates give "".
+    """
+    idx = load_index() if index is None else index
+    ra, dec = np.broadcast_arrays(np.asarray(ra_deg, dtype=float), np.asarray(dec_deg, dtype=float))
+    valid = np.isfinite(ra) & np.isfinite(dec)
+    rah, decd = to_b1875(np.where(valid, ra, 0.0), np.where(valid, dec, 0.0), idx["beta"])
+
+    ra_edges, dec_edges, cells = idx["ra_edges"], idx["dec_edges"], idx["cells"]
+    col = np.clip(np.searchsorted(ra_edges, rah, side="right") - 1, 0, cells.shape[1] - 1)
+    # Boundaries are "Dec > decl", so a point exactly on a Dec edge belongs to the cell below it
+    row = np.clip(np.searchsorted(dec_edges, decd, side="left") - 1, 0, cells.shape[0] - 1)
+    names = idx["short"] if short_name else idx["long"]
+    out = np.where(valid, names[cells[row, col]], "")
+    return str(out) if out.ndim == 0 else out.astype(str)
@@ -3,14 +3,14 @@ from astropy.time import Time
 from astropy import units as u
 import pytz
 import math
+import numpy as np
+import pandas as pd
 from datetime import timedelta
 
-try:
-    from astropy.coordinates import get_moon as _get_moon
-except ImportError:
-    from astropy.coordinates import get_body
-    def _get_moon(time, location=None, ephemeris=None):
-        return get_body("moon", time, location, ephemeris=ephemeris)
+from backend import fastsky
+from backend.constellations import constellation_names
+
+from backend.moonsun import MOON_SUN
 
 
 def moon_sep_deg(target_coord, moon_coord):
@@ -31,48 +31,89 @@ def azimuth_to_compass(az):
     ix = int((az + 11.25) / 22.5) % 16
     return directions[ix]
 
-def compute_trajectory(sky_coord, location, start_time_local, duration_minutes=240, step_minutes=10, ephemeris_coords=None):
-    """Computes the AltAz trajectory of a target."""
-    results = []
+def _as_coord_array(ephemeris_coords, sky_coord, n_steps):
+    """Merge an ephemeris (list of SkyCoords or array-valued SkyCoord) into one
+    array-valued SkyCoord of length n_steps.
+
+    Steps past the end of the ephemeris fall back to the fixed sky_coord,
+    matching the per-step behaviour of the original loop.
+    """
+    if isinstance(ephemeris_coords, SkyCoord) and not ephemeris_coords.isscalar:
+        coords = ephemeris_coords[:n_steps]
+        if len(coords) == n_steps:
+            return coords
+        coords = [coords[i] for i in range(len(coords))]
+    else:
+        coords = list(ephemeris_coords[:n_steps])
+    coords += [sky_coord] * (n_steps - len(coords))
+    return SkyCoord(coords)
+
+
+def compute_trajectory(sky_coord, location, start_time_local, duration_minutes=240, step_minutes=10,
+                       ephemeris_coords=None, as_dataframe=False, engine="astropy", moon_ephemeris=None):
+    """Computes the AltAz trajectory of a target.
+
+    All time steps are evaluated in one batch: a single array-valued Time/AltAz
+    frame, one transform_to call for the target (or the whole ephemeris array),
+    one constellation-index lookup and one interpolated read of the shared
+    per-night Moon grid (backend/moonsun.py; pass moon_ephemeris to use another
+    MoonSunEphemeris) for every step.
+
+    engine="fast" computes Alt/Az with the closed-form kernel in
+    backend/fastsky.py instead (planning-grade, ~0.01° from astropy).
+
+    Returns a list of row dicts, or a DataFrame with the same columns when
+    as_dataframe=True.
+    """
+    fastsky.check_engine(engine)
     time_steps = [start_time_local + timedelta(minutes=i) for i in range(0, duration_minutes + 1, step_minutes)]
-    
-    # If no dynamic ephemeris provided, use the fixed sky_coord for all steps
-    constellation = ""
-    if not ephemeris_coords:
-        constellation = sky_coord.get_constellation()
-
-    for i, t in enumerate(time_steps):
-        # Determine target coordinate for this specific time step
-        if ephemeris_coords and i < len(ephemeris_coords):
-            target_coord = ephemeris_coords[i]
-            # Update constellation for moving objects (though it changes slowly)
-            constellation = target_coord.get_constellation()
-        else:
-            target_coord = sky_coord
-
-        t_utc = t.astimezone(pytz.utc)
-        time_utc = Time(t_utc)
-        altaz_frame = AltAz(obstime=time_utc, location=location)
-        altaz = target_coord.transform_to(altaz_frame)
-        compass_dir = azimuth_to_compass(altaz.az.degree)
-
-        try:
-            moon_sky = _get_moon(time_utc, location)
-            moon_sep_val = round(moon_sep_deg(target_coord, moon_sky), 1)
-        except Exception:
-            moon_sep_val = None
-
-        results.append({
-            "Local Time": t.strftime('%Y-%m-%d %H:%M:%S'),
-            "RA": target_coord.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True),
-            "Dec": target_coord.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True),
-            "Azimuth (°)": round(altaz.az.degree, 2),
-            "Altitude (°)": round(altaz.alt.degree, 2),
-            "Direction": compass_dir,
-            "Constellation": constellation,
-            "Moon Sep (°)": moon_sep_val,
-        })
-    return results
+    n_steps = len(time_steps)
+    times_utc = Time([t.astimezone(pytz.utc) for t in time_steps])
+
+    n_ephem = len(ephemeris_coords) if ephemeris_coords is not None else 0
+    if n_ephem:
+        target_coord = _as_coord_array(ephemeris_coords, sky_coord, n_steps)
+        icrs = target_coord[:min(n_ephem, n_steps)].icrs
+        constellations = list(constellation_names(icrs.ra.deg, icrs.dec.deg, short_name=False))
+        # Steps past the end of the ephemeris keep the last moving-object constellation
+        constellations += [constellations[-1]] * (n_steps - len(constellations))
+        ra_strs = target_coord.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True)
+        dec_strs = target_coord.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True)
+    else:
+        target_coord = sky_coord
+        icrs = sky_coord.icrs
+        constellations = [constellation_names(icrs.ra.deg, icrs.dec.deg, short_name=False)] * n_steps
+        ra_strs = [sky_coord.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True)] * n_steps
+        dec_strs = [sky_coord.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True)] * n_steps
+
+    if engine == "fast":
+        icrs = target_coord.icrs
+        alt_deg, az_deg = fastsky.altaz(icrs.ra.deg, icrs.dec.deg, location, time_steps, grid=not n_ephem)
+    else:
+        altaz = target_coord.transform_to(AltAz(obstime=times_utc, location=location))
+        az_deg = altaz.az.degree
+        alt_deg = altaz.alt.degree
+
+    try:
+        moon_sky = (moon_ephemeris or MOON_SUN).moon(location, times_utc)
+        moon_seps = [round(float(v), 1) for v in moon_sep_deg(target_coord, moon_sky)]
+    except Exception:
+        moon_seps = [None] * n_steps
+
+    columns = {
+        "Local Time": [t.strftime('%Y-%m-%d %H:%M:%S') for t in time_steps],
+        "RA": [str(v) for v in ra_strs],
+        "Dec": [str(v) for v in dec_strs],
+        "Azimuth (°)": [round(float(v), 2) for v in az_deg],
+        "Altitude (°)": [round(float(v), 2) for v in alt_deg],
+        "Direction": [azimuth_to_compass(float(v)) for v in az_deg],
+        "Constellation": [str(v) for v in constellations],
+        "Moon Sep (°)": moon_seps,
+    }
+    if as_dataframe:
+        return pd.DataFrame(columns)
+    keys = list(columns)
+    return [dict(zip(keys, vals)) for vals in zip(*columns.values())]
 
 def calculate_planning_info(sky_coord, location, start_time):
     """
@@ -83,7 +124,8 @@ def calculate_planning_info(sky_coord, location, start_time):
     astro_time = Time(t_utc)
     
     # 2. Constellation
-    constellation = sky_coord.get_constellation(short_name=True)
+    icrs = sky_coord.icrs
+    constellation = constellation_names(icrs.ra.deg, icrs.dec.deg)
 
     # 3. Rise/Set/Transit Approximation
     # Calculate Local Sidereal Time (LST)
@@ -169,11 +211,173 @@ def calculate_planning_info(sky_coord, location, start_time):
     }
 
 
-def compute_peak_alt_in_window(ra_deg, dec_deg, location, win_start_dt, win_end_dt, n_steps=None):
+PLANNING_COLUMNS = ["Constellation", "Transit", "Rise", "Set", "Status",
+                    "_rise_datetime", "_set_datetime", "_transit_datetime"]
+_DAY_US = 86400e6       # one day in microseconds
+
+
+def _format_wall_times(values, suffix):
+    """``strftime("%m-%d %H:%M <suffix>")`` for an array of naive datetime64, in C.
+
+    pandas' strftime runs Python per element for custom formats; slicing
+    numpy's ISO strings ("YYYY-MM-DDTHH:MM") is ~100× faster. NaT rows come
+    out as garbage and must be overwritten by the caller.
+    """
+    iso = np.datetime_as_string(np.asarray(values, dtype="datetime64[us]"), unit="m").astype("U16")
+    chars = iso.view("U1").reshape(-1, 16)[:, 5:16].copy()
+    chars[:, 5] = " "
+    return np.char.add(chars.view("U11").ravel(), f" {suffix}").astype(object)
+
+
+def calculate_planning_info_batch(ra_deg, dec_deg, location, start_time):
+    """Vectorized calculate_planning_info for whole target catalogs.
+
+    Local sidereal time is computed once; transit offsets, semi-diurnal arcs
+    and circumpolar / never-rises status are array math over all targets, and
+    constellations come from one constellation-index lookup. Rise/set/transit
+    datetimes are one pandas offset array per column (rounded to microseconds
+    like ``timedelta``) and strings are sliced from numpy's ISO formatting, so
+    values and formatted strings match the scalar version row for row.
+
+    Parameters
+    ----------
+    ra_deg, dec_deg : array-like
+        ICRS coordinates in decimal degrees. Non-finite rows get Status "Error".
+    location : EarthLocation
+    start_time : datetime (tz-aware)
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per target with the PLANNING_COLUMNS of calculate_planning_info.
+    """
+    ra = np.atleast_1d(np.asarray(ra_deg, dtype=float))
+    dec = np.atleast_1d(np.asarray(dec_deg, dtype=float))
+    n = len(ra)
+    valid = np.isfinite(ra) & np.isfinite(dec)
+
+    lst_ha = Time(start_time.astimezone(pytz.utc)).sidereal_time('mean', longitude=location.lon).hour
+    ra_ha = (ra * u.deg).to_value(u.hourangle)
+    diff_hours = np.mod(ra_ha - lst_ha, 24)
+    diff_hours = np.where(diff_hours > 12, diff_hours - 24, diff_hours)
+
+    lat_rad = location.lat.rad
+    dec_rad = np.radians(dec)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cos_h = (math.sin(-0.01) - math.sin(lat_rad) * np.sin(dec_rad)) / (math.cos(lat_rad) * np.cos(dec_rad))
+        h_hours = np.degrees(np.arccos(np.clip(cos_h, -1.0, 1.0))) / 15.0
+    circumpolar = valid & (cos_h < -1)
+    never = valid & (cos_h > 1)
+
+    constellations = np.full(n, "", dtype=object)
+    if valid.any():
+        constellations[valid] = constellation_names(ra[valid], dec[valid])
+
+    # Offsets from start_time in whole microseconds, rounded like timedelta(hours=...)
+    visible = valid & ~circumpolar & ~never
+    transit_us = np.round(np.where(valid, diff_hours, 0.0) * 3.6e9)
+    h_us = np.round(np.where(visible, h_hours, 0.0) * 3.6e9)
+    # If the event has already finished before the start time, show the next cycle
+    transit_us = transit_us + np.where(visible & (transit_us + h_us < 0), _DAY_US, 0.0)
+    rise_us = np.where(visible, transit_us - h_us, np.where(circumpolar, 0.0, np.nan))
+    set_us = np.where(visible, transit_us + h_us, np.where(circumpolar, _DAY_US, np.nan))
+    transit_us = np.where(valid, transit_us, np.nan)
+
+    # Datetimes are instants (as start_time + timedelta); strings use start_time's own
+    # wall clock and zone abbreviation throughout, like the scalar version's arithmetic.
+    start = pd.Timestamp(start_time)
+    wall = start.tz_localize(None)
+    tz_str = start_time.strftime("%Z")
+    cols = {"Constellation": constellations.astype(str)}
+    for col, offsets in (("Rise", rise_us), ("Set", set_us), ("Transit", transit_us)):
+        delta = pd.to_timedelta(offsets, unit="us")
+        cols[f"_{col.lower()}_datetime"] = start + delta
+        cols[col] = _format_wall_times((wall + delta).to_numpy(), tz_str)
+    for col in ("Rise", "Set"):
+        cols[col][circumpolar] = "Always Up"
+        cols[col][never] = "---"
+    for col in ("Rise", "Set", "Transit"):
+        cols[col][~valid] = "---"
+    cols["Status"] = np.select([~valid, circumpolar, never], ["Error", "Always Up (Circumpolar)", "Never Rises"],
+                               default="Visible").astype(object)
+    return pd.DataFrame(cols, columns=PLANNING_COLUMNS)
+
+
+# Sidereal rotation rate (degrees of hour angle per SI second)
+_SIDEREAL_DEG_PER_SEC = 360.98564736629 / 86400.0
+
+PEAK_ALT_METHODS = ("analytic", "sampled")
+
+
+def compute_peak_alt_batch(ra_deg, dec_deg, location, win_start_dt, win_end_dt, engine="astropy"):
+    """Exact peak altitude of fixed RA/Dec targets during a window, vectorized.
+
+    For a fixed target, altitude depends only on hour angle and is maximal at
+    upper transit (HA = 0). So the peak inside [start, end] is at transit when
+    transit falls inside the window, otherwise at one of the endpoints — at
+    most three candidate times per target, no sampling.
+
+    The hour angle at window start (and hence the transit time) comes from
+    backend/fastsky.py. engine="astropy" then evaluates the three candidate
+    times per target in one array AltAz transform; engine="fast" evaluates
+    them in closed form.
+
+    Parameters
+    ----------
+    ra_deg, dec_deg : array-like
+        ICRS coordinates in decimal degrees (NaN allowed → NaN peak).
+    location : EarthLocation
+    win_start_dt, win_end_dt : datetime (tz-aware)
+
+    Returns
+    -------
+    numpy.ndarray
+        Peak altitude in degrees per target.
+    """
+    fastsky.check_engine(engine)
+    ra = np.atleast_1d(np.asarray(ra_deg, dtype=float))
+    dec = np.atleast_1d(np.asarray(dec_deg, dtype=float))
+    ra, dec = np.broadcast_arrays(ra, dec)
+    valid = np.isfinite(ra) & np.isfinite(dec)
+    peaks = np.full(ra.shape, np.nan)
+    if not valid.any():
+        return peaks
+    ra, dec = ra[valid], dec[valid]
+
+    window_secs = max((win_end_dt - win_start_dt).total_seconds(), 0.0)
+    lat, lon = location.lat.deg, location.lon.deg
+    jd0 = fastsky.julian_date(win_start_dt)
+    ra_d, dec_d = fastsky.precess_from_j2000(ra, dec, jd0 + window_secs / 172800.0)
+    ha0 = fastsky.hour_angle_deg(ra_d, fastsky.lst_deg(jd0, lon))
+    secs_to_transit = np.mod(-ha0, 360.0) / _SIDEREAL_DEG_PER_SEC
+    transit_in_window = secs_to_transit <= window_secs
+
+    if engine == "fast":
+        ha_candidates = np.stack([ha0, ha0 + window_secs * _SIDEREAL_DEG_PER_SEC, np.zeros_like(ha0)], axis=-1)
+        alts, _ = fastsky.hadec_to_altaz(ha_candidates, dec_d[:, None], lat)
+    else:
+        offsets = np.stack([
+            np.zeros_like(ha0),
+            np.full_like(ha0, window_secs),
+            np.where(transit_in_window, secs_to_transit, 0.0),
+        ], axis=-1)
+        t0 = Time(win_start_dt.astimezone(pytz.utc).replace(tzinfo=None), scale='utc')
+        sc = SkyCoord(ra=ra[:, None] * u.deg, dec=dec[:, None] * u.deg, frame='icrs')
+        alts = sc.transform_to(AltAz(obstime=t0 + offsets * u.s, location=location)).alt.deg
+
+    alts[:, 2] = np.where(transit_in_window, alts[:, 2], -np.inf)
+    peaks[valid] = alts.max(axis=1)
+    return peaks
+
+
+def compute_peak_alt_in_window(ra_deg, dec_deg, location, win_start_dt, win_end_dt, n_steps=None,
+                               engine="astropy", method="analytic"):
     """Return the peak altitude (degrees) of an object during an observation window.
 
-    Samples altitude at uniform intervals across the window. n_steps defaults
-    to one sample per 30 minutes, minimum 2.
+    method="analytic" (default) returns the exact peak for a fixed RA/Dec via
+    compute_peak_alt_batch (transit or window endpoint). method="sampled"
+    samples altitude at uniform intervals across the window — the fallback
+    for moving targets; n_steps defaults to one sample per 30 minutes, min 2.
 
     Parameters
     ----------
@@ -183,20 +387,37 @@ def compute_peak_alt_in_window(ra_deg, dec_deg, location, win_start_dt, win_end_
     win_start_dt, win_end_dt : datetime (tz-aware)
         Start and end of the observation window.
     n_steps : int | None
-        Number of altitude samples. Auto-computed from window duration if None
-        (one per 30 min, minimum 2). Passing n_steps=1 explicitly samples only
-        the window start.
+        Number of altitude samples (method="sampled" only). Auto-computed from
+        window duration if None (one per 30 min, minimum 2). Passing n_steps=1
+        explicitly samples only the window start.
+    engine : "astropy" | "fast"
+        "fast" evaluates the candidate/sample times with backend/fastsky.py.
+    method : "analytic" | "sampled"
 
     Returns
     -------
     float
         Peak altitude in degrees. Can be negative if always below horizon.
     """
-    sc = SkyCoord(ra=ra_deg * u.deg, dec=dec_deg * u.deg, frame='icrs')
+    fastsky.check_engine(engine)
+    if method not in PEAK_ALT_METHODS:
+        raise ValueError(f"method must be one of {PEAK_ALT_METHODS}, got {method!r}")
+    if method == "analytic":
+        return float(compute_peak_alt_batch(ra_deg, dec_deg, location, win_start_dt, win_end_dt,
+                                            engine=engine)[0])
+
     window_secs = (win_end_dt - win_start_dt).total_seconds()
     if n_steps is None:
         n_steps = max(2, int(window_secs / 1800) + 1)  # one per 30 min, min 2
 
+    if engine == "fast":
+        samples = [win_start_dt + timedelta(seconds=i / max(n_steps - 1, 1) * window_secs)
+                   for i in range(n_steps)]
+        alt, _ = fastsky.altaz(ra_deg, dec_deg, location, samples)
+        return float(alt.max())
+
+    sc = SkyCoord(ra=ra_deg * u.deg, dec=dec_deg * u.deg, frame='icrs')
+
     peak = -90.0
     for i in range(n_steps):
         frac = i / max(n_steps - 1, 1)
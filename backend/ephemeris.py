@@ -0,0 +1,355 @@
+"""backend/ephemeris.py — Interpolating reader for the pre-computed ephemeris cache.
+
+``ephemeris_cache.json`` (written daily by scripts/update_ephemeris_cache.py)
+holds one geocentric RA/Dec/vmag sample per day per watchlist object. The old
+lookup matched a ``YYYY-MM-DD`` string and returned that day's 00:00 UTC
+position for any time of day — degrees off for fast-moving NEAs — and every
+trajectory still went to JPL Horizons.
+
+``EphemerisReader`` turns each object's samples into NumPy arrays indexed by
+Julian Date (O(1) segment lookup on the uniform daily grid, ``searchsorted``
+otherwise) and interpolates any instant with a cubic Hermite spline:
+
+- RA/Dec on Cartesian unit vectors, so RA wraparound at 0h/24h is harmless;
+- vmag on the same spline, linear next to samples without a magnitude.
+
+Beyond the daily samples the reader answers from the optional long-range
+Chebyshev store (backend/chebyshev.py, a year or more per object); outside
+both it returns None so callers fall back to a live Horizons query.
+``interpolation_error`` bounds the spline error over a window, so callers can
+also fall back when the samples are too coarse for a fast mover.
+
+Binary store
+------------
+The JSON file is parsed in full by every worker and grows with watchlist ×
+horizon. ``write_store`` packs every sample into one structured ``.npy``
+(``STORE_DTYPE``: jd, ra, dec as float64, vmag as float32; rows grouped per
+object, sorted by jd) plus a small ``.index.json`` mapping each object to its
+(offset, count) and carrying the run metadata. ``load_store`` memory-maps the
+array, so startup reads only the index and an object's rows are paged in when
+first used. ``EphemerisStore.to_json_dict`` exports the original JSON layout.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+from astropy import units as u
+from astropy.coordinates import SkyCoord
+
+from backend import fastsky
+
+def _sample_jd(pos):
+    """JD of one cached sample: its 'jd' key, else 00:00 UTC of its 'date'."""
+    if pos.get("jd") is not None:
+        return float(pos["jd"])
+    d = datetime.strptime(pos["date"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return float(fastsky.julian_date(d))
+
+
+def positions_to_arrays(positions):
+    """JSON position dicts → (jd, ra, dec, vmag) float arrays sorted by jd.
+
+    Entries with missing or non-numeric fields are skipped; a missing vmag
+    becomes NaN.
+    """
+    rows = []
+    for pos in positions or []:
+        try:
+            rows.append((_sample_jd(pos), float(pos["ra"]), float(pos["dec"]),
+                         np.nan if pos.get("vmag") is None else float(pos["vmag"])))
+        except (KeyError, TypeError, ValueError):
+            continue
+    if not rows:
+        return tuple(np.empty(0) for _ in range(4))
+    return tuple(np.array(c, dtype=float) for c in zip(*sorted(rows)))
+
+
+def build_table(positions):
+    """Arrays for one object's cached positions, or None if fewer than 2 usable samples.
+
+    positions: list of JSON position dicts, or a (jd, ra, dec, vmag) tuple of
+    arrays sorted by jd (e.g. a slice of the binary store).
+
+    Returns a dict: jd (sorted), xyz (3 × N unit vectors), vmag (NaN where
+    missing), their spline slopes (xyz_slope, vmag_slope) and step (days)
+    when the samples are uniformly spaced, else None.
+    """
+    if isinstance(positions, tuple):
+        jd, ra, dec, vmag = (np.asarray(c, dtype=float) for c in positions)
+    else:
+        jd, ra, dec, vmag = positions_to_arrays(positions)
+    if len(jd) < 2:
+        return None
+    ra, dec = np.radians(ra), np.radians(dec)
+    xyz = np.stack([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)])
+    steps = np.diff(jd)
+    uniform = np.allclose(steps, steps[0], rtol=0, atol=1e-6) and steps[0] > 0
+    return {
+        "jd": jd,
+        "xyz": xyz,
+        "xyz_slope": _tangents(jd, xyz),
+        "vmag": vmag,
+        "vmag_slope": _tangents(jd, vmag),
+        "step": float(steps[0]) if uniform else None,
+    }
+
+
+def _tangents(jd, vals):
+    """Finite-difference slopes (Catmull-Rom inside, one-sided at the ends)."""
+    m = np.empty_like(vals)
+    m[..., 1:-1] = (vals[..., 2:] - vals[..., :-2]) / (jd[2:] - jd[:-2])
+    m[..., 0] = (vals[..., 1] - vals[..., 0]) / (jd[1] - jd[0])
+    m[..., -1] = (vals[..., -1] - vals[..., -2]) / (jd[-1] - jd[-2])
+    return m
+
+
+def interpolate(table, jd):
+    """Hermite-interpolate a table at JD array ``jd`` (all inside its span).
+
+    Returns (ra_deg, dec_deg, vmag) arrays. vmag falls back to linear
+    interpolation next to a sample without a magnitude and is NaN only when an
+    endpoint of its segment has none.
+    """
+    t = table["jd"]
+    if table["step"] is not None:
+        i = np.floor((jd - t[0]) / table["step"]).astype(int)
+    else:
+        i = np.searchsorted(t, jd, side="right") - 1
+    i = np.clip(i, 0, len(t) - 2)
+    h = t[i + 1] - t[i]
+    s = (jd - t[i]) / h
+    h00, h10 = 2 * s**3 - 3 * s**2 + 1, s**3 - 2 * s**2 + s
+    h01, h11 = -2 * s**3 + 3 * s**2, s**3 - s**2
+
+    def spline(vals, m):
+        return (h00 * vals[..., i] + h10 * h * m[..., i]
+                + h01 * vals[..., i + 1] + h11 * h * m[..., i + 1])
+
+    xyz = spline(table["xyz"], table["xyz_slope"])
+    xyz = xyz / np.linalg.norm(xyz, axis=0)
+    ra = np.degrees(np.arctan2(xyz[1], xyz[0])) % 360.0
+    dec = np.degrees(np.arcsin(np.clip(xyz[2], -1.0, 1.0)))
+
+    v = table["vmag"]
+    vmag = spline(v, table["vmag_slope"])
+    linear = v[i] * (1 - s) + v[i + 1] * s
+    return ra, dec, np.where(np.isnan(vmag), linear, vmag)
+
+
+def interpolation_error(table, jd):
+    """Rough upper bound (degrees) on the spline error over the segments ``jd`` touches.
+
+    Catmull-Rom tangents are off by about h²·x‴/6, so the position error is
+    about 1/40 of the third difference of the unit vectors; /20 leaves a
+    margin. Tiny for anything moving steadily, degrees for an NEA passing
+    within a few lunar distances between two samples.
+    """
+    t, xyz = table["jd"], table["xyz"]
+    if len(t) < 4:
+        return float("inf")
+    seg = np.clip(np.searchsorted(t, [np.min(jd), np.max(jd)], side="right") - 1, 0, len(t) - 2)
+    d3 = np.linalg.norm(xyz[:, 3:] - 3 * xyz[:, 2:-1] + 3 * xyz[:, 1:-2] - xyz[:, :-3], axis=0)
+    lo, hi = max(seg[0] - 1, 0), min(seg[1], len(d3) - 1)
+    return float(np.degrees(d3[lo:hi + 1].max()) / 20.0)
+
+# ── Binary store ─────────────────────────────────────────────────────────────
+
+STORE_DTYPE = np.dtype([("jd", "<f8"), ("ra", "<f8"), ("dec", "<f8"), ("vmag", "<f4")])
+STORE_FORMAT = 1
+_META_KEYS = ("generated_utc", "horizon_days", "ids", "names_validated_utc", "name_changes", "failures")
+
+
+def index_path_for(npy_path):
+    """'ephemeris_cache.npy' → 'ephemeris_cache.index.json'."""
+    return os.path.splitext(npy_path)[0] + ".index.json"
+
+
+def _atomic_write(path, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def write_store(cache, npy_path):
+    """Pack an ephemeris_cache.json-style dict into ``npy_path`` + its index.
+
+    Both files are written atomically (array first). Returns the index dict.
+    """
+    chunks, objects, offset = [], {}, 0
+    for section in ("comets", "asteroids"):
+        objects[section] = {}
+        for name, obj in (cache.get(section) or {}).items():
+            jd, ra, dec, vmag = positions_to_arrays((obj or {}).get("positions"))
+            rec = np.empty(len(jd), dtype=STORE_DTYPE)
+            rec["jd"], rec["ra"], rec["dec"], rec["vmag"] = jd, ra, dec, vmag
+            chunks.append(rec)
+            objects[section][name] = [offset, len(rec)]
+            offset += len(rec)
+    data = np.concatenate(chunks) if chunks else np.empty(0, dtype=STORE_DTYPE)
+    index = {"format": STORE_FORMAT, "rows": int(len(data)), "objects": objects}
+    index.update({k: cache[k] for k in _META_KEYS if k in cache})
+    _atomic_write(npy_path, lambda f: np.save(f, data))
+    _atomic_write(index_path_for(npy_path),
+                  lambda f: f.write(json.dumps(index, indent=1, ensure_ascii=False).encode("utf-8")))
+    return index
+
+
+class EphemerisStore:
+    """Memory-mapped binary ephemeris store (see write_store).
+
+    ``data`` is a read-only memmap; ``samples`` returns zero-copy views.
+    """
+
+    def __init__(self, data, index):
+        self.data = data
+        self.index = index
+        self.meta = {k: index[k] for k in _META_KEYS if k in index}
+
+    def names(self, section):
+        return list(self.index["objects"].get(section, {}))
+
+    def samples(self, section, name):
+        """(jd, ra, dec, vmag) views for one object, or None if not stored."""
+        loc = self.index["objects"].get(section, {}).get(name)
+        if loc is None:
+            return None
+        rec = self.data[loc[0]:loc[0] + loc[1]]
+        return rec["jd"], rec["ra"], rec["dec"], rec["vmag"]
+
+    def to_json_dict(self):
+        """Export in the ephemeris_cache.json layout ({date, jd, ra, dec, vmag} per sample)."""
+        out = dict(self.meta)
+        for section in ("comets", "asteroids"):
+            out[section] = {}
+            for name in self.names(section):
+                jd, ra, dec, vmag = self.samples(section, name)
+                out[section][name] = {"positions": [{
+                    "date": datetime.fromtimestamp((j - 2440587.5) * 86400.0, tz=timezone.utc).strftime("%Y-%m-%d"),
+                    "jd": float(j),
+                    "ra": float(r),
+                    "dec": float(d),
+                    "vmag": None if np.isnan(v) else round(float(v), 2),
+                } for j, r, d, v in zip(jd, ra, dec, vmag)]}
+        return out
+
+
+def load_store(npy_path):
+    """Open a binary store with mmap, or None if missing, corrupt or inconsistent."""
+    try:
+        with open(index_path_for(npy_path), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        data = np.load(npy_path, mmap_mode="r")
+    except Exception:
+        return None
+    if index.get("format") != STORE_FORMAT or data.dtype != STORE_DTYPE or len(data) != index.get("rows"):
+        return None
+    return EphemerisStore(data, index)
+
+
+def load_ephemeris(npy_path, json_path):
+    """Reader source: the binary store if usable, else the parsed JSON ({} if missing)."""
+    store = load_store(npy_path)
+    if store is not None:
+        return store
+    from backend.config import read_ephemeris_cache
+    return read_ephemeris_cache(json_path)
+
+
+# ── Reader ───────────────────────────────────────────────────────────────────
+
+class EphemerisReader:
+    """Vectorized, interpolating access to the ephemeris cache.
+
+    ``source`` is an EphemerisStore or a parsed ephemeris_cache.json dict.
+    ``long_range`` is an optional ChebyshevStore consulted for times outside
+    the daily samples. Per-object arrays are built on first use and kept for
+    the reader's life.
+    """
+
+    def __init__(self, source, long_range=None):
+        self._source = source if source is not None else {}
+        self._long_range = long_range
+        self._tables = {}
+
+    def table(self, section, name):
+        """Arrays for one object (see build_table), or None if not cached."""
+        key = (section, name)
+        if key not in self._tables:
+            if isinstance(self._source, EphemerisStore):
+                samples = self._source.samples(section, name)
+                self._tables[key] = None if samples is None else build_table(samples)
+            else:
+                obj = self._source.get(section, {}).get(name) or {}
+                self._tables[key] = build_table(obj.get("positions"))
+        return self._tables[key]
+
+    def span(self, section, name):
+        """(first_jd, last_jd) covered by an object's daily samples, or None."""
+        tbl = self.table(section, name)
+        return None if tbl is None else (float(tbl["jd"][0]), float(tbl["jd"][-1]))
+
+    def positions(self, section, name, times):
+        """Interpolated (ra_deg, dec_deg, vmag) at a time or sequence of times.
+
+        times: datetime, astropy Time, or a sequence of datetimes. Returns
+        floats for a scalar time (vmag None when unknown) and arrays
+        otherwise, or None when the object is not cached or any time falls
+        outside both its sampled span and its long-range fit.
+        """
+        jd, scalar = fastsky.jd_array(times)
+        if len(jd) == 0:
+            return None
+        tbl = self.table(section, name)
+        if tbl is not None and jd.min() >= tbl["jd"][0] and jd.max() <= tbl["jd"][-1]:
+            ra, dec, vmag = interpolate(tbl, jd)
+        elif self._long_range is not None:
+            res = self._long_range.positions(section, name, jd)
+            if res is None:
+                return None
+            ra, dec, vmag = res
+        else:
+            return None
+        if scalar:
+            v = float(vmag[0])
+            return float(ra[0]), float(dec[0]), (None if np.isnan(v) else round(v, 2))
+        return ra, dec, vmag
+
+    def position(self, section, name, when):
+        """(ra_deg, dec_deg, vmag) at one instant, or None — see positions()."""
+        return self.positions(section, name, when)
+
+    def nearest(self, section, name, when):
+        """Last known position when ``when`` is outside the cached span.
+
+        Returns (ra_deg, dec_deg, vmag, jd) at ``when`` clamped to the span —
+        the closest sample edge — or None if the object is not cached. Callers
+        must flag the result as stale when ``jd`` differs from ``when``.
+        """
+        jd, _ = fastsky.jd_array(when)
+        jd = jd[:1]
+        tbl = self.table(section, name)
+        res = None if self._long_range is None else self._long_range.positions(section, name, jd)
+        if res is not None:
+            ra, dec, vmag = res
+        elif tbl is not None:
+            jd = np.clip(jd, tbl["jd"][0], tbl["jd"][-1])
+            ra, dec, vmag = interpolate(tbl, jd)
+        else:
+            return None
+        v = float(vmag[0])
+        return float(ra[0]), float(dec[0]), (None if np.isnan(v) else round(v, 2)), float(jd[0])
+
+    def sky_coords(self, section, name, times):
+        """Array-valued ICRS SkyCoord over ``times`` (e.g. a trajectory window), or None."""
+        res = self.positions(section, name, times)
+        if res is None:
+            return None
+        ra, dec, _ = res
+        return SkyCoord(ra=np.atleast_1d(ra) * u.deg, dec=np.atleast_1d(dec) * u.deg, frame='icrs')
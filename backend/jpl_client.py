@@ -0,0 +1,319 @@
+"""backend/jpl_client.py — Shared, adaptive scheduler for every JPL round trip.
+
+The comet/asteroid summaries used to cap their thread pools at 3 workers and
+retry once after a blind ``sleep(1.5)``; the daily ephemeris script slept a
+fixed 0.5 s between objects. Neither tracked what JPL actually tolerates.
+``JPLScheduler`` gates every Horizons / SBDB request in the process instead:
+
+- a token bucket bounds the request *rate* (``rate`` per second, ``burst``
+  tokens) across all sessions and threads;
+- an AIMD limit bounds *concurrency*: each success adds ``1 / limit``
+  (≈ +1 per round of requests), each throttle — HTTP 429/502/503/504, a
+  timeout or a dropped connection — halves it (at most once per
+  ``decrease_interval`` so a burst of simultaneous failures counts once);
+- throttled calls are retried with exponential backoff and full jitter,
+  up to ``max_retries`` times. Anything else (e.g. Horizons' ValueError for
+  an unknown name) propagates immediately;
+- a ``CircuitBreaker`` trips after ``failure_threshold`` consecutive calls
+  that ended in a throttle / transport error or a server fault (HTTP 5xx,
+  an unparseable JSON body — not retried). While open, ``call`` raises
+  ``CircuitOpenError`` at once — no network, no backoff — so a JPL outage
+  costs callers microseconds instead of a timeout per object. After
+  ``reset_timeout`` seconds one probe request is let through (half-open);
+  its success closes the circuit, its failure re-opens it.
+- superseded work (backend/cancellation.py) is dropped at the checkpoints
+  before each attempt, after the wait for a slot and during a backoff:
+  ``Cancelled`` is raised without touching the network and counts as
+  neither a failure nor a throttle.
+
+``JPL`` is the process-wide instance; callers go through ``call(fn, ...)`` so
+tests can swap it. ``metrics()`` reports in-flight requests, the current
+limit, throttles, retries, time spent waiting and the circuit state.
+"""
+
+import random
+import threading
+import time
+
+import requests
+
+from backend import cancellation
+
+THROTTLE_STATUS = frozenset({429, 502, 503, 504})
+
+
+def is_throttle(exc):
+    """True for errors that mean "slow down / try again" rather than "wrong request"."""
+    if isinstance(exc, requests.exceptions.HTTPError):
+        response = getattr(exc, "response", None)
+        return response is not None and response.status_code in THROTTLE_STATUS
+    return isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                            ConnectionError, TimeoutError))
+
+
+def is_server_fault(exc):
+    """True for "JPL is broken" answers that are not worth retrying (HTTP 5xx, garbled JSON)."""
+    if isinstance(exc, requests.exceptions.JSONDecodeError):
+        return True
+    if isinstance(exc, requests.exceptions.HTTPError):
+        response = getattr(exc, "response", None)
+        return response is not None and response.status_code >= 500
+    return False
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of a JPL request while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Closed → open after consecutive failures → half-open probe → closed.
+
+    Args:
+        failure_threshold: Consecutive failed calls that trip the circuit.
+        reset_timeout:     Seconds the circuit stays open before one probe.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        """'closed', 'open' or 'half_open' (open past its reset timeout reads as half-open)."""
+        with self._lock:
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return self._state
+
+    def allow(self):
+        """May a request go out now? Admits exactly one probe once the timeout has passed."""
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = "half_open"
+            if self._state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def abandon(self):
+        """An admitted request never went out (cancelled): free the probe slot."""
+        with self._lock:
+            self._probing = False
+
+    def seconds_until_retry(self):
+        """0 when a request may go out now, else seconds until the next probe."""
+        with self._lock:
+            if self._state == "closed":
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def record_success(self):
+        with self._lock:
+            self._state, self._failures, self._probing = "closed", 0, False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    self.trips += 1
+                self._state, self._opened_at, self._probing = "open", time.monotonic(), False
+
+    def stats(self):
+        state = self.state
+        with self._lock:
+            return {"state": state, "consecutive_failures": self._failures,
+                    "trips": self.trips, "rejected": self.rejected}
+
+
+class JPLScheduler:
+    """Token bucket + AIMD concurrency limit + jittered retries for JPL requests.
+
+    Args:
+        rate:                Token refill rate (requests per second, process-wide).
+        burst:               Bucket capacity.
+        initial_concurrency: Starting AIMD limit.
+        min_concurrency:     Floor the limit never drops below.
+        max_concurrency:     Hard cap on simultaneous requests.
+        max_retries:         Retries of a throttled call (total attempts = 1 + this).
+        base_backoff:        First backoff ceiling in seconds; doubles per retry.
+        max_backoff:         Backoff ceiling.
+        decrease_interval:   Minimum seconds between two multiplicative decreases.
+        breaker:             CircuitBreaker (default: 5 failures, 30 s reset).
+    """
+
+    def __init__(self, rate=5.0, burst=5, initial_concurrency=3, min_concurrency=1,
+                 max_concurrency=8, max_retries=2, base_backoff=0.5, max_backoff=8.0,
+                 decrease_interval=1.0, breaker=None):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.decrease_interval = decrease_interval
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._limit = float(initial_concurrency)
+        self._last_decrease = float("-inf")
+        self._in_flight = 0
+        self._m = {"requests": 0, "successes": 0, "failures": 0, "throttles": 0,
+                   "retries": 0, "cancelled": 0, "max_in_flight": 0, "wait_s": 0.0}
+
+    # ── admission ──────────────────────────────────────────────────────────
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _acquire(self):
+        """Block until a concurrency slot and a token are both free, then take them."""
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                slots_free = self._in_flight < max(self.min_concurrency, int(self._limit))
+                if slots_free and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self._in_flight += 1
+                    self._m["requests"] += 1
+                    self._m["max_in_flight"] = max(self._m["max_in_flight"], self._in_flight)
+                    self._m["wait_s"] += now - start
+                    return
+                # Wake for the next token, or when a request finishes (notify)
+                timeout = None if not slots_free else (1.0 - self._tokens) / self.rate
+                self._cond.wait(timeout)
+
+    def _release(self, outcome):
+        """Finish one request: 'ok', 'throttle', 'error' (neutral for AIMD) or 'cancelled'."""
+        with self._cond:
+            self._in_flight -= 1
+            if outcome == "cancelled":
+                self._m["requests"] -= 1
+                self._m["cancelled"] += 1
+            elif outcome == "ok":
+                self._m["successes"] += 1
+                self._limit = min(self.max_concurrency, self._limit + 1.0 / self._limit)
+            else:
+                self._m["failures"] += 1
+                if outcome == "throttle":
+                    self._m["throttles"] += 1
+                    now = time.monotonic()
+                    if now - self._last_decrease >= self.decrease_interval:
+                        self._limit = max(self.min_concurrency, self._limit / 2.0)
+                        self._last_decrease = now
+            self._cond.notify_all()
+
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff for the given retry number (1-based)."""
+        return random.uniform(0.0, min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1)))
+
+    # ── public API ─────────────────────────────────────────────────────────
+
+    def call(self, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` as one scheduled JPL request, retrying throttles.
+
+        Raises CircuitOpenError without calling ``fn`` while the circuit is open,
+        and cancellation.Cancelled once the current token has been cancelled.
+        """
+        attempt = 0
+        while True:
+            self._checkpoint()
+            if not self.breaker.allow():
+                raise CircuitOpenError(
+                    f"JPL circuit open — retry in {self.breaker.seconds_until_retry():.0f} s")
+            self._acquire()
+            token = cancellation.current()
+            if token is not None and token.cancelled:      # superseded while queued for a slot
+                self._release("cancelled")
+                self.breaker.abandon()
+                token.check()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as exc:
+                throttled = is_throttle(exc)
+                self._release("throttle" if throttled else "error")
+                if not throttled:
+                    if is_server_fault(exc):
+                        self.breaker.record_failure()  # JPL is failing, just not with a throttle status
+                    else:
+                        self.breaker.record_success()  # JPL answered; the request was the problem
+                    raise
+                if attempt >= self.max_retries or self.breaker.state != "closed":
+                    self.breaker.record_failure()
+                    raise
+                attempt += 1
+                with self._cond:
+                    self._m["retries"] += 1
+                self._sleep(self._backoff(attempt))
+                continue
+            except BaseException:                          # KeyboardInterrupt, SystemExit, …
+                self._release("cancelled")                 # free the slot or _acquire blocks for good
+                self.breaker.abandon()                     # no outcome: free a half-open probe
+                raise
+            self._release("ok")
+            self.breaker.record_success()
+            return result
+
+    def _checkpoint(self):
+        try:
+            cancellation.check()
+        except cancellation.Cancelled:
+            with self._cond:
+                self._m["cancelled"] += 1
+            raise
+
+    def _sleep(self, seconds):
+        """Backoff that ends early (and raises at the next checkpoint) when cancelled."""
+        token = cancellation.current()
+        if token is None:
+            time.sleep(seconds)
+        else:
+            token.wait(seconds)
+
+    @property
+    def concurrency_limit(self):
+        with self._cond:
+            return max(self.min_concurrency, int(self._limit))
+
+    def metrics(self):
+        """Counters plus current in-flight requests, AIMD limit and bucket level."""
+        with self._cond:
+            self._refill(time.monotonic())
+            return {
+                **self._m,
+                "in_flight": self._in_flight,
+                "concurrency_limit": round(self._limit, 2),
+                "tokens": round(self._tokens, 2),
+                "rate": self.rate,
+                "circuit": self.breaker.stats(),
+            }
+
+
+# Process-wide instance shared by every session, worker thread and script
+JPL = JPLScheduler()
+
+
+def call(fn, *args, **kwargs):
+    """Run one JPL request through the process-wide scheduler."""
+    return JPL.call(fn, *args, **kwargs)
+
+
+def available():
+    """False while the process-wide circuit is open (JPL treated as down)."""
+    return JPL.breaker.state != "open"
@@ -0,0 +1,176 @@
+"""backend/moonsun.py — Shared per-night Moon/Sun ephemeris.
+
+Every section needs the Moon (separation filters, Moon Status) and the Sun
+(illumination), and each used to evaluate ``get_body`` on its own: the sidebar,
+every summary function, the observability checks and each trajectory. A
+``MoonSunEphemeris`` evaluates them once per observer-night on a
+``STEP_MINUTES`` grid and interpolates any instant from it (3-point Lagrange).
+
+Grids are keyed by (latitude, longitude rounded to ``LOCATION_DECIMALS``,
+local-solar night). A night runs local solar noon → noon, so one grid covers a
+whole observing session whatever the UTC date. Grids live in an LRU
+(backend/cache.py) shared by every caller in the process; ``MOON_SUN`` is the
+default instance.
+
+Interpolation error vs a direct ``get_body`` call: ~0.01" in Moon position,
+< 0.005° in altitude and ~1e-8 percentage points in illumination.
+"""
+
+import numpy as np
+from astropy import units as u
+from astropy.coordinates import AltAz, EarthLocation, SkyCoord
+from astropy.time import Time
+
+from backend import fastsky
+from backend.cache import LRUCache
+
+try:
+    from astropy.coordinates import get_moon as _get_moon, get_sun as _get_sun
+except ImportError:
+    from astropy.coordinates import get_body
+    def _get_moon(time, location=None, ephemeris=None):
+        return get_body("moon", time, location, ephemeris=ephemeris)
+    def _get_sun(time):
+        return get_body("sun", time)
+
+STEP_MINUTES = 10
+LOCATION_DECIMALS = 2   # 0.01° ≈ 1 km — far below the Moon's parallax sensitivity
+
+
+def _unit_vectors(coord):
+    """(3, N) Cartesian unit vectors of a coordinate's RA/Dec."""
+    ra, dec = coord.ra.rad, coord.dec.rad
+    return np.stack([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)])
+
+
+def _direction(xyz, scalar):
+    """ICRS direction-only SkyCoord from (3, N) vectors (renormalized)."""
+    xyz = xyz / np.linalg.norm(xyz, axis=0)
+    ra = np.degrees(np.arctan2(xyz[1], xyz[0])) % 360.0
+    dec = np.degrees(np.arcsin(np.clip(xyz[2], -1.0, 1.0)))
+    if scalar:
+        ra, dec = ra[0], dec[0]
+    return SkyCoord(ra=ra * u.deg, dec=dec * u.deg, frame='icrs')
+
+
+class MoonSunEphemeris:
+    """Moon and Sun positions, altitudes and Moon illumination for any instant.
+
+    Args:
+        step_minutes: Grid spacing of the per-night evaluation.
+        maxsize:      Number of (location, night) grids kept in the LRU.
+    """
+
+    def __init__(self, step_minutes=STEP_MINUTES, maxsize=64):
+        self.step_days = step_minutes / 1440.0
+        self._grids = LRUCache(maxsize)
+
+    # ── grid management ────────────────────────────────────────────────────
+
+    @staticmethod
+    def _location_key(location):
+        lat, lon = fastsky._lat_lon(location)
+        return round(lat, LOCATION_DECIMALS), round(lon, LOCATION_DECIMALS)
+
+    @staticmethod
+    def _night_of(jd, lon):
+        """Integer local-solar night: JD days start at noon UTC, shifted by longitude."""
+        return np.floor(jd + lon / 360.0).astype(int)
+
+    def _build_grid(self, lat, lon, night):
+        """Evaluate Moon and Sun on one night's grid (one get_body call each)."""
+        location = EarthLocation(lat=lat * u.deg, lon=lon * u.deg)
+        jd0 = night - lon / 360.0 - self.step_days   # one step of margin on each side
+        n = int(round(1.0 / self.step_days)) + 3
+        t = Time(jd0 + np.arange(n) * self.step_days, format='jd', scale='utc')
+
+        moon = _get_moon(t, location)
+        sun = _get_sun(t)
+        elongation = sun.separation(moon)
+        moon_aa = moon.transform_to(AltAz(obstime=t, location=location))
+        sun_aa = sun.transform_to(AltAz(obstime=t, location=location))
+        # Direction-only → ICRS, as moon_sep_deg does before every separation
+        moon_dir = SkyCoord(ra=moon.ra, dec=moon.dec, frame=moon.frame).icrs
+        sun_dir = SkyCoord(ra=sun.ra, dec=sun.dec, frame=sun.frame).icrs
+        return {
+            "jd0": jd0,
+            "moon_xyz": _unit_vectors(moon_dir),
+            "sun_xyz": _unit_vectors(sun_dir),
+            "moon_alt": moon_aa.alt.deg,
+            "moon_az_xy": np.stack([np.cos(moon_aa.az.rad), np.sin(moon_aa.az.rad)]),
+            "sun_alt": sun_aa.alt.deg,
+            "sun_az_xy": np.stack([np.cos(sun_aa.az.rad), np.sin(sun_aa.az.rad)]),
+            "illum": 0.5 * (1 - np.cos(elongation.rad)) * 100,
+        }
+
+    def _sample(self, location, times, field):
+        """Quadratically interpolate a grid field at every requested time.
+
+        Returns (values shaped (..., N), is_scalar).
+        """
+        jd, scalar = fastsky.jd_array(times)
+        lat, lon = self._location_key(location)
+        nights = self._night_of(jd, lon)
+        out = None
+        for night in np.unique(nights):
+            grid = self._grids.get_or_compute(
+                (lat, lon, int(night)), lambda: self._build_grid(lat, lon, int(night)))
+            vals = grid[field]
+            sel = nights == night
+            x = (jd[sel] - grid["jd0"]) / self.step_days
+            # 3-point Lagrange around the nearest node (u in [-0.5, 0.5])
+            k = np.clip(np.rint(x).astype(int), 1, vals.shape[-1] - 2)
+            f = x - k
+            part = (vals[..., k - 1] * (f * (f - 1) / 2) + vals[..., k] * (1 - f * f)
+                    + vals[..., k + 1] * (f * (f + 1) / 2))
+            if out is None:
+                out = np.empty(vals.shape[:-1] + (len(jd),))
+            out[..., sel] = part
+        return out, scalar
+
+    # ── public API ─────────────────────────────────────────────────────────
+
+    def moon(self, location, times):
+        """Moon direction (ICRS SkyCoord, no distance) at a time or array of times."""
+        xyz, scalar = self._sample(location, times, "moon_xyz")
+        return _direction(xyz, scalar)
+
+    def sun(self, location, times):
+        """Sun direction (ICRS SkyCoord, no distance) at a time or array of times."""
+        xyz, scalar = self._sample(location, times, "sun_xyz")
+        return _direction(xyz, scalar)
+
+    def _altaz(self, location, times, body):
+        alt, scalar = self._sample(location, times, f"{body}_alt")
+        az_xy, _ = self._sample(location, times, f"{body}_az_xy")
+        az = np.degrees(np.arctan2(az_xy[1], az_xy[0])) % 360.0
+        return (float(alt[0]), float(az[0])) if scalar else (alt, az)
+
+    def moon_altaz(self, location, times):
+        """Moon (altitude, azimuth) in degrees — floats for a scalar time, else arrays."""
+        return self._altaz(location, times, "moon")
+
+    def sun_altaz(self, location, times):
+        """Sun (altitude, azimuth) in degrees — floats for a scalar time, else arrays."""
+        return self._altaz(location, times, "sun")
+
+    def illumination(self, location, times):
+        """Moon illumination in percent (0–100) from the Sun–Moon elongation."""
+        illum, scalar = self._sample(location, times, "illum")
+        return float(illum[0]) if scalar else illum
+
+    def moon_and_illumination(self, location, when):
+        """(Moon direction, illumination %) at one instant — what the summaries need."""
+        return self.moon(location, when), self.illumination(location, when)
+
+    def stats(self):
+        """LRU counters for the per-night grids (hits, misses, evictions, size, …)."""
+        return self._grids.stats()
+
+    def clear(self):
+        """Drop every cached grid."""
+        self._grids.clear()
+
+
+# Process-wide instance shared by the sidebar, every section and compute_trajectory
+MOON_SUN = MoonSunEphemeris()
@@ -0,0 +1,178 @@
+"""backend/orbits.py — Vectorized two-body propagation of MPC comet elements.
+
+"Explore Catalog" used to send every matched comet to JPL Horizons. With the
+full MPC element set kept in comets_catalog.json (q, e, i, ω, Ω, perihelion
+time, epoch, H and slope), ``catalog_positions`` computes geocentric RA/Dec
+and a predicted total magnitude for the whole catalog in one NumPy pass:
+
+    elements → anomaly (elliptic: Kepler by Newton; parabolic: Barker;
+    hyperbolic: hyperbolic Kepler by Newton) → heliocentric ecliptic J2000
+    → equatorial → minus Earth (one astropy call) → one light-time iteration
+
+Accuracy: pure two-body from the osculating elements, no planetary
+perturbations and no non-gravitational forces. Positions are good to a few
+arcminutes near the element epoch for most comets and degrade away from it —
+plenty for rise/set, altitude filters and sorting, not for pointing. The
+chosen target is still refined through Horizons. Predicted magnitudes use
+the MPC total-magnitude law m = H + 5 log Δ + 2.5 G log r, which is itself
+only as good as the published H/G (comets routinely outburst or fade).
+
+Entries without the full element set (old catalog snapshots) come back as
+NaN and ``valid`` False, so callers can fall back to Horizons for them.
+"""
+
+import numpy as np
+
+from backend import fastsky
+
+GAUSS_K = 0.01720209895                 # Gaussian gravitational constant (AU^1.5 / day)
+C_AU_PER_DAY = 173.1446326846693        # speed of light
+OBLIQUITY_J2000_DEG = 23.4392911        # mean obliquity of the ecliptic at J2000
+DEFAULT_SLOPE = 4.0                     # MPC default comet slope parameter (G / "n")
+PARABOLIC_TOL = 1e-6                    # |e − 1| below this uses Barker's equation
+_KEPLER_ITERATIONS = 30
+
+ELEMENT_FIELDS = ("q", "e", "i", "peri", "node", "tp_jd", "H", "G")
+
+
+def elements_from_catalog(entries):
+    """comets_catalog.json entries → dict of float arrays (NaN where missing).
+
+    Keys: the ``ELEMENT_FIELDS`` plus ``valid`` (bool — all orbital elements
+    present and physical). H may be NaN for a valid orbit (magnitude NaN).
+    """
+    cols = {k: np.full(len(entries), np.nan) for k in ELEMENT_FIELDS}
+    for row, entry in enumerate(entries):
+        for key in ELEMENT_FIELDS:
+            val = entry.get(key)
+            if val is None:
+                continue
+            try:
+                cols[key][row] = float(val)
+            except (TypeError, ValueError):
+                pass
+    cols["G"] = np.where(np.isnan(cols["G"]), DEFAULT_SLOPE, cols["G"])
+    orbit = np.stack([cols[k] for k in ("q", "e", "i", "peri", "node", "tp_jd")])
+    cols["valid"] = np.isfinite(orbit).all(axis=0) & (cols["q"] > 0) & (cols["e"] >= 0)
+    return cols
+
+
+def _solve_elliptic(M, e):
+    """Eccentric anomaly E for e < 1 (M wrapped to [−π, π])."""
+    M = np.remainder(M + np.pi, 2 * np.pi) - np.pi
+    E = M + 0.85 * e * np.sign(np.sin(M))          # Danby's starter, robust up to e → 1
+    for _ in range(_KEPLER_ITERATIONS):
+        dE = (E - e * np.sin(E) - M) / (1 - e * np.cos(E))
+        E = E - dE
+        if np.all(np.abs(dE) < 1e-12):
+            break
+    return E
+
+
+def _solve_hyperbolic(M, e):
+    """Hyperbolic anomaly F for e > 1 (e·sinh F − F = M)."""
+    F = np.arcsinh(M / e)
+    for _ in range(_KEPLER_ITERATIONS * 2):
+        dF = (e * np.sinh(F) - F - M) / (e * np.cosh(F) - 1)
+        F = F - dF
+        if np.all(np.abs(dF) < 1e-12):
+            break
+    return F
+
+
+def _orbital_plane(q, e, dt):
+    """(r, true anomaly) at dt days from perihelion, for any eccentricity."""
+    nu = np.zeros_like(q)
+    r = np.zeros_like(q)
+
+    para = np.abs(e - 1.0) < PARABOLIC_TOL
+    ell = (e < 1.0) & ~para
+    hyp = (e > 1.0) & ~para
+
+    if para.any():
+        # Barker: tan³(ν/2)/3 + tan(ν/2) = W, solved in closed form
+        W = 3 * GAUSS_K * dt[para] / np.sqrt(2 * q[para] ** 3) / 2
+        Y = np.cbrt(W + np.sqrt(W * W + 1))
+        s = Y - 1 / Y
+        nu[para] = 2 * np.arctan(s)
+        r[para] = q[para] * (1 + s * s)
+    if ell.any():
+        ee, a = e[ell], q[ell] / (1 - e[ell])
+        E = _solve_elliptic(GAUSS_K * dt[ell] / a ** 1.5, ee)
+        nu[ell] = 2 * np.arctan2(np.sqrt(1 + ee) * np.sin(E / 2), np.sqrt(1 - ee) * np.cos(E / 2))
+        r[ell] = a * (1 - ee * np.cos(E))
+    if hyp.any():
+        ee = e[hyp]
+        a = q[hyp] / (ee - 1)
+        F = _solve_hyperbolic(GAUSS_K * dt[hyp] / a ** 1.5, ee)
+        nu[hyp] = 2 * np.arctan(np.sqrt((ee + 1) / (ee - 1)) * np.tanh(F / 2))
+        r[hyp] = a * (ee * np.cosh(F) - 1)
+    return r, nu
+
+
+def heliocentric_xyz(el, jd):
+    """(3, N) heliocentric equatorial J2000 positions in AU at TT-ish Julian Date(s).
+
+    ``jd`` is a scalar or an array broadcastable against the element arrays.
+    Invalid rows are NaN.
+    """
+    q, e = el["q"], el["e"]
+    jd = np.broadcast_to(np.asarray(jd, dtype=float), q.shape)
+    valid = el["valid"]
+    r = np.full(q.shape, np.nan)
+    nu = np.full(q.shape, np.nan)
+    r[valid], nu[valid] = _orbital_plane(q[valid], e[valid], jd[valid] - el["tp_jd"][valid])
+
+    i, w, node = (np.radians(el[k]) for k in ("i", "peri", "node"))
+    u_ = w + nu
+    cu, su, cn, sn, ci, si = np.cos(u_), np.sin(u_), np.cos(node), np.sin(node), np.cos(i), np.sin(i)
+    x_ecl = r * (cn * cu - sn * su * ci)
+    y_ecl = r * (sn * cu + cn * su * ci)
+    z_ecl = r * (su * si)
+    eps = np.radians(OBLIQUITY_J2000_DEG)
+    return np.stack([x_ecl,
+                     y_ecl * np.cos(eps) - z_ecl * np.sin(eps),
+                     y_ecl * np.sin(eps) + z_ecl * np.cos(eps)])
+
+
+def earth_heliocentric(jd):
+    """Earth's heliocentric ICRS position (AU) at one Julian Date (UTC), via astropy."""
+    from astropy.coordinates import get_body_barycentric
+    from astropy.time import Time
+
+    t = Time(float(jd), format="jd", scale="utc")
+    earth = get_body_barycentric("earth", t).xyz.to_value("AU")
+    sun = get_body_barycentric("sun", t).xyz.to_value("AU")
+    return earth - sun
+
+
+def catalog_positions(elements, when):
+    """Geocentric astrometric RA/Dec and predicted magnitude for every comet at one instant.
+
+    Args:
+        elements: Output of ``elements_from_catalog``.
+        when:     datetime (naive = UTC) or astropy Time.
+
+    Returns a dict of arrays: ra, dec (deg), vmag, r (heliocentric AU),
+    delta (geocentric AU) and valid. Invalid rows are NaN.
+    """
+    jd_utc, _ = fastsky.jd_array(when)
+    jd_utc = float(jd_utc[0])
+    jd_tt = jd_utc + 69.184 / 86400.0        # TT − UTC (leap seconds since 2017)
+    earth = earth_heliocentric(jd_utc)[:, None]
+
+    helio = heliocentric_xyz(elements, jd_tt)
+    geo = helio - earth
+    delta = np.linalg.norm(geo, axis=0)
+    # One light-time iteration: where the comet was when the light left it
+    helio = heliocentric_xyz(elements, jd_tt - delta / C_AU_PER_DAY)
+    geo = helio - earth
+    delta = np.linalg.norm(geo, axis=0)
+    r = np.linalg.norm(helio, axis=0)
+
+    with np.errstate(invalid="ignore"):
+        ra = np.degrees(np.arctan2(geo[1], geo[0])) % 360.0
+        dec = np.degrees(np.arcsin(np.clip(geo[2] / delta, -1.0, 1.0)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vmag = elements["H"] + 5 * np.log10(delta) + 2.5 * elements["G"] * np.log10(r)
+    return {"ra": ra, "dec": dec, "vmag": vmag, "r": r, "delta": delta, "valid": elements["valid"].copy()}
@@ -0,0 +1,180 @@
+"""backend/planets.py — Local planetary ephemeris engine (no network).
+
+The planet section used to send one JPL Horizons ``majorbody`` query per
+planet per date, plus another for the trajectory. ``planet_positions``
+computes every planet at every requested instant in one NumPy pass instead:
+
+- Mercury … Neptune: ERFA ``plan94`` (Simon et al. 1994 analytic series,
+  J2000 mean equator) broadcast over (times × bodies); Earth from ERFA
+  ``epv00``. Both ship with astropy, so no kernel download is needed.
+- Pluto: JPL's approximate Keplerian elements (Standish, valid 1800–2050)
+  propagated with backend/orbits.py.
+- one light-time iteration, then astrometric RA/Dec — the same quantity
+  Horizons returns as RA/DEC.
+- visual magnitude from the Mallama & Hilton (2018) phase laws Horizons
+  uses (Saturn includes the ring-tilt term; Uranus' sub-latitude term and
+  Mars' seasonal term are omitted, ≲ 0.1 mag).
+
+Accuracy is arcseconds for Mercury–Saturn and tens of arcseconds for
+Uranus/Neptune over 1900–2100, and a few arcminutes for Pluto — far inside
+what rise/set, altitude filters and trajectories need. ``horizons_separation``
+queries Horizons for the same instant, for spot checks.
+"""
+
+import numpy as np
+import erfa
+from astropy import units as u
+from astropy.coordinates import SkyCoord
+
+from backend import fastsky, orbits
+
+# Display name → Horizons major-body ID (the app's planet picker order)
+PLANETS = {
+    "Mercury": "199", "Venus": "299", "Mars": "499", "Jupiter": "599",
+    "Saturn": "699", "Uranus": "799", "Neptune": "899", "Pluto": "999",
+}
+_PLAN94 = {"Mercury": 1, "Venus": 2, "Mars": 4, "Jupiter": 5, "Saturn": 6, "Uranus": 7, "Neptune": 8}
+_TT_MINUS_UTC_DAYS = 69.184 / 86400.0
+
+# Pluto, J2000 ecliptic elements and rates per Julian century:
+# a (AU), e, i, mean longitude L, longitude of perihelion ϖ, node Ω (degrees)
+_PLUTO = ((39.48211675, -0.00031596), (0.24882730, 0.00005170), (17.14001206, 0.00004818),
+          (238.92903833, 145.20780515), (224.06891629, -0.04062942), (110.30393684, -0.01183482))
+
+# Saturn's north pole (IAU), for the ring opening angle
+_SATURN_POLE = np.array([np.cos(np.radians(83.537)) * np.cos(np.radians(40.589)),
+                         np.cos(np.radians(83.537)) * np.sin(np.radians(40.589)),
+                         np.sin(np.radians(83.537))])
+
+
+def body_name(body):
+    """'Mars' or '499' → 'Mars'. Raises ValueError for anything else."""
+    if body in PLANETS:
+        return body
+    for name, horizons_id in PLANETS.items():
+        if str(body).strip() == horizons_id:
+            return name
+    raise ValueError(f"Unknown planet {body!r}")
+
+
+def _pluto_heliocentric(jd_tt):
+    """(3, N) heliocentric equatorial J2000 position of Pluto (AU)."""
+    T = (jd_tt - 2451545.0) / 36525.0
+    a, e, inc, L, varpi, node = (v0 + rate * T for v0, rate in _PLUTO)
+    M = np.radians(np.remainder(L - varpi, 360.0))
+    el = {
+        "q": a * (1 - e), "e": e, "i": inc, "peri": varpi - node, "node": node,
+        "tp_jd": jd_tt - M * a ** 1.5 / orbits.GAUSS_K,
+        "valid": np.ones(len(jd_tt), dtype=bool),
+    }
+    return orbits.heliocentric_xyz(el, jd_tt)
+
+
+def _heliocentric(names, jd_tt):
+    """(len(names), 3, N) heliocentric positions at JD(TT) array ``jd_tt``."""
+    out = np.empty((len(names), 3, len(jd_tt)))
+    analytic = [k for k, n in enumerate(names) if n in _PLAN94]
+    if analytic:
+        ids = np.array([_PLAN94[names[k]] for k in analytic])
+        pv = erfa.plan94(jd_tt[:, None], 0.0, ids[None, :])          # (N, bodies)
+        out[analytic] = np.transpose(pv["p"], (1, 2, 0))
+    if "Pluto" in names:
+        out[names.index("Pluto")] = _pluto_heliocentric(jd_tt)
+    return out
+
+
+def _magnitude(name, r, delta, phase_deg, sin_ring):
+    """Apparent V magnitude (Mallama & Hilton 2018) from r, Δ (AU) and phase angle."""
+    a = phase_deg
+    dist = 5 * np.log10(r * delta)
+    if name == "Mercury":
+        return (-0.613 + dist + 6.3280e-02 * a - 1.6336e-03 * a**2 + 3.3644e-05 * a**3
+                - 3.4265e-07 * a**4 + 1.6893e-09 * a**5 - 3.0334e-12 * a**6)
+    if name == "Venus":
+        return np.where(a <= 163.7,
+                        -4.384 + dist - 1.044e-03 * a + 3.687e-04 * a**2 - 2.814e-06 * a**3 + 8.938e-09 * a**4,
+                        236.05828 + dist - 2.81914 * a + 8.39034e-03 * a**2)
+    if name == "Mars":
+        return np.where(a <= 50.0,
+                        -1.601 + dist + 2.267e-02 * a - 1.302e-04 * a**2,
+                        -0.367 + dist - 0.02573 * a + 0.0003445 * a**2)
+    if name == "Jupiter":
+        return -9.395 + dist + 3.7e-04 * a + 6.16e-04 * a**2
+    if name == "Saturn":
+        return -8.914 + dist - 1.825 * sin_ring + 0.026 * a - 0.378 * sin_ring * np.exp(-2.25 * a)
+    if name == "Uranus":
+        return -7.110 + dist + 6.587e-03 * a + 1.045e-04 * a**2
+    if name == "Neptune":
+        return -7.00 + dist
+    return -1.0 + dist                                                  # Pluto
+
+
+def planet_positions(times, bodies=None):
+    """Astrometric geocentric positions of several planets at one or more instants.
+
+    Args:
+        times:  datetime (naive = UTC), astropy Time, or a sequence of datetimes.
+        bodies: Names or Horizons IDs (default: all of ``PLANETS``).
+
+    Returns {name: {"ra", "dec" (deg), "delta", "r" (AU), "phase" (deg),
+    "vmag"}} with arrays of one value per time.
+    """
+    names = [body_name(b) for b in (bodies or PLANETS)]
+    jd_utc, _ = fastsky.jd_array(times)
+    jd_tt = np.asarray(jd_utc, dtype=float) + _TT_MINUS_UTC_DAYS
+
+    earth_helio = np.transpose(erfa.epv00(jd_tt, 0.0)[0]["p"])       # (3, N)
+    helio = _heliocentric(names, jd_tt)
+    delta = np.linalg.norm(helio - earth_helio, axis=1)               # (bodies, N)
+    # One light-time iteration: where each planet was when the light left it
+    helio = np.stack([_heliocentric([n], jd_tt - delta[k] / orbits.C_AU_PER_DAY)[0]
+                      for k, n in enumerate(names)])
+    geo = helio - earth_helio
+    delta = np.linalg.norm(geo, axis=1)
+    r = np.linalg.norm(helio, axis=1)
+    R = np.linalg.norm(earth_helio, axis=0)
+    phase = np.degrees(np.arccos(np.clip((r**2 + delta**2 - R**2) / (2 * r * delta), -1.0, 1.0)))
+
+    out = {}
+    for k, name in enumerate(names):
+        unit = geo[k] / delta[k]
+        sin_ring = np.abs(_SATURN_POLE @ unit) if name == "Saturn" else 0.0
+        out[name] = {
+            "ra": np.degrees(np.arctan2(unit[1], unit[0])) % 360.0,
+            "dec": np.degrees(np.arcsin(np.clip(unit[2], -1.0, 1.0))),
+            "delta": delta[k],
+            "r": r[k],
+            "phase": phase[k],
+            "vmag": _magnitude(name, r[k], delta[k], phase[k], sin_ring),
+        }
+    return out
+
+
+def planet_position(body, when):
+    """(ra_deg, dec_deg, vmag) of one planet at one instant."""
+    name = body_name(body)
+    p = planet_positions(when, [name])[name]
+    return float(p["ra"][0]), float(p["dec"][0]), round(float(p["vmag"][0]), 2)
+
+
+def sky_coords(body, times):
+    """Array-valued ICRS SkyCoord of one planet over ``times`` (e.g. a trajectory window)."""
+    name = body_name(body)
+    p = planet_positions(times, [name])[name]
+    return SkyCoord(ra=p["ra"] * u.deg, dec=p["dec"] * u.deg, frame="icrs")
+
+
+def horizons_separation(body, when):
+    """Arcseconds between this engine and JPL Horizons for one planet at one instant.
+
+    Verification only — makes one (cached) Horizons request.
+    """
+    from backend.resolvers import _majorbody_ephemerides
+
+    name = body_name(body)
+    jd = float(fastsky.jd_array(when)[0][0])
+    row = _majorbody_ephemerides(PLANETS[name], "500", jd)[0]
+    ra, dec, _ = planet_position(name, when)
+    local = SkyCoord(ra=ra * u.deg, dec=dec * u.deg, frame="icrs")
+    remote = SkyCoord(ra=float(row["RA"]) * u.deg, dec=float(row["DEC"]) * u.deg, frame="icrs")
+    return float(local.separation(remote).arcsec)
@@ -0,0 +1,275 @@
+"""backend/positions.py — Two-stage summary pipeline: cached positions, then geometry.
+
+Stage 1 — positions (location-independent). ``PositionCache`` holds one short
+geocentric ephemeris per (section, resolved JPL ID, UTC date): positions
+every 6 h from the day before to two days after, fetched in one Horizons
+range query. Any session start on that date is Hermite-interpolated from it
+(backend/ephemeris.py), so moving the start time within the day or moving the
+observer never touches the network. An admin override drops only the
+affected object's entries (``invalidate``) — one refetch, not a cache wipe.
+Failed lookups are cached as the stub row the summary shows, but only for
+``FAILURE_TTL`` seconds, so reruns do not hammer Horizons while a transient
+error still clears itself.
+
+The same entry serves drill-down: ``window`` interpolates it over a whole
+trajectory (any window starting on that date and lasting up to 24 h fits in
+the table), so pressing "Calculate Visibility" for a listed object costs no
+new request. 6-hour samples are too coarse for an NEA passing close to Earth
+(degrees of error at 0.001 AU): when ``interpolation_error`` exceeds
+``WINDOW_MAX_ERROR_DEG`` the window is refused and the caller fetches a
+trajectory at its own step from Horizons.
+
+Stale-while-revalidate: every successful fetch is also remembered as the
+object's last known good ephemeris — in memory and in the persistent response
+cache (``last_good_positions``), so it survives restarts. When a fetch fails
+(typically because the JPL circuit is open and ``backend/jpl_client.py``
+fails fast), ``position_at`` answers from that ephemeris instead of the stub,
+flagged ``_stale`` with ``_stale_as_of`` (the UTC date it was fetched for),
+and queues one background revalidation for the key. The revalidation waits
+for the circuit's next probe, refetches, and replaces the cached entry on
+success — so during an outage a page render costs cache reads only.
+
+Stage 2 — geometry (location- and time-dependent). ``GeometryCache`` memoizes
+the rise/set/transit/Moon DataFrame per (latitude, longitude, start time,
+stage-1 rows). The rows are part of the key, so a refetched position is a
+new entry and nothing ever needs invalidating here; a miss is one vectorized
+``_add_planning_columns`` call (~10 ms for 40 objects).
+
+``POSITIONS`` and ``GEOMETRY`` are the process-wide instances shared by every
+session; both report LRU ``stats()``.
+"""
+
+import queue
+import threading
+import time
+from datetime import timezone
+
+import numpy as np
+
+from backend import fastsky, jpl_client, response_cache
+from backend.cache import LRUCache
+from backend.ephemeris import build_table, interpolate, interpolation_error
+
+FAILURE_TTL = 600          # seconds a failed lookup is remembered
+SUCCESS_TTL = 6 * 3600     # bound the age of fetched ephemerides
+REVALIDATE_MAX_WAIT = 300  # longest a background revalidation waits for the JPL circuit
+WINDOW_MAX_ERROR_DEG = 0.01  # spline error bound for serving a trajectory from the 6 h table
+
+
+def utc_date(when):
+    """'YYYY-MM-DD' of an instant in UTC (naive datetimes are taken as UTC)."""
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc).strftime("%Y-%m-%d")
+
+
+class PositionCache:
+    """Stage 1: process-wide map (section, jpl_id, UTC date) → daily ephemeris.
+
+    ``fetch`` callbacks return either ``{"positions": [...], "_jpl_id_used": id}``
+    (position dicts as from backend.resolvers.get_daily_positions) or a failure
+    stub — the summary's placeholder columns with ``_resolve_error`` True.
+    """
+
+    def __init__(self, maxsize=4096, failure_ttl=FAILURE_TTL, success_ttl=SUCCESS_TTL):
+        self.failure_ttl = failure_ttl
+        self._cache = LRUCache(maxsize, ttl=success_ttl)
+        self._last_good = LRUCache(maxsize)
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._queue = None
+        self.stale_served = 0
+        self.revalidated = 0
+        self.too_coarse = 0
+
+    def _prepare(self, entry, section=None, jpl_id=None, date=None):
+        """Fetched positions → interpolation table (an empty result becomes a failure).
+
+        Successful tables are also recorded as the object's last known good.
+        """
+        if entry.get("_resolve_error"):
+            return entry
+        table = build_table(entry.get("positions"))
+        if table is None:
+            return {"_resolve_error": True, "_jpl_id_tried": entry.get("_jpl_id_used", "?"),
+                    "_jpl_id_used": entry.get("_jpl_id_used", "?"),
+                    "_jpl_error": "Horizons returned fewer than 2 positions"}
+        prepared = {"table": table, "_jpl_id_used": entry.get("_jpl_id_used")}
+        if section is not None:
+            self._last_good.put((section, jpl_id), {"date": date, **prepared})
+            response_cache.store("last_good_positions", {"section": section, "id": jpl_id},
+                                 {"date": date, "positions": entry["positions"],
+                                  "_jpl_id_used": prepared["_jpl_id_used"]})
+        return prepared
+
+    def _payload(self, entry, when, clamp=False):
+        """Interpolated position columns at ``when`` (clamped to the table span if asked)."""
+        table = entry["table"]
+        jd, _ = fastsky.jd_array(when)
+        if clamp:
+            jd = np.clip(jd, table["jd"][0], table["jd"][-1])
+        ra, dec, vmag = interpolate(table, jd)
+        return {
+            "_ra_deg": float(ra[0]),
+            "_dec_deg": float(dec[0]),
+            "Magnitude": None if np.isnan(vmag[0]) else round(float(vmag[0]), 2),
+            "_jpl_id_used": entry["_jpl_id_used"],
+        }
+
+    def last_good(self, section, jpl_id):
+        """Most recent successful ephemeris for an object (memory, then disk), or None."""
+        found = self._last_good.get((section, jpl_id))
+        if found is not None:
+            return found
+        saved = response_cache.lookup("last_good_positions", {"section": section, "id": jpl_id})
+        table = build_table(saved["positions"]) if saved else None
+        if table is None:
+            return None
+        found = {"date": saved["date"], "table": table, "_jpl_id_used": saved.get("_jpl_id_used")}
+        self._last_good.put((section, jpl_id), found)
+        return found
+
+    def _entry(self, section, jpl_id, date, fetch):
+        """Cached (or freshly fetched) table / failure stub for one (section, id, date)."""
+        return self._cache.get_or_compute(
+            (section, jpl_id, date), lambda: self._prepare(fetch(), section, jpl_id, date),
+            ttl=lambda e: self.failure_ttl if e.get("_resolve_error") else None,
+        )
+
+    def window(self, section, jpl_id, times, fetch):
+        """(ra_deg, dec_deg, vmag) arrays over a sequence of datetimes, from the entry
+        for the first time's UTC date (fetched on a miss, exactly as ``position_at``).
+
+        Returns None when the lookup failed, a time falls outside that entry's
+        span, or the object moves too fast for the table's cadence
+        (``WINDOW_MAX_ERROR_DEG``) — callers fall back to a live query.
+        """
+        entry = self._entry(section, jpl_id, utc_date(times[0]), fetch)
+        if entry.get("_resolve_error"):
+            return None
+        jd, _ = fastsky.jd_array(times)
+        span = entry["table"]["jd"]
+        if jd.min() < span[0] or jd.max() > span[-1]:
+            return None
+        if interpolation_error(entry["table"], jd) > WINDOW_MAX_ERROR_DEG:
+            with self._pending_lock:
+                self.too_coarse += 1
+            return None
+        return interpolate(entry["table"], jd)
+
+    def position_at(self, section, jpl_id, when, fetch):
+        """Payload for one object at ``when``, fetching its day on a miss.
+
+        Returns a fresh dict: ``_ra_deg``, ``_dec_deg``, ``Magnitude`` (None if
+        unknown) and ``_jpl_id_used`` — plus ``_stale`` / ``_stale_as_of`` when
+        it comes from the last known good ephemeris because the fetch failed —
+        or the failure stub columns.
+        """
+        date = utc_date(when)
+        key = (section, jpl_id, date)
+        entry = self._entry(section, jpl_id, date, fetch)
+        if not entry.get("_resolve_error"):
+            return self._payload(entry, when)
+        stale = self.last_good(section, jpl_id)
+        if stale is None:
+            return dict(entry)
+        self._schedule_revalidation(key, fetch)
+        with self._pending_lock:
+            self.stale_served += 1
+        return {**self._payload(stale, when, clamp=True), "_stale": True, "_stale_as_of": stale["date"]}
+
+    # ── background revalidation ────────────────────────────────────────────
+
+    def _schedule_revalidation(self, key, fetch):
+        """Queue one refetch per key (no-op if one is already pending)."""
+        with self._pending_lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            if self._queue is None:
+                self._queue = queue.Queue()
+                threading.Thread(target=self._revalidate_loop, name="position-revalidate",
+                                 daemon=True).start()
+        self._queue.put((key, fetch))
+
+    def _revalidate_loop(self):
+        while True:
+            key, fetch = self._queue.get()
+            try:
+                self.revalidate(key, fetch)
+            except Exception:
+                pass
+            finally:
+                with self._pending_lock:
+                    self._pending.discard(key)
+
+    def revalidate(self, key, fetch, max_wait=REVALIDATE_MAX_WAIT):
+        """Refetch one key once the JPL circuit allows it; replace the entry on success.
+
+        Returns True when fresh data was stored.
+        """
+        wait = jpl_client.JPL.breaker.seconds_until_retry()
+        if wait > max_wait:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        section, jpl_id, date = key
+        entry = self._prepare(fetch(), section, jpl_id, date)
+        if entry.get("_resolve_error"):
+            return False
+        self._cache.put(key, entry)
+        with self._pending_lock:
+            self.revalidated += 1
+        return True
+
+    def invalidate(self, section, jpl_ids):
+        """Drop every date cached for the given JPL ID(s) in one section. Returns the count."""
+        ids = {jpl_ids} if isinstance(jpl_ids, str) else set(jpl_ids)
+        return self._cache.invalidate_where(lambda k, _: k[0] == section and k[1] in ids)
+
+    def invalidate_failures(self, section=None):
+        """Drop cached failures (all sections, or one) so they are retried. Returns the count."""
+        return self._cache.invalidate_where(
+            lambda k, v: (section is None or k[0] == section) and bool(v.get("_resolve_error")))
+
+    def stats(self):
+        """LRU counters (hits, misses, evictions, size, …) plus stale-serving counters."""
+        with self._pending_lock:
+            extra = {"stale_served": self.stale_served, "revalidated": self.revalidated,
+                     "revalidating": len(self._pending), "too_coarse": self.too_coarse}
+        return {**self._cache.stats(), **extra}
+
+    def clear(self):
+        self._cache.clear()
+        self._last_good.clear()
+
+
+class GeometryCache:
+    """Stage 2: (lat, lon, start time, stage-1 rows) → summary DataFrame.
+
+    ``compute`` builds the DataFrame (e.g. ``_add_planning_columns``); every
+    hit returns a copy because callers add observability columns in place.
+    """
+
+    def __init__(self, maxsize=256):
+        self._cache = LRUCache(maxsize)
+
+    @staticmethod
+    def _rows_key(rows):
+        return tuple(tuple(sorted((k, v) for k, v in row.items() if not isinstance(v, float) or v == v))
+                     for row in rows)
+
+    def get_or_compute(self, lat, lon, start_time, rows, compute):
+        key = (round(float(lat), 6), round(float(lon), 6), start_time.isoformat(), self._rows_key(rows))
+        return self._cache.get_or_compute(key, compute).copy()
+
+    def stats(self):
+        return self._cache.stats()
+
+    def clear(self):
+        self._cache.clear()
+
+
+# Process-wide instances shared by every session's summaries
+POSITIONS = PositionCache()
+GEOMETRY = GeometryCache()
@@ -1,4 +1,5 @@
 import re
+import numpy as np
 from astropy.coordinates import SkyCoord, FK5
 from astropy import units as u
 from astropy.time import Time
@@ -6,45 +7,113 @@ from datetime import timedelta
 from astroquery.simbad import Simbad
 from astroquery.jplhorizons import Horizons
 
+from backend import jpl_client
+from backend.response_cache import forget, lookup, read_through, store
+
+HORIZONS_TTL = 24 * 3600   # orbit solutions are refit now and then; positions for fixed epochs barely move
+STRATEGY_TTL = 30 * 86400  # how long a winning fallback variant is tried first
+DEAD_VARIANT_TTL = 86400   # how long a variant Horizons rejected is skipped
+# ValueError messages that reject the *target* itself. Anything else (no ephemeris
+# for the epochs, unparseable date, unknown query failure) depends on the query.
+TARGET_ERRORS = ("Unknown target", "Ambiguous target name")
+HORIZONS_WAIT = 300        # a caller joining an identical in-flight query waits this long (fallback chain + retries)
+
 def _horizons_query(obj_name, location_code, epochs, closest_apparition=True):
     """Query JPL Horizons with 3-level fallback.
 
     epochs: float (JD) for single-time queries, or dict with start/stop/step for ranges.
     Returns the ephemerides result table.
     Raises RuntimeError if all attempts fail.
+
+    Successful results are kept in the persistent response cache
+    (backend/response_cache.py) for HORIZONS_TTL; failures are not cached.
+    Concurrent calls for the same query share one in-flight fetch.
     """
-    ca_kwargs = {"closest_apparition": True} if closest_apparition else {}
+    params = {"id": obj_name, "id_type": "auto", "location": location_code,
+              "epochs": epochs, "closest_apparition": bool(closest_apparition)}
+    return read_through(
+        "horizons", params,
+        lambda: _horizons_query_uncached(obj_name, location_code, epochs, closest_apparition),
+        ttl=HORIZONS_TTL, wait=HORIZONS_WAIT,
+    )
 
-    # Attempt 1: id_type='smallbody'
-    try:
-        obj = Horizons(id=obj_name, location=location_code, epochs=epochs, id_type='smallbody')
-        return obj.ephemerides(**ca_kwargs)
-    except Exception:
-        pass
+def _horizons_variants(obj_name, closest_apparition=True):
+    """The ordered fallback attempts as (id, id_type, closest_apparition) triples.
 
-    # Attempt 2: no id_type (generic search string)
-    try:
-        obj = Horizons(id=obj_name, location=location_code, epochs=epochs)
-        return obj.ephemerides(**ca_kwargs)
-    except Exception:
-        pass
-
-    # Attempt 3: regex-extracted short ID with three sub-fallbacks
+    1. full name, id_type='smallbody'   2. full name, no id_type (generic search)
+    3–5. regex-extracted short ID with 'smallbody', 'designation', no id_type
+    Returns (variants, short_id or None).
+    """
+    ca = bool(closest_apparition)
+    variants = [(obj_name, 'smallbody', ca), (obj_name, None, ca)]
     match = re.search(r"^(\d+[PDCX]|P/\d{4} [A-Z0-9]+|C/\d{4} [A-Z0-9]+|\d+)", obj_name)
-    if not match:
-        raise RuntimeError(f"All Horizons attempts failed for {obj_name!r}")
+    short_id = match.group(1) if match else None
+    if short_id:
+        variants += [(short_id, id_type, ca) for id_type in ('smallbody', 'designation', None)]
+    return list(dict.fromkeys(variants)), short_id   # '433' is its own short ID
+
+def _run_variant(variant, location_code, epochs):
+    """One Horizons round trip for an (id, id_type, closest_apparition) triple (scheduled)."""
+    target, id_type, ca = variant
+    kw = {"id_type": id_type} if id_type is not None else {}
+    obj = Horizons(id=target, location=location_code, epochs=epochs, **kw)
+    return jpl_client.call(obj.ephemerides, **({"closest_apparition": True} if ca else {}))
+
+def _horizons_query_uncached(obj_name, location_code, epochs, closest_apparition=True):
+    """The network side of _horizons_query.
 
-    short_id = match.group(1)
-    for id_type in ('smallbody', 'designation', None):
+    The resolution strategy memo (kept in the response cache) puts the variant
+    that last worked for ``obj_name`` first, so a hard-to-resolve comet costs
+    one round trip instead of five. Variants whose target Horizons rejected
+    (TARGET_ERRORS: unknown or ambiguous name) are skipped for
+    DEAD_VARIANT_TTL. Other ValueErrors (e.g. no ephemeris for these epochs)
+    and network errors only move on to the next variant — they never mark a
+    variant dead or drop the memo. An open JPL circuit ends the chain at once
+    (CircuitOpenError propagates), and so does superseded work: the scheduler
+    raises cancellation.Cancelled before the next variant's request, which
+    the ``except Exception`` below deliberately does not catch.
+    """
+    variants, short_id = _horizons_variants(obj_name, closest_apparition)
+    memo = lookup("horizons_strategy", {"name": obj_name})
+    memo = tuple(memo) if memo is not None else None
+    if memo in variants:
+        variants.remove(memo)
+        variants.insert(0, memo)
+
+    for variant in variants:
+        dead_key = {"name": obj_name, "variant": variant}
+        if variant != memo and lookup("horizons_dead", dead_key):
+            continue
         try:
-            kw = {"id_type": id_type} if id_type is not None else {}
-            obj = Horizons(id=short_id, location=location_code, epochs=epochs, **kw)
-            return obj.ephemerides(**ca_kwargs)
+            result = _run_variant(variant, location_code, epochs)
+        except jpl_client.CircuitOpenError:
+            raise                     # JPL is down: the other variants would fail the same way
+        except ValueError as e:
+            if any(marker in str(e) for marker in TARGET_ERRORS):
+                store("horizons_dead", dead_key, True, ttl=DEAD_VARIANT_TTL)
+                if variant == memo:
+                    forget("horizons_strategy", {"name": obj_name})
+            continue
         except Exception:
-            pass
+            continue
+        if variant != memo:
+            store("horizons_strategy", {"name": obj_name}, list(variant), ttl=STRATEGY_TTL)
+        return result
 
+    if short_id is None:
+        raise RuntimeError(f"All Horizons attempts failed for {obj_name!r}")
     raise RuntimeError(f"All Horizons attempts failed for {obj_name!r} (short: {short_id!r})")
 
+def _majorbody_ephemerides(obj_name, location_code, epochs):
+    """Horizons ephemerides for a major body (id_type='majorbody'), read through the response cache."""
+    params = {"id": obj_name, "id_type": "majorbody", "location": location_code, "epochs": epochs}
+    return read_through(
+        "horizons", params,
+        lambda: jpl_client.call(
+            Horizons(id=obj_name, location=location_code, epochs=epochs, id_type='majorbody').ephemerides),
+        ttl=HORIZONS_TTL, wait=HORIZONS_WAIT,
+    )
+
 def resolve_simbad(obj_name):
     """Resolves an object name using SIMBAD."""
     try:
@@ -107,6 +176,56 @@ def resolve_horizons_with_mag(obj_name, obs_time_str, section, location_code='50
 
     return obj_name, sky_coord, vmag
 
+def extract_positions(result, section=None):
+    """Convert Horizons result rows → list of {date, jd, ra, dec, vmag} dicts.
+
+    section: 'comets' → reads Tmag; 'asteroids' → reads V; None → vmag=None.
+    vmag is None when the column is absent or the value is masked/non-numeric.
+    """
+    vmag_col = 'Tmag' if section == 'comets' else ('V' if section == 'asteroids' else None)
+    positions = []
+    for row in result:
+        t = Time(float(row['datetime_jd']), format='jd', scale='utc')
+        vmag = None
+        if vmag_col:
+            try:
+                v = float(row[vmag_col])
+                if -10 < v < 40:   # sanity range — allow bright objects (Venus ~-4.5); reject masked/garbage
+                    vmag = round(v, 2)
+            except (KeyError, ValueError, TypeError):
+                pass
+        positions.append({
+            'date': t.datetime.strftime('%Y-%m-%d'),
+            'jd':   float(row['datetime_jd']),
+            'ra':   round(float(row['RA']),  6),
+            'dec':  round(float(row['DEC']), 6),
+            'vmag': vmag,
+        })
+    return positions
+
+
+def get_daily_positions(obj_name, date_str, section, step='6h', location_code='500'):
+    """Geocentric positions from the day before to two days after one UTC date.
+
+    One Horizons range query, location-independent (code '500'). The span
+    covers any session start on ``date_str`` plus a spline margin either side.
+    section: 'comets' / 'asteroids' (small bodies, with magnitude) or
+    'planets' (major bodies, no magnitude).
+    Returns a list of {date, jd, ra, dec, vmag} dicts (see extract_positions).
+    """
+    day = Time(f"{date_str} 00:00:00", scale='utc')
+    epochs = {
+        'start': (day - 1 * u.day).datetime.strftime('%Y-%m-%d %H:%M'),
+        'stop': (day + 2 * u.day).datetime.strftime('%Y-%m-%d %H:%M'),
+        'step': step,
+    }
+    if section == 'planets':
+        return extract_positions(_majorbody_ephemerides(obj_name, location_code, epochs))
+    result = _horizons_query(obj_name, location_code, epochs,
+                             closest_apparition=(section == 'comets'))
+    return extract_positions(result, section)
+
+
 def get_horizons_ephemerides(obj_name, start_time, duration_minutes=240, step_minutes=10, location_code='500'):
     """Queries JPL Horizons for a range of times to get dynamic coordinates."""
     try:
@@ -124,9 +243,9 @@ def get_horizons_ephemerides(obj_name, start_time, duration_minutes=240, step_mi
         # Query Horizons with epochs dict
         result = _horizons_query(obj_name, location_code, epochs)
 
-        # Convert result table to list of SkyCoords
-        coords = [SkyCoord(ra=row['RA']*u.deg, dec=row['DEC']*u.deg, frame='icrs') for row in result]
-        return coords
+        # One array-valued SkyCoord for the whole table (no per-row objects)
+        return SkyCoord(ra=np.asarray(result['RA'], dtype=float) * u.deg,
+                        dec=np.asarray(result['DEC'], dtype=float) * u.deg, frame='icrs')
 
     except Exception as e:
         raise RuntimeError(f"JPL Horizons ephemeris lookup failed: {e}")
@@ -136,8 +255,7 @@ def resolve_planet(obj_name, obs_time_str="2026-02-13 00:30:00", location_code='
     try:
         obs_time = Time(obs_time_str)
         # Use id_type='majorbody' for planets. No closest_apparition needed.
-        obj = Horizons(id=obj_name, location=location_code, epochs=obs_time.jd, id_type='majorbody')
-        result = obj.ephemerides()
+        result = _majorbody_ephemerides(obj_name, location_code, obs_time.jd)
 
         ra = result['RA'][0] * u.deg
         dec = result['DEC'][0] * u.deg
@@ -160,10 +278,9 @@ def get_planet_ephemerides(obj_name, start_time, duration_minutes=240, step_minu
             'step': f"{step_minutes}m"
         }
 
-        obj = Horizons(id=obj_name, location=location_code, epochs=epochs, id_type='majorbody')
-        result = obj.ephemerides()
+        result = _majorbody_ephemerides(obj_name, location_code, epochs)
 
-        coords = [SkyCoord(ra=row['RA']*u.deg, dec=row['DEC']*u.deg, frame='icrs') for row in result]
-        return coords
+        return SkyCoord(ra=np.asarray(result['RA'], dtype=float) * u.deg,
+                        dec=np.asarray(result['DEC'], dtype=float) * u.deg, frame='icrs')
     except Exception as e:
         raise RuntimeError(f"JPL Horizons planetary ephemeris lookup failed: {e}")
\ No newline at end of file
@@ -0,0 +1,353 @@
+"""backend/response_cache.py — Persistent JPL response cache (SQLite, WAL mode).
+
+Horizons and SBDB answers used to live only in per-process ``st.cache_data``
+memory (or nowhere), so a container restart or a second Streamlit worker
+started cold and re-queried JPL for everything. ``ResponseCache`` keeps them
+in one SQLite file shared by every thread and process on the host:
+
+- keys are normalized ``(endpoint, params)`` — id, id_type, epochs, location,
+  … — serialized as canonical JSON, so ``"  3I "`` and ``"3I"``, or a JD given
+  as 2461000.5 and 2461000.50000001, hit the same entry;
+- every entry has its own expiry (``ttl``); expired rows are misses and are
+  deleted on access or by ``prune()``;
+- the file is bounded by entry count and total bytes. Once a bound is
+  exceeded, least recently used rows are deleted down to a low-water mark
+  (``EVICT_TO`` of each bound) in one statement, so eviction runs rarely
+  rather than on every write. A per-process running estimate of the totals
+  decides when to check the real ones;
+- WAL journaling lets readers proceed while one writer commits, and SQLite's
+  own locking (with a busy timeout) serializes writers across processes.
+  Each thread (and each forked process) gets its own connection.
+
+Values are pickled — the file is a private cache, never shared or committed.
+Any SQLite error degrades to "not cached": a broken or locked cache file never
+breaks a lookup.
+
+``read_through(endpoint, params, fetch, ttl)`` is what the resolvers call
+(``lookup`` / ``store`` / ``forget`` for small bookkeeping records). It runs
+through the process-wide single-flight layer (backend/singleflight.py), so
+concurrent misses for one key send one request. All use the
+process default cache (``default_cache()``), whose path comes from the
+``JPL_RESPONSE_CACHE`` environment variable (empty string disables it).
+Inspect or prune the file with scripts/jpl_response_cache.py.
+"""
+
+import json
+import math
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from backend.singleflight import FLIGHTS
+
+DEFAULT_PATH = "jpl_response_cache.sqlite3"
+ENV_VAR = "JPL_RESPONSE_CACHE"
+DEFAULT_MAX_ENTRIES = 20000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+BUSY_TIMEOUT_S = 30
+JD_DECIMALS = 6          # epochs closer than ~0.09 s share a key
+EVICT_TO = 0.9           # eviction low-water mark, as a fraction of each bound
+RESYNC_EVERY = 1000      # puts between exact size checks (other processes write too)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    endpoint    TEXT NOT NULL,
+    value       BLOB NOT NULL,
+    size        INTEGER NOT NULL,
+    created     REAL NOT NULL,
+    expires     REAL,
+    last_access REAL NOT NULL
+);
+DROP INDEX IF EXISTS responses_last_access;
+CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access, size);
+CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires);
+"""
+
+
+def _normalize(value):
+    """Canonical JSON-able form of a key component."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, bool) or value is None or isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return round(value, JD_DECIMALS) if math.isfinite(value) else str(value)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if hasattr(value, "item"):          # NumPy scalar
+        return _normalize(value.item())
+    return str(value)
+
+
+def make_key(endpoint, params):
+    """Canonical cache key for one request: endpoint + normalized params."""
+    return json.dumps([endpoint, _normalize(params)], sort_keys=True, separators=(",", ":"))
+
+
+class ResponseCache:
+    """Disk-backed key → value store with per-entry TTL and LRU size bounds.
+
+    Args:
+        path:        SQLite file (created on first use).
+        max_entries: Evict least-recently-used rows beyond this count.
+        max_bytes:   … or beyond this many bytes of pickled values.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._approx = None         # [entries, bytes] estimate since the last exact check
+        self._since_sync = 0
+
+    # ── connection management ──────────────────────────────────────────────
+
+    def _conn(self):
+        """This thread's connection (reopened after a fork)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_S, isolation_level=None,
+                               check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_S * 1000}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.executescript(_SCHEMA)
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def close(self):
+        """Close this thread's connection (others close when their thread exits)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _count(self, attr):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    # ── core operations ────────────────────────────────────────────────────
+
+    def get(self, key, default=None):
+        """Live value for ``key`` (refreshing its LRU position), else ``default``."""
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT value, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[1] is not None and row[1] <= now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self._count("misses")
+                return default
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            value = pickle.loads(row[0])
+        except (sqlite3.Error, OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            self._count("errors")
+            return default
+        self._count("hits")
+        return value
+
+    def put(self, key, value, ttl=None, endpoint=""):
+        """Store ``value`` for ``ttl`` seconds (None = until evicted). Returns success."""
+        now = time.time()
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, value, size, created, expires, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, blob, len(blob), now, None if ttl is None else now + ttl, now),
+            )
+            self._evict(conn, len(blob))
+        except (sqlite3.Error, OSError, pickle.PicklingError, TypeError, AttributeError):
+            self._count("errors")
+            return False
+        return True
+
+    def delete(self, key):
+        """Remove one entry. Returns True if it existed."""
+        try:
+            return self._conn().execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount > 0
+        except (sqlite3.Error, OSError):
+            self._count("errors")
+            return False
+
+    def _over(self, count, total):
+        return count > self.max_entries or total > self.max_bytes
+
+    def _evict(self, conn, added_bytes=None):
+        """After a put of ``added_bytes`` (None: check now): evict LRU rows if over a bound.
+
+        The exact totals are only read when the running estimate crosses a
+        bound (or every RESYNC_EVERY puts); eviction then deletes down to
+        EVICT_TO of both bounds in one DELETE per round.
+        """
+        with self._lock:
+            if added_bytes is not None and self._approx is not None and self._since_sync < RESYNC_EVERY:
+                self._approx[0] += 1                   # over-counts replacements: errs towards checking
+                self._approx[1] += added_bytes
+                self._since_sync += 1
+                if not self._over(*self._approx):
+                    return 0
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        dropped = 0
+        if self._over(count, total):
+            low_entries = math.ceil(self.max_entries * EVICT_TO)
+            low_bytes = math.ceil(self.max_bytes * EVICT_TO)
+            while count > low_entries or total > low_bytes:
+                by_bytes = math.ceil((total - low_bytes) * count / total) if total > low_bytes else 0
+                n = max(count - low_entries, by_bytes, 1)
+                removed = conn.execute(
+                    "DELETE FROM responses WHERE key IN"
+                    " (SELECT key FROM responses ORDER BY last_access LIMIT ?)", (n,)).rowcount
+                if removed <= 0:
+                    break
+                dropped += removed
+                count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        with self._lock:
+            self._approx, self._since_sync = [count, total], 0
+        return dropped
+
+    def get_or_fetch(self, endpoint, params, fetch, ttl=None):
+        """Cached value for (endpoint, params), calling ``fetch()`` on a miss.
+
+        ``ttl`` is seconds, None (no expiry) or a callable value → seconds/None.
+        Exceptions from ``fetch`` propagate and nothing is stored.
+        """
+        key = make_key(endpoint, params)
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        value = fetch()
+        self.put(key, value, ttl(value) if callable(ttl) else ttl, endpoint=endpoint)
+        return value
+
+    # ── maintenance (scripts/jpl_response_cache.py) ────────────────────────
+
+    def prune(self):
+        """Delete expired rows, then enforce the size bounds. Returns rows removed."""
+        conn = self._conn()
+        cur = conn.execute("DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+        return cur.rowcount + self._evict(conn)
+
+    def clear(self, endpoint=None):
+        """Delete every row (or one endpoint's). Returns rows removed."""
+        conn = self._conn()
+        if endpoint is None:
+            return conn.execute("DELETE FROM responses").rowcount
+        return conn.execute("DELETE FROM responses WHERE endpoint = ?", (endpoint,)).rowcount
+
+    def vacuum(self):
+        """Checkpoint the WAL and compact the file."""
+        conn = self._conn()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+
+    def entries(self, endpoint=None, limit=50):
+        """Most recently used rows: list of {key, endpoint, size, created, expires, last_access}."""
+        sql = "SELECT key, endpoint, size, created, expires, last_access FROM responses"
+        args = ()
+        if endpoint is not None:
+            sql += " WHERE endpoint = ?"
+            args = (endpoint,)
+        sql += " ORDER BY last_access DESC LIMIT ?"
+        cols = ("key", "endpoint", "size", "created", "expires", "last_access")
+        return [dict(zip(cols, row)) for row in self._conn().execute(sql, args + (limit,))]
+
+    def stats(self):
+        """Process-local hit/miss/error counters plus on-disk totals per endpoint."""
+        now = time.time()
+        rows = self._conn().execute(
+            "SELECT endpoint, COUNT(*), COALESCE(SUM(size), 0),"
+            " SUM(CASE WHEN expires IS NOT NULL AND expires <= ? THEN 1 ELSE 0 END)"
+            " FROM responses GROUP BY endpoint", (now,)).fetchall()
+        endpoints = {ep: {"entries": n, "bytes": size, "expired": expired} for ep, n, size, expired in rows}
+        with self._lock:
+            counters = {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+        return {
+            **counters,
+            "entries": sum(e["entries"] for e in endpoints.values()),
+            "bytes": sum(e["bytes"] for e in endpoints.values()),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "endpoints": endpoints,
+            "path": self.path,
+        }
+
+
+# ── process default ────────────────────────────────────────────────────────
+
+_UNSET = object()
+_default = _UNSET
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """The process-wide cache (None when disabled via ``JPL_RESPONSE_CACHE=''``)."""
+    global _default
+    with _default_lock:
+        if _default is _UNSET:
+            path = os.environ.get(ENV_VAR, DEFAULT_PATH)
+            _default = ResponseCache(path) if path else None
+        return _default
+
+
+def set_default_cache(cache):
+    """Replace the process-wide cache (None disables it).
+
+    Returns the previous setting; passing it back restores it exactly
+    (including "not created yet").
+    """
+    global _default
+    with _default_lock:
+        previous, _default = _default, cache
+    return previous
+
+
+def read_through(endpoint, params, fetch, ttl=None, wait=None):
+    """``default_cache().get_or_fetch(...)``, or just ``fetch()`` when disabled.
+
+    Identical concurrent calls share one lookup-and-fetch (backend/singleflight.py);
+    ``wait`` bounds how long a joining caller waits before FlightTimeout.
+    """
+    cache = default_cache()
+    if cache is None:
+        return FLIGHTS.do(make_key(endpoint, params), fetch, wait)
+    return FLIGHTS.do(make_key(endpoint, params),
+                      lambda: cache.get_or_fetch(endpoint, params, fetch, ttl), wait)
+
+
+def lookup(endpoint, params, default=None):
+    """Cached value for (endpoint, params) in the process default cache, else ``default``."""
+    cache = default_cache()
+    if cache is None:
+        return default
+    return cache.get(make_key(endpoint, params), default)
+
+
+def store(endpoint, params, value, ttl=None):
+    """Write (endpoint, params) → value to the process default cache (no-op when disabled)."""
+    cache = default_cache()
+    if cache is not None:
+        cache.put(make_key(endpoint, params), value, ttl, endpoint=endpoint)
+
+
+def forget(endpoint, params):
+    """Drop one entry from the process default cache. Returns True if it existed."""
+    cache = default_cache()
+    return cache is not None and cache.delete(make_key(endpoint, params))
@@ -1,35 +1,216 @@
 # backend/sbdb.py
-"""JPL Small Body Database name lookup — no Streamlit dependency."""
+"""JPL Small Body Database name lookup — no Streamlit dependency.
+
+``sbdb_lookup`` resolves one name per request (HTTP 300 multi-match answers
+cost a second one). ``sbdb_lookup_many`` resolves a whole watchlist through
+the SBDB *query* API instead: every name becomes an exact designation (or
+name) constraint, ``BULK_CHUNK`` of them are OR-ed into one request, and the
+returned rows — all candidates for every name at once — are matched back
+locally, the first row per name being the primary just as in a 300 list.
+A 1,000-object list costs ~10 requests; only names no row matches exactly
+go through ``sbdb_lookup``'s fuzzy search.
+"""
+import json
+import re
+
 import requests
 
+from backend import jpl_client
+from backend.response_cache import lookup, read_through, store
+from backend.singleflight import FlightTimeout
+
 SBDB_API = "https://ssd-api.jpl.nasa.gov/sbdb.api"
+SBDB_QUERY_API = "https://ssd-api.jpl.nasa.gov/sbdb_query.api"
+SBDB_TTL = 30 * 86400           # name → SPK-ID mappings practically never change
+SBDB_NOT_FOUND_TTL = 86400      # new discoveries appear in SBDB within a day or so
+BULK_CHUNK = 100                # designation constraints per query-API request
+
+_QUERY_FIELDS = "spkid,pdes,prefix,name"
+_MISSING = object()
+_COMET_PREFIXED = re.compile(r"^([PCDXIA])/\s*(.+)$")                 # 'C/2024 G3', 'P/2019 LD2'
+_PERIODIC = re.compile(r"^(\d+[PDI](?:-[A-Z]+)?)(?:/.*)?$")          # '24P/Schaumasse', '73P-B', '3I'
+_PROVISIONAL = re.compile(r"^\d{4}\s+[A-Z]{1,2}\d*$")                 # '2001 FD58'
+_NUMBERED = re.compile(r"^(\d+)(?:\s+.*)?$")                          # '433 Eros', '99942'
+
 
+def is_sbdb_internal_id(spk_id):
+    """True for SBDB's internal SPK-IDs in [20M, 30M), which JPL Horizons rejects.
 
-def sbdb_lookup(name, timeout=10, _depth=0):
+    SBDB returns 20000000 + catalog number for numbered bodies (e.g. 20000433
+    for Eros); the Horizons SPK-ID of a numbered asteroid is 2000000 + N.
+    Non-numeric IDs (designations like 'C/2025 F2', '3I') are never internal.
+    """
+    try:
+        return 20_000_000 <= int(spk_id) < 30_000_000
+    except (ValueError, TypeError):
+        return False
+
+
+def sbdb_lookup(name, timeout=10):
     """Query JPL SBDB for a small body name -> SPK-ID string, or None if not found.
 
     Returns the SPK-ID as a string (e.g. '90004812'), or None on any failure.
     Handles HTTP 300 (multiple matches) by picking the primary object and recursing.
+    Answers (including "not found") are kept in the persistent response cache
+    (backend/response_cache.py); network and parse errors are not. Concurrent
+    lookups of the same name share one request.
     """
     try:
-        # full-prec=0 suppresses extended orbital element data — only object identity needed
-        resp = requests.get(SBDB_API, params={"sstr": name, "full-prec": "0"}, timeout=timeout)
-        if resp.status_code == 300:
-            # Multiple matches — pick the primary (first in list) and recurse once
-            if _depth > 1:
-                return None
-            data = resp.json()
-            matches = data.get("list", [])
-            if not matches:
-                return None
-            primary_pdes = matches[0].get("pdes")
-            if not primary_pdes:
-                return None
-            return sbdb_lookup(primary_pdes, timeout=timeout, _depth=_depth + 1)
-        resp.raise_for_status()
-        data = resp.json()
-        if "object" in data and "spkid" in data["object"]:
-            return str(data["object"]["spkid"])
+        return read_through(
+            "sbdb", {"sstr": name},
+            lambda: _sbdb_query(name, timeout),
+            ttl=lambda spkid: SBDB_TTL if spkid else SBDB_NOT_FOUND_TTL,
+            wait=6 * timeout,            # a 300 redirect × three scheduler attempts
+        )
+    except (requests.exceptions.RequestException, jpl_client.CircuitOpenError, FlightTimeout,
+            ValueError, KeyError):
         return None
-    except (requests.exceptions.RequestException, ValueError, KeyError):
+
+
+def sbdb_lookup_many(names, timeout=30):
+    """Resolve many small body names at once → {name: SPK-ID string or None}.
+
+    Same answers and cache entries as calling ``sbdb_lookup`` per name, in a
+    handful of query-API requests: cached names cost nothing, the rest are
+    matched by exact designation ``BULK_CHUNK`` at a time, and only names no
+    row matches fall back to ``sbdb_lookup``. A chunk whose request fails
+    degrades to per-name lookups; an open JPL circuit leaves its names None
+    (and uncached) without any request.
+    """
+    result, pending = {}, {}
+    for name in dict.fromkeys(n for n in names if n):
+        cached = lookup("sbdb", {"sstr": name}, _MISSING)
+        if cached is not _MISSING:
+            result[name] = cached
+            continue
+        key = designation_key(name)
+        if key is None:
+            result[name] = sbdb_lookup(name)
+        else:
+            pending.setdefault(key, []).append(name)
+
+    keys = list(pending)
+    for start in range(0, len(keys), BULK_CHUNK):
+        chunk = keys[start:start + BULK_CHUNK]
+        try:
+            matches = _bulk_query(chunk, timeout)
+        except jpl_client.CircuitOpenError:
+            result.update({n: None for key in chunk for n in pending[key]})
+            continue
+        except (requests.exceptions.RequestException, ValueError, KeyError):
+            matches = {}
+        for key in chunk:
+            for name in pending[key]:
+                spkid = matches.get(key)
+                if spkid:
+                    store("sbdb", {"sstr": name}, spkid, ttl=SBDB_TTL)
+                    result[name] = spkid
+                else:
+                    result[name] = sbdb_lookup(name, timeout=min(timeout, 10))
+    return result
+
+
+def designation_key(name):
+    """Display name → (field, value) an SBDB row must match exactly, or None.
+
+    'C/2024 G3 (ATLAS)' → ('pdes', 'C/2024 G3'); '24P/Schaumasse' → ('pdes', '24P');
+    '433 Eros' → ('pdes', '433'); '2001 FD58' → ('pdes', '2001 FD58');
+    'Apophis' → ('name', 'Apophis').
+    """
+    base = str(name).split("(")[0].strip()
+    if not base:
         return None
+    m = _COMET_PREFIXED.match(base)
+    if m:
+        return "pdes", f"{m.group(1)}/{m.group(2).strip()}"
+    m = _PERIODIC.match(base)
+    if m:
+        return "pdes", m.group(1)
+    if _PROVISIONAL.match(base):
+        return "pdes", " ".join(base.split())
+    m = _NUMBERED.match(base)
+    if m:
+        return "pdes", m.group(1)
+    return "name", base
+
+
+def _constraint(key):
+    """sb-cdata condition for one designation key (comet prefixes are a separate field)."""
+    field, value = key
+    if field == "pdes":
+        m = _COMET_PREFIXED.match(value)
+        return f"pdes|EQ|{m.group(2) if m else value}"
+    return f"name|EQ|{value}"
+
+
+def _row_keys(row):
+    """Every designation key an SBDB query row answers."""
+    pdes, prefix, name = row.get("pdes"), row.get("prefix"), row.get("name")
+    keys = set()
+    if pdes:
+        keys.add(("pdes", f"{prefix}/{pdes}" if prefix and "/" not in pdes else pdes))
+        if not prefix or _PERIODIC.match(pdes):
+            keys.add(("pdes", pdes))
+    if name:
+        keys.add(("name", name.strip()))
+    return keys
+
+
+def _get_query(params, timeout):
+    """One SBDB query-API request; throttling statuses raise so the JPL scheduler backs off."""
+    resp = requests.get(SBDB_QUERY_API, params=params, timeout=timeout)
+    if resp.status_code in jpl_client.THROTTLE_STATUS:
+        resp.raise_for_status()
+    return resp
+
+
+def _bulk_query(keys, timeout):
+    """One query-API request for many designation keys → {key: primary SPK-ID}.
+
+    Raises on network / malformed-response errors.
+    """
+    conditions = list(dict.fromkeys(_constraint(k) for k in keys))
+    params = {"fields": _QUERY_FIELDS, "sb-cdata": json.dumps({"OR": conditions})}
+    resp = jpl_client.call(_get_query, params, timeout)
+    resp.raise_for_status()
+    data = resp.json()
+    fields = data["fields"] if data.get("data") else []
+    wanted, found = set(keys), {}
+    for values in data.get("data", []):
+        row = dict(zip(fields, values))
+        if row.get("spkid") is None:
+            continue
+        for key in _row_keys(row) & wanted:
+            found.setdefault(key, str(row["spkid"]))      # first row = primary, as in a 300 list
+    return found
+
+
+def _get(params, timeout):
+    """One SBDB request; throttling statuses raise so the JPL scheduler backs off."""
+    resp = requests.get(SBDB_API, params=params, timeout=timeout)
+    if resp.status_code in jpl_client.THROTTLE_STATUS:
+        resp.raise_for_status()
+    return resp
+
+
+def _sbdb_query(name, timeout, _depth=0):
+    """One SBDB lookup; raises on network / malformed-response errors."""
+    # full-prec=0 suppresses extended orbital element data — only object identity needed
+    resp = jpl_client.call(_get, {"sstr": name, "full-prec": "0"}, timeout)
+    if resp.status_code == 300:
+        # Multiple matches — pick the primary (first in list) and recurse once
+        if _depth > 1:
+            return None
+        data = resp.json()
+        matches = data.get("list", [])
+        if not matches:
+            return None
+        primary_pdes = matches[0].get("pdes")
+        if not primary_pdes:
+            return None
+        return _sbdb_query(primary_pdes, timeout, _depth=_depth + 1)
+    resp.raise_for_status()
+    data = resp.json()
+    if "object" in data and "spkid" in data["object"]:
+        return str(data["object"]["spkid"])
+    return None
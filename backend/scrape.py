@@ -1,51 +1,21 @@
 import re
-import sys
-import asyncio
 import logging
-import subprocess
-from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
-from scrapling.fetchers import StealthyFetcher
-
-logger = logging.getLogger(__name__)
-
-_browser_ready = False
 
+from backend.browser import BROWSER
 
-def _ensure_browser():
-    """Install Patchright Chromium if not already present (idempotent, runs once per session)."""
-    global _browser_ready
-    if _browser_ready:
-        return
-    try:
-        subprocess.run(
-            ["patchright", "install", "chromium"],
-            check=True, capture_output=True, text=True, timeout=120,
-        )
-    except Exception as e:
-        logger.warning(f"Browser auto-install note: {e}")
-    _browser_ready = True
+logger = logging.getLogger(__name__)
 
 
 def _fetch_page(url, **kwargs):
-    """Run StealthyFetcher.fetch in a worker thread to avoid event loop conflicts.
-
-    Fixes two issues:
-    - Streamlit's running asyncio loop conflicts with Playwright's sync API
-    - Windows SelectorEventLoop doesn't support subprocess (needed by Playwright)
+    """Fetch ``url`` through the shared browser worker (backend/browser.py).
 
-    set_event_loop_policy is process-wide, which is needed because Playwright
-    creates its OWN event loop in a background thread via new_event_loop().
+    The worker keeps one stealth browser with a pool of reusable tabs on its
+    own event-loop thread, so scrapes neither launch a browser nor clash with
+    Streamlit's event loop, and different pages can load concurrently.
     """
-    if sys.platform == 'win32':
-        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-
-    def _worker():
-        return StealthyFetcher.fetch(url, **kwargs)
-
-    with ThreadPoolExecutor(max_workers=1) as executor:
-        return executor.submit(_worker).result()
+    return BROWSER.fetch(url, **kwargs)
 
 
 def _deep_text(element):
@@ -66,8 +36,7 @@ def scrape_unistellar_table():
 
     try:
         logger.debug("Connecting to Unistellar Alerts...")
-        _ensure_browser()
-        page = _fetch_page(url, headless=True, network_idle=True)
+        page = _fetch_page(url, network_idle=True)
 
         # Get headers
         headers = [_deep_text(h).replace('\n', ' ') for h in page.css("table th")]
@@ -118,8 +87,7 @@ def scrape_unistellar_priority_comets():
     url = "https://science.unistellar.com/comets/missions/"
 
     try:
-        _ensure_browser()
-        page = _fetch_page(url, headless=True, network_idle=True)
+        page = _fetch_page(url, network_idle=True)
 
         # Collect text from headings and content sections (Divi theme structure)
         elements = page.css("h1,h2,h3,h4,p,.et_pb_text_inner")
@@ -181,8 +149,7 @@ def scrape_unistellar_priority_asteroids():
     url = "https://science.unistellar.com/planetary-defense/missions/"
 
     try:
-        _ensure_browser()
-        page = _fetch_page(url, headless=True, network_idle=True)
+        page = _fetch_page(url, network_idle=True)
 
         # Each mission target is an <h3> heading on the page
         found = []
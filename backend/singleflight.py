@@ -0,0 +1,118 @@
+"""backend/singleflight.py — Coalesce identical concurrent JPL fetches.
+
+The response cache (backend/response_cache.py) only helps once an answer has
+landed: when several sessions open the comet page together, every worker
+that misses the same ``(endpoint, params)`` key before the first answer is
+stored sends its own Horizons / SBDB request. ``SingleFlight.do(key, fn)``
+makes the first caller for a key the *leader* — it runs ``fn`` — while every
+concurrent caller for the same key waits on the leader's future and gets the
+same result (or the same exception). Peak JPL load then scales with distinct
+objects, not with concurrent users.
+
+- followers wait at most ``timeout`` seconds (per call, so each key type can
+  pick its own bound) and then raise ``FlightTimeout``; the leader carries
+  on and its answer is still cached for the next caller;
+- a leader calling ``do`` again for its own key runs ``fn`` directly rather
+  than waiting on itself;
+- a leader whose own work was superseded (backend/cancellation.py) does not
+  cancel its followers: a follower that still wants the answer takes over
+  as the new leader instead of receiving ``Cancelled``;
+- nothing is remembered once a flight lands — caching stays the response
+  cache's job.
+
+``FLIGHTS`` is the process-wide instance ``read_through`` uses; ``stats()``
+reports calls, executions, coalesced calls, follower timeouts, takeovers
+from cancelled leaders and flights currently in the air.
+"""
+
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from backend import cancellation
+
+DEFAULT_TIMEOUT = 120.0    # seconds a follower waits for the leader
+
+
+class FlightTimeout(TimeoutError):
+    """Raised to a caller that gave up waiting for an identical in-flight fetch."""
+
+
+class SingleFlight:
+    """Process-wide map key → in-flight future, shared by every thread."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._flights = {}          # key → (Future, leader thread ident)
+        self._m = {"calls": 0, "executions": 0, "coalesced": 0, "timeouts": 0, "takeovers": 0}
+
+    def do(self, key, fn, timeout=None):
+        """``fn()`` once for all concurrent callers of ``key``; everyone gets its result.
+
+        Exceptions from ``fn`` propagate to the leader and every follower,
+        except the leader's ``Cancelled``: live followers then retry. Followers
+        raise FlightTimeout after ``timeout`` seconds (default: the instance's).
+        """
+        me = threading.get_ident()
+        with self._lock:
+            self._m["calls"] += 1
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                if flight is None:
+                    future = Future()
+                    self._flights[key] = (future, me)
+                if flight is None or flight[1] == me:
+                    self._m["executions"] += 1
+                else:
+                    self._m["coalesced"] += 1
+            if flight is None:
+                return self._lead(key, future, fn)
+            if flight[1] == me:                 # re-entrant call from the leader itself
+                return fn()
+            try:
+                return self._wait(key, flight[0], self.timeout if timeout is None else timeout)
+            except cancellation.Cancelled:
+                cancellation.check()            # our own work was superseded too
+                with self._lock:
+                    self._m["takeovers"] += 1
+
+    def _lead(self, key, future, fn):
+        """Run ``fn`` for everyone waiting on ``key``; the flight lands before they wake."""
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._land(key)
+            future.set_exception(exc)
+            raise
+        self._land(key)
+        future.set_result(result)
+        return result
+
+    def _land(self, key):
+        with self._lock:
+            self._flights.pop(key, None)
+
+    def _wait(self, key, future, timeout):
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            if future.done():                   # landed with a TimeoutError of its own
+                raise
+            with self._lock:
+                self._m["timeouts"] += 1
+            raise FlightTimeout(f"identical JPL request still in flight after {timeout:g} s: {key!r}"[:300])
+
+    def stats(self):
+        """Counters snapshot plus in-flight keys and the share of calls that were coalesced."""
+        with self._lock:
+            return {
+                **self._m,
+                "in_flight": len(self._flights),
+                "coalesce_rate": self._m["coalesced"] / self._m["calls"] if self._m["calls"] else 0.0,
+            }
+
+
+# Process-wide instance shared by every session and worker thread
+FLIGHTS = SingleFlight()
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+benchmarks.py — Timing harness for the batched astronomy engines in backend/.
+
+Each benchmark compares the current batched implementation against the
+pre-vectorization per-step / per-row algorithm it replaced, and checks that
+both produce the same output.
+
+Run locally (no network needed):
+    python scripts/benchmarks.py trajectory
+    python scripts/benchmarks.py observability
+    python scripts/benchmarks.py fastsky
+    python scripts/benchmarks.py peak_alt
+    python scripts/benchmarks.py planning
+    python scripts/benchmarks.py constellations
+    python scripts/benchmarks.py moonsun
+    python scripts/benchmarks.py ephemeris
+    python scripts/benchmarks.py ephemeris_store
+    python scripts/benchmarks.py orbits
+    python scripts/benchmarks.py all
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytz
+from astropy import units as u
+from astropy.coordinates import AltAz, EarthLocation, SkyCoord
+from astropy.time import Time
+
+from backend import constellations, fastsky, orbits
+from backend.config import lookup_cached_position, read_ephemeris_cache
+from backend.ephemeris import EphemerisReader, load_store, write_store
+from backend.moonsun import MoonSunEphemeris, _get_moon, _get_sun
+from backend.app_logic import _check_row_observability, evaluate_observability, moon_positions_at
+from backend.core import (
+    PLANNING_COLUMNS, azimuth_to_compass, calculate_planning_info, calculate_planning_info_batch,
+    compute_peak_alt_batch, compute_peak_alt_in_window, compute_trajectory, moon_sep_deg,
+)
+
+# Same suppression as app.py — Moon separation crosses GCRS→ICRS on every call
+warnings.filterwarnings("ignore", message=".*transforming other coordinates.*")
+
+LOCATION = EarthLocation(lat=40.7 * u.deg, lon=-74.0 * u.deg)
+START = pytz.timezone("America/New_York").localize(datetime(2026, 7, 1, 20, 0))
+
+
+def _timed(fn, repeat=3):
+    """Return (best wall time in seconds, last result) over `repeat` runs."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+# ── Trajectory ──────────────────────────────────────────────────────────────
+
+def _trajectory_per_step(sky_coord, location, start_time_local, duration_minutes, step_minutes):
+    """Reference: the original one-transform-per-step compute_trajectory loop."""
+    results = []
+    time_steps = [start_time_local + timedelta(minutes=i) for i in range(0, duration_minutes + 1, step_minutes)]
+    constellation = sky_coord.get_constellation()
+    for t in time_steps:
+        time_utc = Time(t.astimezone(pytz.utc))
+        altaz = sky_coord.transform_to(AltAz(obstime=time_utc, location=location))
+        try:
+            moon_sep_val = round(moon_sep_deg(sky_coord, _get_moon(time_utc, location)), 1)
+        except Exception:
+            moon_sep_val = None
+        results.append({
+            "Local Time": t.strftime('%Y-%m-%d %H:%M:%S'),
+            "RA": sky_coord.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True),
+            "Dec": sky_coord.dec.to_string(sep=('° ', "' ", '"'), precision=0, alwayssign=True, pad=True),
+            "Azimuth (°)": round(altaz.az.degree, 2),
+            "Altitude (°)": round(altaz.alt.degree, 2),
+            "Direction": azimuth_to_compass(altaz.az.degree),
+            "Constellation": constellation,
+            "Moon Sep (°)": moon_sep_val,
+        })
+    return results
+
+
+def bench_trajectory(duration_minutes=720):
+    sc = SkyCoord(ra=279.23 * u.deg, dec=38.78 * u.deg, frame='icrs')  # Vega
+    print(f"compute_trajectory — {duration_minutes} min window")
+    for step in (10, 1):
+        n = duration_minutes // step + 1
+        t_old, rows_old = _timed(
+            lambda: _trajectory_per_step(sc, LOCATION, START, duration_minutes, step), repeat=1)
+        t_new, rows_new = _timed(
+            lambda: compute_trajectory(sc, LOCATION, START, duration_minutes=duration_minutes, step_minutes=step))
+        same = rows_old == rows_new
+        print(f"  step={step:>2} min  ({n:>4} steps)  per-step {t_old * 1000:9.1f} ms   "
+              f"batched {t_new * 1000:7.1f} ms   speedup {t_old / t_new:6.1f}x   identical={same}")
+
+
+# ── Observability ───────────────────────────────────────────────────────────
+
+def bench_observability(n_targets=500):
+    rng = np.random.default_rng(0)
+    ra = rng.uniform(0, 360, n_targets)
+    dec = np.degrees(np.arcsin(rng.uniform(-1, 1, n_targets)))
+    check_times = [START + timedelta(minutes=m) for m in (0, 120, 240)]
+    filters = dict(moon_illum=60.0, min_alt=20, max_alt=90, az_dirs={"S", "SE", "SW"}, min_moon_sep=30)
+    print(f"observability — {n_targets} targets × {len(check_times)} check times")
+
+    def per_row():
+        # Reference: the original section loop — Moon and AltAz recomputed per row
+        out = []
+        for r, d in zip(ra, dec):
+            sc = SkyCoord(ra=r * u.deg, dec=d * u.deg, frame='icrs')
+            mlocs = [_get_moon(Time(t), LOCATION) for t in check_times]
+            out.append(_check_row_observability(
+                sc, "Visible", LOCATION, check_times, mlocs[0], mlocs,
+                filters["moon_illum"], filters["min_alt"], filters["max_alt"],
+                filters["az_dirs"], filters["min_moon_sep"]))
+        return out
+
+    def batched():
+        mlocs = moon_positions_at(check_times, LOCATION)
+        obs, reasons, seps, stats = evaluate_observability(ra, dec, LOCATION, check_times,
+                                                           moon_coords=mlocs, **filters)
+        return [(bool(o), r, s, st) for o, r, s, st in zip(obs, reasons, seps, stats)]
+
+    t_old, rows_old = _timed(per_row, repeat=1)
+    t_new, rows_new = _timed(batched)
+    print(f"  per-row {t_old * 1000:9.1f} ms   batched {t_new * 1000:7.1f} ms   "
+          f"speedup {t_old / t_new:6.1f}x   identical={rows_old == rows_new}")
+
+
+# ── fastsky vs astropy AltAz ────────────────────────────────────────────────
+
+def bench_fastsky(n_targets=2000, n_times=25):
+    rng = np.random.default_rng(1)
+    ra = rng.uniform(0, 360, n_targets)
+    dec = np.degrees(np.arcsin(rng.uniform(-1, 1, n_targets)))
+    times = [START + timedelta(minutes=30 * i) for i in range(n_times)]
+    print(f"alt/az — {n_targets} targets × {n_times} times")
+
+    def astropy_altaz():
+        sc = SkyCoord(ra=ra[:, None] * u.deg, dec=dec[:, None] * u.deg, frame='icrs')
+        aa = sc.transform_to(AltAz(obstime=Time(times)[None, :], location=LOCATION))
+        return aa.alt.deg, aa.az.deg
+
+    t_ref, (alt_ref, az_ref) = _timed(astropy_altaz)
+    t_fast, (alt, az) = _timed(lambda: fastsky.altaz(ra, dec, LOCATION, times))
+    d_alt = np.abs(alt - alt_ref).max()
+    d_az = (np.abs((az - az_ref + 180) % 360 - 180) * np.cos(np.radians(alt_ref))).max()
+    print(f"  astropy {t_ref * 1000:9.1f} ms   fastsky {t_fast * 1000:7.1f} ms   "
+          f"speedup {t_ref / t_fast:6.1f}x   max |Δalt| {d_alt:.4f}°   max |Δaz|·cos(alt) {d_az:.4f}°")
+
+    # Per-call overhead dominates the scalar callers (one target, a few samples)
+    n_calls = 200
+    win_end = START + timedelta(hours=6)
+    t_ref, peaks_ref = _timed(lambda: [compute_peak_alt_in_window(r, d, LOCATION, START, win_end)
+                                       for r, d in zip(ra[:n_calls], dec[:n_calls])], repeat=1)
+    t_fast, peaks = _timed(lambda: [compute_peak_alt_in_window(r, d, LOCATION, START, win_end, engine="fast")
+                                    for r, d in zip(ra[:n_calls], dec[:n_calls])])
+    print(f"compute_peak_alt_in_window — {n_calls} calls")
+    print(f"  astropy {t_ref * 1000:9.1f} ms   fastsky {t_fast * 1000:7.1f} ms   "
+          f"speedup {t_ref / t_fast:6.1f}x   max |Δpeak| {np.abs(np.subtract(peaks, peaks_ref)).max():.4f}°")
+
+
+# ── Peak altitude ───────────────────────────────────────────────────────────
+
+def bench_peak_alt(n_targets=300, window_hours=8):
+    rng = np.random.default_rng(2)
+    ra = rng.uniform(0, 360, n_targets)
+    dec = np.degrees(np.arcsin(rng.uniform(-1, 1, n_targets)))
+    win_end = START + timedelta(hours=window_hours)
+    print(f"peak altitude — {n_targets} targets, {window_hours} h window")
+
+    t_old, peaks_old = _timed(lambda: np.array([
+        compute_peak_alt_in_window(r, d, LOCATION, START, win_end, method="sampled")
+        for r, d in zip(ra, dec)]), repeat=1)
+    for engine in ("astropy", "fast"):
+        t_new, peaks = _timed(lambda: compute_peak_alt_batch(ra, dec, LOCATION, START, win_end, engine=engine))
+        # Sampling can only under-estimate the true peak
+        print(f"  sampled/row {t_old * 1000:9.1f} ms   analytic[{engine:>7}] {t_new * 1000:7.1f} ms   "
+              f"speedup {t_old / t_new:7.1f}x   analytic−sampled {np.min(peaks - peaks_old):+.4f}°…"
+              f"{np.max(peaks - peaks_old):+.4f}°")
+
+
+# ── Planning info (rise / transit / set) ────────────────────────────────────
+
+def bench_planning(sizes=(1_000, 100_000), scalar_subset=200):
+    """Scalar timing is measured on `scalar_subset` rows and extrapolated linearly."""
+    rng = np.random.default_rng(3)
+    for n in sizes:
+        ra = rng.uniform(0, 360, n)
+        dec = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+        m = min(n, scalar_subset)
+
+        def scalar():
+            return pd.DataFrame([
+                calculate_planning_info(SkyCoord(ra=r * u.deg, dec=d * u.deg, frame='icrs'), LOCATION, START)
+                for r, d in zip(ra[:m], dec[:m])])
+
+        t_sub, rows_old = _timed(scalar, repeat=1)
+        t_old = t_sub * n / m
+        t_new, df_new = _timed(lambda: calculate_planning_info_batch(ra, dec, LOCATION, START),
+                               repeat=1 if n > 10_000 else 3)
+        same = rows_old[PLANNING_COLUMNS].equals(df_new.iloc[:m].reset_index(drop=True))
+        print(f"calculate_planning_info — {n:>7,} targets   scalar ~{t_old:8.1f} s (from {m})   "
+              f"batch {t_new:6.2f} s   speedup ~{t_old / t_new:6.0f}x   identical(first {m})={same}")
+
+
+# ── Constellation lookup ────────────────────────────────────────────────────
+
+def bench_constellations(n_targets=10_000, per_object=300):
+    """Per-object timing is measured on `per_object` targets and extrapolated linearly."""
+    rng = np.random.default_rng(4)
+    ra = rng.uniform(0, 360, n_targets)
+    dec = np.degrees(np.arcsin(rng.uniform(-1, 1, n_targets)))
+    print(f"constellation lookup — {n_targets:,} targets")
+
+    constellations.load_index()  # make sure the disk cache exists, then time a cold-process load
+    constellations._index.clear()
+    t_load, _ = _timed(constellations.load_index, repeat=1)
+    t_sub, ref = _timed(lambda: [SkyCoord(ra=r * u.deg, dec=d * u.deg, frame='icrs').get_constellation(short_name=True)
+                                 for r, d in zip(ra[:per_object], dec[:per_object])], repeat=1)
+    t_obj = t_sub * n_targets / per_object
+    t_arr, ref_all = _timed(lambda: SkyCoord(ra=ra * u.deg, dec=dec * u.deg, frame='icrs')
+                            .get_constellation(short_name=True))
+    t_new, got = _timed(lambda: constellations.constellation_names(ra, dec))
+    print(f"  index load from disk {t_load * 1000:.1f} ms")
+    print(f"  per-object ~{t_obj * 1000:9.1f} ms   array get_constellation {t_arr * 1000:7.1f} ms   "
+          f"index {t_new * 1000:6.1f} ms   speedup {t_obj / t_new:7.0f}x / {t_arr / t_new:4.1f}x   "
+          f"mismatches {int((got != ref_all).sum())} (boundary lines)")
+
+
+# ── Shared Moon/Sun ephemeris ───────────────────────────────────────────────
+
+def bench_moonsun(n_sections=5, trajectory_minutes=720):
+    """One page render: sidebar + 4 summaries + per-section check times + one trajectory."""
+    check_times = [START + timedelta(minutes=m) for m in (0, 120, 240)]
+    traj = Time([START + timedelta(minutes=m) for m in range(0, trajectory_minutes + 1, 10)])
+    print(f"Moon/Sun for one page render — sidebar, 4 summaries, {n_sections} sections, "
+          f"{len(traj)}-step trajectory")
+
+    def per_section():
+        t0 = Time(START)
+        moon, sun = _get_moon(t0, LOCATION), _get_sun(t0)             # sidebar
+        out = [sun.separation(moon), moon.transform_to(AltAz(obstime=t0, location=LOCATION))]
+        for _ in range(4):                                            # summaries
+            moon, sun = _get_moon(t0, LOCATION), _get_sun(t0)
+            out.append(sun.separation(moon))
+        for _ in range(n_sections):                                   # observability
+            out.append(_get_moon(Time(check_times), LOCATION))
+        out.append(_get_moon(traj, LOCATION))                         # trajectory
+        return out
+
+    def shared(eph):
+        out = [eph.moon_and_illumination(LOCATION, START), eph.moon_altaz(LOCATION, START)]
+        out += [eph.moon_and_illumination(LOCATION, START) for _ in range(4)]
+        out += [eph.moon(LOCATION, check_times) for _ in range(n_sections)]
+        out.append(eph.moon(LOCATION, traj))
+        return out
+
+    t_old, _ = _timed(per_section)
+    t_cold, _ = _timed(lambda: shared(MoonSunEphemeris()))
+    eph = MoonSunEphemeris()
+    shared(eph)
+    t_warm, _ = _timed(lambda: shared(eph))
+    print(f"  get_body per call {t_old * 1000:8.1f} ms   shared grid cold {t_cold * 1000:7.1f} ms   "
+          f"warm {t_warm * 1000:6.1f} ms   speedup {t_old / t_cold:5.1f}x / {t_old / t_warm:6.1f}x   "
+          f"stats {eph.stats()}")
+
+
+# ── Ephemeris cache reader ──────────────────────────────────────────────────
+
+def bench_ephemeris(path="ephemeris_cache.json", steps=73):
+    """Daily-snapshot lookup vs the interpolating reader on the committed cache."""
+    cache = read_ephemeris_cache(path)
+    objects = [(sec, name) for sec in ("comets", "asteroids") for name in cache.get(sec, {})]
+    if not objects:
+        print(f"ephemeris — {path} has no objects")
+        return
+    reader = EphemerisReader(cache)
+    lo = max(reader.span(sec, name)[0] for sec, name in objects)
+    when = Time(lo + 3.85, format='jd').to_datetime(timezone=pytz.utc)   # ~20:24 UTC, day 4
+    window = [when + timedelta(minutes=10 * i) for i in range(steps)]
+    print(f"ephemeris — {len(objects)} cached objects, {steps}-step trajectory window")
+
+    t_old, old = _timed(lambda: [lookup_cached_position(cache, sec, name, when.date().isoformat())
+                                 for sec, name in objects])
+    t_new, new = _timed(lambda: [reader.position(sec, name, when) for sec, name in objects])
+    t_traj, _ = _timed(lambda: [reader.sky_coords(sec, name, window) for sec, name in objects])
+    offs = [SkyCoord(ra=o[0] * u.deg, dec=o[1] * u.deg).separation(SkyCoord(ra=n[0] * u.deg, dec=n[1] * u.deg)).deg
+            for o, n in zip(old, new)]
+    i_max = int(np.argmax(offs))
+    print(f"  daily snapshot {t_old * 1e3:6.2f} ms   interpolated {t_new * 1e3:6.2f} ms   "
+          f"trajectories {t_traj * 1e3:6.1f} ms (0 Horizons calls)")
+    print(f"  snapshot error at {when:%H:%M} UTC: median {np.median(offs) * 3600:7.1f}\"   "
+          f"max {offs[i_max]:.3f}° ({objects[i_max][1]})")
+
+
+def bench_ephemeris_store(n_objects=2000, days=365):
+    """Startup cost of ephemeris_cache.json vs the memory-mapped binary store."""
+    rng = np.random.default_rng(0)
+    jd0 = 2461100.5
+    cache = {"generated_utc": "2026-03-01T06:00:00", "horizon_days": days,
+             "comets": {}, "asteroids": {}, "name_changes": [], "failures": []}
+    for i in range(n_objects):
+        ra = (rng.uniform(0, 360) + np.arange(days) * rng.uniform(-1, 1)) % 360.0
+        dec = np.clip(rng.uniform(-60, 60) + np.arange(days) * rng.uniform(-0.3, 0.3), -89, 89)
+        cache["asteroids"][f"{i} Synthetic"] = {"positions": [
+            {"date": f"d{d}", "jd": jd0 + d, "ra": float(ra[d]), "dec": float(dec[d]), "vmag": 14.0}
+            for d in range(days)]}
+    print(f"ephemeris_store — {n_objects} objects × {days} days")
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, npy_path = os.path.join(tmp, "eph.json"), os.path.join(tmp, "eph.npy")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+        write_store(cache, npy_path)
+        del cache
+        sizes = [os.path.getsize(p) for p in (json_path, npy_path, npy_path[:-4] + ".index.json")]
+
+        def load_json():
+            with open(json_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        def first_lookup(source):
+            return EphemerisReader(source).position("asteroids", "7 Synthetic", Time(jd0 + 100.3, format='jd'))
+
+        results = {}
+        for label, load in (("json", load_json), ("store", lambda: load_store(npy_path))):
+            t_load, source = _timed(load, repeat=1)
+            tracemalloc.start()
+            source = load()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            t_first, pos = _timed(lambda src=source: first_lookup(src), repeat=1)
+            results[label] = pos
+            print(f"  {label:5s} load {t_load * 1e3:8.1f} ms   peak alloc {peak / 2**20:7.1f} MiB   "
+                  f"first lookup {t_first * 1e3:6.2f} ms")
+            del source
+        print(f"  on disk: json {sizes[0] / 2**20:.1f} MiB   store {sizes[1] / 2**20:.1f} MiB "
+              f"+ index {sizes[2] / 2**10:.0f} KiB   same position: {results['json'] == results['store']}")
+
+
+# ── Catalog orbit propagation ───────────────────────────────────────────────
+
+def bench_orbits(path="comets_catalog.json", scale=10):
+    """Whole-catalog two-body positions in one pass vs one comet at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f).get("comets", [])
+    # Snapshots from before the full element set was kept lack ω/Ω/Tp — fill
+    # them reproducibly so the timing covers every orbit type in the catalog.
+    rng = np.random.default_rng(0)
+    entries = [dict(c, q=c.get("q") or 1.0,
+                    peri=c.get("peri", rng.uniform(0, 360)), node=c.get("node", rng.uniform(0, 360)),
+                    tp_jd=c.get("tp_jd", 2461100.0 + rng.uniform(-1000, 1000))) for c in entries]
+    print(f"orbits — {len(entries)} catalog comets "
+          f"({sum(c['e'] < 1 for c in entries)} elliptic, {sum(c['e'] >= 1 for c in entries)} parabolic/hyperbolic)")
+    el = orbits.elements_from_catalog(entries)
+    t_one, pos = _timed(lambda: orbits.catalog_positions(el, START))
+    t_parse, _ = _timed(lambda: orbits.elements_from_catalog(entries))
+    singles = [orbits.elements_from_catalog([c]) for c in entries[:100]]
+    t_loop, loop = _timed(lambda: [orbits.catalog_positions(e1, START) for e1 in singles], repeat=1)
+    same = np.allclose([p["ra"][0] for p in loop], pos["ra"][:100], atol=1e-9)
+    big = orbits.elements_from_catalog(entries * scale)
+    t_big, _ = _timed(lambda: orbits.catalog_positions(big, START))
+    print(f"  one pass {t_one * 1e3:6.1f} ms (+ {t_parse * 1e3:.1f} ms element parse)   "
+          f"per comet {t_loop / 100 * 1e3:6.2f} ms   x{scale} catalog {t_big * 1e3:6.1f} ms   same: {same}")
+
+
+BENCHMARKS = {
+    "constellations": bench_constellations,
+    "moonsun": bench_moonsun,
+    "ephemeris": bench_ephemeris,
+    "ephemeris_store": bench_ephemeris_store,
+    "orbits": bench_orbits,
+    "planning": bench_planning,
+    "peak_alt": bench_peak_alt,
+    "fastsky": bench_fastsky,
+    "observability": bench_observability,
+    "trajectory": bench_trajectory,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("name", choices=sorted(BENCHMARKS) + ["all"])
+    args = parser.parse_args()
+    names = sorted(BENCHMARKS) if args.name == "all" else [args.name]
+    for name in names:
+        BENCHMARKS[name]()
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,7 @@ import json
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import yaml
 
@@ -33,6 +34,7 @@ OUTPUT_FILE = os.path.join(os.path.dirname(__file__), "..", "_priority_changes.j
 # Import scrapers (reuse production code from backend/)
 # ---------------------------------------------------------------------------
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from backend.browser import BROWSER
 from backend.scrape import scrape_unistellar_priority_comets, scrape_unistellar_priority_asteroids
 
 
@@ -133,9 +135,15 @@ def diff_priorities(scraped, yaml_list, category, aliases=None):
 def main():
     all_changes = []
 
+    # Install/launch the shared browser once, then load both mission pages in parallel tabs
+    print("Scraping Unistellar comet and asteroid missions pages...")
+    BROWSER.warmup().result()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        comets_future = pool.submit(scrape_unistellar_priority_comets)
+        asteroids_future = pool.submit(scrape_unistellar_priority_asteroids)
+        scraped_comets, scraped_asteroids = comets_future.result(), asteroids_future.result()
+
     # --- Comets ---
-    print("Scraping Unistellar comet missions page...")
-    scraped_comets = scrape_unistellar_priority_comets()
     yaml_comets, comet_aliases = load_yaml_priority(COMETS_FILE)
     print(f"  Scraped: {len(scraped_comets)} comets  |  YAML priority: {len(yaml_comets)} comets")
     if comet_aliases:
@@ -160,8 +168,7 @@ def main():
         print("  WARNING: Scrape returned 0 comets — skipping comparison (page may be down).")
 
     # --- Asteroids ---
-    print("\nScraping Unistellar asteroid missions page...")
-    scraped_asteroids = scrape_unistellar_priority_asteroids()
+    print()
     yaml_asteroids, asteroid_aliases = load_yaml_priority(ASTEROIDS_FILE)
     print(f"  Scraped: {len(scraped_asteroids)} asteroids  |  YAML priority: {len(yaml_asteroids)} asteroids")
     if asteroid_aliases:
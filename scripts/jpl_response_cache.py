@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+jpl_response_cache.py — Inspect or prune the persistent JPL response cache
+(backend/response_cache.py). Works while the app is running: SQLite WAL mode
+lets this read and delete alongside the Streamlit workers.
+
+Usage:
+  python scripts/jpl_response_cache.py stats                 # entries, bytes, per endpoint
+  python scripts/jpl_response_cache.py list [--endpoint sbdb] [--limit 20]
+  python scripts/jpl_response_cache.py prune                 # drop expired rows, enforce size bounds
+  python scripts/jpl_response_cache.py clear [--endpoint horizons]
+  python scripts/jpl_response_cache.py vacuum                # checkpoint WAL + compact the file
+
+The file is --path, else $JPL_RESPONSE_CACHE, else jpl_response_cache.sqlite3.
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.response_cache import DEFAULT_PATH, ENV_VAR, ResponseCache
+
+
+def _when(ts):
+    if ts is None:
+        return "never"
+    return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('command', choices=('stats', 'list', 'prune', 'clear', 'vacuum'))
+    parser.add_argument('--path', default=os.environ.get(ENV_VAR) or DEFAULT_PATH,
+                        help=f'cache file (default: ${ENV_VAR} or {DEFAULT_PATH})')
+    parser.add_argument('--endpoint', help="only this endpoint ('horizons' or 'sbdb')")
+    parser.add_argument('--limit', type=int, default=50, help='rows shown by list')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"No cache at {args.path}")
+        return 0
+    cache = ResponseCache(args.path)
+
+    if args.command == 'stats':
+        s = cache.stats()
+        print(f"{s['path']}: {s['entries']} entries, {s['bytes'] / 1048576:.1f} MiB "
+              f"(bounds {s['max_entries']} entries / {s['max_bytes'] / 1048576:.0f} MiB)")
+        for endpoint, e in sorted(s['endpoints'].items()):
+            print(f"  {endpoint:10s} {e['entries']:6d} entries  {e['bytes'] / 1024:9.1f} KiB  "
+                  f"{e['expired']} expired")
+    elif args.command == 'list':
+        for e in cache.entries(args.endpoint, args.limit):
+            print(f"{_when(e['last_access'])}  expires {_when(e['expires'])}  "
+                  f"{e['size']:8d} B  {e['key']}")
+    elif args.command == 'prune':
+        print(f"Removed {cache.prune()} rows")
+    elif args.command == 'clear':
+        print(f"Removed {cache.clear(args.endpoint)} rows")
+    elif args.command == 'vacuum':
+        cache.vacuum()
+        print(f"Compacted {args.path} ({os.path.getsize(args.path) / 1048576:.1f} MiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
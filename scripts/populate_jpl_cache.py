@@ -20,7 +20,7 @@ import re
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.sbdb import sbdb_lookup
+from backend.sbdb import is_sbdb_internal_id, sbdb_lookup_many
 from backend.config import (
     read_jpl_overrides, read_jpl_cache, write_jpl_cache,
     read_comets_config, read_asteroids_config,
@@ -51,6 +51,10 @@ def resolve_all(names, section, strip_fn, overrides):
     """
     Attempt to resolve every name via SBDB. Skip names that have admin overrides.
 
+    All stripped queries go to SBDB in one bulk lookup (a few requests for the
+    whole list); names still unresolved are retried by full display name in a
+    second one.
+
     Returns:
         resolved: dict[name → spk_id]  (successfully resolved)
         failed:   list[name]           (could not resolve)
@@ -59,29 +63,31 @@ def resolve_all(names, section, strip_fn, overrides):
     failed = []
     override_section = overrides.get(section, {})
 
+    queries = {}
     for name in names:
         if name in override_section:
             print(f"  SKIP (override): {name!r} -> {override_section[name]!r}")
             continue
-        query = strip_fn(name)
-        spk_id = sbdb_lookup(query)
-        if spk_id is None and query != name:
-            spk_id = sbdb_lookup(name)   # also try full display name
+        queries[name] = strip_fn(name)
+    found = sbdb_lookup_many(list(queries.values()))
+    retry = [name for name, query in queries.items() if not found.get(query) and query != name]
+    if retry:
+        found.update(sbdb_lookup_many(retry))   # also try full display names
+
+    for name, query in queries.items():
+        spk_id = found.get(query) or found.get(name)
         if spk_id:
             # Guard: SBDB internal IDs in [20M, 30M) are rejected by Horizons for comets.
             # For numbered asteroids, SBDB returns 20000000+N; correct Horizons SPK-ID is 2000000+N.
-            try:
-                if 20_000_000 <= int(spk_id) < 30_000_000:
-                    if section == "asteroids":
-                        horizons_id = str(int(spk_id) - 18_000_000)
-                        print(f"  OK:   {name!r} -> SPK-ID {horizons_id!r} (converted from SBDB {spk_id!r})")
-                        resolved[name] = horizons_id
-                    else:
-                        print(f"  SKIP (SBDB internal ID, Horizons rejects): {name!r} -> {spk_id!r}")
-                        failed.append(name)
-                    continue
-            except (ValueError, TypeError):
-                pass
+            if is_sbdb_internal_id(spk_id):
+                if section == "asteroids":
+                    horizons_id = str(int(spk_id) - 18_000_000)
+                    print(f"  OK:   {name!r} -> SPK-ID {horizons_id!r} (converted from SBDB {spk_id!r})")
+                    resolved[name] = horizons_id
+                else:
+                    print(f"  SKIP (SBDB internal ID, Horizons rejects): {name!r} -> {spk_id!r}")
+                    failed.append(name)
+                continue
             print(f"  OK:   {name!r} -> SPK-ID {spk_id!r} (queried: {query!r})")
             resolved[name] = spk_id
         else:
@@ -132,7 +138,7 @@ def main():
             elif old_spk != spk_id:
                 changed_entries.append((section, name, old_spk, spk_id))
 
-    # Write updated cache
+    # Write updated cache (one atomic write for every resolved ID)
     write_jpl_cache(CACHE_FILE, new_cache)
     print(f"\n=== Cache written to {CACHE_FILE} ===")
     print(f"  New entries:     {len(new_entries)}")
@@ -4,6 +4,10 @@ update_comet_catalog.py
 Downloads the MPC (Minor Planet Center) comet orbital elements and saves a
 filtered snapshot to comets_catalog.json in the repo root.
 
+Each entry keeps the full element set (q, e, i, argument of perihelion,
+node, perihelion time as a Julian Date, epoch, H and slope G) so
+backend/orbits.py can propagate the whole catalog locally.
+
 Run manually:
     python scripts/update_comet_catalog.py
 
@@ -63,6 +67,42 @@ def _get_orbit_type(entry, designation):
     return ""
 
 
+def _calendar_jd(year, month, day):
+    """Julian Date for a calendar date with fractional day (MPC times are TT)."""
+    base = datetime(int(year), int(month), 1, tzinfo=timezone.utc)
+    return round(2440587.5 + base.timestamp() / 86400.0 + float(day) - 1.0, 6)
+
+
+def _get_perihelion_jd(entry):
+    """Perihelion time as a Julian Date, or None if the split fields are missing."""
+    try:
+        return _calendar_jd(entry["Year_of_perihelion"], entry["Month_of_perihelion"],
+                            entry["Day_of_perihelion"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _get_epoch_jd(entry):
+    """Osculation epoch as a Julian Date, or None if not given."""
+    try:
+        return _calendar_jd(entry["Epoch_year"], entry["Epoch_month"], entry["Epoch_day"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _get_float(entry, *keys):
+    """First numeric value among keys, or None."""
+    for key in keys:
+        val = entry.get(key)
+        if val is None or val == "":
+            continue
+        try:
+            return float(val)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
 def _parse_perihelion_date(T_str):
     """Parse MPC perihelion time string to a datetime.
     MPC uses YYYYMMDD.ddd (e.g. '20250415.123') or ISO format."""
@@ -132,14 +172,22 @@ def download_and_save():
             e = entry.get("e") or entry.get("Eccentricity") or 0
             i = entry.get("i") or entry.get("Inclination") or 0
             H = entry.get("H") or entry.get("Abs_magnitude")
+            peri = _get_float(entry, "Peri", "Argument_of_perihelion", "w")
+            node = _get_float(entry, "Node", "Longitude_of_ascending_node")
+            G = _get_float(entry, "G", "Slope_parameter")
 
             catalog.append({
                 "designation": desig,
                 "T_peri": T_str,
-                "q": round(float(q), 4) if q else 0.0,
+                "q": round(float(q), 6) if q else 0.0,
                 "e": round(float(e), 6) if e else 0.0,
                 "i": round(float(i), 4) if i else 0.0,
+                "peri": round(peri, 4) if peri is not None else None,
+                "node": round(node, 4) if node is not None else None,
+                "tp_jd": _get_perihelion_jd(entry),
+                "epoch_jd": _get_epoch_jd(entry),
                 "H": float(H) if H is not None else None,
+                "G": G,
                 "orbit_type": orbit_type,
             })
         except Exception:
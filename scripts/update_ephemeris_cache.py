@@ -1,32 +1,67 @@
 #!/usr/bin/env python3
 """
-update_ephemeris_cache.py — Pre-compute 30-day RA/Dec ephemerides for all
-watchlist comets and asteroids. Run daily via GitHub Actions.
-
-Output: ephemeris_cache.json (committed to repo)
+update_ephemeris_cache.py — Keep 30-day RA/Dec ephemerides for all watchlist
+comets and asteroids up to date. Run daily via GitHub Actions.
+
+Incremental: the existing cache is loaded, days before today are dropped and
+only the missing tail (normally one new day per object) is fetched. An object
+is refetched in full when it is new, its Horizons ID changed (override) or
+its cached days do not start today. Objects are fetched concurrently; the
+shared JPL scheduler (backend/jpl_client.py) keeps the request rate polite.
+SBDB name validation runs weekly (or with --validate-names).
+
+Long range: every REFIT_EVERY_DAYS (or on an ID change / --full) each object's
+next LONG_HORIZON_DAYS are fetched in one daily-step query and compressed into
+piecewise Chebyshev segments (backend/chebyshev.py), so the app can plan
+months ahead without JPL. A failed refit keeps the previous fit.
+
+Output (committed to repo, each file written atomically):
+  ephemeris_cache.npy + ephemeris_cache.index.json — binary store read by the app
+  ephemeris_chebyshev.npy + ephemeris_chebyshev.index.json — long-range fits
+  ephemeris_cache.json — JSON export, only with --export-json
+
+Usage:
+  python scripts/update_ephemeris_cache.py                  # fetch missing days, write store
+  python scripts/update_ephemeris_cache.py --export-json    # also write the JSON
+  python scripts/update_ephemeris_cache.py --full           # ignore the cache, refetch 30 days and refit
+  python scripts/update_ephemeris_cache.py --validate-names # force the weekly SBDB check
+  python scripts/update_ephemeris_cache.py --convert        # rebuild store from JSON, no network
 """
+import argparse
 import json
 import os
 import re
 import sys
-import time
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from astropy.time import Time
 from backend.config import (
     read_comets_config, read_asteroids_config, read_jpl_overrides,
+    read_ephemeris_cache,
+)
+from astropy.time import Time
+
+from backend import jpl_client
+from backend.chebyshev import fit_segments, load_chebyshev, write_chebyshev
+from backend.ephemeris import (
+    EphemerisStore, _atomic_write, index_path_for, load_ephemeris, positions_to_arrays, write_store,
 )
-from backend.resolvers import _horizons_query
+from backend.resolvers import _horizons_query, extract_positions as _extract_positions
 from backend.github import create_issue
+from backend.sbdb import _get as _sbdb_get
 
 COMETS_FILE = "comets.yaml"
 ASTEROIDS_FILE = "asteroids.yaml"
 OVERRIDES_FILE = "jpl_id_overrides.yaml"
 OUTPUT_FILE = "ephemeris_cache.json"
+STORE_FILE = "ephemeris_cache.npy"
+CHEB_FILE = "ephemeris_chebyshev.npy"
 HORIZON_DAYS = 30
-REQUEST_DELAY = 0.5  # seconds between requests — polite to JPL
+LONG_HORIZON_DAYS = 400   # span of the Chebyshev fits
+REFIT_EVERY_DAYS = 7      # long-range refetch cadence
+VALIDATE_EVERY_DAYS = 7   # SBDB name check cadence
 
 
 def _strip_comet_id(name):
@@ -43,62 +78,11 @@ def _strip_asteroid_id(name):
     return name
 
 
-def _build_epochs(days=HORIZON_DAYS):
-    """Return (start_str, epochs_dict) for today → today+days."""
-    today = datetime.now(timezone.utc).date()
-    start = today.strftime('%Y-%m-%d')
-    stop = (today + timedelta(days=days)).strftime('%Y-%m-%d')
-    return start, {'start': start, 'stop': stop, 'step': '1d'}
-
-
-def _extract_positions(result, section=None):
-    """Convert Horizons result rows → list of {date, ra, dec, vmag} dicts.
-
-    section: 'comets' → reads Tmag; 'asteroids' → reads V; None → vmag=None.
-    vmag is None when the column is absent or the value is masked/non-numeric.
-    """
-    vmag_col = 'Tmag' if section == 'comets' else ('V' if section == 'asteroids' else None)
-    positions = []
-    for row in result:
-        t = Time(float(row['datetime_jd']), format='jd', scale='utc')
-        vmag = None
-        if vmag_col:
-            try:
-                v = float(row[vmag_col])
-                if -10 < v < 40:   # sanity range — allow bright objects (Venus ~-4.5); reject masked/garbage
-                    vmag = round(v, 2)
-            except (KeyError, ValueError, TypeError):
-                pass
-        positions.append({
-            'date': t.datetime.strftime('%Y-%m-%d'),
-            'ra':   round(float(row['RA']),  6),
-            'dec':  round(float(row['DEC']), 6),
-            'vmag': vmag,
-        })
-    return positions
-
-
-def _lookup_cached_position(cache, section, name, target_date_str):
-    """Return (ra, dec) from cache for a given object+date, or None."""
-    obj = cache.get(section, {}).get(name)
-    if not obj:
-        return None
-    for pos in obj.get('positions', []):
-        if pos['date'] == target_date_str:
-            return pos['ra'], pos['dec']
-    return None
-
-
 def _validate_name(stored_name, section):
     """Query SBDB for current canonical fullname. Returns changed canonical or None."""
-    import requests
     query = _strip_comet_id(stored_name) if section == 'comets' else _strip_asteroid_id(stored_name)
     try:
-        resp = requests.get(
-            'https://ssd-api.jpl.nasa.gov/sbdb.api',
-            params={'sstr': query, 'full-prec': '0'},
-            timeout=10,
-        )
+        resp = jpl_client.call(_sbdb_get, {'sstr': query, 'full-prec': '0'}, 10)
         if resp.status_code == 200:
             canonical = resp.json().get('object', {}).get('fullname')
             if canonical:
@@ -115,17 +99,39 @@ def _validate_name(stored_name, section):
     return None
 
 
-def _fetch_object(name, section, overrides):
-    """Fetch 30-day ephemeris for one object. Returns (positions, error_or_None)."""
+def _horizons_id(name, section, overrides):
+    """Horizons ID for a watchlist entry: override, else the stripped display name."""
     override_id = overrides.get(section, {}).get(name)
     if override_id:
-        horizons_id = override_id
-    elif section == 'comets':
-        horizons_id = _strip_comet_id(name)
-    else:
-        horizons_id = _strip_asteroid_id(name)
+        return override_id
+    return _strip_comet_id(name) if section == 'comets' else _strip_asteroid_id(name)
+
+
+def _plan_fetch(cached, today, days=HORIZON_DAYS):
+    """What to keep from an object's cached positions and which days to fetch.
 
-    _start_str, epochs = _build_epochs()
+    Returns (kept_positions, epochs) — epochs is None when the cache already
+    reaches today+days, a JD float for a single missing day, else a
+    start/stop/step dict. Cached days must start today and be contiguous with
+    the tail, otherwise everything is refetched.
+    """
+    stop = today + timedelta(days=days)
+    full = {'start': today.isoformat(), 'stop': stop.isoformat(), 'step': '1d'}
+    kept = [p for p in (cached or []) if p.get('date', '') >= today.isoformat()]
+    if not kept or kept[0]['date'] != today.isoformat():
+        return [], full
+    first_missing = date.fromisoformat(kept[-1]['date']) + timedelta(days=1)
+    if len(kept) != (first_missing - today).days:          # hole in the cached days
+        return [], full
+    if first_missing > stop:
+        return kept, None
+    if first_missing == stop:                                # Horizons needs stop > start
+        return kept, Time(first_missing.isoformat(), scale='utc').jd
+    return kept, {'start': first_missing.isoformat(), 'stop': stop.isoformat(), 'step': '1d'}
+
+
+def _fetch_object(name, section, horizons_id, epochs):
+    """Fetch one object's missing days. Returns (positions, error_or_None)."""
     try:
         result = _horizons_query(
             horizons_id, '500', epochs,
@@ -136,7 +142,95 @@ def _fetch_object(name, section, overrides):
         return [], str(exc)[:200]
 
 
-def main():
+def _update_object(name, section, horizons_id, cached, today, full=False):
+    """Incremental update of one object → (positions, fetched_days, error_or_None)."""
+    kept, epochs = _plan_fetch(None if full else cached, today)
+    if epochs is None:
+        return kept, 0, None
+    fetched, error = _fetch_object(name, section, horizons_id, epochs)
+    if error:
+        return kept, 0, error
+    return kept + fetched, len(fetched), None
+
+
+def _refit_due(fit, horizons_id, now, force=False):
+    """Does an object's long-range fit need refetching (missing, other ID, too old)?"""
+    if force or not fit or fit.get('id') != horizons_id:
+        return True
+    try:
+        fitted = datetime.strptime(fit['fitted_utc'], '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc)
+    except (KeyError, TypeError, ValueError):
+        return True
+    return now - fitted >= timedelta(days=REFIT_EVERY_DAYS)
+
+
+def _fit_long_range(name, section, horizons_id, now):
+    """Fetch LONG_HORIZON_DAYS daily samples and fit them. Returns (fit, error_or_None)."""
+    today = now.date()
+    epochs = {'start': today.isoformat(),
+              'stop': (today + timedelta(days=LONG_HORIZON_DAYS)).isoformat(), 'step': '1d'}
+    positions, error = _fetch_object(name, section, horizons_id, epochs)
+    if error:
+        return None, error
+    segments, worst = fit_segments(*positions_to_arrays(positions))
+    if not len(segments):
+        return None, 'Horizons returned fewer than 2 positions'
+    return {'segments': segments, 'fitted_utc': now.strftime('%Y-%m-%dT%H:%M:%S'),
+            'id': horizons_id, 'max_error_arcsec': round(worst, 3)}, None
+
+
+def _load_previous():
+    """The existing cache as an ephemeris_cache.json-style dict ({} if none)."""
+    source = load_ephemeris(STORE_FILE, OUTPUT_FILE)
+    return source.to_json_dict() if isinstance(source, EphemerisStore) else (source or {})
+
+
+def _validation_due(previous, now, force=False):
+    """Is the weekly SBDB name check due?"""
+    if force:
+        return True
+    try:
+        last = datetime.strptime(previous['names_validated_utc'], '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc)
+    except (KeyError, TypeError, ValueError):
+        return True
+    return now - last >= timedelta(days=VALIDATE_EVERY_DAYS)
+
+
+def _write_outputs(output, export_json, fits=None):
+    """Write the binary store (and the Chebyshev fits if given), plus the JSON export when asked."""
+    index = write_store(output, STORE_FILE)
+    print(f"\n=== Written to {STORE_FILE} + {index_path_for(STORE_FILE)} ({index['rows']} rows) ===")
+    if fits is not None:
+        cheb = write_chebyshev(fits, CHEB_FILE, {'generated_utc': output['generated_utc'],
+                                                 'horizon_days': LONG_HORIZON_DAYS})
+        print(f"=== Written to {CHEB_FILE} + {index_path_for(CHEB_FILE)} ({cheb['rows']} segments) ===")
+    if export_json:
+        _atomic_write(OUTPUT_FILE, lambda f: f.write(json.dumps(output, indent=2).encode('utf-8')))
+        print(f"=== Exported {OUTPUT_FILE} ===")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--export-json', action='store_true',
+                        help=f'also write {OUTPUT_FILE}')
+    parser.add_argument('--convert', action='store_true',
+                        help=f'rebuild {STORE_FILE} from the existing {OUTPUT_FILE} (no network)')
+    parser.add_argument('--full', action='store_true',
+                        help=f'ignore the existing cache and refetch {HORIZON_DAYS} days for every object')
+    parser.add_argument('--validate-names', action='store_true',
+                        help=f'run the SBDB name check now (default: every {VALIDATE_EVERY_DAYS} days)')
+    parser.add_argument('--workers', type=int, default=jpl_client.JPL.max_concurrency,
+                        help='objects fetched concurrently (JPL requests are paced separately)')
+    args = parser.parse_args(argv)
+
+    if args.convert:
+        cache = read_ephemeris_cache(OUTPUT_FILE)
+        if not cache:
+            print(f"ERROR: {OUTPUT_FILE} missing or unreadable")
+            return 1
+        _write_outputs(cache, export_json=False)
+        return 0
+
     print("=== update_ephemeris_cache.py ===")
 
     overrides = read_jpl_overrides(OVERRIDES_FILE)
@@ -149,11 +243,23 @@ def main():
         for e in asteroid_cfg.get('asteroids', [])
     ]
 
+    now = datetime.now(timezone.utc)
+    today = now.date()
+    previous = _load_previous()
+    prev_ids = previous.get('ids', {})
+    validate = _validation_due(previous, now, args.validate_names)
+    prev_cheb = load_chebyshev(CHEB_FILE)
+    prev_fits = prev_cheb.to_fits() if prev_cheb is not None else {}
+    fits = {'comets': {}, 'asteroids': {}}
+
     output = {
-        'generated_utc': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S'),
+        'generated_utc': now.strftime('%Y-%m-%dT%H:%M:%S'),
         'horizon_days': HORIZON_DAYS,
         'comets': {},
         'asteroids': {},
+        'ids': {'comets': {}, 'asteroids': {}},
+        'names_validated_utc': (now.strftime('%Y-%m-%dT%H:%M:%S') if validate
+                                else previous.get('names_validated_utc')),
         'name_changes': [],
         'failures': [],
     }
@@ -163,18 +269,48 @@ def main():
         [(n, 'asteroids') for n in asteroid_names]
     )
 
-    for name, section in all_objects:
-        print(f"  Fetching {section[:-1]}: {name!r} ...", end=' ', flush=True)
-        positions, error = _fetch_object(name, section, overrides)
-        if error:
-            print(f"FAIL: {error}")
-            output['failures'].append({'section': section, 'name': name, 'error': error})
-        else:
-            print(f"OK ({len(positions)} days)")
-            output[section][name] = {'positions': positions}
-
-            # Name validation — check SBDB canonical name
-            canonical = _validate_name(name, section)
+    def work(item):
+        name, section = item
+        horizons_id = _horizons_id(name, section, overrides)
+        cached = (previous.get(section, {}).get(name) or {}).get('positions')
+        if prev_ids.get(section, {}).get(name, horizons_id) != horizons_id:
+            cached = None                       # ID changed: old positions are for another object
+        positions, fetched, error = _update_object(name, section, horizons_id, cached, today, args.full)
+        fit, refit, fit_error = prev_fits.get(section, {}).get(name), False, None
+        if fit and fit.get('id') != horizons_id:
+            fit = None
+        if not error and _refit_due(fit, horizons_id, now, args.full):
+            new_fit, fit_error = _fit_long_range(name, section, horizons_id, now)
+            fit, refit = (new_fit, True) if new_fit else (fit, False)
+        canonical = _validate_name(name, section) if validate and not error else None
+        return horizons_id, positions, fetched, error, canonical, fit, refit, fit_error
+
+    total_fetched, refits = 0, 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        # map() keeps watchlist order, so the store layout is stable across runs
+        for (name, section), (horizons_id, positions, fetched, error, canonical, fit, refit, fit_error) in zip(
+                all_objects, pool.map(work, all_objects)):
+            label = f"  {section[:-1]}: {name!r}"
+            if error:
+                print(f"{label} FAIL: {error}" + (f" (kept {len(positions)} cached days)" if positions else ""))
+                output['failures'].append({'section': section, 'name': name, 'error': error})
+            else:
+                print(f"{label} OK ({len(positions)} days, {fetched} fetched)")
+            if positions:
+                output[section][name] = {'positions': positions}
+                output['ids'][section][name] = horizons_id
+            total_fetched += fetched
+            if fit_error:
+                print(f"    long-range fit FAIL: {fit_error}" + (" (kept previous fit)" if fit else ""))
+                output['failures'].append({'section': section, 'name': name,
+                                           'error': f'long-range fit: {fit_error}'})
+            elif refit:
+                print(f"    long-range fit: {len(fit['segments'])} segments, "
+                      f"max error {fit['max_error_arcsec']}\"")
+            if fit:
+                fits[section][name] = fit
+                refits += refit
+
             if canonical and canonical != name:
                 print(f"    WARNING Name change: {name!r} -> {canonical!r}")
                 output['name_changes'].append({
@@ -183,15 +319,15 @@ def main():
                     'canonical': canonical,
                 })
 
-        time.sleep(REQUEST_DELAY)
-
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2)
-    print(f"\n=== Written to {OUTPUT_FILE} ===")
+    _write_outputs(output, args.export_json, fits)
     print(f"  Comets:       {len(output['comets'])}")
     print(f"  Asteroids:    {len(output['asteroids'])}")
     print(f"  Name changes: {len(output['name_changes'])}")
     print(f"  Failures:     {len(output['failures'])}")
+    print(f"  Days fetched: {total_fetched}" + ("  (names validated)" if validate else ""))
+    print(f"  Refits:       {refits}")
+    m = jpl_client.JPL.metrics()
+    print(f"  JPL requests: {m['requests']} ({m['throttles']} throttled, {m['retries']} retries)")
 
     # GitHub notification for name changes or failures
     token = os.environ.get('GITHUB_TOKEN')
@@ -0,0 +1,22 @@
+"""Shared pytest fixtures."""
+import pytest
+
+from backend import jpl_client, response_cache
+
+
+@pytest.fixture(autouse=True)
+def _isolated_response_cache(tmp_path):
+    """Give every test an empty JPL response cache instead of the on-disk default."""
+    cache = response_cache.ResponseCache(tmp_path / "jpl_response_cache.sqlite3")
+    previous = response_cache.set_default_cache(cache)
+    yield cache
+    cache.close()
+    response_cache.set_default_cache(previous)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_jpl_scheduler(monkeypatch):
+    """A fresh JPL scheduler per test: clean metrics, no rate limit, no backoff sleeps."""
+    scheduler = jpl_client.JPLScheduler(rate=1e6, burst=1e6, base_backoff=0.0)
+    monkeypatch.setattr(jpl_client, "JPL", scheduler)
+    return scheduler
@@ -104,6 +104,105 @@ def test_check_row_observability_does_not_raise_with_az_filter():
     assert isinstance(obs, bool)
 
 
+import numpy as np
+from astropy.coordinates import get_body
+from astropy.time import Time
+from backend.app_logic import (
+    az_in_selected_mask, evaluate_observability, _add_observability_columns,
+)
+
+
+def test_az_in_selected_mask_matches_scalar():
+    az = np.array([0.0, 10.0, 22.5, 67.5, 90.0, 180.0, 350.0])
+    for dirs in ({"N"}, {"NE"}, {"E", "S"}):
+        expected = [az_in_selected(a, dirs) for a in az]
+        assert az_in_selected_mask(az, dirs).tolist() == expected
+
+
+def test_evaluate_observability_matches_row_check():
+    """Batched result equals _check_row_observability for every target, with Moon + az filters."""
+    loc = EarthLocation(lat=40 * u.deg, lon=-74 * u.deg)
+    times = [datetime(2025, 7, 15, 3, 0, tzinfo=pytz.utc) + timedelta(hours=i) for i in range(3)]
+    moon_locs = [get_body("moon", Time(t), loc) for t in times]
+    ra = np.linspace(0, 350, 15)
+    dec = np.linspace(-70, 80, 15)
+    statuses = ["Visible"] * 14 + ["Never Rises"]
+    for az_dirs, min_sep in ((set(), 0), ({"S", "SE", "E"}, 40)):
+        obs, reasons, seps, mstats = evaluate_observability(
+            ra, dec, loc, times, statuses=statuses,
+            moon_coords=get_body("moon", Time(times), loc), moon_illum=60.0,
+            min_alt=15, max_alt=90, az_dirs=az_dirs, min_moon_sep=min_sep,
+        )
+        for i in range(len(ra)):
+            sc = SkyCoord(ra=ra[i] * u.deg, dec=dec[i] * u.deg, frame='icrs')
+            expected = _check_row_observability(
+                sc, statuses[i], loc, times, moon_locs[0], moon_locs, 60.0, 15, 90, az_dirs, min_sep
+            )
+            assert (bool(obs[i]), reasons[i], seps[i], mstats[i]) == expected
+
+
+def test_evaluate_observability_without_moon():
+    loc = EarthLocation(lat=40 * u.deg, lon=-74 * u.deg)
+    times = [datetime(2025, 7, 15, 3, 0, tzinfo=pytz.utc)]
+    obs, reasons, seps, mstats = evaluate_observability(
+        [279.23, 0.0], [38.78, -80.0], loc, times, min_alt=10, fail_reason="Not in window"
+    )
+    assert obs.tolist() == [True, False]
+    assert reasons == ["", "Not in window"]
+    assert seps == ["–", "–"] and mstats == ["", ""]
+
+
+def test_evaluate_observability_fast_engine_agrees_away_from_limits():
+    loc = EarthLocation(lat=40 * u.deg, lon=-74 * u.deg)
+    times = [datetime(2025, 7, 15, 3, 0, tzinfo=pytz.utc) + timedelta(hours=i) for i in range(3)]
+    ra, dec = np.linspace(0, 350, 36), np.linspace(-60, 85, 36)
+    ref = evaluate_observability(ra, dec, loc, times, min_alt=20, az_dirs={"S", "SE"})
+    fast = evaluate_observability(ra, dec, loc, times, min_alt=20, az_dirs={"S", "SE"}, engine="fast")
+    assert fast[0].tolist() == ref[0].tolist()
+    assert fast[1] == ref[1]
+
+def test_add_observability_columns_stub_and_parse_rows():
+    loc = EarthLocation(lat=40 * u.deg, lon=-74 * u.deg)
+    times = [datetime(2025, 7, 15, 3, 0, tzinfo=pytz.utc)]
+    df = pd.DataFrame({
+        "Name": ["Vega", "Stub", "Broken"],
+        "_ra_deg": [279.23, 0.0, None],
+        "_dec_deg": [38.78, 0.0, None],
+        "Status": ["Visible", "—", "Visible"],
+        "_resolve_error": [np.nan, True, np.nan],
+        "_jpl_id_tried": [None, "C/2099 X1", None],
+    })
+    _add_observability_columns(df, loc, times, None, 0.0, 10, 90, set(), 0)
+    assert df["is_observable"].tolist() == [True, False, False]
+    assert df["filter_reason"].tolist() == ["", "JPL lookup failed (tried: C/2099 X1)", "Parse Error"]
+    assert df["Moon Sep (°)"].tolist() == ["–", "—", "–"]
+
+
+from backend.app_logic import _add_planning_columns
+
+
+def test_add_planning_columns_fills_resolved_rows_and_keeps_stubs():
+    from backend.core import calculate_planning_info, moon_sep_deg
+    loc = EarthLocation(lat=40 * u.deg, lon=-74 * u.deg)
+    start = datetime(2025, 7, 15, 3, 0, tzinfo=pytz.utc)
+    moon = get_body("moon", Time(start), loc)
+    df = pd.DataFrame([
+        {"Name": "Vega", "_ra_deg": 279.23, "_dec_deg": 38.78, "_jpl_id_used": "x"},
+        {"Name": "Stub", "RA": "—", "Dec": "—", "_ra_deg": 0.0, "_dec_deg": 0.0,
+         "Status": "—", "Moon Sep (°)": "—", "_resolve_error": True},
+    ])
+    _add_planning_columns(df, loc, start, moon, 60.0)
+
+    sc = SkyCoord(ra=279.23 * u.deg, dec=38.78 * u.deg, frame='icrs')
+    expected = calculate_planning_info(sc, loc, start)
+    for key in ("Constellation", "Transit", "Rise", "Set", "Status"):
+        assert df.loc[0, key] == expected[key]
+    assert df.loc[0, "_rise_datetime"] == expected["_rise_datetime"]
+    assert df.loc[0, "RA"] == sc.ra.to_string(unit=u.hour, sep=('h ', 'm ', 's'), precision=0, pad=True)
+    assert df.loc[0, "Moon Sep (°)"] == round(moon_sep_deg(sc, moon), 1)
+    assert df.loc[1, "Status"] == "—" and df.loc[1, "RA"] == "—" and df.loc[1, "Moon Sep (°)"] == "—"
+
+
 import pandas as pd
 from datetime import datetime, timezone
 from backend.app_logic import _sort_df_like_chart, build_night_plan
@@ -194,6 +293,18 @@ def test_add_peak_alt_session_missing_coord_cols_returns_none_column():
     assert result["_peak_alt_session"].isna().all()
 
 
+def test_add_peak_alt_session_fast_engine_matches_astropy():
+    from backend.fastsky import MAX_ERROR_DEG
+    loc = EarthLocation(lat=40.7 * u.deg, lon=-74.0 * u.deg)
+    start = datetime(2026, 7, 2, 1, 0, tzinfo=pytz.utc)
+    end = start + timedelta(hours=6)
+    df = pd.DataFrame({"_ra_deg": [279.23, 0.0, None], "_dec_deg": [38.78, -70.0, None]})
+    ref = _add_peak_alt_session(df.copy(), loc, start, end)["_peak_alt_session"]
+    fast = _add_peak_alt_session(df.copy(), loc, start, end, engine="fast")["_peak_alt_session"]
+    assert abs(fast[0] - ref[0]) < MAX_ERROR_DEG
+    assert abs(fast[1] - ref[1]) < MAX_ERROR_DEG
+    assert pd.isna(fast[2]) and pd.isna(ref[2])
+
 # ── _apply_night_plan_filters tests ───────────────────────────────────────────
 
 import pytz
@@ -274,6 +385,26 @@ def test_apply_filters_window_excludes_target_after_window():
     )
     assert result.empty
 
+def test_apply_filters_min_alt_uses_batched_peak():
+    """With a location, rows below min_alt at their window peak are dropped and the peak is reported."""
+    from backend.core import compute_peak_alt_in_window
+    loc = EarthLocation(lat=40.7 * u.deg, lon=-74.0 * u.deg)
+    df = _base_obs_df()
+    win_s, win_e = _win()
+    peaks = [compute_peak_alt_in_window(r, d, loc, win_s, win_e, method="sampled", n_steps=25)
+             for r, d in zip(df["_ra_deg"], df["_dec_deg"])]
+    cutoff = sorted(peaks)[1]
+    result = _apply_night_plan_filters(
+        df, None, None, None, None, None, None, None, None,
+        win_start_dt=win_s, win_end_dt=win_e,
+        sel_moon=None, all_moon_statuses=[],
+        location=loc, min_alt=cutoff - 0.01,
+    )
+    assert len(result) == 2
+    for name, peak in zip(result["Name"], result["_peak_alt_window"]):
+        # analytic peak is never below a sampled one (10-min samples miss < 0.1°)
+        assert -1e-3 < peak - peaks[["A", "B", "C"].index(name)] < 0.1
+
 def test_apply_filters_always_up_passes_window():
     tz = pytz.utc
     df = pd.DataFrame({
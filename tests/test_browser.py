@@ -0,0 +1,124 @@
+"""Tests for backend/browser.py (persistent scraper browser worker)."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend import browser
+
+
+class _FakeContext:
+    def __init__(self, session):
+        self.session = session
+
+    async def cookies(self):
+        if self.session.dead:
+            raise RuntimeError("Target page, context or browser has been closed")
+        return []
+
+
+class _FakeSession:
+    """Stands in for scrapling's AsyncStealthySession (no Chromium in tests)."""
+    launched = []
+    active = 0
+    peak = 0
+
+    def __init__(self, max_pages, **options):
+        self.max_pages, self.options = max_pages, options
+        self.dead = False
+        self.closed = False
+        self.context = _FakeContext(self)
+
+    async def start(self):
+        _FakeSession.launched.append(self)
+
+    async def fetch(self, url, **kwargs):
+        if self.dead:
+            raise RuntimeError("Browser has been closed")
+        _FakeSession.active += 1
+        _FakeSession.peak = max(_FakeSession.peak, _FakeSession.active)
+        await asyncio.sleep(0.05)
+        _FakeSession.active -= 1
+        return (url, kwargs, self)
+
+    async def close(self):
+        self.closed = True
+
+    def get_pool_stats(self):
+        return {"total_pages": 0, "busy_pages": 0, "max_pages": self.max_pages}
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    monkeypatch.setattr(browser, "AsyncStealthySession", _FakeSession)
+    _FakeSession.launched, _FakeSession.active, _FakeSession.peak = [], 0, 0
+    w = browser.BrowserWorker(max_pages=2)
+    yield w
+    w.close()
+
+
+def test_one_browser_serves_concurrent_fetches_up_to_the_page_pool(worker):
+    urls = [f"https://example.org/{k}" for k in range(6)]
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        pages = list(pool.map(lambda url: worker.fetch(url, network_idle=True), urls))
+    assert [p[0] for p in pages] == urls and pages[0][1] == {"network_idle": True}
+    assert len(_FakeSession.launched) == 1 and _FakeSession.peak == 2
+    assert _FakeSession.launched[0].options == {"headless": True}
+    stats = worker.stats()
+    assert (stats["fetches"], stats["launches"], stats["alive"], stats["busy"]) == (6, 1, True, 0)
+
+
+def test_dead_browser_is_replaced_and_the_fetch_retried(worker):
+    worker.fetch("https://example.org/a")
+    first = _FakeSession.launched[0]
+    first.dead = True
+    assert worker.fetch("https://example.org/b")[2] is not first
+    assert first.closed and len(_FakeSession.launched) == 2
+    stats = worker.stats()
+    assert (stats["failures"], stats["restarts"], stats["fetches"]) == (1, 1, 2)
+
+
+def test_idle_health_check_and_recycling(worker):
+    worker.health_interval = 0.0
+    worker.fetch("https://example.org/a")
+    _FakeSession.launched[0].dead = True              # died while idle
+    worker.fetch("https://example.org/b")
+    assert worker.stats()["failures"] == 0 and len(_FakeSession.launched) == 2
+
+    worker.health_interval, worker.recycle_after = 300.0, 2
+    worker.fetch("https://example.org/c")
+    worker.fetch("https://example.org/d")              # second use on this session: recycled first
+    assert len(_FakeSession.launched) == 3 and worker.stats()["restarts"] == 2
+
+
+def test_idle_browser_is_closed_and_relaunched_on_demand(worker):
+    worker.idle_timeout = 0.1
+    worker.fetch("https://example.org/a")
+    time.sleep(0.05)
+    worker.fetch("https://example.org/b")              # use re-arms the idle timer
+    time.sleep(0.07)
+    assert worker.stats()["alive"] and not _FakeSession.launched[0].closed
+    time.sleep(0.2)
+    stats = worker.stats()
+    assert not stats["alive"] and _FakeSession.launched[0].closed
+    assert (stats["idle_closes"], stats["restarts"]) == (1, 0)
+    worker.fetch("https://example.org/c")
+    assert len(_FakeSession.launched) == 2 and worker.stats()["alive"]
+
+
+def test_fetches_wait_for_the_startup_warmup(worker, monkeypatch):
+    gate, installs = threading.Event(), []
+    monkeypatch.setattr(browser, "install_chromium", lambda: installs.append(gate.wait(5)))
+    warm = worker.warmup()
+    time.sleep(0.05)
+    fetched = []
+    t = threading.Thread(target=lambda: fetched.append(worker.fetch("https://example.org/a")))
+    t.start()
+    time.sleep(0.05)
+    assert not fetched and not _FakeSession.launched       # still installing
+    gate.set()
+    warm.result(5)
+    t.join(5)
+    assert installs == [True] and len(fetched) == 1 and len(_FakeSession.launched) == 1
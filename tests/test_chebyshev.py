@@ -0,0 +1,105 @@
+"""Tests for backend/chebyshev.py (piecewise Chebyshev long-range ephemerides)."""
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import chebyshev
+from backend.ephemeris import EphemerisReader
+
+_JD0 = 2461000.5      # 2025-11-21 00:00 UTC
+
+
+def _track(d):
+    """Smooth synthetic geocentric track crossing RA 0h, d in days from _JD0."""
+    ra = (340.0 + 0.8 * d + 15 * np.sin(2 * np.pi * d / 365) + 3 * np.sin(2 * np.pi * d / 27)) % 360.0
+    dec = 30 * np.sin(2 * np.pi * d / 300) + 2 * np.cos(2 * np.pi * d / 29)
+    vmag = 12 + 2 * np.sin(2 * np.pi * d / 200)
+    return ra, dec, vmag
+
+
+def _sep_arcsec(ra1, dec1, ra2, dec2):
+    dra = ((ra1 - ra2 + 180) % 360 - 180) * np.cos(np.radians(dec2))
+    return np.hypot(dra, dec1 - dec2) * 3600
+
+
+def _fit(days=400):
+    d = np.arange(days + 1.0)
+    return chebyshev.fit_segments(_JD0 + d, *_track(d))
+
+
+def test_fit_is_accurate_between_samples_and_smaller_than_samples():
+    segs, worst = _fit()
+    assert worst < chebyshev.TOLERANCE_ARCSEC
+    d = np.linspace(0, 400, 4001)
+    ra, dec, vmag = chebyshev.evaluate(segs, _JD0 + d)
+    ra0, dec0, vmag0 = _track(d)
+    assert _sep_arcsec(ra, dec, ra0, dec0).max() < 2.0
+    assert np.abs(vmag - vmag0).max() < 0.01
+    assert segs.nbytes < 401 * 28 / 1.5        # vs the daily binary store rows
+    # Segments tile the span with shared edges
+    assert segs["jd0"][0] == _JD0 and segs["jd1"][-1] == _JD0 + 400
+    assert np.array_equal(segs["jd0"][1:], segs["jd1"][:-1])
+
+
+def test_fit_splits_segments_that_miss_the_tolerance():
+    d = np.arange(121.0)
+    ra, dec, vmag = _track(d)
+    dec = dec + 5 * np.sin(2 * np.pi * d / 6)    # fast wobble a 32-day series cannot follow
+    segs, _ = chebyshev.fit_segments(_JD0 + d, ra, dec, vmag)
+    loose, _ = chebyshev.fit_segments(_JD0 + d, ra, dec, vmag, tolerance_arcsec=1e9)
+    assert len(segs) > len(loose) == 4
+    assert (segs["jd1"] - segs["jd0"]).min() >= chebyshev.MIN_SEGMENT_DAYS
+
+
+def test_fit_handles_missing_magnitudes_and_short_input():
+    d = np.arange(41.0)
+    ra, dec, vmag = _track(d)
+    segs, _ = chebyshev.fit_segments(_JD0 + d, ra, dec, np.full_like(vmag, np.nan))
+    assert np.isnan(chebyshev.evaluate(segs, [_JD0 + 3.5])[2][0])
+    empty, worst = chebyshev.fit_segments([_JD0], [1.0], [2.0], [np.nan])
+    assert len(empty) == 0 and worst == 0.0
+
+
+def test_store_roundtrip_and_reader_fallback(tmp_path):
+    segs, worst = _fit()
+    path = str(tmp_path / "cheb.npy")
+    fits = {"comets": {"C/2025 X1": {"segments": segs, "fitted_utc": "2025-11-21T00:00:00",
+                                     "id": "C/2025 X1", "max_error_arcsec": worst}}}
+    index = chebyshev.write_chebyshev(fits, path, {"horizon_days": 400})
+    assert index["rows"] == len(segs) and index["horizon_days"] == 400
+
+    store = chebyshev.load_chebyshev(path)
+    assert store.names("comets") == ["C/2025 X1"] and store.names("asteroids") == []
+    assert store.fit_info("comets", "C/2025 X1")["id"] == "C/2025 X1"
+    assert store.span("comets", "C/2025 X1") == (_JD0, _JD0 + 400)
+    assert store.positions("comets", "C/2025 X1", [_JD0 + 401]) is None
+    assert np.array_equal(store.to_fits()["comets"]["C/2025 X1"]["segments"], segs)
+
+    # 30 daily samples + the long-range fit: beyond day 30 the reader uses the fit
+    d = np.arange(31.0)
+    ra, dec, vmag = _track(d)
+    daily = {"comets": {"C/2025 X1": {"positions": [
+        {"jd": _JD0 + k, "ra": r, "dec": de, "vmag": v} for k, r, de, v in zip(d, ra, dec, vmag)]}}}
+    start = datetime(2025, 11, 21, tzinfo=timezone.utc)
+    when = start + timedelta(days=200, hours=6)
+    assert EphemerisReader(daily).position("comets", "C/2025 X1", when) is None
+    reader = EphemerisReader(daily, long_range=store)
+    ra_, dec_, vmag_ = reader.position("comets", "C/2025 X1", when)
+    ra0, dec0, vmag0 = _track(np.array([200.25]))
+    assert _sep_arcsec(ra_, dec_, ra0[0], dec0[0]) < 2.0 and abs(vmag_ - vmag0[0]) < 0.01
+    # A trajectory straddling the daily span is answered entirely from the fit
+    times = [start + timedelta(days=29, hours=h) for h in range(0, 72, 6)]
+    assert len(reader.positions("comets", "C/2025 X1", times)[0]) == len(times)
+    assert reader.position("comets", "C/2025 X1", start + timedelta(days=500)) is None
+
+
+def test_load_rejects_inconsistent_store(tmp_path):
+    path = str(tmp_path / "cheb.npy")
+    assert chebyshev.load_chebyshev(path) is None
+    chebyshev.write_chebyshev({"comets": {"X": {"segments": _fit(60)[0]}}}, path)
+    np.save(path, np.zeros(3))
+    assert chebyshev.load_chebyshev(path) is None
@@ -0,0 +1,72 @@
+"""Parity tests for backend/constellations.py against SkyCoord.get_constellation."""
+import warnings
+
+import numpy as np
+import pytest
+from astropy import units as u
+from astropy.coordinates import PrecessedGeocentric, SkyCoord
+
+from backend import constellations
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    return constellations.load_index(str(tmp_path_factory.mktemp("const") / "index.npz"))
+
+
+def _random_sky(n, seed):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, 360, n), np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+
+
+def test_every_cell_has_a_constellation(index):
+    assert (index["cells"] >= 0).all()
+    assert len(index["short"]) == 88
+
+
+def test_matches_get_constellation_away_from_boundaries(index):
+    ra, dec = _random_sky(50_000, seed=0)
+    sc = SkyCoord(ra=ra * u.deg, dec=dec * u.deg, frame='icrs')
+    ref = sc.get_constellation(short_name=True)
+    got = constellations.constellation_names(ra, dec, index=index)
+
+    miss = got != ref
+    assert miss.sum() <= 5
+    # Any disagreement must sit on a boundary line (within the ~5" closed-form residual)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        b1875 = sc[miss].transform_to(PrecessedGeocentric(equinox="B1875"))
+    tol = 10.0 / 3600.0
+    for rah, decd in zip(b1875.ra.hour, b1875.dec.deg):
+        near_dec = np.abs(index["dec_edges"] - decd).min() < tol
+        near_ra = np.abs(index["ra_edges"] - rah).min() * 15.0 * np.cos(np.radians(decd)) < tol
+        assert near_dec or near_ra
+
+
+def test_long_names_and_scalar_input(index):
+    assert constellations.constellation_names(279.23, 38.78, index=index) == "Lyr"
+    assert constellations.constellation_names(279.23, 38.78, short_name=False, index=index) == "Lyra"
+    assert constellations.constellation_names(0.0, -90.0, index=index) == "Oct"
+    assert constellations.constellation_names(0.0, 90.0, index=index) == "UMi"
+
+
+def test_non_finite_rows_are_blank(index):
+    got = constellations.constellation_names([np.nan, 83.82, 10.0], [0.0, -5.39, np.inf], index=index)
+    assert list(got) == ["", "Ori", ""]
+
+
+def test_index_is_cached_on_disk(tmp_path, monkeypatch):
+    path = str(tmp_path / "index.npz")
+    built = constellations.load_index(path)
+    constellations._index.pop(path)
+    monkeypatch.setattr(constellations, "build_index", lambda: pytest.fail("index rebuilt"))
+    loaded = constellations.load_index(path)
+    np.testing.assert_array_equal(loaded["cells"], built["cells"])
+
+
+def test_stale_or_corrupt_cache_is_rebuilt(tmp_path):
+    path = tmp_path / "index.npz"
+    path.write_bytes(b"not an npz")
+    idx = constellations.load_index(str(path))
+    assert (idx["cells"] >= 0).all()
+    assert constellations._read_index(str(path)) is not None
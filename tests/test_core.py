@@ -97,6 +97,37 @@ def test_calculate_planning_info_set_after_rise():
 
 # ── compute_peak_alt_in_window ────────────────────────────────────────────────
 
+@pytest.mark.parametrize("lat, tz_name", [(40.7, "America/New_York"), (-33.9, "Africa/Johannesburg"), (65.0, "UTC")])
+def test_calculate_planning_info_batch_matches_scalar(lat, tz_name):
+    """Batch frame equals the scalar dicts row for row (incl. a DST change inside the 24 h span)."""
+    import numpy as np
+    import pandas as pd
+    from backend.core import calculate_planning_info_batch, PLANNING_COLUMNS
+
+    rng = np.random.default_rng(7)
+    ra = rng.uniform(0, 360, 40)
+    dec = np.degrees(np.arcsin(rng.uniform(-1, 1, 40)))
+    loc = EarthLocation(lat=lat * u.deg, lon=-74.0 * u.deg)
+    start = pytz.timezone(tz_name).localize(datetime(2026, 3, 7, 21, 0))
+    batch = calculate_planning_info_batch(ra, dec, loc, start)
+    scalar = pd.DataFrame([
+        calculate_planning_info(SkyCoord(ra=r * u.deg, dec=d * u.deg, frame='icrs'), loc, start)
+        for r, d in zip(ra, dec)
+    ])
+    pd.testing.assert_frame_equal(batch, scalar[PLANNING_COLUMNS])
+
+
+def test_calculate_planning_info_batch_non_finite_row_is_error():
+    import numpy as np
+    from backend.core import calculate_planning_info_batch
+
+    loc = EarthLocation(lat=40.7 * u.deg, lon=-74.0 * u.deg)
+    start = pytz.utc.localize(datetime(2026, 7, 1, 1, 0))
+    df = calculate_planning_info_batch([279.23, np.nan], [38.78, 10.0], loc, start)
+    assert df["Status"].tolist() == ["Visible", "Error"]
+    assert df.loc[1, "Rise"] == "---"
+    assert df.loc[0, "Constellation"] == "Lyr"
+
 def test_compute_peak_alt_in_window_below_horizon():
     """Object that never rises from the observer's location returns negative peak altitude."""
     from datetime import datetime
@@ -147,3 +178,137 @@ def test_compute_peak_alt_in_window_n_steps_minimum():
     peak = compute_peak_alt_in_window(279.23, 38.78, loc, win_start, win_end, n_steps=2)
     assert isinstance(peak, float)
     assert -90.0 <= peak <= 90.0
+
+
+@pytest.mark.parametrize("ra, dec", [(279.23, 38.78), (0.0, -70.0), (83.8, -5.4)])
+def test_compute_peak_alt_in_window_fast_engine_matches_astropy(ra, dec):
+    from backend.core import compute_peak_alt_in_window
+    from backend.fastsky import MAX_ERROR_DEG
+
+    loc = EarthLocation(lat=40.7 * u.deg, lon=-74.0 * u.deg)
+    tz  = pytz.timezone('America/New_York')
+    win_start = tz.localize(datetime(2026, 7, 1, 21, 0))
+    win_end   = tz.localize(datetime(2026, 7, 2, 3, 0))
+    ref  = compute_peak_alt_in_window(ra, dec, loc, win_start, win_end)
+    fast = compute_peak_alt_in_window(ra, dec, loc, win_start, win_end, engine="fast")
+    assert isinstance(fast, float)
+    assert abs(fast - ref) < MAX_ERROR_DEG
+
+
+def test_compute_peak_alt_in_window_unknown_engine_raises():
+    from backend.core import compute_peak_alt_in_window
+
+    loc = EarthLocation(lat=40.7 * u.deg, lon=-74.0 * u.deg)
+    start = datetime(2026, 7, 2, 1, 0, tzinfo=pytz.utc)
+    with pytest.raises(ValueError):
+        compute_peak_alt_in_window(0.0, 0.0, loc, start, start, engine="skyfield")
+
+
+@pytest.mark.parametrize("engine", ["astropy", "fast"])
+def test_compute_peak_alt_batch_matches_dense_sampling(engine):
+    """Analytic peak (transit or endpoint) equals a 1-minute sampled peak, never below it by more than noise."""
+    import numpy as np
+    from backend.core import compute_peak_alt_batch, compute_peak_alt_in_window
+    from backend.fastsky import MAX_ERROR_DEG
+
+    loc = EarthLocation(lat=-33.9 * u.deg, lon=18.4 * u.deg)
+    win_start = datetime(2026, 3, 1, 18, 0, tzinfo=pytz.utc)
+    win_end = datetime(2026, 3, 2, 4, 0, tzinfo=pytz.utc)
+    ra = np.array([0.0, 90.0, 180.0, 270.0, 45.0, 300.0])
+    dec = np.array([-60.0, -30.0, 0.0, 20.0, -89.0, 10.0])
+    peaks = compute_peak_alt_batch(ra, dec, loc, win_start, win_end, engine=engine)
+    from astropy.coordinates import AltAz
+    from astropy.time import Time
+    t = Time(win_start) + np.linspace(0, 10 * 3600, 601) * u.s
+    sc = SkyCoord(ra=ra[:, None] * u.deg, dec=dec[:, None] * u.deg, frame='icrs')
+    sampled = sc.transform_to(AltAz(obstime=t[None, :], location=loc)).alt.deg.max(axis=1)
+    tol = 1e-3 if engine == "astropy" else MAX_ERROR_DEG
+    assert np.abs(peaks - sampled).max() < tol
+    assert compute_peak_alt_in_window(ra[0], dec[0], loc, win_start, win_end, engine=engine) == peaks[0]
+
+
+def test_compute_peak_alt_batch_transit_inside_window():
+    """Transit inside the window → peak is the meridian altitude 90 - |lat - dec|."""
+    import numpy as np
+    from backend.core import compute_peak_alt_batch
+
+    loc = EarthLocation(lat=40.7 * u.deg, lon=-74.0 * u.deg)
+    tz = pytz.timezone('America/New_York')
+    win_start = tz.localize(datetime(2026, 7, 1, 21, 0))
+    win_end = tz.localize(datetime(2026, 7, 2, 3, 0))
+    peaks = compute_peak_alt_batch([279.23, np.nan], [38.78, 10.0], loc, win_start, win_end)
+    assert peaks[0] == pytest.approx(90.0 - abs(40.7 - 38.78), abs=0.3)   # precession/nutation of date
+    assert np.isnan(peaks[1])
+
+# ── compute_trajectory ────────────────────────────────────────────────────────
+
+def _traj_inputs():
+    from datetime import datetime
+    import pytz
+    from astropy.coordinates import EarthLocation
+    import astropy.units as u
+    loc = EarthLocation(lat=40.7 * u.deg, lon=-74.0 * u.deg)
+    start = pytz.timezone('America/New_York').localize(datetime(2026, 7, 1, 21, 0))
+    return loc, start
+
+
+def test_compute_trajectory_matches_per_step_transform():
+    """Batched transform must equal a scalar AltAz transform at each step."""
+    from datetime import timedelta
+    from astropy.coordinates import AltAz
+    from astropy.time import Time
+    from backend.core import compute_trajectory
+
+    loc, start = _traj_inputs()
+    sc = SkyCoord(ra=279.23 * u.deg, dec=38.78 * u.deg, frame='icrs')
+    rows = compute_trajectory(sc, loc, start, duration_minutes=60, step_minutes=30)
+    assert len(rows) == 3
+    for i, row in enumerate(rows):
+        t = Time(start + timedelta(minutes=30 * i))
+        aa = sc.transform_to(AltAz(obstime=t, location=loc))
+        assert row["Altitude (°)"] == round(aa.alt.degree, 2)
+        assert row["Azimuth (°)"] == round(aa.az.degree, 2)
+        assert row["Constellation"] == "Lyra"
+        assert 0.0 <= row["Moon Sep (°)"] <= 180.0
+
+
+def test_compute_trajectory_ephemeris_shorter_than_window():
+    """Steps past the end of the ephemeris fall back to the fixed coordinate."""
+    from backend.core import compute_trajectory
+
+    loc, start = _traj_inputs()
+    sc = SkyCoord(ra=279.23 * u.deg, dec=38.78 * u.deg, frame='icrs')
+    ephem = [SkyCoord(ra=10.68 * u.deg, dec=41.27 * u.deg, frame='icrs')] * 2  # M31
+    rows = compute_trajectory(sc, loc, start, duration_minutes=30, step_minutes=10, ephemeris_coords=ephem)
+    assert len(rows) == 4
+    assert rows[0]["RA"] == rows[1]["RA"] != rows[2]["RA"] == rows[3]["RA"]
+    # Constellation is carried over from the last ephemeris step
+    assert [r["Constellation"] for r in rows] == ["Andromeda"] * 4
+
+
+def test_compute_trajectory_as_dataframe_same_columns():
+    from backend.core import compute_trajectory
+
+    loc, start = _traj_inputs()
+    sc = SkyCoord(ra=279.23 * u.deg, dec=38.78 * u.deg, frame='icrs')
+    rows = compute_trajectory(sc, loc, start, duration_minutes=20)
+    df = compute_trajectory(sc, loc, start, duration_minutes=20, as_dataframe=True)
+    assert list(df.columns) == list(rows[0].keys())
+    assert df.to_dict("records") == rows
+
+
+def test_compute_trajectory_fast_engine_close_to_astropy():
+    from backend.core import compute_trajectory
+    from backend.fastsky import MAX_ERROR_DEG
+
+    loc, start = _traj_inputs()
+    sc = SkyCoord(ra=279.23 * u.deg, dec=38.78 * u.deg, frame='icrs')
+    ephem = [SkyCoord(ra=(10.68 + i) * u.deg, dec=41.27 * u.deg, frame='icrs') for i in range(3)]
+    for eph in (None, ephem):
+        ref = compute_trajectory(sc, loc, start, duration_minutes=60, ephemeris_coords=eph)
+        fast = compute_trajectory(sc, loc, start, duration_minutes=60, ephemeris_coords=eph, engine="fast")
+        assert [r["Local Time"] for r in fast] == [r["Local Time"] for r in ref]
+        for a, b in zip(fast, ref):
+            assert abs(a["Altitude (°)"] - b["Altitude (°)"]) < MAX_ERROR_DEG
+            assert abs(a["Azimuth (°)"] - b["Azimuth (°)"]) < MAX_ERROR_DEG
+            assert (a["RA"], a["Constellation"], a["Moon Sep (°)"]) == (b["RA"], b["Constellation"], b["Moon Sep (°)"])
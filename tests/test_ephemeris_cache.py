@@ -81,17 +81,17 @@ def test_lookup_cached_position_wrong_date():
     assert _lookup_cached_position(cache, "comets", "X", "2026-04-15") is None
 
 
-# --- _build_epochs ---
+# --- _plan_fetch epochs ---
 
-def test_build_epochs_date_format():
-    from scripts.update_ephemeris_cache import _build_epochs
+def test_plan_fetch_epochs_date_format():
+    from scripts.update_ephemeris_cache import _plan_fetch
     from datetime import datetime, timezone
-    start, epochs = _build_epochs(days=30)
-    today = datetime.now(timezone.utc).date().isoformat()
-    assert start == today
-    assert epochs['start'] == today
+    today = datetime.now(timezone.utc).date()
+    kept, epochs = _plan_fetch(None, today, days=30)
+    assert kept == []
+    assert epochs['start'] == today.isoformat()
     assert len(epochs['stop']) == 10   # YYYY-MM-DD
-    assert epochs['stop'] > today
+    assert epochs['stop'] > today.isoformat()
     assert epochs['step'] == '1d'
 
 
@@ -182,3 +182,250 @@ def test_lookup_cached_position_hit_without_vmag_returns_none():
     }
     result = _lcp(cache, "comets", "X", "2026-03-05")
     assert result == (1.0, 2.0, None)
+
+
+# --- EphemerisReader (interpolating reader) ---
+
+def _daily(ra_dec_vmag, start="2026-03-01"):
+    from datetime import date, timedelta
+    d0 = date.fromisoformat(start)
+    return [{"date": (d0 + timedelta(days=i)).isoformat(), "ra": r, "dec": d, "vmag": v}
+            for i, (r, d, v) in enumerate(ra_dec_vmag)]
+
+
+def test_reader_matches_get_body_between_daily_samples():
+    """Daily Mars samples interpolated at arbitrary instants stay within 1 arcsec."""
+    import warnings
+    import numpy as np
+    from astropy import units as u
+    from astropy.coordinates import SkyCoord, get_body
+    from astropy.time import Time
+    from backend.ephemeris import EphemerisReader
+
+    warnings.filterwarnings("ignore", message=".*transforming other coordinates.*")
+    days = Time("2026-03-01") + np.arange(10) * u.day
+    mars = get_body("mars", days).icrs
+    cache = {"asteroids": {"Mars": {"positions": _daily(zip(mars.ra.deg, mars.dec.deg, [1.0] * 10))}}}
+    query = Time("2026-03-01") + np.linspace(0.1, 8.9, 40) * u.day
+    ref = get_body("mars", query).icrs
+
+    ra, dec, _ = EphemerisReader(cache).positions("asteroids", "Mars", query)
+    err = SkyCoord(ra=ra * u.deg, dec=dec * u.deg).separation(SkyCoord(ra=ref.ra, dec=ref.dec))
+    assert err.arcsec.max() < 1.0
+
+
+def test_reader_interpolates_across_ra_wraparound():
+    from datetime import datetime, timezone
+    from backend.ephemeris import EphemerisReader
+    cache = {"comets": {"X": {"positions": _daily([(358.0, 0.0, 10.0), (0.0, 0.0, 10.2),
+                                                   (2.0, 0.0, 10.4)])}}}
+    ra, dec, vmag = EphemerisReader(cache).position(
+        "comets", "X", datetime(2026, 3, 1, 12, tzinfo=timezone.utc))
+    assert abs(ra - 359.0) < 1e-3 and abs(dec) < 1e-6
+    assert vmag == 10.1
+
+
+def test_reader_out_of_span_and_unknown_object_return_none():
+    from datetime import datetime, timezone
+    from backend.ephemeris import EphemerisReader
+    reader = EphemerisReader({"comets": {"X": {"positions": _daily([(1.0, 2.0, None), (2.0, 3.0, None)])}}})
+    assert reader.position("comets", "X", datetime(2026, 3, 3, tzinfo=timezone.utc)) is None
+    assert reader.position("comets", "Y", datetime(2026, 3, 1, tzinfo=timezone.utc)) is None
+    assert reader.position("asteroids", "X", datetime(2026, 3, 1, tzinfo=timezone.utc)) is None
+    # Old-format entries (no vmag) still interpolate; vmag is None
+    assert reader.position("comets", "X", datetime(2026, 3, 1, 6, tzinfo=timezone.utc))[2] is None
+
+
+def test_reader_sky_coords_for_trajectory_window():
+    from datetime import datetime, timedelta, timezone
+    import numpy as np
+    from backend.ephemeris import EphemerisReader
+    positions = _daily([(10.0 + i, -5.0 + 0.5 * i, 12.0) for i in range(5)])
+    positions[2]["jd"] = 2461102.75       # irregular spacing → searchsorted path
+    reader = EphemerisReader({"asteroids": {"A": {"positions": positions}}})
+    start = datetime(2026, 3, 1, 20, tzinfo=timezone.utc)
+    steps = [start + timedelta(minutes=10 * i) for i in range(73)]
+    coords = reader.sky_coords("asteroids", "A", steps)
+    assert coords.shape == (73,)
+    assert abs(coords[0].ra.deg - 10.83) < 0.05
+    assert (np.diff(coords.ra.deg) > 0).all()
+
+
+# --- Binary store ---
+
+def _sample_cache():
+    return {
+        "generated_utc": "2026-03-01T06:00:00",
+        "horizon_days": 5,
+        "comets": {"C/2025 A1 (Test)": {"positions": _daily([(358.0 + i, -1.0 + i, 9.0 + 0.1 * i) for i in range(5)])}},
+        "asteroids": {"1 Ceres": {"positions": _daily([(40.0 + i, 10.0, None) for i in range(5)])},
+                      "Empty": {"positions": []}},
+        "name_changes": [],
+        "failures": [{"section": "comets", "name": "Gone", "error": "not found"}],
+    }
+
+
+def test_store_round_trip_and_mmap(tmp_path):
+    import numpy as np
+    from backend.ephemeris import load_store, write_store, index_path_for
+    path = str(tmp_path / "eph.npy")
+    index = write_store(_sample_cache(), path)
+    assert index["rows"] == 10 and os.path.exists(index_path_for(path))
+
+    store = load_store(path)
+    assert isinstance(store.data, np.memmap)
+    assert store.meta["failures"][0]["name"] == "Gone"
+    assert store.names("asteroids") == ["1 Ceres", "Empty"]
+    jd, ra, dec, vmag = store.samples("comets", "C/2025 A1 (Test)")
+    assert list(ra) == [358.0, 359.0, 360.0, 361.0, 362.0] and (np.diff(jd) == 1.0).all()
+    assert np.isnan(store.samples("asteroids", "1 Ceres")[3]).all()
+    assert len(store.samples("asteroids", "Empty")[0]) == 0
+    assert store.samples("comets", "Nope") is None
+
+
+def test_store_json_export_matches_source(tmp_path):
+    from backend.ephemeris import load_store, write_store
+    from backend.config import lookup_cached_position
+    src = _sample_cache()
+    path = str(tmp_path / "eph.npy")
+    write_store(src, path)
+    exported = load_store(path).to_json_dict()
+    for section, name in (("comets", "C/2025 A1 (Test)"), ("asteroids", "1 Ceres")):
+        for date in ("2026-03-01", "2026-03-04"):
+            assert lookup_cached_position(exported, section, name, date) == \
+                lookup_cached_position(src, section, name, date)
+    assert exported["failures"] == src["failures"]
+    assert json.loads(json.dumps(exported))["horizon_days"] == 5
+
+
+def test_reader_on_store_matches_reader_on_json(tmp_path):
+    from datetime import datetime, timezone
+    from backend.ephemeris import EphemerisReader, load_store, write_store
+    src = _sample_cache()
+    path = str(tmp_path / "eph.npy")
+    write_store(src, path)
+    from_store, from_json = EphemerisReader(load_store(path)), EphemerisReader(src)
+    when = datetime(2026, 3, 2, 15, tzinfo=timezone.utc)
+    for section, name in (("comets", "C/2025 A1 (Test)"), ("asteroids", "1 Ceres"), ("asteroids", "Empty")):
+        assert from_store.position(section, name, when) == from_json.position(section, name, when)
+
+
+def test_load_ephemeris_falls_back_to_json(tmp_path):
+    from backend.ephemeris import EphemerisStore, load_ephemeris, load_store, write_store, index_path_for
+    json_path = tmp_path / "eph.json"
+    json_path.write_text(json.dumps(_sample_cache()))
+    npy_path = str(tmp_path / "eph.npy")
+    assert load_ephemeris(npy_path, str(json_path))["horizon_days"] == 5   # no store yet
+
+    write_store(_sample_cache(), npy_path)
+    assert isinstance(load_ephemeris(npy_path, str(json_path)), EphemerisStore)
+
+    # Index out of step with the array (e.g. a half-finished update) → JSON
+    index = json.loads(open(index_path_for(npy_path)).read())
+    index["rows"] += 1
+    open(index_path_for(npy_path), "w").write(json.dumps(index))
+    assert load_store(npy_path) is None
+    assert isinstance(load_ephemeris(npy_path, str(json_path)), dict)
+
+
+def test_convert_writes_store_from_json(tmp_path, monkeypatch):
+    from scripts import update_ephemeris_cache as upd
+    from backend.ephemeris import load_store
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / upd.OUTPUT_FILE).write_text(json.dumps(_sample_cache()))
+    assert upd.main(["--convert"]) == 0
+    assert load_store(upd.STORE_FILE).names("comets") == ["C/2025 A1 (Test)"]
+
+
+# --- incremental update ---
+
+def _days(start, n, ra0=10.0):
+    from datetime import timedelta
+    from astropy.time import Time
+    out = []
+    for k in range(n):
+        d = (start + timedelta(days=k)).isoformat()
+        out.append({"date": d, "jd": Time(d, scale="utc").jd, "ra": ra0 + k, "dec": 1.0, "vmag": 9.0})
+    return out
+
+
+def test_plan_fetch_only_missing_tail():
+    from datetime import date, timedelta
+    from scripts.update_ephemeris_cache import _plan_fetch
+    today = date(2026, 3, 10)
+    yesterdays = _days(today - timedelta(days=1), 31)        # last run: yesterday..yesterday+30
+    kept, epochs = _plan_fetch(yesterdays, today, days=30)
+    assert kept[0]["date"] == "2026-03-10" and len(kept) == 30
+    assert isinstance(epochs, float)                         # one missing day → single epoch
+    kept, epochs = _plan_fetch(_days(today - timedelta(days=3), 25), today, days=30)
+    assert len(kept) == 22 and epochs == {"start": "2026-04-01", "stop": "2026-04-09", "step": "1d"}
+    assert _plan_fetch(_days(today, 31), today, days=30) == (_days(today, 31), None)
+
+
+def test_plan_fetch_refetches_on_gaps_or_empty_cache():
+    from datetime import date, timedelta
+    from scripts.update_ephemeris_cache import _plan_fetch
+    today = date(2026, 3, 10)
+    full = {"start": "2026-03-10", "stop": "2026-04-09", "step": "1d"}
+    assert _plan_fetch(None, today, days=30) == ([], full)
+    assert _plan_fetch(_days(today + timedelta(days=2), 10), today, days=30) == ([], full)
+    holey = _days(today, 10)
+    del holey[4]
+    assert _plan_fetch(holey, today, days=30) == ([], full)
+
+
+def test_incremental_run_fetches_only_new_days(tmp_path, monkeypatch):
+    from datetime import datetime, timedelta, timezone
+    from astropy.table import Table
+    from astropy.time import Time
+    from scripts import update_ephemeris_cache as upd
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / upd.COMETS_FILE).write_text("comets:\n  - C/2025 A1 (Test)\n")
+    (tmp_path / upd.ASTEROIDS_FILE).write_text("asteroids:\n  - 433 Eros\n")
+    (tmp_path / upd.OVERRIDES_FILE).write_text("comets: {}\nasteroids: {}\n")
+
+    queries, long_queries, validations = [], [], []
+
+    def fake_query(horizons_id, location, epochs, closest_apparition=True):
+        if isinstance(epochs, float):
+            jds = [epochs]
+        else:
+            first = Time(epochs["start"], scale="utc").jd
+            jds = [first + k for k in range(int(Time(epochs["stop"], scale="utc").jd - first) + 1)]
+        (long_queries if len(jds) > upd.HORIZON_DAYS + 1 else queries).append((horizons_id, epochs))
+        return Table({"datetime_jd": jds, "RA": [10.0] * len(jds), "DEC": [1.0] * len(jds),
+                      "Tmag": [9.0] * len(jds), "V": [8.0] * len(jds)})
+
+    monkeypatch.setattr(upd, "_horizons_query", fake_query)
+    monkeypatch.setattr(upd, "_validate_name", lambda name, section: validations.append(name))
+    assert upd.main([]) == 0
+    assert len(queries) == 2 and all(isinstance(e, dict) for _, e in queries)
+    assert len(validations) == 2 and len(long_queries) == 2
+
+    # Same day again: nothing to fetch, weekly validation and refit not due
+    queries.clear()
+    long_queries.clear()
+    validations.clear()
+    assert upd.main(["--export-json"]) == 0
+    assert queries == [] and long_queries == [] and validations == []
+    exported = json.loads((tmp_path / upd.OUTPUT_FILE).read_text())
+    assert len(exported["comets"]["C/2025 A1 (Test)"]["positions"]) == upd.HORIZON_DAYS + 1
+    assert exported["ids"]["asteroids"] == {"433 Eros": "433"}
+
+    # Next day: one epoch per object
+    tomorrow = datetime.now(timezone.utc) + timedelta(days=1)
+
+    class _Tomorrow(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return tomorrow
+    monkeypatch.setattr(upd, "datetime", _Tomorrow)
+    assert upd.main([]) == 0
+    assert len(queries) == 2 and all(isinstance(e, float) for _, e in queries)
+
+    # An override change refetches that object in full and refits it
+    queries.clear()
+    (tmp_path / upd.OVERRIDES_FILE).write_text("comets: {}\nasteroids:\n  433 Eros: '2000433'\n")
+    assert upd.main([]) == 0
+    assert [(hid, isinstance(e, dict)) for hid, e in queries] == [("2000433", True)]
+    assert [hid for hid, _ in long_queries] == ["2000433"]
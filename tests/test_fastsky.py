@@ -0,0 +1,65 @@
+"""Parity tests for backend/fastsky.py against the astropy AltAz pipeline."""
+import numpy as np
+import pytest
+from datetime import datetime, timedelta, timezone
+from astropy import units as u
+from astropy.coordinates import AltAz, EarthLocation, SkyCoord
+from astropy.time import Time
+
+from backend import fastsky
+
+
+def _astropy_altaz(ra, dec, loc, times):
+    sc = SkyCoord(ra=ra[:, None] * u.deg, dec=dec[:, None] * u.deg, frame='icrs')
+    aa = sc.transform_to(AltAz(obstime=Time(times)[None, :], location=loc))
+    return aa.alt.deg, aa.az.deg
+
+
+def _grid():
+    ra, dec = np.meshgrid(np.linspace(0, 345, 24), np.linspace(-88, 88, 23))
+    return ra.ravel(), dec.ravel()
+
+
+@pytest.mark.parametrize("lat", [-70.0, -33.9, 0.0, 19.8, 51.5, 78.2])
+@pytest.mark.parametrize("year", [1985, 2026, 2060])
+def test_altaz_within_error_bound(lat, year):
+    loc = EarthLocation(lat=lat * u.deg, lon=(lat * 2.5 - 40) * u.deg)
+    times = [datetime(year, 3, 1, 2, 0, tzinfo=timezone.utc) + timedelta(hours=5 * i) for i in range(5)]
+    ra, dec = _grid()
+    alt_ref, az_ref = _astropy_altaz(ra, dec, loc, times)
+    alt, az = fastsky.altaz(ra, dec, loc, times)
+
+    assert alt.shape == alt_ref.shape
+    assert np.abs(alt - alt_ref).max() < fastsky.MAX_ERROR_DEG
+    d_az = np.abs((az - az_ref + 180.0) % 360.0 - 180.0) * np.cos(np.radians(alt_ref))
+    assert d_az.max() < fastsky.MAX_ERROR_DEG
+
+
+def test_altaz_scalar_time_and_tuple_location():
+    t = datetime(2025, 7, 15, 3, 0, tzinfo=timezone.utc)
+    alt, az = fastsky.altaz(279.23, 38.78, (40.0, -74.0), t)
+    assert np.ndim(alt) == 0
+    ref_alt, ref_az = _astropy_altaz(np.array([279.23]), np.array([38.78]),
+                                     EarthLocation(lat=40 * u.deg, lon=-74 * u.deg), [t])
+    assert abs(alt - ref_alt[0, 0]) < fastsky.MAX_ERROR_DEG
+    assert abs(az - ref_az[0, 0]) < fastsky.MAX_ERROR_DEG
+
+
+def test_julian_date_naive_is_utc():
+    aware = datetime(2000, 1, 1, 12, 0, tzinfo=timezone.utc)
+    assert fastsky.julian_date(aware) == pytest.approx(2451545.0)
+    assert fastsky.julian_date(aware.replace(tzinfo=None)) == pytest.approx(2451545.0)
+
+
+def test_lst_matches_astropy_mean_sidereal_time():
+    times = [datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(days=37 * i) for i in range(10)]
+    lst = fastsky.lst_deg(fastsky.julian_date(times), -74.0)
+    ref = Time(times).sidereal_time('mean', longitude=-74.0 * u.deg).deg
+    diff = (lst - ref + 180.0) % 360.0 - 180.0
+    assert np.abs(diff).max() < 0.005   # only UT1-UTC separates them
+
+
+def test_check_engine_rejects_unknown():
+    assert fastsky.check_engine("fast") == "fast"
+    with pytest.raises(ValueError):
+        fastsky.check_engine("numba")
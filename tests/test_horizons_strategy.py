@@ -0,0 +1,86 @@
+"""Tests for the _horizons_query resolution strategy memo (backend/resolvers.py)."""
+import pytest
+import requests
+from astropy.table import Table
+
+from backend import resolvers
+
+NAME = "C/2025 N1 (ATLAS)"
+WINNER = ("C/2025 N1", None, True)      # fifth variant: short ID, no id_type
+
+
+@pytest.fixture
+def horizons(monkeypatch):
+    """Fake _run_variant: only WINNER resolves; records every attempt."""
+    calls = []
+
+    def fake(variant, location_code, epochs):
+        calls.append(variant)
+        if variant == state["winner"]:
+            return Table({"RA": [1.0], "DEC": [2.0]})
+        raise state["error"](state["message"])
+
+    state = {"winner": WINNER, "error": ValueError, "calls": calls,
+             "message": "Ambiguous target name; provide unique id"}
+    monkeypatch.setattr(resolvers, "_run_variant", fake)
+    return state
+
+
+def test_variants_order_and_dedup():
+    variants, short = resolvers._horizons_variants(NAME)
+    assert short == "C/2025 N1" and len(variants) == 5 and variants[-1] == WINNER
+    assert variants[0] == (NAME, "smallbody", True)
+    variants, short = resolvers._horizons_variants("433", closest_apparition=False)
+    assert short == "433" and len(variants) == 3
+
+
+def test_winning_variant_is_tried_first(horizons):
+    resolvers._horizons_query_uncached(NAME, "500", 2461000.5)
+    assert len(horizons["calls"]) == 5
+    horizons["calls"].clear()
+    resolvers._horizons_query_uncached(NAME, "500", 2461001.5)
+    assert horizons["calls"] == [WINNER]
+
+
+def test_dead_variants_are_skipped_when_memo_fails(horizons):
+    resolvers._horizons_query_uncached(NAME, "500", 2461000.5)
+    # The memo variant now fails, another one starts working: dead ones stay skipped
+    horizons["winner"] = (NAME, "smallbody", True)
+    horizons["calls"].clear()
+    with pytest.raises(RuntimeError, match="short: 'C/2025 N1'"):
+        resolvers._horizons_query_uncached(NAME, "500", 2461001.5)
+    assert horizons["calls"] == [WINNER]
+
+
+def test_network_errors_do_not_mark_variants_dead(horizons):
+    horizons["error"] = requests.exceptions.ConnectionError
+    horizons["winner"] = None
+    with pytest.raises(RuntimeError):
+        resolvers._horizons_query_uncached(NAME, "500", 2461000.5)
+    horizons["winner"] = WINNER
+    horizons["calls"].clear()
+    resolvers._horizons_query_uncached(NAME, "500", 2461000.5)
+    assert len(horizons["calls"]) == 5
+
+
+def test_memo_is_per_closest_apparition(horizons):
+    resolvers._horizons_query_uncached(NAME, "500", 2461000.5)
+    horizons["winner"] = ("C/2025 N1", None, False)
+    horizons["calls"].clear()
+    resolvers._horizons_query_uncached(NAME, "500", 2461000.5, closest_apparition=False)
+    assert horizons["calls"][-1] == ("C/2025 N1", None, False) and len(horizons["calls"]) == 5
+
+
+def test_query_dependent_value_errors_do_not_mark_variants_dead(horizons):
+    """An out-of-span query must not block the object's valid queries afterwards."""
+    resolvers._horizons_query_uncached(NAME, "500", 2461000.5)     # memo: WINNER
+    horizons["winner"] = None
+    horizons["message"] = "No ephemeris for target \"C/2025 N1\" after A.D. 2100-JAN-01"
+    horizons["calls"].clear()
+    with pytest.raises(RuntimeError):
+        resolvers._horizons_query(NAME, "500", 2480000.5)
+    assert horizons["calls"][0] == WINNER
+    horizons["winner"] = WINNER
+    horizons["calls"].clear()
+    assert len(resolvers._horizons_query(NAME, "500", 2461001.5)) == 1
+    assert horizons["calls"] == [WINNER]                           # memo kept, nothing dead
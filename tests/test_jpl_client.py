@@ -0,0 +1,236 @@
+"""Tests for backend/jpl_client.py (token bucket, AIMD concurrency, retries)."""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from backend import cancellation, jpl_client
+from backend.jpl_client import JPLScheduler, is_server_fault, is_throttle
+from backend.sbdb import sbdb_lookup
+
+
+def _http_error(status):
+    return requests.exceptions.HTTPError(response=MagicMock(status_code=status))
+
+
+def test_is_throttle():
+    assert is_throttle(_http_error(503)) and is_throttle(_http_error(429))
+    assert is_throttle(requests.exceptions.Timeout()) and is_throttle(requests.exceptions.ConnectionError())
+    assert not is_throttle(_http_error(404))
+    assert not is_throttle(ValueError("Ambiguous target name"))
+    assert is_server_fault(_http_error(500)) and not is_server_fault(_http_error(404))
+    assert not is_server_fault(ValueError("Ambiguous target name"))
+
+
+def test_throttles_are_retried_and_halve_the_limit():
+    sched = JPLScheduler(initial_concurrency=4, base_backoff=0.0, decrease_interval=0.0)
+    fn = MagicMock(side_effect=[_http_error(503), requests.exceptions.Timeout(), "ok"])
+    assert sched.call(fn) == "ok"
+    m = sched.metrics()
+    assert (m["requests"], m["retries"], m["throttles"], m["successes"]) == (3, 2, 2, 1)
+    assert m["concurrency_limit"] == pytest.approx(1.0 + 1.0)     # 4 → 2 → 1, then +1/1
+
+
+def test_gives_up_after_max_retries_and_does_not_retry_other_errors():
+    sched = JPLScheduler(base_backoff=0.0, max_retries=2)
+    fn = MagicMock(side_effect=_http_error(503))
+    with pytest.raises(requests.exceptions.HTTPError):
+        sched.call(fn)
+    assert fn.call_count == 3
+    fn = MagicMock(side_effect=ValueError("no match"))
+    with pytest.raises(ValueError):
+        sched.call(fn)
+    assert fn.call_count == 1 and sched.metrics()["concurrency_limit"] < 3
+
+
+def test_additive_increase_is_capped():
+    sched = JPLScheduler(rate=1e6, burst=1e6, initial_concurrency=1, max_concurrency=3)
+    for _ in range(50):
+        sched.call(lambda: None)
+    assert sched.concurrency_limit == 3
+
+
+def test_simultaneous_throttles_decrease_once():
+    sched = JPLScheduler(initial_concurrency=8, decrease_interval=60.0, max_retries=0)
+    for _ in range(3):
+        with pytest.raises(requests.exceptions.HTTPError):
+            sched.call(MagicMock(side_effect=_http_error(429)))
+    assert sched.metrics()["concurrency_limit"] == 4.0
+
+
+def test_concurrency_never_exceeds_limit():
+    sched = JPLScheduler(rate=1e6, burst=1e6, initial_concurrency=2, max_concurrency=2)
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def work():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+
+    threads = [threading.Thread(target=sched.call, args=(work,)) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2 and sched.metrics()["max_in_flight"] == 2
+
+
+def test_token_bucket_paces_requests():
+    sched = JPLScheduler(rate=50.0, burst=1, initial_concurrency=8)
+    start = time.monotonic()
+    for _ in range(6):
+        sched.call(lambda: None)
+    assert time.monotonic() - start >= 5 / 50.0 * 0.9
+    assert sched.metrics()["wait_s"] > 0
+
+
+def test_sbdb_throttle_status_is_retried(_fresh_jpl_scheduler):
+    busy = MagicMock(status_code=503)
+    busy.raise_for_status.side_effect = _http_error(503)
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"object": {"spkid": "90004812"}}
+    with patch("backend.sbdb.requests.get", side_effect=[busy, ok]):
+        assert sbdb_lookup("C/2025 Q3") == "90004812"
+    assert jpl_client.JPL.metrics()["retries"] == 1
+
+
+def test_circuit_opens_after_consecutive_failures_and_fails_fast():
+    sched = JPLScheduler(max_retries=0, breaker=jpl_client.CircuitBreaker(failure_threshold=3, reset_timeout=60))
+    down = MagicMock(side_effect=requests.exceptions.ConnectionError())
+    for _ in range(3):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            sched.call(down)
+    with pytest.raises(jpl_client.CircuitOpenError):
+        sched.call(down)
+    assert down.call_count == 3
+    circuit = sched.metrics()["circuit"]
+    assert circuit["state"] == "open" and circuit["trips"] == 1 and circuit["rejected"] == 1
+
+
+def test_non_throttle_errors_keep_the_circuit_closed():
+    sched = JPLScheduler(max_retries=0, breaker=jpl_client.CircuitBreaker(failure_threshold=2))
+    for err in (requests.exceptions.Timeout(), ValueError("no match"), requests.exceptions.Timeout()):
+        with pytest.raises(type(err)):
+            sched.call(MagicMock(side_effect=err))
+    assert sched.breaker.state == "closed"
+
+
+def test_server_faults_trip_the_circuit_without_retries():
+    sched = JPLScheduler(base_backoff=0.0, breaker=jpl_client.CircuitBreaker(failure_threshold=3))
+    fn = MagicMock(side_effect=_http_error(500))
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.HTTPError):
+            sched.call(fn)
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        sched.call(MagicMock(side_effect=requests.exceptions.JSONDecodeError("Expecting value", "<html>", 0)))
+    assert fn.call_count == 2 and sched.metrics()["retries"] == 0
+    assert sched.breaker.state == "open"
+    with pytest.raises(jpl_client.CircuitOpenError):
+        sched.call(fn)
+    assert fn.call_count == 2
+    # A real "no" from JPL (404) is an answer: it resets the failure count
+    sched = JPLScheduler(breaker=jpl_client.CircuitBreaker(failure_threshold=2))
+    for err in (_http_error(500), _http_error(404), _http_error(500)):
+        with pytest.raises(requests.exceptions.HTTPError):
+            sched.call(MagicMock(side_effect=err))
+    assert sched.breaker.state == "closed"
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = jpl_client.CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    sched = JPLScheduler(max_retries=0, breaker=breaker)
+    with pytest.raises(requests.exceptions.Timeout):
+        sched.call(MagicMock(side_effect=requests.exceptions.Timeout()))
+    assert breaker.state == "open" and breaker.seconds_until_retry() > 0
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    with pytest.raises(requests.exceptions.Timeout):          # failed probe re-opens at once
+        sched.call(MagicMock(side_effect=requests.exceptions.Timeout()))
+    assert breaker.state == "open"
+    time.sleep(0.06)
+    assert breaker.allow() and not breaker.allow()            # exactly one probe
+    breaker.record_success()
+    assert breaker.state == "closed" and sched.call(lambda: 1) == 1
+
+
+def test_interrupted_probe_does_not_wedge_the_circuit():
+    breaker = jpl_client.CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    sched = JPLScheduler(max_retries=0, breaker=breaker)
+    with pytest.raises(requests.exceptions.Timeout):
+        sched.call(MagicMock(side_effect=requests.exceptions.Timeout()))
+    time.sleep(0.06)
+    with pytest.raises(KeyboardInterrupt):                    # the probe itself is interrupted
+        sched.call(MagicMock(side_effect=KeyboardInterrupt()))
+    assert breaker.state == "half_open" and sched.call(lambda: 1) == 1
+    assert breaker.state == "closed"
+
+
+def test_open_circuit_stops_the_horizons_fallback_chain(monkeypatch):
+    from backend import resolvers
+    for _ in range(jpl_client.JPL.breaker.failure_threshold):
+        jpl_client.JPL.breaker.record_failure()
+    attempts = []
+    monkeypatch.setattr(resolvers, "Horizons", lambda **kw: attempts.append(kw) or MagicMock())
+    with pytest.raises(jpl_client.CircuitOpenError):
+        resolvers._horizons_query_uncached("C/2025 N1 (ATLAS)", "500", 2461000.5)
+    assert len(attempts) == 1 and not jpl_client.available()
+    assert sbdb_lookup("C/2025 N1") is None
+
+
+def test_cancelled_work_never_reaches_the_network(monkeypatch):
+    sched = JPLScheduler(base_backoff=0.0)
+    token = cancellation.CancelToken("comets")
+    fn = MagicMock(return_value="ok")
+    assert token.run(sched.call, fn) == "ok"
+    token.cancel()
+    with pytest.raises(cancellation.Cancelled):
+        token.run(sched.call, fn)
+    assert fn.call_count == 1 and sched.call(fn) == "ok"        # no token: unaffected
+    m = sched.metrics()
+    assert (m["requests"], m["cancelled"], m["failures"]) == (2, 1, 0)
+    assert m["in_flight"] == 0 and m["circuit"]["consecutive_failures"] == 0
+
+    # Superseded during a backoff: the sleep ends early and no retry goes out
+    sched = JPLScheduler(base_backoff=30.0, max_backoff=30.0)
+    monkeypatch.setattr(sched, "_backoff", lambda attempt: 30.0)
+    fn = MagicMock(side_effect=_http_error(503))
+    token = cancellation.CancelToken()
+    threading.Timer(0.05, token.cancel).start()
+    start = time.monotonic()
+    with pytest.raises(cancellation.Cancelled):
+        token.run(sched.call, fn)
+    assert time.monotonic() - start < 5 and fn.call_count == 1
+
+
+def test_base_exceptions_release_the_slot():
+    sched = JPLScheduler(initial_concurrency=1, min_concurrency=1, max_concurrency=1)
+    with pytest.raises(KeyboardInterrupt):
+        sched.call(MagicMock(side_effect=KeyboardInterrupt()))
+    m = sched.metrics()
+    assert (m["in_flight"], m["cancelled"], m["failures"]) == (0, 1, 0)
+    assert sched.call(lambda: "ok") == "ok"                    # the only slot is free again
+
+
+def test_cancellation_stops_the_horizons_fallback_chain(monkeypatch):
+    from backend import resolvers
+    from backend.response_cache import lookup
+    token = cancellation.CancelToken()
+    attempts = []
+
+    def _horizons(**kw):
+        attempts.append(kw)
+        token.cancel()                       # the user moved on while this request was out
+        raise ValueError("Ambiguous target name")
+    monkeypatch.setattr(resolvers, "Horizons", lambda **kw: MagicMock(ephemerides=lambda **_: _horizons(**kw)))
+    with pytest.raises(cancellation.Cancelled):
+        token.run(resolvers._horizons_query_uncached, "C/2025 N1 (ATLAS)", "500", 2461000.5)
+    assert len(attempts) == 1
+    # The answered request still counts; the skipped variants are not marked dead
+    variants, _ = resolvers._horizons_variants("C/2025 N1 (ATLAS)", True)
+    dead = [v for v in variants if lookup("horizons_dead", {"name": "C/2025 N1 (ATLAS)", "variant": v})]
+    assert dead == [variants[0]]
@@ -184,6 +184,47 @@ def test_save_jpl_cache_entry_accepts_valid_ids(tmp_path):
     assert cache["asteroids"]["99942 Apophis"] == "99942"
 
 
+def test_failed_summary_rows_retry_via_one_bulk_sbdb_lookup(tmp_path, monkeypatch):
+    """Failed rows are resolved in one SBDB batch, refetched, and saved in one write."""
+    from datetime import datetime, timezone
+    from backend import config
+    from backend.positions import PositionCache
+    ovr_path, cache_path = _make_files(tmp_path)
+    import app
+    lookups, fetched, writes = [], [], []
+    known = {"C/2025 K1 (ATLAS)": "90004567", "88P/Howell": "20015091", "90004812": "90004812"}
+    monkeypatch.setattr("backend.sbdb.sbdb_lookup_many",
+                        lambda names: lookups.append(list(names)) or {n: known.get(n) for n in names})
+    jd0 = 2461100.5
+    monkeypatch.setattr(app, "get_daily_positions", lambda jpl_id, day, section: fetched.append(jpl_id) or [
+        {"jd": jd0 - 1 + k / 4, "ra": 10.0, "dec": 5.0, "vmag": 9.0} for k in range(13)])
+    monkeypatch.setattr(app, "POSITIONS", PositionCache())
+    real_write = config.write_jpl_cache
+    monkeypatch.setattr(config, "write_jpl_cache", lambda path, data: writes.append(1) or real_write(path, data))
+    stub = {"_resolve_error": True, "_jpl_error": "no match"}
+    rows = [{"Name": "C/2025 K1 (ATLAS)", "_jpl_id_tried": "C/2025 K1", **stub},
+            {"Name": "88P/Howell", "_jpl_id_tried": "88P", **stub},
+            {"Name": "C/2099 Z9", "_jpl_id_tried": "C/2099 Z9", **stub},
+            {"Name": "1P/Halley", "_ra_deg": 1.0, "_dec_deg": 2.0}]
+    with patch("app.JPL_CACHE_FILE", cache_path):
+        out = app._retry_failed_via_sbdb("comets", rows, datetime(2026, 3, 1, 20, tzinfo=timezone.utc))
+    # Names only; no tried IDs, since every unresolved name was its own tried ID
+    assert lookups == [["C/2025 K1 (ATLAS)", "88P/Howell", "C/2099 Z9"]]
+    assert out[0]["_jpl_id_used"] == "90004567" and not out[0].get("_resolve_error")
+    assert out[2].get("_resolve_error") and out[3] is rows[3]
+    assert writes == [1]
+    from backend.config import read_jpl_cache
+    assert read_jpl_cache(cache_path)["comets"] == {"C/2025 K1 (ATLAS)": "90004567"}   # 20M ID not saved
+
+    # Tried IDs are looked up only for names SBDB did not resolve
+    lookups.clear()
+    rows = [{"Name": "C/2025 K1 (ATLAS)", "_jpl_id_tried": "C/2025 K1", **stub},
+            {"Name": "Some Local Nickname", "_jpl_id_tried": "90004812", **stub}]
+    with patch("app.JPL_CACHE_FILE", cache_path):
+        app._retry_failed_via_sbdb("comets", rows, datetime(2026, 3, 1, 20, tzinfo=timezone.utc))
+    assert lookups == [["C/2025 K1 (ATLAS)", "Some Local Nickname"], ["90004812"]]
+
+
 # ---------------------------------------------------------------------------
 # NaN-truthy guard in observability loop
 # ---------------------------------------------------------------------------
@@ -0,0 +1,93 @@
+"""Tests for backend/moonsun.py (shared Moon/Sun grid) and backend/cache.py (LRU)."""
+import warnings
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from astropy import units as u
+from astropy.coordinates import AltAz, EarthLocation, SkyCoord
+from astropy.time import Time
+
+from backend.cache import LRUCache
+from backend.core import moon_sep_deg
+from backend.moonsun import MoonSunEphemeris, _get_moon, _get_sun
+
+warnings.filterwarnings("ignore", message=".*transforming other coordinates.*")
+
+LOC = EarthLocation(lat=-33.9 * u.deg, lon=151.2 * u.deg)
+START = datetime(2026, 7, 1, 8, 0, tzinfo=timezone.utc)  # evening in Sydney
+
+
+def _times(n=60, step_min=11):
+    return [START + timedelta(minutes=step_min * i) for i in range(n)]
+
+
+def test_moon_matches_get_body():
+    eph = MoonSunEphemeris()
+    times = _times()
+    ref = _get_moon(Time(times), LOC)
+    got = eph.moon(LOC, times)
+    target = SkyCoord(ra=250.0 * u.deg, dec=-20.0 * u.deg, frame='icrs')
+    d_sep = np.abs(moon_sep_deg(target, got) - moon_sep_deg(target, ref))
+    assert d_sep.max() < 1.0 / 3600.0
+
+    aa = ref.transform_to(AltAz(obstime=Time(times), location=LOC))
+    alt, az = eph.moon_altaz(LOC, times)
+    assert np.abs(alt - aa.alt.deg).max() < 0.02
+    assert (np.abs((az - aa.az.deg + 180) % 360 - 180) * np.cos(aa.alt.rad)).max() < 0.02
+
+
+def test_illumination_and_sun_altitude_match_get_body():
+    eph = MoonSunEphemeris()
+    times = _times()
+    t = Time(times)
+    moon, sun = _get_moon(t, LOC), _get_sun(t)
+    ref_illum = 0.5 * (1 - np.cos(sun.separation(moon).rad)) * 100
+    assert np.abs(eph.illumination(LOC, times) - ref_illum).max() < 0.01
+    sun_alt, _ = eph.sun_altaz(LOC, times)
+    assert np.abs(sun_alt - sun.transform_to(AltAz(obstime=t, location=LOC)).alt.deg).max() < 0.02
+
+
+def test_scalar_time_returns_scalars():
+    eph = MoonSunEphemeris()
+    moon, illum = eph.moon_and_illumination(LOC, START)
+    assert moon.isscalar and isinstance(illum, float) and 0.0 <= illum <= 100.0
+    alt, az = eph.moon_altaz(LOC, Time(START))
+    assert isinstance(alt, float) and 0.0 <= az < 360.0
+
+
+def test_one_grid_per_location_night_is_shared():
+    eph = MoonSunEphemeris()
+    eph.moon(LOC, _times(n=30))
+    eph.illumination(LOC, START)
+    eph.moon(EarthLocation(lat=-33.9001 * u.deg, lon=151.2001 * u.deg), START)  # rounds to same key
+    stats = eph.stats()
+    assert stats["misses"] == 1 and stats["hits"] == 2 and stats["size"] == 1
+
+
+def test_times_spanning_two_nights():
+    eph = MoonSunEphemeris()
+    times = [START + timedelta(hours=h) for h in (0, 12, 24)]
+    got = eph.moon(LOC, times)
+    ref = _get_moon(Time(times), LOC)
+    assert np.all(np.asarray(moon_sep_deg(got, ref)) < 1.0 / 3600.0)
+    assert eph.stats()["size"] == 2
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1          # "a" is now most recent
+    cache.put("c", 3)                   # evicts "b"
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.get("b", "missing") == "missing"
+    assert cache.get_or_compute("a", lambda: pytest.fail("recomputed")) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (2, 1, 1, 2)
+    assert cache.invalidate("a") and not cache.invalidate("a")
+
+
+def test_lru_rejects_zero_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
@@ -0,0 +1,94 @@
+"""Tests for backend/orbits.py (two-body propagation of MPC comet elements)."""
+import os
+import sys
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+from astropy import units as u
+from astropy.coordinates import SkyCoord, get_body
+from astropy.time import Time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import orbits
+
+warnings.filterwarnings("ignore", message=".*transforming other coordinates.*")
+
+# Mars, J2000 mean elements (JPL "Keplerian elements for approximate positions")
+_A, _E, _I, _L, _VARPI, _NODE = 1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891
+
+
+def _mars_entry():
+    n = orbits.GAUSS_K / _A ** 1.5
+    tp = 2451545.0 - np.radians(_L - _VARPI) / n
+    return {"designation": "Mars", "q": _A * (1 - _E), "e": _E, "i": _I,
+            "peri": _VARPI - _NODE, "node": _NODE, "tp_jd": tp, "H": -1.5, "G": 2.0}
+
+
+def test_elliptic_orbit_matches_get_body():
+    el = orbits.elements_from_catalog([_mars_entry()])
+    for when in (datetime(2003, 8, 27, tzinfo=timezone.utc), datetime(2026, 3, 5, 3, tzinfo=timezone.utc)):
+        pos = orbits.catalog_positions(el, when)
+        ref = get_body("mars", Time(when))      # GCRS: geocentric apparent direction
+        sep = SkyCoord(ra=pos["ra"][0] * u.deg, dec=pos["dec"][0] * u.deg).separation(
+            SkyCoord(ra=ref.ra, dec=ref.dec))
+        assert sep.arcmin < 10.0                 # approximate mean elements, ~25 years out
+        assert abs(pos["delta"][0] - ref.distance.to_value(u.AU)) < 1e-3
+
+
+def test_parabolic_is_continuous_with_elliptic_and_hyperbolic():
+    when = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    base = {"q": 1.2, "i": 40.0, "peri": 100.0, "node": 30.0, "H": 8.0}
+    offsets = (-200.0, -10.0, 0.0, 30.0, 400.0)
+    results = {}
+    for e in (0.99999, 1.0, 1.00001):
+        entries = [dict(base, e=e, tp_jd=2461100.5 + d) for d in offsets]
+        results[e] = orbits.catalog_positions(orbits.elements_from_catalog(entries), when)
+    for e in (0.99999, 1.00001):
+        assert np.abs(results[e]["ra"] - results[1.0]["ra"]).max() < 0.01
+        assert np.abs(results[e]["r"] - results[1.0]["r"]).max() < 1e-3
+    # At perihelion the heliocentric distance is q
+    jd = orbits.fastsky.jd_array(when)[0][0] + 69.184 / 86400.0
+    el = orbits.elements_from_catalog([dict(base, e=e, tp_jd=jd) for e in (0.5, 1.0, 3.0)])
+    assert np.allclose(np.linalg.norm(orbits.heliocentric_xyz(el, jd), axis=0), 1.2)
+
+
+def test_hyperbolic_satisfies_vis_viva():
+    el = orbits.elements_from_catalog([{"q": 1.36, "e": 3.36, "i": 175.1, "peri": 128.0,
+                                        "node": 322.2, "tp_jd": 2460977.5}])   # 3I/ATLAS-like
+    jd = np.array([2460977.5 + d for d in (-300.0, -50.0, 50.0, 300.0)])
+    r = np.array([np.linalg.norm(orbits.heliocentric_xyz(el, t)) for t in jd])
+    a = 1.36 / (3.36 - 1)
+    v = (np.array([np.linalg.norm(orbits.heliocentric_xyz(el, t + 1e-3)) for t in jd]) - r) / 1e-3
+    assert np.all(np.diff(r[:2]) < 0) and np.all(np.diff(r[2:]) > 0)
+    assert np.all(np.abs(v) < orbits.GAUSS_K * np.sqrt(2 / r + 1 / a) + 1e-9)
+
+
+def test_missing_elements_are_invalid_and_nan():
+    entries = [_mars_entry(), {"designation": "old", "q": 1.0, "e": 0.5, "i": 10.0, "H": 12.0},
+               dict(_mars_entry(), H=None)]
+    el = orbits.elements_from_catalog(entries)
+    assert el["valid"].tolist() == [True, False, True]
+    assert el["G"][1] == orbits.DEFAULT_SLOPE
+    pos = orbits.catalog_positions(el, datetime(2026, 3, 1, tzinfo=timezone.utc))
+    assert np.isfinite(pos["ra"][0]) and np.isnan(pos["ra"][1]) and np.isnan(pos["dec"][1])
+    assert np.isfinite(pos["ra"][2]) and np.isnan(pos["vmag"][2])
+
+
+def test_predicted_magnitude_law():
+    el = orbits.elements_from_catalog([_mars_entry()])
+    pos = orbits.catalog_positions(el, datetime(2026, 3, 1, tzinfo=timezone.utc))
+    expect = -1.5 + 5 * np.log10(pos["delta"][0]) + 2.5 * 2.0 * np.log10(pos["r"][0])
+    assert abs(pos["vmag"][0] - expect) < 1e-12
+
+
+def test_catalog_script_keeps_full_elements():
+    from scripts.update_comet_catalog import _calendar_jd, _get_epoch_jd, _get_float, _get_perihelion_jd
+    assert _calendar_jd(2000, 1, 1.5) == 2451545.0
+    entry = {"Year_of_perihelion": 2026, "Month_of_perihelion": 4, "Day_of_perihelion": 15.25,
+             "Epoch_year": 2026, "Epoch_month": 5, "Epoch_day": 1, "Peri": "12.5", "G": ""}
+    assert _get_perihelion_jd(entry) == 2461145.75
+    assert _get_epoch_jd(entry) == 2461161.5
+    assert _get_float(entry, "Peri") == 12.5 and _get_float(entry, "G") is None
+    assert _get_perihelion_jd({}) is None
@@ -0,0 +1,58 @@
+"""Tests for backend/planets.py (local planetary ephemeris engine)."""
+import os
+import sys
+import warnings
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from astropy.coordinates import SkyCoord, get_body
+from astropy.time import Time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import planets
+
+warnings.filterwarnings("ignore", message=".*transforming other coordinates.*")
+
+_WHEN = datetime(2026, 3, 1, 3, 0, tzinfo=timezone.utc)
+
+
+def test_matches_astropy_apparent_positions():
+    """Astrometric vs astropy's apparent GCRS: they differ by aberration (≤ ~21″)."""
+    res = planets.planet_positions(_WHEN)
+    for name in ("Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune"):
+        body = get_body(name.lower(), Time(_WHEN))
+        local = SkyCoord(res[name]["ra"][0], res[name]["dec"][0], unit="deg")
+        assert local.separation(SkyCoord(body.ra, body.dec)).arcsec < 30, name
+
+
+def test_pluto_and_magnitudes_are_plausible():
+    res = planets.planet_positions(_WHEN)
+    # Pluto in Capricornus, ~20h30m −23° in 2026 (approximate elements: arcminutes)
+    assert abs(res["Pluto"]["ra"][0] - 307.5) < 1 and abs(res["Pluto"]["dec"][0] + 23.0) < 1
+    vmag = {n: float(p["vmag"][0]) for n, p in res.items()}
+    assert -4.9 < vmag["Venus"] < -3.7
+    assert -2.9 < vmag["Jupiter"] < -1.6
+    assert 5.3 < vmag["Uranus"] < 6.1 and 7.6 < vmag["Neptune"] < 8.0
+    assert 13.8 < vmag["Pluto"] < 15.2
+    assert all(0 <= float(p["phase"][0]) <= 180 for p in res.values())
+
+
+def test_vectorized_over_times_and_bodies():
+    times = [_WHEN + timedelta(minutes=10 * k) for k in range(25)]
+    res = planets.planet_positions(times, ["499", "Saturn"])
+    assert list(res) == ["Mars", "Saturn"]
+    assert res["Mars"]["ra"].shape == (25,)
+    # Same answer one instant at a time
+    for k in (0, 12, 24):
+        ra, dec, _ = planets.planet_position("Mars", times[k])
+        assert ra == pytest.approx(res["Mars"]["ra"][k]) and dec == pytest.approx(res["Mars"]["dec"][k])
+    coords = planets.sky_coords("699", times)
+    assert len(coords) == 25
+
+
+def test_body_name():
+    assert planets.body_name("Venus") == "Venus"
+    assert planets.body_name(" 599 ") == "Jupiter"
+    with pytest.raises(ValueError):
+        planets.body_name("Vulcan")
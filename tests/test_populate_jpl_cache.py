@@ -6,7 +6,7 @@ from scripts.populate_jpl_cache import resolve_all
 def test_asteroid_sbdb_id_converted(monkeypatch):
     """SBDB internal IDs in [20M, 30M) for asteroids must be converted to 2M+N Horizons SPK-ID."""
     import scripts.populate_jpl_cache as pjc
-    monkeypatch.setattr(pjc, "sbdb_lookup", lambda q: "20000433")
+    monkeypatch.setattr(pjc, "sbdb_lookup_many", lambda qs: {q: "20000433" for q in qs})
     resolved, failed = resolve_all(["433 Eros"], "asteroids", lambda n: n, {})
     assert resolved.get("433 Eros") == "2000433"
     assert "433 Eros" not in failed
@@ -15,7 +15,7 @@ def test_asteroid_sbdb_id_converted(monkeypatch):
 def test_comet_bad_spk_id_not_saved(monkeypatch):
     """SBDB internal IDs in [20M, 30M) for comets must be dropped (Horizons rejects them)."""
     import scripts.populate_jpl_cache as pjc
-    monkeypatch.setattr(pjc, "sbdb_lookup", lambda q: "20001797")
+    monkeypatch.setattr(pjc, "sbdb_lookup_many", lambda qs: {q: "20001797" for q in qs})
     resolved, failed = resolve_all(["24P/Schaumasse"], "comets", lambda n: n, {})
     assert "24P/Schaumasse" not in resolved
     assert "24P/Schaumasse" in failed
@@ -23,7 +23,7 @@ def test_comet_bad_spk_id_not_saved(monkeypatch):
 def test_valid_spk_id_saved(monkeypatch):
     """Valid comet SPK-IDs in [1_000_000, 2_000_000) must be kept."""
     import scripts.populate_jpl_cache as pjc
-    monkeypatch.setattr(pjc, "sbdb_lookup", lambda q: "1003993")
+    monkeypatch.setattr(pjc, "sbdb_lookup_many", lambda qs: {q: "1003993" for q in qs})
     resolved, failed = resolve_all(["C/2024 G3 (ATLAS)"], "comets",
                                    lambda n: n.split('(')[0].strip(), {})
     assert resolved.get("C/2024 G3 (ATLAS)") == "1003993"
@@ -32,8 +32,26 @@ def test_valid_spk_id_saved(monkeypatch):
 def test_none_spk_id_fails(monkeypatch):
     """When SBDB returns None, object goes to failed list."""
     import scripts.populate_jpl_cache as pjc
-    monkeypatch.setattr(pjc, "sbdb_lookup", lambda q: None)
+    monkeypatch.setattr(pjc, "sbdb_lookup_many", lambda qs: {q: None for q in qs})
     resolved, failed = resolve_all(["C/2099 Z9 (UNKNOWN)"], "comets",
                                    lambda n: n.split('(')[0].strip(), {})
     assert resolved == {}
     assert "C/2099 Z9 (UNKNOWN)" in failed
+
+
+def test_resolve_all_uses_two_bulk_lookups(monkeypatch):
+    """Stripped queries go in one bulk call; only misses are retried by full name."""
+    import scripts.populate_jpl_cache as pjc
+    calls = []
+
+    def fake_many(queries):
+        calls.append(list(queries))
+        return {q: ("1003993" if q == "C/2024 G3" else "90004812" if q == "X (Y)" else None)
+                for q in queries}
+
+    monkeypatch.setattr(pjc, "sbdb_lookup_many", fake_many)
+    resolved, failed = resolve_all(["C/2024 G3 (ATLAS)", "X (Y)", "Z"], "comets",
+                                   lambda n: n.split('(')[0].strip(), {"comets": {"Z": "1"}})
+    assert resolved == {"C/2024 G3 (ATLAS)": "1003993", "X (Y)": "90004812"}
+    assert failed == []
+    assert calls == [["C/2024 G3", "X"], ["X (Y)"]]
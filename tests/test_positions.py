@@ -0,0 +1,268 @@
+"""Tests for backend/positions.py (two-stage summary caches) and LRUCache TTL."""
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from backend import resolvers
+from backend.cache import LRUCache
+from backend.positions import GeometryCache, PositionCache, utc_date
+
+START = datetime(2026, 3, 1, 20, 0, tzinfo=timezone.utc)
+JD0 = 2461100.5          # 2026-03-01 00:00 UTC
+
+
+def _day(ra0=10.0, jpl_id="x"):
+    """What a stage-1 fetch returns: 6-hourly samples from the day before to two days after."""
+    positions = [{"jd": JD0 - 1 + k / 4, "ra": ra0 + (k / 4 - 1), "dec": 5.0, "vmag": 9.0 + k / 40}
+                 for k in range(13)]
+    return lambda: {"positions": positions, "_jpl_id_used": jpl_id}
+
+
+def _fail():
+    return {"_resolve_error": True, "_jpl_id_tried": "bad", "_jpl_error": "boom"}
+
+
+def test_one_fetch_per_object_per_utc_date():
+    cache = PositionCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return _day()()
+    for minutes in (0, 1, 90, 200):            # start-time tweaks within the UTC day
+        pos = cache.position_at("comets", "1P", START + timedelta(minutes=minutes), fetch)
+    assert len(calls) == 1
+    assert abs(pos["_ra_deg"] - (10.0 + (20 * 60 + 200) / 1440)) < 1e-6
+    assert abs(pos["Magnitude"] - 9.0 - 0.1 * (1 + (20 * 60 + 200) / 1440)) < 0.01
+    cache.position_at("comets", "1P", START + timedelta(hours=5), fetch)   # next UTC date
+    assert len(calls) == 2 and cache.stats()["size"] == 2
+
+
+def test_utc_date_uses_utc():
+    est = timezone(timedelta(hours=-5))
+    assert utc_date(datetime(2026, 3, 1, 21, 0, tzinfo=est)) == "2026-03-02"
+    assert utc_date(datetime(2026, 3, 1, 21, 0)) == "2026-03-01"
+
+
+def test_invalidate_drops_only_that_object():
+    cache = PositionCache()
+    for jpl_id in ("1P", "2P"):
+        for day in (0, 1):
+            cache.position_at("comets", jpl_id, START + timedelta(days=day), _day())
+    cache.position_at("asteroids", "1P", START, _day())
+    assert cache.invalidate("comets", ["1P", "never-cached"]) == 2
+    assert cache.stats()["size"] == 3
+    refetched = []
+    cache.position_at("comets", "2P", START, lambda: refetched.append(1) or _day()())
+    cache.position_at("comets", "1P", START, lambda: refetched.append(1) or _day()())
+    assert refetched == [1]          # only the invalidated object goes back to the network
+
+
+def test_failures_expire_and_can_be_retried():
+    cache = PositionCache(failure_ttl=0.05)
+    assert cache.position_at("comets", "bad", START, _fail)["_resolve_error"]
+    assert cache.position_at("comets", "bad", START, _day())["_resolve_error"]      # still cached
+    time.sleep(0.06)
+    assert cache.position_at("comets", "bad", START, _day(ra0=20.0))["_ra_deg"] > 20.0
+
+    cache.position_at("asteroids", "worse", START, _fail)
+    assert cache.invalidate_failures("comets") == 0
+    assert cache.invalidate_failures() == 1
+
+
+def test_empty_horizons_result_is_a_failure():
+    cache = PositionCache()
+    pos = cache.position_at("comets", "1P", START, lambda: {"positions": [], "_jpl_id_used": "1P"})
+    assert pos["_resolve_error"] and pos["_jpl_id_tried"] == "1P"
+
+
+def test_geometry_cache_keys_on_location_time_and_rows():
+    geo = GeometryCache()
+    calls = []
+    rows = [{"Name": "A", "_ra_deg": 10.0, "_dec_deg": 5.0, "Magnitude": float("nan")}]
+
+    def compute():
+        calls.append(1)
+        return pd.DataFrame(rows)
+    df = geo.get_or_compute(40.7, -74.0, START, rows, compute)
+    df["added"] = 1                                       # callers mutate the result
+    assert "added" not in geo.get_or_compute(40.7, -74.0, START, list(rows), compute).columns
+    assert len(calls) == 1
+    geo.get_or_compute(40.7, -74.0, START + timedelta(minutes=1), rows, compute)
+    geo.get_or_compute(40.7, -74.0, START, [dict(rows[0], _ra_deg=10.5)], compute)
+    assert len(calls) == 3 and geo.stats()["hits"] == 1
+
+
+def test_get_daily_positions_is_one_geocentric_range_query(monkeypatch):
+    seen = {}
+
+    def fake_query(obj_name, location_code, epochs, closest_apparition=True):
+        seen.update(obj=obj_name, loc=location_code, epochs=epochs, ca=closest_apparition)
+        return [{"datetime_jd": JD0 + k / 4, "RA": 10.0, "DEC": 5.0, "V": 12.3} for k in range(3)]
+    monkeypatch.setattr(resolvers, "_horizons_query", fake_query)
+    out = resolvers.get_daily_positions("433", "2026-03-01", "asteroids")
+    assert seen == {"obj": "433", "loc": "500", "ca": False,
+                    "epochs": {"start": "2026-02-28 00:00", "stop": "2026-03-03 00:00", "step": "6h"}}
+    assert out[0] == {"date": "2026-03-01", "jd": JD0, "ra": 10.0, "dec": 5.0, "vmag": 12.3}
+
+
+def test_lru_ttl_and_invalidate_where():
+    lru = LRUCache(maxsize=4, ttl=0.05)
+    lru.put("short", 1)
+    lru.put("long", 2, ttl=60)
+    assert lru.get_or_compute("computed", lambda: 3, ttl=lambda v: 60 if v == 3 else 0) == 3
+    time.sleep(0.06)
+    assert "short" not in lru and lru.get("short") is None
+    assert lru.get("long") == 2 and lru.get("computed") == 3
+    assert lru.invalidate_where(lambda k, v: v >= 2) == 2 and len(lru) == 0
+
+
+def test_failure_serves_last_known_good_flagged_stale(monkeypatch):
+    cache = PositionCache()
+    monkeypatch.setattr(cache, "_schedule_revalidation", lambda key, fetch: scheduled.append(key))
+    scheduled = []
+    fresh = cache.position_at("comets", "1P", START, _day())
+    later = START + timedelta(days=3)
+    stale = cache.position_at("comets", "1P", later, _fail)
+    assert stale["_stale"] and stale["_stale_as_of"] == "2026-03-01" and "_resolve_error" not in stale
+    # Clamped to the last sample of the old day, not extrapolated
+    assert abs(stale["_ra_deg"] - 12.0) < 1e-6 and fresh["_ra_deg"] < stale["_ra_deg"]
+    assert scheduled == [("comets", "1P", utc_date(later))]
+    assert cache.position_at("comets", "2P", later, _fail)["_resolve_error"]
+    assert cache.stats()["stale_served"] == 1
+
+
+def test_last_known_good_survives_restart_via_response_cache():
+    PositionCache().position_at("asteroids", "433", START, _day(jpl_id="433"))
+    fresh_process = PositionCache()
+    fresh_process._schedule_revalidation = lambda key, fetch: None
+    stale = fresh_process.position_at("asteroids", "433", START + timedelta(days=5), _fail)
+    assert stale["_stale"] and stale["_jpl_id_used"] == "433"
+
+
+def test_revalidate_replaces_failure_entry():
+    cache = PositionCache()
+    cache._schedule_revalidation = lambda key, fetch: None
+    cache.position_at("comets", "1P", START, _day())
+    key = ("comets", "1P", utc_date(START + timedelta(days=3)))
+    cache.position_at("comets", "1P", START + timedelta(days=3), _fail)
+    assert cache.revalidate(key, _day(ra0=50.0))
+    pos = cache.position_at("comets", "1P", START + timedelta(days=3), _fail)
+    assert "_stale" not in pos and cache.stats()["revalidated"] == 1
+
+
+def test_window_reuses_the_summary_entry():
+    cache = PositionCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return _day()()
+    cache.position_at("comets", "1P", START, fetch)                     # summary row
+    steps = [START + timedelta(minutes=m) for m in range(0, 24 * 60 + 1, 10)]
+    ra, dec, vmag = cache.window("comets", "1P", steps, fetch)          # trajectory
+    assert len(calls) == 1 and len(ra) == len(steps)
+    assert abs(ra[0] - cache.position_at("comets", "1P", START, fetch)["_ra_deg"]) < 1e-9
+    # Past the fetched span (day before → two days after) or after a failure: no answer
+    assert cache.window("comets", "1P", steps + [START + timedelta(hours=29)], fetch) is None
+    assert cache.window("comets", "bad", steps, _fail) is None
+
+
+def _flyby(miss_au, jpl_id="2026 AB"):
+    """6-hourly geocentric samples of a 10 km/s straight-line pass, closest at 2026-03-01 22:00 UTC."""
+    jd = JD0 - 1 + np.arange(13) / 4
+    v = 10.0 * 86400 / 1.495978707e8                    # AU/day
+    x, y, z = np.full(13, miss_au), v * (jd - (JD0 + 22 / 24)), 0.3 * v * (jd - (JD0 + 22 / 24))
+    positions = [{"jd": j, "ra": float(np.degrees(np.arctan2(b, a)) % 360),
+                  "dec": float(np.degrees(np.arcsin(c / np.sqrt(a * a + b * b + c * c)))), "vmag": 15.0}
+                 for j, a, b, c in zip(jd, x, y, z)]
+    return lambda: {"positions": positions, "_jpl_id_used": jpl_id}
+
+
+def test_window_refuses_fast_movers_the_6h_table_cannot_follow():
+    cache = PositionCache()
+    steps = [START + timedelta(minutes=m) for m in range(0, 4 * 60 + 1, 10)]
+    assert cache.window("asteroids", "far", steps, _flyby(0.05)) is not None
+    # 0.002 AU: the spline is off by more than a degree — the caller fetches at its own step
+    assert cache.window("asteroids", "close", steps, _flyby(0.002)) is None
+    assert cache.stats()["too_coarse"] == 1
+    assert "_resolve_error" not in cache.position_at("asteroids", "close", START, _fail)
+
+
+def test_horizons_ephemerides_return_one_array_skycoord(monkeypatch):
+    from astropy.table import Table
+    table = Table({"RA": [10.0, 10.1, 10.2], "DEC": [5.0, 5.1, 5.2]})
+    monkeypatch.setattr(resolvers, "_horizons_query", lambda *a, **k: table)
+    monkeypatch.setattr(resolvers, "_majorbody_ephemerides", lambda *a, **k: table)
+    for fn in (resolvers.get_horizons_ephemerides, resolvers.get_planet_ephemerides):
+        coords = fn("499", START, duration_minutes=20)
+        assert not coords.isscalar and len(coords) == 3
+        assert abs(coords[2].dec.deg - 5.2) < 1e-12
+
+
+def test_summary_stream_yields_cached_rows_first_then_live_rows(monkeypatch):
+    """Progressive summary: ephemeris rows in the first frame, live rows as they land, final memoized."""
+    import threading
+    import app
+    monkeypatch.setitem(app.CONFIG, "summary_frame_interval", 0.0)
+    monkeypatch.setattr(app, "GEOMETRY", GeometryCache())
+    gate = threading.Event()
+
+    def cached(name):
+        return {"Name": name, "_ra_deg": 10.0, "_dec_deg": 5.0, "Magnitude": 9.0} if name == "A" else None
+
+    def live(name):
+        if name == "C":
+            gate.wait(5)
+        return {"Name": name, "_ra_deg": 40.0, "_dec_deg": 5.0, "Magnitude": 12.0, "_jpl_id_used": name}
+
+    class _NoEphem:
+        def nearest(self, *args):
+            return None
+
+    frames = app._stream_summary("comets", 40.7, -74.0, START, ["A", "B", "C"], cached, live, _NoEphem())
+    first, pending = next(frames)
+    assert list(first["Name"]) == ["A"] and pending == 2
+    second, pending = next(frames)
+    assert list(second["Name"]) == ["A", "B"] and pending == 1
+    gate.set()
+    final, pending = next(frames)
+    assert list(final["Name"]) == ["A", "B", "C"] and pending == 0
+    assert app.GEOMETRY.stats()["size"] == 1          # only the final frame is cached
+    assert next(frames, None) is None
+
+
+def test_closing_the_summary_stream_cancels_queued_jpl_work(monkeypatch):
+    """A superseded run: no new JPL requests; answers already received stay cached."""
+    import threading
+    import app
+    from backend import jpl_client
+    monkeypatch.setitem(app.CONFIG, "summary_frame_interval", 0.01)
+    monkeypatch.setattr(app.JPL, "max_concurrency", 2)
+    gate, sent = threading.Event(), []
+
+    def live(name):
+        def _request():
+            sent.append(name)
+            gate.wait(5)
+            return {"Name": name, "_ra_deg": 40.0, "_dec_deg": 5.0, "Magnitude": 12.0}
+        return jpl_client.call(_request)
+
+    names = [f"C/2026 A{k}" for k in range(6)]
+    frames = app._stream_summary("comets", 40.7, -74.0, START, names, lambda name: None, live, None)
+    df, pending = next(frames)                 # heartbeat while the first two are on the wire
+    assert df is None and pending == 6
+    token = app.st.session_state["_summary_token_comets"]
+    while len(sent) < 2:
+        time.sleep(0.001)
+    frames.close()                             # Streamlit stopped the run
+    assert token.cancelled
+    gate.set()
+    time.sleep(0.2)
+    assert sorted(sent) == names[:2]           # queued names never went out
+    # A newer run for the same section supersedes the previous one; other sections are untouched
+    newer, asteroids = app._summary_token("comets"), app._summary_token("asteroids")
+    app._summary_token("comets")
+    assert newer.cancelled and not asteroids.cancelled
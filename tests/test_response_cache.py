@@ -0,0 +1,167 @@
+"""Tests for backend/response_cache.py and the resolvers reading through it."""
+import multiprocessing
+import sqlite3
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from astropy.table import MaskedColumn, Table
+
+from backend import resolvers, response_cache
+from backend.response_cache import ResponseCache, make_key
+from backend.sbdb import sbdb_lookup
+
+
+def test_key_normalization():
+    assert make_key("horizons", {"id": " 3I ", "epochs": 2461000.5}) == \
+        make_key("horizons", {"epochs": 2461000.50000001, "id": "3I"})
+    assert make_key("horizons", {"id": "3I", "epochs": {"start": "a", "stop": "b"}}) != \
+        make_key("horizons", {"id": "3I", "epochs": {"start": "a", "stop": "c"}})
+    assert make_key("horizons", {"epochs": np.float64(1.5)}) == make_key("horizons", {"epochs": 1.5})
+
+
+def test_roundtrip_persists_across_instances(tmp_path):
+    path = tmp_path / "c.sqlite3"
+    table = Table({"RA": [1.0, 2.0], "Tmag": MaskedColumn([5.0, 0.0], mask=[False, True])})
+    ResponseCache(path).put("k", table, ttl=60, endpoint="horizons")
+    got = ResponseCache(path).get("k")
+    assert list(got["RA"]) == [1.0, 2.0] and bool(got["Tmag"].mask[1])
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_ttl_expiry(tmp_path):
+    cache = ResponseCache(tmp_path / "c.sqlite3")
+    with patch("backend.response_cache.time.time", return_value=1000.0):
+        cache.put("k", "v", ttl=10)
+        cache.put("forever", "v")
+    with patch("backend.response_cache.time.time", return_value=1011.0):
+        assert cache.get("k", "gone") == "gone"
+        assert cache.get("forever") == "v"
+        cache.put("old", "v", ttl=1)
+    with patch("backend.response_cache.time.time", return_value=2000.0):
+        assert cache.prune() == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_lru_eviction_by_count_and_bytes(tmp_path):
+    cache = ResponseCache(tmp_path / "c.sqlite3", max_entries=2)
+    with patch("backend.response_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1          # "a" now more recent than "b"
+        cache.put("c", 3)                   # evicts "b"
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+
+    small = ResponseCache(tmp_path / "s.sqlite3", max_bytes=3000)
+    for i in range(5):
+        small.put(f"k{i}", b"x" * 1000)
+    assert small.stats()["bytes"] <= 3000 and small.get("k4") is not None
+
+
+def test_eviction_is_batched_to_a_low_water_mark(tmp_path):
+    cache = ResponseCache(tmp_path / "c.sqlite3", max_entries=100)
+    statements = []
+    cache._conn().set_trace_callback(statements.append)
+    for i in range(100):
+        cache.put(f"k{i}", i)
+    aggregates = [sql for sql in statements if "COUNT(*)" in sql]
+    assert len(aggregates) == 1                    # first put only: under the bound, no scans
+    statements.clear()
+    cache.put("k100", 100)                         # 101 > 100: one DELETE down to 90 rows
+    assert sum(sql.startswith("DELETE") for sql in statements) == 1
+    assert cache.stats()["entries"] == 90
+    assert cache.get("k10") is None and cache.get("k11") == 11 and cache.get("k100") == 100
+    statements.clear()
+    for i in range(101, 111):                      # back up to the bound: no eviction yet
+        cache.put(f"k{i}", i)
+    assert not any(sql.startswith("DELETE") for sql in statements)
+    assert cache.stats()["entries"] == 100
+
+
+def test_get_or_fetch_does_not_store_failures(tmp_path):
+    cache = ResponseCache(tmp_path / "c.sqlite3")
+    with pytest.raises(RuntimeError):
+        cache.get_or_fetch("horizons", {"id": "x"}, MagicMock(side_effect=RuntimeError))
+    fetch = MagicMock(return_value="ok")
+    assert cache.get_or_fetch("horizons", {"id": "x"}, fetch) == "ok"
+    assert cache.get_or_fetch("horizons", {"id": "x"}, fetch) == "ok"
+    assert fetch.call_count == 1
+    assert cache.stats()["endpoints"]["horizons"]["entries"] == 1
+
+
+def test_broken_file_degrades_to_uncached(tmp_path):
+    path = tmp_path / "c.sqlite3"
+    path.write_bytes(b"not a database" * 100)
+    cache = ResponseCache(path)
+    assert cache.get_or_fetch("sbdb", {"sstr": "x"}, lambda: "42") == "42"
+    assert cache.errors >= 1
+
+
+def test_concurrent_threads(tmp_path):
+    cache = ResponseCache(tmp_path / "c.sqlite3")
+
+    def work(n):
+        for i in range(50):
+            cache.put(f"{n}-{i}", i)
+            assert cache.get(f"{n}-{i}") == i
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.stats()["entries"] == 400 and cache.errors == 0
+
+
+def _writer(path, n):
+    cache = ResponseCache(path)
+    for i in range(50):
+        cache.put(f"{n}-{i}", i)
+
+
+def test_concurrent_processes(tmp_path):
+    path = str(tmp_path / "c.sqlite3")
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_writer, args=(path, n)) for n in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+    assert all(p.exitcode == 0 for p in procs)
+    assert ResponseCache(path).stats()["entries"] == 150
+
+
+def test_horizons_query_reads_through(monkeypatch):
+    calls = []
+
+    def fake_uncached(obj_name, location_code, epochs, closest_apparition=True):
+        calls.append(obj_name)
+        return Table({"RA": [10.0], "DEC": [20.0]})
+
+    monkeypatch.setattr(resolvers, "_horizons_query_uncached", fake_uncached)
+    for _ in range(3):
+        result = resolvers._horizons_query("3I", "500", 2461000.5)
+    assert calls == ["3I"] and result["RA"][0] == 10.0
+    resolvers._horizons_query("3I", "500", 2461001.5)
+    assert len(calls) == 2
+
+
+def test_sbdb_lookup_caches_answers_not_errors():
+    import requests
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"object": {"spkid": "90004812"}}
+    with patch("backend.sbdb.requests.get", side_effect=requests.exceptions.Timeout):
+        assert sbdb_lookup("C/2025 Q3") is None
+    with patch("backend.sbdb.requests.get", return_value=ok) as get:
+        assert sbdb_lookup("C/2025 Q3") == "90004812"
+        assert sbdb_lookup(" C/2025 Q3") == "90004812"
+    assert get.call_count == 1
+
+
+def test_disabled_default_cache_just_fetches():
+    response_cache.set_default_cache(None)
+    fetch = MagicMock(return_value=1)
+    response_cache.read_through("sbdb", {"sstr": "x"}, fetch)
+    response_cache.read_through("sbdb", {"sstr": "x"}, fetch)
+    assert fetch.call_count == 2
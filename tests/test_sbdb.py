@@ -94,3 +94,93 @@ def test_sbdb_lookup_300_cascading_does_not_recurse():
     with patch("backend.sbdb.requests.get", return_value=mock_300):
         result = sbdb_lookup("ambiguous")
     assert result is None
+
+
+# ---------------------------------------------------------------------------
+# sbdb_lookup_many — bulk resolution through the SBDB query API
+# ---------------------------------------------------------------------------
+
+from backend import jpl_client
+from backend.sbdb import BULK_CHUNK, designation_key, sbdb_lookup_many
+
+
+def _query_response(rows):
+    resp = MagicMock(status_code=200)
+    resp.json.return_value = {
+        "fields": ["spkid", "pdes", "prefix", "name"],
+        "data": [[r.get("spkid"), r.get("pdes"), r.get("prefix"), r.get("name")] for r in rows],
+    }
+    resp.raise_for_status.return_value = None
+    return resp
+
+
+def test_designation_key():
+    assert designation_key("C/2024 G3 (ATLAS)") == ("pdes", "C/2024 G3")
+    assert designation_key("24P/Schaumasse") == ("pdes", "24P")
+    assert designation_key("73P-B") == ("pdes", "73P-B")
+    assert designation_key("433 Eros") == ("pdes", "433")
+    assert designation_key("2001 FD58") == ("pdes", "2001 FD58")
+    assert designation_key("162882 (2001 FD58)") == ("pdes", "162882")
+    assert designation_key("Apophis") == ("name", "Apophis")
+    assert designation_key("  ") is None
+
+
+def test_sbdb_lookup_many_resolves_a_list_in_one_request():
+    rows = [
+        {"spkid": "1003993", "pdes": "2024 G3", "prefix": "C"},
+        {"spkid": "20000433", "pdes": "433", "name": "Eros"},
+        {"spkid": "1000147", "pdes": "24P", "prefix": "P", "name": "Schaumasse"},
+        # Multi-match: asteroid 2024 G3 shares the bare designation; the comet keeps its prefix
+        {"spkid": "54400001", "pdes": "2024 G3"},
+        {"spkid": "20099942", "pdes": "99942", "name": "Apophis"},
+    ]
+    with patch("backend.sbdb.requests.get", return_value=_query_response(rows)) as get:
+        result = sbdb_lookup_many(["C/2024 G3 (ATLAS)", "433 Eros", "24P/Schaumasse",
+                                   "2024 G3", "Apophis", "433 Eros"])
+    assert result == {"C/2024 G3 (ATLAS)": "1003993", "433 Eros": "20000433",
+                      "24P/Schaumasse": "1000147", "2024 G3": "54400001", "Apophis": "20099942"}
+    assert get.call_count == 1
+    cdata = get.call_args.kwargs["params"]["sb-cdata"]
+    assert "pdes|EQ|2024 G3" in cdata and "name|EQ|Apophis" in cdata
+
+    # Same cache entries as sbdb_lookup: no further requests
+    with patch("backend.sbdb.requests.get") as get:
+        assert sbdb_lookup("24P/Schaumasse") == "1000147"
+        assert sbdb_lookup_many(["433 Eros"]) == {"433 Eros": "20000433"}
+    get.assert_not_called()
+
+
+def test_sbdb_lookup_many_chunks_and_falls_back_per_name():
+    names = [f"{n} Rock" for n in range(1, BULK_CHUNK + 6)]
+    bulk = _query_response([{"spkid": str(2000000 + n), "pdes": str(n)} for n in range(2, BULK_CHUNK + 6)])
+    single = MagicMock(status_code=200)
+    single.json.return_value = {"object": {"spkid": "2000001"}}
+    single.raise_for_status.return_value = None
+
+    def fake_get(url, params, timeout):
+        return single if "sstr" in params else bulk
+
+    with patch("backend.sbdb.requests.get", side_effect=fake_get) as get:
+        result = sbdb_lookup_many(names)
+    assert result["1 Rock"] == "2000001"                  # no exact row → fuzzy sbdb_lookup
+    assert result[f"{BULK_CHUNK + 5} Rock"] == str(2000000 + BULK_CHUNK + 5)
+    assert get.call_count == 3                            # two chunks + one single lookup
+
+
+def test_sbdb_lookup_many_failures():
+    # Query API down: per-name lookups take over
+    single = MagicMock(status_code=200)
+    single.json.return_value = {"object": {"spkid": "90004812"}}
+    single.raise_for_status.return_value = None
+    bad = MagicMock(status_code=400)
+    bad.raise_for_status.side_effect = requests.exceptions.HTTPError("400")
+    with patch("backend.sbdb.requests.get",
+               side_effect=lambda url, params, timeout: single if "sstr" in params else bad):
+        assert sbdb_lookup_many(["C/2025 Q3"]) == {"C/2025 Q3": "90004812"}
+
+    # Circuit open: nothing is requested and nothing is cached
+    for _ in range(jpl_client.JPL.breaker.failure_threshold):
+        jpl_client.JPL.breaker.record_failure()
+    with patch("backend.sbdb.requests.get") as get:
+        assert sbdb_lookup_many(["C/2025 K1"]) == {"C/2025 K1": None}
+    get.assert_not_called()
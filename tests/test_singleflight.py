@@ -0,0 +1,109 @@
+"""Tests for backend/singleflight.py (coalescing identical concurrent JPL fetches)."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend import cancellation, resolvers
+from backend.sbdb import sbdb_lookup
+from backend.singleflight import FlightTimeout, SingleFlight
+
+
+def _slow(result, gate, calls):
+    def fn():
+        calls.append(1)
+        gate.wait(5)
+        return result
+    return fn
+
+
+def test_concurrent_callers_share_one_execution():
+    flights, gate, calls = SingleFlight(), threading.Event(), []
+    with ThreadPoolExecutor(max_workers=9) as pool:
+        futures = [pool.submit(flights.do, "k", _slow(42, gate, calls)) for _ in range(8)]
+        while flights.stats()["coalesced"] < 7:
+            time.sleep(0.001)
+        other = pool.submit(flights.do, "other", lambda: "x")     # distinct keys never wait
+        assert other.result(1) == "x"
+        gate.set()
+        assert [f.result(5) for f in futures] == [42] * 8
+    stats = flights.stats()
+    assert calls == [1] and stats["executions"] == 2 and stats["coalesced"] == 7
+    assert stats["in_flight"] == 0 and stats["coalesce_rate"] == pytest.approx(7 / 9)
+    flights.do("k", lambda: calls.append(1))                       # landed: runs again
+    assert len(calls) == 2
+
+
+def test_errors_propagate_to_followers_and_timeouts_are_per_call():
+    flights, gate = SingleFlight(), threading.Event()
+
+    def boom():
+        gate.wait(5)
+        raise ValueError("no match")
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(flights.do, "k", boom)
+        while flights.stats()["in_flight"] == 0:
+            time.sleep(0.001)
+        patient = pool.submit(flights.do, "k", boom)
+        with pytest.raises(FlightTimeout):
+            flights.do("k", boom, timeout=0.01)
+        gate.set()
+        for f in (leader, patient):
+            with pytest.raises(ValueError):
+                f.result(5)
+    assert flights.stats()["timeouts"] == 1
+
+
+def test_reentrant_leader_does_not_deadlock():
+    flights = SingleFlight(timeout=1)
+    assert flights.do("k", lambda: flights.do("k", lambda: 7) + 1) == 8
+
+
+def test_concurrent_jpl_lookups_send_one_request(monkeypatch):
+    gate = threading.Event()
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"object": {"spkid": "90004812"}}
+
+    def slow_get(*args, **kwargs):
+        gate.wait(5)
+        return ok
+    with patch("backend.sbdb.requests.get", side_effect=slow_get) as get, \
+            ThreadPoolExecutor(max_workers=6) as pool:
+        futures = [pool.submit(sbdb_lookup, "C/2025 Q3") for _ in range(6)]
+        time.sleep(0.05)
+        gate.set()
+        assert {f.result(5) for f in futures} == {"90004812"}
+    assert get.call_count == 1
+
+    horizons = []
+    monkeypatch.setattr(resolvers, "_horizons_query_uncached",
+                        lambda *a: horizons.append(a) or time.sleep(0.05) or "table")
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(lambda _: resolvers._horizons_query("3I", "500", 2461000.5), range(6)))
+    assert results == ["table"] * 6 and len(horizons) == 1
+
+
+def test_follower_takes_over_from_a_cancelled_leader():
+    flights, gate, calls = SingleFlight(), threading.Event(), []
+    token = cancellation.CancelToken()
+
+    def fetch():
+        calls.append(1)
+        gate.wait(5)
+        cancellation.check()
+        return 42
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(token.run, flights.do, "k", fetch)
+        while flights.stats()["in_flight"] == 0:
+            time.sleep(0.001)
+        follower = pool.submit(flights.do, "k", fetch)
+        while flights.stats()["coalesced"] == 0:
+            time.sleep(0.001)
+        token.cancel()
+        gate.set()
+        with pytest.raises(cancellation.Cancelled):
+            leader.result(5)
+        assert follower.result(5) == 42
+    assert len(calls) == 2 and flights.stats()["takeovers"] == 1